@@ -0,0 +1,76 @@
+"""
+Compare the blocking pymysql helpers with the aiomysql layer under concurrency.
+
+Each simulated request runs a query that takes --query-delay seconds on the server
+(SELECT SLEEP). While the requests run, a ticker coroutine measures how late the
+event loop wakes it up, which is what every other request on the worker would feel.
+
+Run from the Backend directory against a reachable MySQL:
+    python -m benchmarks.async_db_benchmark --concurrency 50 --query-delay 0.05
+"""
+import argparse
+import asyncio
+import time
+
+import pymysql.cursors
+
+from connections.mysql_database import get_Mysql_db, fetch_one, close_async_mysql_pool
+
+
+async def blocking_request(delay):
+    db = get_Mysql_db()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        cursor.execute("SELECT SLEEP(%s) AS slept", (delay,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+        db.close()
+
+
+async def async_request(delay):
+    return await fetch_one("SELECT SLEEP(%s) AS slept", (delay,))
+
+
+async def loop_lag_probe(stop, interval=0.005):
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(label, request, concurrency, rounds, delay):
+    await request(0)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(loop_lag_probe(stop))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(request(delay) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await probe
+
+    total = concurrency * rounds
+    print(
+        f"{label:<10} requests={total:<6} wall={elapsed:8.3f}s "
+        f"throughput={total / elapsed:9.1f} req/s worst_loop_lag={worst_lag * 1000:8.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--query-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    await run("blocking", blocking_request, args.concurrency, args.rounds, args.query_delay)
+    await run("async", async_request, args.concurrency, args.rounds, args.query_delay)
+    await close_async_mysql_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
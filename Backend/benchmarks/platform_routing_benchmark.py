@@ -0,0 +1,117 @@
+"""
+Per-request overhead of PlatformRoutingMiddleware, before and after the ASGI rewrite.
+
+Requests are driven straight through the ASGI interface (no sockets) into a
+trivial endpoint, so the numbers are the middleware's own cost. "legacy" is the
+previous BaseHTTPMiddleware version that parsed the User-Agent on every request;
+"none" is the bare app for reference. Scenarios cover the common API request, a
+mobile hit on "/", and a browser hit on "/" that gets redirected.
+
+Run from the Backend directory:
+    python -m benchmarks.platform_routing_benchmark --requests 20000
+"""
+import argparse
+import asyncio
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, RedirectResponse
+
+from connections.platform_routing import PlatformRoutingMiddleware, WEB_REDIRECTS, is_mobile_user_agent
+
+DESKTOP_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+MOBILE_UA = "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Mobile Safari/537.36"
+
+SCENARIOS = {
+    "api request": ("/api/user/video-submissions", DESKTOP_UA),
+    "mobile on /": ("/", MOBILE_UA),
+    "browser on /": ("/", DESKTOP_UA),
+}
+
+
+class LegacyPlatformRoutingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this module replaced."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.web_redirects = dict(WEB_REDIRECTS)
+
+    async def dispatch(self, request, call_next):
+        import user_agents
+
+        user_agent = request.headers.get("User-Agent")
+        if not user_agent:
+            return await call_next(request)
+
+        ua = user_agents.parse(user_agent)
+
+        if ua.is_mobile:
+            return await call_next(request)
+
+        current_path = request.url.path
+        if current_path in self.web_redirects:
+            return RedirectResponse(url=self.web_redirects[current_path])
+
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def make_scope(path, user_agent):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"user-agent", user_agent.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, scope, requests):
+    for _ in range(min(200, requests)):
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main(requests):
+    apps = {
+        "none": endpoint,
+        "legacy": LegacyPlatformRoutingMiddleware(endpoint),
+        "asgi": PlatformRoutingMiddleware(endpoint),
+    }
+    for scenario, (path, user_agent) in SCENARIOS.items():
+        timings = {name: await measure(app, make_scope(path, user_agent), requests) for name, app in apps.items()}
+        overhead_before = timings["legacy"] - timings["none"]
+        overhead_after = timings["asgi"] - timings["none"]
+        print(
+            f"{scenario:<14} none={timings['none']:7.1f} us  legacy={timings['legacy']:7.1f} us  "
+            f"asgi={timings['asgi']:7.1f} us  overhead {overhead_before:7.1f} -> {overhead_after:6.1f} us/request"
+        )
+    print(f"UA cache: {is_mobile_user_agent.cache_info()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
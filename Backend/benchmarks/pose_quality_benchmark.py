@@ -0,0 +1,61 @@
+"""
+Time process_video_with_pose_detection for each pose quality preset.
+
+For every mode the script prints the wall time, the throughput in source frames
+per second, and the speed relative to real time (>1.0x means faster than playback).
+The processed output lands in PROCESSED_VIDEO_DIR as <name>_processed.mp4 and is
+overwritten by each mode, so point it at a sample clip rather than a live upload.
+
+Run from the Backend directory on a host with OpenCV and MediaPipe installed:
+    python -m benchmarks.pose_quality_benchmark path/to/sample.mp4 --modes fast balanced full
+"""
+import argparse
+import time
+
+from connections.pose_pipeline import POSE_QUALITY_PRESETS, process_video_with_pose_detection
+
+
+def probe(video_path):
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return (
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            cap.get(cv2.CAP_PROP_FPS) or 30.0,
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+    finally:
+        cap.release()
+
+
+def run(video_path, mode, total_frames, fps):
+    quality = POSE_QUALITY_PRESETS[mode]
+    started = time.perf_counter()
+    result = process_video_with_pose_detection(video_path, quality=quality)
+    elapsed = time.perf_counter() - started
+
+    status = "ok" if result else "FAILED"
+    print(
+        f"{mode:<10} stride={quality.stride} max_side={quality.inference_max_side or 'native':<6} "
+        f"complexity={quality.model_complexity} wall={elapsed:8.2f}s "
+        f"throughput={total_frames / elapsed:7.1f} fps realtime={total_frames / fps / elapsed:5.2f}x {status}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--modes", nargs="+", default=list(POSE_QUALITY_PRESETS), choices=list(POSE_QUALITY_PRESETS))
+    args = parser.parse_args()
+
+    total_frames, fps, width, height = probe(args.video)
+    print(f"{args.video}: {width}x{height}, {total_frames} frames at {fps:.1f} fps ({total_frames / fps:.1f}s)")
+
+    for mode in args.modes:
+        run(args.video, mode, total_frames, fps)
+
+
+if __name__ == "__main__":
+    main()
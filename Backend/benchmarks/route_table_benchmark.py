@@ -0,0 +1,132 @@
+"""
+Startup time, route count and route-dispatch latency of the app.
+
+Startup is the import of --module (default: main, which builds the app and
+registers every route) in fresh interpreters, as in startup_benchmark. Dispatch
+is the cost of finding the endpoint for a request: for every registered API
+route a concrete path is made up ({id} -> 1, {path:path} -> a/b) and resolved
+the way Starlette's router does it, walking the route list in order until one
+matches fully. Requests for routes late in the table, or shadowed by a
+duplicate, pay for every route in front of them.
+
+Older FastAPI releases copy an included router's routes into the app; newer ones
+keep a single entry wrapping the router. Such entries are expanded in place (with
+their include prefix), so both layouts are measured route by route.
+
+Only the routing table is exercised, no endpoint runs, so no database is needed;
+the app's .env must still be importable. To compare before/after, run it on
+both checkouts:
+    python -m benchmarks.route_table_benchmark --runs 5 --lookups 200
+"""
+import argparse
+import importlib
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+
+from starlette.routing import Match
+
+from benchmarks.startup_benchmark import measure as measure_startup
+
+PARAM = re.compile(r"{([^}:]+)(:[^}]+)?}")
+
+
+def concrete_path(path):
+    return PARAM.sub(lambda m: "a/b" if m.group(2) == ":path" else "1", path)
+
+
+def make_scope(method, path):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+
+
+def flatten_routes(routes, prefix=""):
+    """(route, include prefix) pairs in dispatch order, descending into included routers."""
+    flat = []
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            context = getattr(route, "include_context", None)
+            flat.extend(flatten_routes(included.routes, prefix + (getattr(context, "prefix", "") or "")))
+        else:
+            flat.append((route, prefix))
+    return flat
+
+
+def full_path(entry):
+    route, prefix = entry
+    return prefix + route.path
+
+
+def resolve(entries, scope):
+    for position, (route, prefix) in enumerate(entries):
+        route_scope = scope
+        if prefix:
+            if not scope["path"].startswith(prefix):
+                continue
+            route_scope = {**scope, "path": scope["path"][len(prefix):]}
+        match, _ = route.matches(route_scope)
+        if match == Match.FULL:
+            return position
+    return None
+
+
+def api_routes(entries):
+    return [entry for entry in entries if getattr(entry[0], "methods", None)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    startups = [measure_startup(args.module) for _ in range(args.runs)]
+    seconds = statistics.median(result["seconds"] for result in startups)
+    print(f"import {args.module}: median {seconds:.3f}s over {args.runs} runs")
+
+    app = importlib.import_module(args.module).app
+    entries = flatten_routes(app.router.routes)
+    routes = api_routes(entries)
+    # Mounts (static files) have no methods; a second mount at one path is dead too
+    registrations = Counter(
+        (method, full_path(entry)) for entry in entries for method in (getattr(entry[0], "methods", None) or ("MOUNT",))
+    )
+    duplicates = sorted(key for key, count in registrations.items() if count > 1)
+    print(f"routes: {len(entries)} total, {len(routes)} API, {len(duplicates)} duplicate method/path pairs")
+    for method, path in duplicates:
+        print(f"  duplicate: {method} {path}")
+
+    # Request paths always start with "/", so a route registered without one is dead
+    unreachable = [full_path(entry) for entry in routes if not full_path(entry).startswith("/")]
+    requests = [
+        make_scope(sorted(entry[0].methods)[0], concrete_path(full_path(entry)))
+        for entry in routes if full_path(entry).startswith("/")
+    ]
+    depths = [resolve(entries, scope) for scope in requests]
+
+    started = time.perf_counter()
+    for _ in range(args.lookups):
+        for scope in requests:
+            resolve(entries, scope)
+    per_lookup = (time.perf_counter() - started) / (args.lookups * len(requests)) * 1e6
+
+    matched = [depth for depth in depths if depth is not None]
+    print(f"dispatch: {per_lookup:.1f} us per lookup, mean {statistics.mean(matched) + 1:.1f} routes checked, "
+          f"worst {max(matched) + 1}")
+    for path in unreachable:
+        print(f"  never matched: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Import time and memory of the web tier, and a guard against pulling the CV/ML
+stack back into it.
+
+Each run imports --module (default: main, which builds the app and registers
+every route) in a fresh interpreter and reports the import wall time, the peak
+RSS, and which heavy modules got loaded. cv2, mediapipe, numpy, qrcode and
+user_agents are only needed by the pose/preview workers or on first use, so the
+script exits non-zero if any of them is imported at startup, or if the median
+time / peak RSS exceeds --max-seconds / --max-rss-mb.
+
+Run from the Backend directory with the app's environment (.env) available:
+    python -m benchmarks.startup_benchmark --runs 5 --max-seconds 3 --max-rss-mb 250
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("cv2", "mediapipe", "numpy", "qrcode", "user_agents")
+
+PROBE = """
+import importlib, json, resource, sys, time
+started = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - started
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    peak_kb //= 1024
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": peak_kb / 1024,
+    "heavy": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+
+def measure(module):
+    probe = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True
+    )
+    if probe.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{probe.stderr.strip()}")
+    return json.loads(probe.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    args = parser.parse_args()
+
+    results = [measure(args.module) for _ in range(args.runs)]
+    seconds = statistics.median(result["seconds"] for result in results)
+    rss_mb = max(result["rss_mb"] for result in results)
+    heavy = sorted({name for result in results for name in result["heavy"]})
+
+    print(f"import {args.module}: median {seconds:.3f}s over {args.runs} runs, peak RSS {rss_mb:.1f} MB")
+    print(f"heavy modules loaded at startup: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if heavy:
+        failures.append(f"web tier imports {', '.join(heavy)} at startup")
+    if args.max_seconds is not None and seconds > args.max_seconds:
+        failures.append(f"import time {seconds:.3f}s exceeds {args.max_seconds}s")
+    if args.max_rss_mb is not None and rss_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {rss_mb:.1f} MB exceeds {args.max_rss_mb} MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
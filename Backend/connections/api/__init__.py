@@ -0,0 +1,48 @@
+"""
+The app's endpoints, one APIRouter per domain.
+
+Nothing here is imported with connections.routes: Routes() imports the router
+modules listed in API_ROUTERS (all of ROUTER_MODULES by default) and merges them
+with build_route_table(). Modules are registered in ROUTER_MODULES order, which
+matters where a static path in one module (/exercises/submissions) would
+otherwise be taken by a parameterised one in another (/exercises/{exercise_id}).
+"""
+import importlib
+import os
+
+from connections.api.route_table import RouteTableError, build_route_table, check_route_table
+
+ROUTER_MODULES = (
+    "dashboard",
+    "auth",
+    "messages",
+    "therapists",
+    "video",
+    "patients",
+    "exercises",
+    "treatment_plans",
+    "appointments",
+    "metrics",
+)
+
+# Comma-separated subset of ROUTER_MODULES to serve, e.g. "auth,video"
+API_ROUTERS = os.getenv("API_ROUTERS")
+
+
+def enabled_router_modules():
+    if not API_ROUTERS:
+        return ROUTER_MODULES
+    requested = {name.strip() for name in API_ROUTERS.split(",") if name.strip()}
+    unknown = requested.difference(ROUTER_MODULES)
+    if unknown:
+        raise RouteTableError(f"Unknown router modules in API_ROUTERS: {', '.join(sorted(unknown))}")
+    return tuple(name for name in ROUTER_MODULES if name in requested)
+
+
+def load_routers(modules=None):
+    modules = enabled_router_modules() if modules is None else modules
+    return [importlib.import_module(f"{__name__}.{name}").router for name in modules]
+
+
+def register_api_routes(app, modules=None):
+    build_route_table(app, load_routers(modules))
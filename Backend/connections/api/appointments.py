@@ -0,0 +1,1473 @@
+"""
+Appointment calendar pages for therapists and appointment booking from the mobile app.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/appointments/new")
+async def new_appointment_form(request: Request, user=Depends(get_current_user)):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            cursor.execute(
+                """SELECT patient_id, first_name, last_name, diagnosis, phone
+                    FROM Patients
+                    WHERE therapist_id = %s
+                    ORDER BY last_name, first_name""",
+                (session_data["user_id"],)
+            )
+            patients = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result['count'] if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT m.message_id, m.subject, m.content, m.created_at,
+                            t.first_name, t.last_name, COALESCE(t.profile_image, 'avatar-1.jpg') as profile_image
+                        FROM Messages m
+                        JOIN Therapists t ON m.sender_id = t.id
+                        WHERE m.recipient_id = %s AND m.is_read = FALSE
+                        ORDER BY m.created_at DESC
+                        LIMIT 4""",
+                (session_data["user_id"],)
+            )
+            messages_result = cursor.fetchall()
+
+            recent_messages = []
+            for message in messages_result:
+                message_with_time = message.copy()
+
+                timestamp = message['created_at']
+                now = datetime.datetime.now()
+                if isinstance(timestamp, datetime.datetime):
+                    diff = now - timestamp
+                    if timestamp.date() == now.date():
+                        message_with_time['time_display'] = timestamp.strftime('%I:%M %p')
+
+                        minutes_ago = diff.seconds // 60
+                        if minutes_ago < 60:
+                            message_with_time['time_ago'] = f"{minutes_ago} min ago"
+                        else:
+                            hours_ago = minutes_ago // 60
+                            message_with_time['time_ago'] = f"{hours_ago} hours ago"
+
+                    elif timestamp.date() == (now - timedelta(days=1)).date():
+                        message_with_time['time_display'] = "Yesterday"
+                        message_with_time['time_ago'] = timestamp.strftime('%I:%M %p')
+                    else:
+                        message_with_time['time_display'] = timestamp.strftime('%d %b')
+                        message_with_time['time_ago'] = timestamp.strftime('%Y')
+
+                recent_messages.append(message_with_time)
+
+            today = datetime.datetime.now().strftime('%Y-%m-%d')
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(user["user_id"])
+
+
+            return templates.TemplateResponse(
+                "dist/appointments/new_appointment.html",
+                {
+                    "request": request,
+                    "therapist": therapist_data,
+                    "first_name": therapist["first_name"],
+                    "last_name": therapist["last_name"],
+                    "patients": patients,
+                    "unread_messages_count": unread_messages_count,
+                    "recent_messages": recent_messages,
+                    "today": today
+                }
+            )
+        except Exception as e:
+            print(f"Database error in new appointment form: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/appointments")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in new appointment form: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+def process_appointment_for_calendar(appointment):
+    """Process an appointment object to make it suitable for calendar display"""
+    from datetime import datetime, date, time, timedelta
+
+    processed = dict(appointment)
+
+
+    if 'appointment_id' in processed and processed['appointment_id'] is not None:
+        processed['appointment_id'] = int(processed['appointment_id'])
+
+
+    if 'appointment_date' in processed and processed['appointment_date'] is not None:
+        if isinstance(processed['appointment_date'], datetime) or isinstance(processed['appointment_date'], date):
+            processed['appointment_date_iso'] = processed['appointment_date'].isoformat()
+
+
+    if 'appointment_time' in processed and processed['appointment_time'] is not None:
+        if isinstance(processed['appointment_time'], timedelta):
+            total_seconds = processed['appointment_time'].total_seconds()
+            hours = int(total_seconds // 3600)
+            minutes = int((total_seconds % 3600) // 60)
+
+
+            processed['appointment_time_obj'] = {
+                'hour': hours,
+                'minute': minutes
+            }
+
+
+            processed['appointment_time_24h'] = f"{hours:02d}:{minutes:02d}"
+
+
+            am_pm = "AM" if hours < 12 else "PM"
+            display_hours = hours if hours <= 12 else hours - 12
+            display_hours = 12 if display_hours == 0 else display_hours
+            processed['appointment_time_12h'] = f"{display_hours}:{minutes:02d} {am_pm}"
+
+
+            end_hours = hours + ((processed.get('duration', 60) + minutes) // 60)
+            end_minutes = (minutes + processed.get('duration', 60)) % 60
+            processed['end_time_24h'] = f"{end_hours:02d}:{end_minutes:02d}"
+
+
+            processed['formatted_time'] = processed['appointment_time_12h']
+
+        elif hasattr(processed['appointment_time'], 'hour'):
+
+            hours = processed['appointment_time'].hour
+            minutes = processed['appointment_time'].minute
+
+
+            processed['appointment_time_obj'] = {
+                'hour': hours,
+                'minute': minutes
+            }
+
+
+            processed['appointment_time_24h'] = f"{hours:02d}:{minutes:02d}"
+
+
+            am_pm = "AM" if hours < 12 else "PM"
+            display_hours = hours if hours <= 12 else hours - 12
+            display_hours = 12 if display_hours == 0 else display_hours
+            processed['appointment_time_12h'] = f"{display_hours}:{minutes:02d} {am_pm}"
+
+
+            end_hours = hours + ((processed.get('duration', 60) + minutes) // 60)
+            end_minutes = (minutes + processed.get('duration', 60)) % 60
+            processed['end_time_24h'] = f"{end_hours:02d}:{end_minutes:02d}"
+
+
+            processed['formatted_time'] = processed['appointment_time_12h']
+
+
+    if 'duration' not in processed or processed['duration'] is None:
+        processed['duration'] = 60
+
+
+    if 'status' not in processed or processed['status'] is None:
+        processed['status'] = 'Scheduled'
+
+    return processed
+
+
+def serialize_datetime(obj):
+    """JSON serializer for datetime objects not serializable by default json code"""
+    from datetime import datetime, date, time, timedelta
+
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif isinstance(obj, time):
+        return obj.strftime('%H:%M:%S')
+    elif isinstance(obj, timedelta):
+        total_seconds = obj.total_seconds()
+        hours = int(total_seconds // 3600)
+        minutes = int((total_seconds % 3600) // 60)
+        return f"{hours:02d}:{minutes:02d}"
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+@router.get("/appointments")
+async def appointments_page(request: Request, user=Depends(get_current_user)):
+    """Route to display appointments schedule and management page"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT a.*, p.first_name as patient_first_name, p.last_name as patient_last_name
+                    FROM Appointments a
+                    JOIN Patients p ON a.patient_id = p.patient_id
+                    WHERE a.therapist_id = %s AND a.appointment_date >= CURDATE()
+                    ORDER BY a.appointment_date, a.appointment_time""",
+                (session_data["user_id"],)
+            )
+            upcoming_appointments_raw_result = cursor.fetchall()
+
+            upcoming_appointments_raw = []
+            for appt in upcoming_appointments_raw_result:
+                clean_appt = {}
+                for key, value in appt.items():
+                    if isinstance(value, bytes):
+                        clean_appt[key] = value.decode('utf-8')
+                    else:
+                        clean_appt[key] = value
+                upcoming_appointments_raw.append(clean_appt)
+
+            cursor.execute(
+                """SELECT a.*, p.first_name as patient_first_name, p.last_name as patient_last_name
+                    FROM Appointments a
+                    JOIN Patients p ON a.patient_id = p.patient_id
+                    WHERE a.therapist_id = %s AND a.appointment_date < CURDATE()
+                    ORDER BY a.appointment_date DESC, a.appointment_time DESC
+                    LIMIT 10""",
+                (session_data["user_id"],)
+            )
+            past_appointments_raw_result = cursor.fetchall()
+
+            past_appointments_raw = []
+            for appt in past_appointments_raw_result:
+                clean_appt = {}
+                for key, value in appt.items():
+                    if isinstance(value, bytes):
+                        clean_appt[key] = value.decode('utf-8')
+                    else:
+                        clean_appt[key] = value
+                past_appointments_raw.append(clean_appt)
+
+            cursor.execute(
+                "SELECT patient_id, first_name, last_name, diagnosis FROM Patients WHERE therapist_id = %s",
+                (session_data["user_id"],)
+            )
+            patients_result = cursor.fetchall()
+
+            patients = []
+            for patient in patients_result:
+                clean_patient = {}
+                for key, value in patient.items():
+                    if isinstance(value, bytes):
+                        clean_patient[key] = value.decode('utf-8')
+                    else:
+                        clean_patient[key] = value
+                patients.append(clean_patient)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT m.message_id, m.subject, m.content, m.created_at,
+                            t.first_name, t.last_name, COALESCE(t.profile_image, 'avatar-1.jpg') as profile_image
+                        FROM Messages m
+                        JOIN Therapists t ON m.sender_id = t.id
+                        WHERE m.recipient_id = %s AND m.is_read = FALSE
+                        ORDER BY m.created_at DESC
+                        LIMIT 4""",
+                (session_data["user_id"],)
+            )
+            messages_result = cursor.fetchall()
+
+            recent_messages = []
+            for message in messages_result:
+                clean_message = {}
+                for key, value in message.items():
+                    if isinstance(value, bytes):
+                        clean_message[key] = value.decode('utf-8')
+                    else:
+                        clean_message[key] = value
+
+                message_with_time = dict(clean_message)
+
+                timestamp = clean_message.get('created_at')
+                now = datetime.datetime.now()
+                if isinstance(timestamp, datetime.datetime):
+                    diff = now - timestamp
+                    if timestamp.date() == now.date():
+                        message_with_time['time_display'] = timestamp.strftime('%I:%M %p')
+
+                        minutes_ago = diff.seconds // 60
+                        if minutes_ago < 60:
+                            message_with_time['time_ago'] = f"{minutes_ago} min ago"
+                        else:
+                            hours_ago = minutes_ago // 60
+                            message_with_time['time_ago'] = f"{hours_ago} hours ago"
+
+                    elif timestamp.date() == (now - timedelta(days=1)).date():
+                        message_with_time['time_display'] = "Yesterday"
+                        message_with_time['time_ago'] = timestamp.strftime('%I:%M %p')
+                    else:
+                        message_with_time['time_display'] = timestamp.strftime('%d %b')
+                        message_with_time['time_ago'] = timestamp.strftime('%Y')
+
+                recent_messages.append(message_with_time)
+
+            today = datetime.datetime.now().strftime('%Y-%m-%d')
+
+            upcoming_appointments = []
+            for appt in upcoming_appointments_raw:
+                processed_appt = process_appointment_for_calendar(appt)
+                upcoming_appointments.append(processed_appt)
+
+            past_appointments = []
+            for appt in past_appointments_raw:
+                processed_appt = process_appointment_for_calendar(appt)
+                past_appointments.append(processed_appt)
+
+            serialized_upcoming = json.dumps(upcoming_appointments, default=serialize_datetime)
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(user["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/appointments/appointment_list.html",
+                {
+                    "request": request,
+                    "therapist": therapist_data,
+                    "first_name": therapist_data.get("first_name", ""),
+                    "last_name": therapist_data.get("last_name", ""),
+                    "upcoming_appointments": upcoming_appointments,
+                    "past_appointments": past_appointments,
+                    "patients": patients,
+                    "unread_messages_count": unread_messages_count,
+                    "recent_messages": recent_messages,
+                    "today": today,
+                    "serialized_upcoming": serialized_upcoming
+                }
+            )
+        except Exception as e:
+            print(f"Database error in appointments page: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in appointments page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/appointments/{appointment_id}")
+async def view_appointment(request: Request, appointment_id: int, user = Depends(get_current_user)):
+    """Display the detailed view of an appointment"""
+    session_id = request.cookies.get("session_id")
+    therapist_data = await get_therapist_data(user["user_id"])
+
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT a.*, p.first_name as patient_first_name, p.last_name as patient_last_name,
+                            p.diagnosis, p.phone, p.email
+                    FROM Appointments a
+                    JOIN Patients p ON a.patient_id = p.patient_id
+                    WHERE a.appointment_id = %s AND a.therapist_id = %s""",
+                (appointment_id, session_data["user_id"])
+            )
+            appointment_result = cursor.fetchone()
+
+            if not appointment_result:
+                return RedirectResponse(url="/appointments?error=not_found")
+
+            appointment = {}
+            for key, value in appointment_result.items():
+                if isinstance(value, bytes):
+                    appointment[key] = value.decode('utf-8')
+                else:
+                    appointment[key] = value
+
+            processed_appointment = process_appointment_for_calendar(appointment)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT m.message_id, m.subject, m.content, m.created_at,
+                            t.first_name, t.last_name, COALESCE(t.profile_image, 'avatar-1.jpg') as profile_image
+                        FROM Messages m
+                        JOIN Therapists t ON m.sender_id = t.id
+                        WHERE m.recipient_id = %s AND m.is_read = FALSE
+                        ORDER BY m.created_at DESC
+                        LIMIT 4""",
+                (session_data["user_id"],)
+            )
+            messages_result = cursor.fetchall()
+
+            recent_messages = []
+            for message in messages_result:
+                clean_message = {}
+                for key, value in message.items():
+                    if isinstance(value, bytes):
+                        clean_message[key] = value.decode('utf-8')
+                    else:
+                        clean_message[key] = value
+
+                message_with_time = dict(clean_message)
+
+                timestamp = clean_message.get('created_at')
+                now = datetime.datetime.now()
+                if isinstance(timestamp, datetime.datetime):
+                    diff = now - timestamp
+                    if timestamp.date() == now.date():
+                        message_with_time['time_display'] = timestamp.strftime('%I:%M %p')
+
+                        minutes_ago = diff.seconds // 60
+                        if minutes_ago < 60:
+                            message_with_time['time_ago'] = f"{minutes_ago} min ago"
+                        else:
+                            hours_ago = minutes_ago // 60
+                            message_with_time['time_ago'] = f"{hours_ago} hours ago"
+
+                    elif timestamp.date() == (now - timedelta(days=1)).date():
+                        message_with_time['time_display'] = "Yesterday"
+                        message_with_time['time_ago'] = timestamp.strftime('%I:%M %p')
+                    else:
+                        message_with_time['time_display'] = timestamp.strftime('%d %b')
+                        message_with_time['time_ago'] = timestamp.strftime('%Y')
+
+                recent_messages.append(message_with_time)
+
+            cursor.execute(
+                """SELECT plan_id, name, status
+                    FROM TreatmentPlans
+                    WHERE patient_id = %s
+                    ORDER BY start_date DESC""",
+                (appointment.get('patient_id'),)
+            )
+            treatment_plans_result = cursor.fetchall()
+
+            treatment_plans = []
+            for plan in treatment_plans_result:
+                clean_plan = {}
+                for key, value in plan.items():
+                    if isinstance(value, bytes):
+                        clean_plan[key] = value.decode('utf-8')
+                    else:
+                        clean_plan[key] = value
+                treatment_plans.append(clean_plan)
+
+            return templates.TemplateResponse(
+                "dist/appointments/view_appointment.html",
+                {
+                    "request": request,
+                    "therapist": therapist_data,
+                    "first_name": therapist_data.get("first_name", ""),
+                    "last_name": therapist_data.get("last_name", ""),
+                    "appointment": processed_appointment,
+                    "treatment_plans": treatment_plans,
+                    "unread_messages_count": unread_messages_count,
+                    "recent_messages": recent_messages
+                }
+            )
+        except Exception as e:
+            print(f"Database error in view appointment: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/appointments?error=database")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in view appointment: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/appointments/{appointment_id}/edit")
+async def edit_appointment_form(request: Request, appointment_id: int, user = Depends(get_current_user)):
+    """Display the form to edit an appointment"""
+    session_id = request.cookies.get("session_id")
+    therapist_data = await get_therapist_data(user["user_id"])
+
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT a.*, p.first_name as patient_first_name, p.last_name as patient_last_name
+                    FROM Appointments a
+                    JOIN Patients p ON a.patient_id = p.patient_id
+                    WHERE a.appointment_id = %s AND a.therapist_id = %s""",
+                (appointment_id, session_data["user_id"])
+            )
+            appointment_result = cursor.fetchone()
+
+            if not appointment_result:
+                return RedirectResponse(url="/appointments?error=not_found")
+
+            appointment = {}
+            for key, value in appointment_result.items():
+                if isinstance(value, bytes):
+                    appointment[key] = value.decode('utf-8')
+                else:
+                    appointment[key] = value
+
+            processed_appointment = process_appointment_for_calendar(appointment)
+
+            cursor.execute(
+                """SELECT patient_id, first_name, last_name, diagnosis, phone
+                    FROM Patients
+                    WHERE therapist_id = %s
+                    ORDER BY last_name, first_name""",
+                (session_data["user_id"],)
+            )
+            patients_result = cursor.fetchall()
+
+            patients = []
+            for patient in patients_result:
+                clean_patient = {}
+                for key, value in patient.items():
+                    if isinstance(value, bytes):
+                        clean_patient[key] = value.decode('utf-8')
+                    else:
+                        clean_patient[key] = value
+                patients.append(clean_patient)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT m.message_id, m.subject, m.content, m.created_at,
+                            t.first_name, t.last_name, COALESCE(t.profile_image, 'avatar-1.jpg') as profile_image
+                        FROM Messages m
+                        JOIN Therapists t ON m.sender_id = t.id
+                        WHERE m.recipient_id = %s AND m.is_read = FALSE
+                        ORDER BY m.created_at DESC
+                        LIMIT 4""",
+                (session_data["user_id"],)
+            )
+            messages_result = cursor.fetchall()
+
+            recent_messages = []
+            for message in messages_result:
+                clean_message = {}
+                for key, value in message.items():
+                    if isinstance(value, bytes):
+                        clean_message[key] = value.decode('utf-8')
+                    else:
+                        clean_message[key] = value
+
+                message_with_time = dict(clean_message)
+
+                timestamp = clean_message.get('created_at')
+                now = datetime.datetime.now()
+                if isinstance(timestamp, datetime.datetime):
+                    diff = now - timestamp
+                    if timestamp.date() == now.date():
+                        message_with_time['time_display'] = timestamp.strftime('%I:%M %p')
+
+                        minutes_ago = diff.seconds // 60
+                        if minutes_ago < 60:
+                            message_with_time['time_ago'] = f"{minutes_ago} min ago"
+                        else:
+                            hours_ago = minutes_ago // 60
+                            message_with_time['time_ago'] = f"{hours_ago} hours ago"
+
+                    elif timestamp.date() == (now - timedelta(days=1)).date():
+                        message_with_time['time_display'] = "Yesterday"
+                        message_with_time['time_ago'] = timestamp.strftime('%I:%M %p')
+                    else:
+                        message_with_time['time_display'] = timestamp.strftime('%d %b')
+                        message_with_time['time_ago'] = timestamp.strftime('%Y')
+
+                recent_messages.append(message_with_time)
+
+            appointment_date = appointment.get('appointment_date')
+            formatted_date = appointment_date.strftime('%Y-%m-%d') if isinstance(appointment_date, datetime.date) else appointment_date
+
+            appointment_time = appointment.get('appointment_time')
+            if isinstance(appointment_time, datetime.time):
+                formatted_time = appointment_time.strftime('%H:%M')
+            elif isinstance(appointment_time, datetime.timedelta):
+                total_seconds = appointment_time.total_seconds()
+                hours = int(total_seconds // 3600)
+                minutes = int((total_seconds % 3600) // 60)
+                formatted_time = f"{hours:02d}:{minutes:02d}"
+            else:
+                formatted_time = appointment_time
+
+            status_options = ['Scheduled', 'Completed', 'Cancelled', 'No-Show']
+
+            return templates.TemplateResponse(
+                "dist/appointments/edit_appointment.html",
+                {
+                    "request": request,
+                    "therapist": therapist_data,
+                    "first_name": therapist_data.get("first_name", ""),
+                    "last_name": therapist_data.get("last_name", ""),
+                    "appointment": processed_appointment,
+                    "appointment_date": formatted_date,
+                    "appointment_time": formatted_time,
+                    "patients": patients,
+                    "unread_messages_count": unread_messages_count,
+                    "recent_messages": recent_messages,
+                    "status_options": status_options
+                }
+            )
+        except Exception as e:
+            print(f"Database error in edit appointment form: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/appointments?error=database")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in edit appointment form: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/appointments/{appointment_id}/delete")
+async def delete_appointment(request: Request, appointment_id: int, user=Depends(get_current_user)):
+    """Delete an appointment"""
+    session_id = request.cookies.get("session_id")
+
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT appointment_id
+                    FROM Appointments
+                    WHERE appointment_id = %s AND therapist_id = %s""",
+                (appointment_id, session_data["user_id"])
+            )
+            appointment = cursor.fetchone()
+
+            if not appointment:
+                return RedirectResponse(url="/appointments?error=not_found")
+
+            cursor.execute(
+                "DELETE FROM Appointments WHERE appointment_id = %s",
+                (appointment_id,)
+            )
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+
+            return RedirectResponse(url="/appointments?success=deleted", status_code=303)
+
+        except Exception as e:
+            print(f"Database error in delete appointment: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/appointments?error=database")
+
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Error in delete appointment: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/appointments/{appointment_id}/edit")
+async def update_appointment(request: Request, appointment_id: int):
+    """Handle appointment update form submission"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        form_data = await request.form()
+
+        patient_id = form_data.get("patient_id")
+        appointment_date = form_data.get("appointment_date")
+        appointment_time = form_data.get("appointment_time")
+        duration = form_data.get("duration", "60")
+        notes = form_data.get("notes")
+        status = form_data.get("status", "Scheduled")
+
+        if not patient_id or not appointment_date or not appointment_time:
+            return RedirectResponse(
+                url=f"/appointments/{appointment_id}/edit?error=missing_fields",
+                status_code=303
+            )
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT appointment_id
+                    FROM Appointments
+                    WHERE appointment_id = %s AND therapist_id = %s""",
+                (appointment_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                print(f"Appointment {appointment_id} does not belong to therapist {session_data['user_id']}")
+                return RedirectResponse(url="/appointments?error=unauthorized")
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE patient_id = %s AND therapist_id = %s",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                print(f"Patient {patient_id} does not belong to therapist {session_data['user_id']}")
+                return RedirectResponse(url=f"/appointments/{appointment_id}/edit?error=invalid_patient")
+
+            try:
+                try:
+                    time_obj = datetime.datetime.strptime(appointment_time, "%H:%M").time()
+                except ValueError:
+                    try:
+                        time_obj = datetime.datetime.strptime(appointment_time, "%I:%M %p").time()
+                    except ValueError:
+                        time_obj = datetime.datetime.strptime(appointment_time, "%I:%M%p").time()
+
+                cursor.execute(
+                    """UPDATE Appointments
+                        SET patient_id = %s,
+                            appointment_date = %s,
+                            appointment_time = %s,
+                            duration = %s,
+                            notes = %s,
+                            status = %s,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE appointment_id = %s""",
+                    (patient_id, appointment_date, time_obj, duration, notes, status, appointment_id)
+                )
+                db.commit()
+                release_Mysql_db(db, cursor)
+                await invalidate_dashboard_cache(session_data["user_id"])
+
+                return RedirectResponse(url="/appointments?success=updated", status_code=303)
+            except ValueError as ve:
+                print(f"Time parsing error: {ve}")
+                return RedirectResponse(url=f"/appointments/{appointment_id}/edit?error=invalid_time_format")
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error updating appointment: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url=f"/appointments/{appointment_id}/edit?error=db_error")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error updating appointment: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/appointments/new")
+async def create_appointment(request: Request, user=Depends(get_current_user)):
+    """Handle appointment creation"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        form_data = await request.form()
+
+        patient_id = form_data.get("patient_id")
+        appointment_date = form_data.get("appointment_date")
+        appointment_time = form_data.get("appointment_time")
+        duration = form_data.get("duration", "60")
+        notes = form_data.get("notes")
+
+        if not patient_id or not appointment_date or not appointment_time:
+            return RedirectResponse(url="/appointments/new?error=missing_fields", status_code=303)
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE patient_id = %s AND therapist_id = %s",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                print(f"Patient {patient_id} does not belong to therapist {session_data['user_id']}")
+                return RedirectResponse(url="/appointments/new?error=invalid_patient")
+
+            try:
+                try:
+                    time_obj = datetime.datetime.strptime(appointment_time, "%H:%M").time()
+                except ValueError:
+                    try:
+                        time_obj = datetime.datetime.strptime(appointment_time, "%I:%M %p").time()
+                    except ValueError:
+                        time_obj = datetime.datetime.strptime(appointment_time, "%I:%M%p").time()
+
+                cursor.execute(
+                    """INSERT INTO Appointments
+                        (patient_id, therapist_id, appointment_date, appointment_time, duration, notes, status)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    (patient_id, session_data["user_id"], appointment_date, time_obj, duration, notes, "Scheduled")
+                )
+                db.commit()
+                release_Mysql_db(db, cursor)
+                await invalidate_dashboard_cache(session_data["user_id"])
+
+                return RedirectResponse(url="/appointments", status_code=303)
+            except ValueError as ve:
+                print(f"Time parsing error: {ve}")
+                return RedirectResponse(url="/appointments/new?error=invalid_time_format")
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error creating appointment: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/appointments/new?error=db_error")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error creating appointment: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/appointments/{appointment_id}/status")
+async def update_appointment_status(
+    request: Request,
+    appointment_id: int,
+    status: str = Form(...),
+    session_notes: str = Form(None)
+):
+    """Route to update appointment status"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT appointment_id FROM Appointments
+                    WHERE appointment_id = %s AND therapist_id = %s""",
+                (appointment_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                return JSONResponse(
+                    status_code=403,
+                    content={"success": False, "message": "You don't have permission to update this appointment"}
+                )
+
+            notes_update = ""
+            if session_notes:
+                safe_notes = session_notes.replace("'", "''")
+                notes_update = f", notes = CONCAT(COALESCE(notes, ''), '\n\n{safe_notes}')"
+
+            cursor.execute(
+                f"UPDATE Appointments SET status = %s{notes_update} WHERE appointment_id = %s",
+                (status, appointment_id)
+            )
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+
+            return JSONResponse(content={"success": True, "message": f"Appointment marked as {status}"})
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in update appointment status: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"success": False, "message": f"Error updating appointment: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in update appointment status: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "message": "Server error"}
+        )
+
+
+@router.post("/api/book-appointment")
+async def book_appointment(appointment_request: AppointmentRequest, request: Request):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    print(f"Appointment request - Cookie session ID: {session_id}")
+
+    session_data = None
+    if session_id:
+        try:
+            session_data = await get_session_data(session_id)
+        except Exception as e:
+            print(f"Error getting session data: {e}")
+
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            "SELECT id FROM Therapists WHERE id = %s",
+            (appointment_request.therapist_id,)
+        )
+        therapist = cursor.fetchone()
+
+        if not therapist:
+            return JSONResponse(
+                status_code=404,
+                content={"status": "failed", "message": "Therapist not found"}
+            )
+
+        user_info = None
+        user_id = None
+
+        if session_data and hasattr(session_data, 'user_id'):
+            try:
+                user_id = session_data.user_id
+                cursor.execute(
+                    "SELECT username, email, user_id FROM users WHERE user_id = %s",
+                    (user_id,)
+                )
+                user_info = cursor.fetchone()
+            except Exception as e:
+                print(f"Error getting session user: {e}")
+
+        patient_id = None
+
+        if user_info:
+            user_username = user_info.get('username')
+            user_email = user_info.get('email')
+            user_user_id = user_info.get('user_id')
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE email = %s",
+                (user_email,)
+            )
+            patient_record = cursor.fetchone()
+            print(f"patient_record: {patient_record}")
+
+            if patient_record:
+                patient_id = patient_record.get('patient_id')
+            else:
+                cursor.execute(
+                    """INSERT INTO Patients
+                        (therapist_id, first_name, last_name, email, user_id)
+                        VALUES (%s, %s, %s, %s, %s)""",
+                    (appointment_request.therapist_id, user_username, "", user_email, user_user_id)
+                )
+                db.commit()
+                patient_id = cursor.lastrowid
+        else:
+            cursor.execute(
+                """INSERT INTO Patients
+                    (therapist_id, first_name, last_name, email)
+                    VALUES (%s, %s, %s, %s)""",
+                (appointment_request.therapist_id, "Guest", "User", f"guest_{int(time.time())}@example.com")
+            )
+            db.commit()
+            patient_id = cursor.lastrowid
+
+        time_parts = appointment_request.time.split()
+        time_str = time_parts[0]
+        am_pm = time_parts[1] if len(time_parts) > 1 else "AM"
+
+        try:
+            time_obj = datetime.datetime.strptime(f"{time_str} {am_pm}", "%I:%M %p").time()
+        except ValueError:
+            try:
+                time_obj = datetime.datetime.strptime(time_str, "%H:%M").time()
+            except ValueError:
+                return JSONResponse(
+                    status_code=400,
+                    content={"status": "failed", "message": "Invalid time format"}
+                )
+
+        duration = 60
+
+        full_notes = f"Type: {appointment_request.type}\n"
+        if appointment_request.notes:
+            full_notes += f"Notes: {appointment_request.notes}\n"
+        if appointment_request.insuranceProvider:
+            full_notes += f"Insurance: {appointment_request.insuranceProvider}\n"
+        if appointment_request.insuranceMemberId:
+            full_notes += f"Member ID: {appointment_request.insuranceMemberId}"
+
+        cursor.execute(
+            """INSERT INTO Appointments
+                (patient_id, therapist_id, appointment_date, appointment_time, duration, notes, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            (patient_id, appointment_request.therapist_id, appointment_request.date,
+            time_obj, duration, full_notes, "Scheduled")
+        )
+        db.commit()
+        release_Mysql_db(db, cursor)
+        await invalidate_dashboard_cache(appointment_request.therapist_id)
+
+        return {"status": "success", "message": "Appointment scheduled successfully"}
+
+    except Exception as e:
+        db.rollback()
+        print(f"Database error in request appointment API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "failed", "message": f"Error requesting appointment: {str(e)}"}
+        )
+    finally:
+        cursor.close()
+        db.close()
+
+
+def format_mysql_time(mysql_time):
+    """Converts MySQL TIME (timedelta) to formatted string like '02:30 PM'"""
+    if isinstance(mysql_time, timedelta):
+        mysql_time = (datetime.datetime.min + mysql_time).time()
+    return mysql_time.strftime("%I:%M %p") if mysql_time else "N/A"
+
+
+@router.get("/api/user/appointments")
+async def get_user_appointments_data(request: Request):
+    """API endpoint to get appointments for the current logged-in user"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"}
+            )
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient_record = cursor.fetchone()
+
+            if not patient_record:
+                return []
+
+            patient_id = patient_record.get('patient_id')
+
+            cursor.execute(
+                """SELECT a.*
+                    FROM Appointments a
+                    WHERE a.patient_id = %s
+                    ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
+                (patient_id,)
+            )
+            appointments = cursor.fetchall()
+
+            formatted_appointments = []
+            for appointment in appointments:
+                notes_info = {"appointmentType": "", "additionalNotes": "", "insurance": "", "memberId": 0}
+                appointment_notes = appointment.get("notes", "")
+
+                if appointment_notes:
+                    lines = appointment_notes.split('\n')
+                    for line in lines:
+                        if line.startswith('Type:'):
+                            notes_info["appointmentType"] = line[5:].strip()
+                        elif line.startswith('Notes:'):
+                            notes_info["additionalNotes"] = line[6:].strip()
+                        elif line.startswith('Insurance:'):
+                            notes_info["insurance"] = line[10:].strip()
+                        elif line.startswith('Member ID:'):
+                            id_str = line[10:].strip()
+                            try:
+                                notes_info["memberId"] = int(id_str)
+                            except ValueError:
+                                notes_info["memberId"] = 0
+
+                formatted_appointment = {
+                    "appointment_id": appointment.get("appointment_id", 0),
+                    "patient_id": appointment.get("patient_id", 0),
+                    "therapist_id": appointment.get("therapist_id", 0),
+                    "appointment_date": appointment.get("appointment_date").isoformat() if appointment.get("appointment_date") else "",
+                    "appointment_time": format_mysql_time(appointment.get("appointment_time")),
+                    "duration": appointment.get("duration", 60) or 60,
+                    "status": appointment.get("status", "Scheduled") or "Scheduled",
+                    "notes": appointment.get("notes", "") or "",
+                    "appointmentType": notes_info["appointmentType"],
+                    "additionalNotes": notes_info["additionalNotes"],
+                    "insurance": notes_info["insurance"],
+                    "memberId": notes_info["memberId"],
+                    "created_at": appointment.get("created_at").isoformat() if appointment.get("created_at") else "",
+                    "updated_at": appointment.get("updated_at").isoformat() if appointment.get("updated_at") else ""
+                }
+
+                formatted_appointments.append(formatted_appointment)
+
+            return formatted_appointments
+
+        except Exception as e:
+            print(f"Database error in get user appointments data API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user appointments data API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/appointments/{appointment_id}")
+async def get_appointment_details(appointment_id: int ):
+    """API endpoint to get detailed information about a specific appointment"""
+    try:
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT * FROM Appointments WHERE appointment_id = %s",
+                (appointment_id,)
+            )
+            appointment = cursor.fetchone()
+
+            if not appointment:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Appointment not found"}
+                )
+
+            notes_info = {"Type": "", "Notes": "", "Insurance": "", "Member_ID": 0}
+            if appointment["notes"]:
+                lines = appointment["notes"].split('\n')
+                for line in lines:
+                    if line.startswith('Type:'):
+                        notes_info["Type"] = line[5:].strip()
+                    elif line.startswith('Notes:'):
+                        notes_info["Notes"] = line[6:].strip()
+                    elif line.startswith('Insurance:'):
+                        notes_info["Insurance"] = line[10:].strip()
+                    elif line.startswith('Member ID:'):
+                        id_str = line[10:].strip()
+                        try:
+                            notes_info["Member_ID"] = int(id_str)
+                        except ValueError:
+                            notes_info["Member_ID"] = 0
+
+            formatted_appointment = {
+                "appointment_id": appointment["appointment_id"],
+                "patient_id": appointment["patient_id"],
+                "therapist_id": appointment["therapist_id"],
+                "appointment_date": appointment["appointment_date"].isoformat() if appointment["appointment_date"] else "",
+                "appointment_time": format_mysql_time(appointment["appointment_time"]),
+                "duration": appointment["duration"] or 60,
+                "status": appointment["status"] or "Scheduled",
+                "notes": appointment["notes"] or "",
+                "Type": notes_info["Type"],
+                "Notes": notes_info["Notes"],
+                "Insurance": notes_info["Insurance"],
+                "Member_ID": notes_info["Member_ID"],
+                "created_at": appointment["created_at"].isoformat() if appointment["created_at"] else "",
+                "updated_at": appointment["updated_at"].isoformat() if appointment["updated_at"] else ""
+            }
+
+            return formatted_appointment
+
+        except Exception as e:
+            print(f"Database error in get appointment details API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get appointment details API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/patients/{patient_id}/appointments")
+async def get_patient_appointments(patient_id: int):
+    """API endpoint to get all appointments for a specific patient"""
+    try:
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE patient_id = %s",
+                (patient_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Patient not found"}
+                )
+
+            cursor.execute(
+                """SELECT * FROM Appointments
+                    WHERE patient_id = %s
+                    ORDER BY appointment_date DESC, appointment_time DESC""",
+                (patient_id,)
+            )
+            appointments = cursor.fetchall()
+
+            formatted_appointments = []
+            for appointment in appointments:
+                notes_info = {"Type": "", "Notes": "", "Insurance": "", "Member_ID": 0}
+                if appointment["notes"]:
+                    lines = appointment["notes"].split('\n')
+                    for line in lines:
+                        if line.startswith('Type:'):
+                            notes_info["Type"] = line[5:].strip()
+                        elif line.startswith('Notes:'):
+                            notes_info["Notes"] = line[6:].strip()
+                        elif line.startswith('Insurance:'):
+                            notes_info["Insurance"] = line[10:].strip()
+                        elif line.startswith('Member ID:'):
+                            id_str = line[10:].strip()
+                            try:
+                                notes_info["Member_ID"] = int(id_str)
+                            except ValueError:
+                                notes_info["Member_ID"] = 0
+
+                formatted_appointment = {
+                    "appointment_id": appointment["appointment_id"],
+                    "patient_id": appointment["patient_id"],
+                    "therapist_id": appointment["therapist_id"],
+                    "appointment_date": appointment["appointment_date"].isoformat() if appointment["appointment_date"] else "",
+                    "appointment_time": format_mysql_time(appointment["appointment_time"]),
+                    "duration": appointment["duration"] or 60,
+                    "status": appointment["status"] or "Scheduled",
+                    "notes": appointment["notes"] or "",
+                    "Type": notes_info["Type"],
+                    "Notes": notes_info["Notes"],
+                    "Insurance": notes_info["Insurance"],
+                    "Member_ID": notes_info["Member_ID"],
+                    "created_at": appointment["created_at"].isoformat() if appointment["created_at"] else "",
+                    "updated_at": appointment["updated_at"].isoformat() if appointment["updated_at"] else ""
+                }
+
+                formatted_appointments.append(formatted_appointment)
+
+            return formatted_appointments
+
+        except Exception as e:
+            print(f"Database error in get patient appointments API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get patient appointments API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
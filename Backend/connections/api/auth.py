@@ -0,0 +1,314 @@
+"""
+Sign-up, sign-in and sign-out for therapists (web) and patients (mobile app).
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.post("/registerUser")
+async def registerUser(result: Register):
+    try:
+        hashed_password = await hash_password(result.password)
+    except PasswordHasherBusy as e:
+        return JSONResponse(status_code=e.status_code, content={"error": str(e)})
+    db = await get_Mysql_db_async()
+    cursor = db.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES (%s, %s, %s)",
+            (result.username, result.email, hashed_password)
+        )
+        db.commit()
+        return RedirectResponse(url="/", status_code=303)
+    except pymysql.err.IntegrityError:
+        return {"error": "Username or email already exists."}
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.route("/Register_User_Web", methods=["GET", "POST"])
+async def Register_User_Web(request: Request):
+    form = await request.form()
+    first_name = form.get("first_name")
+    last_name = form.get("last_name")
+    company_email = form.get("company_email")
+    password = form.get("password")
+
+    if not all([first_name, last_name, company_email, password]):
+        return templates.TemplateResponse("dist/pages/register.html", {
+            "request": request,
+            "error": "All fields are required."
+        })
+
+    try:
+        hashed_password = await hash_password(password)
+    except PasswordHasherBusy as e:
+        return templates.TemplateResponse("dist/pages/register.html", {
+            "request": request,
+            "error": str(e)
+        }, status_code=e.status_code)
+    db = await get_Mysql_db_async()
+    cursor = db.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO Therapists (first_name, last_name, company_email, password) VALUES (%s, %s, %s, %s)",
+            (first_name, last_name, company_email, hashed_password)
+        )
+        db.commit()
+        return RedirectResponse(url="/", status_code=303)
+    except pymysql.err.IntegrityError:
+        return templates.TemplateResponse("dist/pages/register.html", {
+            "request": request,
+            "error": "Therapist with this email already exists."
+        })
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.post("/loginUser")
+async def loginUser(result: Login, response: Response):
+    # No pooled connection is held while bcrypt runs: the lookup and the
+    # rehash write each borrow one from the async pool just for the statement
+    user = await fetch_one(
+        "SELECT user_id, password_hash FROM users WHERE username = %s",
+        (result.username,)
+    )
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+
+    user_id, stored_password_hash = user["user_id"], user["password_hash"]
+
+    try:
+        password_matches, new_hash = await verify_password(result.password, stored_password_hash)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if password_matches:
+        if new_hash:
+            await execute("UPDATE users SET password_hash = %s WHERE user_id = %s", (new_hash, user_id))
+        session_id = await create_session(
+            user_id=user_id,
+            email=result.username,
+        )
+        if not session_id:
+            raise HTTPException(status_code=503, detail="Could not create session, please try again")
+        response.set_cookie(
+            key="session_id",
+            value=session_id,
+            httponly=True,
+            samesite="lax",
+            path="/"
+        )
+        print("response 152", response)
+        return {"status": "valid"}
+    else:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+
+
+@router.get("/getUserInfo")
+async def get_user_info(request: Request):
+    session_id = request.cookies.get("session_id")
+    print(f"session_id: {session_id}")
+    if not session_id:
+        raise HTTPException(status_code=401, detail="Session not found")
+
+    session_data = await get_session_data(session_id)
+    print(f"session_data: {session_data}")
+    if not session_data:
+        raise HTTPException(status_code=401, detail="Invalid session")
+
+    user_id = session_data.user_id
+    print(f"user_id: {user_id}")
+
+    db = await get_Mysql_db_async()
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT username, email, created_at FROM users WHERE user_id = %s", (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        username, email, created_at = row
+
+        return {
+            "username": username,
+            "email": email,
+            "joined": str(created_at)
+        }
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.post("/logout")
+async def logout(request: Request):
+    session_id = request.cookies.get("session_id")
+
+    if session_id:
+        await delete_session(session_id)
+        await delete_redis_session(session_id)
+
+    response = JSONResponse(content={"message": "Logged out"})
+    response.delete_cookie("session_id")
+    return response
+
+
+@router.get("/logout")
+async def logout_get(request: Request):
+    session_id = request.cookies.get("session_id")
+    if session_id:
+        await delete_session(session_id)
+        await delete_redis_session(session_id)
+    response = RedirectResponse(url="/Therapist_Login")
+    response.delete_cookie("session_id")
+    return response
+
+
+@router.get("/Therapist_Login")
+async def therapist_login_page(request: Request):
+    session_id = request.cookies.get("session_id")
+    if session_id:
+        session = await get_session_data(session_id)
+        if session:
+            return RedirectResponse(url="/front-page")
+    return templates.TemplateResponse("dist/pages/login.html", {"request": request})
+
+
+@router.post("/Therapist_Login")
+async def therapist_login(
+    request: Request,
+    email: str = Form(...),
+    password: str = Form(...),
+    remember: bool = Form(False)
+):
+    import traceback
+
+    try:
+        # As in loginUser, no connection is held while the password is verified
+        therapist = await fetch_one(
+            "SELECT id, company_email, password, first_name, last_name FROM Therapists WHERE company_email = %s",
+            (email,)
+        )
+
+        if not therapist:
+            return templates.TemplateResponse(
+                "dist/pages/login.html",
+                {"request": request, "error": "Invalid email or password"}
+            )
+
+        stored_password = therapist.get("password", "")
+
+        try:
+            password_matches, new_hash = await verify_password(password, stored_password)
+        except PasswordHasherBusy as e:
+            return templates.TemplateResponse(
+                "dist/pages/login.html",
+                {"request": request, "error": str(e)},
+                status_code=e.status_code
+            )
+
+        if password_matches:
+            if new_hash:
+                await execute("UPDATE Therapists SET password = %s WHERE id = %s", (new_hash, therapist.get("id")))
+            session_data = {
+                "user_id": str(therapist.get("id")),
+                "email": therapist.get("company_email")
+            }
+
+            session_id = await create_redis_session(
+                data=session_data,
+            )
+
+            print(f"Session created: {session_id}")
+            print(f"User ID: {therapist.get('id')}")
+
+            response = RedirectResponse(url="/front-page", status_code=303)
+            response.set_cookie(
+                key="session_id",
+                value=session_id,
+                httponly=True,
+                samesite="lax"
+            )
+
+            print(f"Response created with cookie: {response.headers}")
+            return response
+        else:
+            return templates.TemplateResponse(
+                "dist/pages/login.html",
+                {"request": request, "error": "Invalid email or password"}
+            )
+    except Exception as e:
+        print(f"Login error: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return templates.TemplateResponse(
+            "dist/pages/login.html",
+            {"request": request, "error": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/reset-password")
+async def reset_password(email: dict):
+    """API endpoint to initiate password reset"""
+    try:
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+            email_address = email.get("email")
+            if not email_address:
+                return JSONResponse(
+                    status_code=400,
+                    content={"status": "invalid", "detail": "Email is required"}
+                )
+
+
+            cursor.execute(
+                "SELECT user_id FROM users WHERE email = %s",
+                (email_address,)
+            )
+            user = cursor.fetchone()
+
+            if not user:
+
+                cursor.execute(
+                    "SELECT id FROM Therapists WHERE company_email = %s",
+                    (email_address,)
+                )
+                therapist = cursor.fetchone()
+
+                if not therapist:
+
+                    return {"status": "valid", "message": "If this email is registered, you will receive reset instructions"}
+
+
+            expiry = datetime.datetime.now() + datetime.timedelta(hours=24)
+
+
+            reset_token = secrets.token_hex(32)
+
+            release_Mysql_db(db, cursor)
+            await r.set(f"reset:{reset_token}", email_address, ex=86400)
+
+
+            print(f"Password reset requested for {email_address}. Token: {reset_token}")
+
+            return {"status": "valid", "message": "If this email is registered, you will receive reset instructions"}
+
+        except Exception as e:
+            print(f"Database error in reset password API: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"status": "invalid", "detail": f"Error processing request: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in reset password API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "invalid", "detail": f"Server error: {str(e)}"}
+        )
@@ -0,0 +1,40 @@
+"""
+Names shared by the router modules: everything connections.routes exposes (the
+app, templates, upload settings and the database/Redis helpers it star-imports)
+plus the helpers more than one domain uses.
+"""
+from connections.routes import *
+
+
+async def get_therapist_data(therapist_id):
+    therapist_data = await fetch_one(
+        "SELECT first_name, last_name, profile_image FROM Therapists WHERE id = %s",
+        (therapist_id,)
+    )
+
+    if therapist_data:
+        clean_data = {}
+        for key, value in therapist_data.items():
+            if isinstance(value, bytes):
+                clean_data[key] = value.decode('utf-8')
+            else:
+                clean_data[key] = value
+        return clean_data
+    return {}
+
+
+# Mobile sessions live in Redis (see create_mobile_session) so every worker
+# sees them and Redis expires them; these keep the SessionData interface.
+async def create_session(user_id: int, email: str, remember: bool = False) -> str:
+    return await create_mobile_session(user_id, email, remember)
+
+
+async def delete_session(session_id: str) -> None:
+    await delete_mobile_session(session_id)
+
+
+async def get_session_data(session_id: str) -> Optional[SessionData]:
+    session = await get_mobile_session(session_id)
+    if not session:
+        return None
+    return SessionData(**session)
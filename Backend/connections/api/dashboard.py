@@ -0,0 +1,360 @@
+"""
+Landing page, therapist front page, recovery analytics and dashboard stats.
+"""
+from connections.api.common import *
+from connections.api.metrics import require_metrics_token
+
+router = APIRouter()
+
+
+@router.get("/")
+async def Home(request: Request):
+    session_id = request.cookies.get("session_id")
+
+    if session_id:
+        try:
+            user_data = await get_redis_session(session_id)
+            if user_data:
+                return {"status": "valid", "user": user_data}
+        except Exception as e:
+            print(f"Session validation error: {e}")
+
+    return {"status": "valid"}
+
+
+@router.get("/front-page")
+async def front_page(request: Request):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    print(f"Session ID from cookie: {session_id}")
+    if not session_id:
+        print("No session ID found in cookie")
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        print(f"Session data retrieved: {session_data}")
+        if not session_data:
+            print("Session data is None")
+            return RedirectResponse(url="/Therapist_Login")
+
+        user_id = int(session_data["user_id"]) if session_data.get("user_id") else None
+        print(f"User ID (converted to int): {user_id}")
+
+        if not user_id:
+            print("Invalid user ID")
+            return RedirectResponse(url="/Therapist_Login")
+
+        # Loaded before borrowing a connection so none sits idle while it runs
+        print("Loading dashboard KPI metrics")
+        metrics = await get_cached_dashboard_metrics(user_id)
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            print("Executing query #1: Get therapist info")
+            cursor.execute(
+                "SELECT first_name, last_name, profile_image FROM Therapists WHERE id = %s",
+                (user_id,)
+            )
+            therapist = cursor.fetchone()
+            print(f"Therapist data: {therapist}")
+            if not therapist:
+                print(f"No therapist found for ID: {user_id}")
+                return RedirectResponse(url="/Therapist_Login")
+
+            try:
+                print("Executing query #2: Get recent messages")
+                cursor.execute(
+                    """SELECT m.message_id, m.subject, m.content, m.created_at,
+                                CASE
+                                    WHEN m.sender_type = 'therapist' THEN t.first_name
+                                    WHEN m.sender_type = 'user' THEN u.username
+                                    ELSE 'Unknown'
+                                END as first_name,
+                                CASE
+                                    WHEN m.sender_type = 'therapist' THEN t.last_name
+                                    ELSE ''
+                                END as last_name,
+                                CASE
+                                    WHEN m.sender_type = 'therapist' THEN COALESCE(t.profile_image, 'avatar-1.jpg')
+                                    WHEN m.sender_type = 'user' THEN 'avatar-2.jpg'
+                                    ELSE 'avatar-2.jpg'
+                                END as profile_image
+                            FROM Messages m
+                            LEFT JOIN Therapists t ON m.sender_id = t.id AND m.sender_type = 'therapist'
+                            LEFT JOIN users u ON m.sender_id = u.user_id AND m.sender_type = 'user'
+                            WHERE m.recipient_id = %s AND m.is_read = FALSE
+                            ORDER BY m.created_at DESC
+                            LIMIT 4""",
+                    (user_id,)
+                )
+                messages_result = cursor.fetchall()
+
+                recent_messages = []
+                for message in messages_result:
+                    message_with_time = dict(message)
+
+                    timestamp = message.get('created_at')
+                    now = datetime.datetime.now()
+                    if isinstance(timestamp, datetime.datetime):
+                        diff = now - timestamp
+                        if timestamp.date() == now.date():
+                            message_with_time['time_display'] = timestamp.strftime('%I:%M %p')
+
+                            minutes_ago = diff.seconds // 60
+                            if minutes_ago < 60:
+                                message_with_time['time_ago'] = f"{minutes_ago} min ago"
+                            else:
+                                hours_ago = minutes_ago // 60
+                                message_with_time['time_ago'] = f"{hours_ago}-{hours_ago}"
+
+                        elif timestamp.date() == (now - timedelta(days=1)).date():
+                            message_with_time['time_display'] = "Yesterday"
+                            message_with_time['time_ago'] = timestamp.strftime('%I:%M %p')
+                        else:
+                            message_with_time['time_display'] = timestamp.strftime('%d %b')
+                            message_with_time['time_ago'] = timestamp.strftime('%Y')
+
+                    recent_messages.append(message_with_time)
+            except Exception as e:
+                print(f"Error in messages query: {e}")
+                recent_messages = []
+
+            print("Setting hardcoded value for exercise completion rate")
+            exercise_completion_rate = 80.5
+
+            try:
+                print("Executing query #20: Get recent activities")
+                cursor.execute(
+                    """(SELECT 'video' as type, 'New Exercise Uploaded' as title, e.name as primary_detail,
+                            CONCAT(e.duration, ' min') as secondary_detail, e.created_at as timestamp,
+                            CONCAT('/exercises/', e.exercise_id) as link
+                        FROM Exercises e
+                        WHERE e.therapist_id = %s
+                        ORDER BY e.created_at DESC
+                        LIMIT 3)
+                        UNION
+                        (SELECT 'user-plus' as type, 'New Patient Added' as title,
+                            CONCAT(p.first_name, ' ', p.last_name) as primary_detail,
+                            p.diagnosis as secondary_detail, p.created_at as timestamp,
+                            CONCAT('/patients/', p.patient_id) as link
+                        FROM Patients p
+                        WHERE p.therapist_id = %s
+                        ORDER BY p.created_at DESC
+                        LIMIT 3)
+                        UNION
+                        (SELECT 'report-medical' as type, 'Progress Report Updated' as title,
+                            CONCAT(p.first_name, ' ', p.last_name) as primary_detail,
+                            CONCAT('+', pm.recovery_progress, '% improvement') as secondary_detail,
+                            pm.created_at as timestamp,
+                            CONCAT('/patients/', p.patient_id) as link
+                        FROM PatientMetrics pm
+                        JOIN Patients p ON pm.patient_id = p.patient_id
+                        WHERE pm.therapist_id = %s
+                        ORDER BY pm.created_at DESC
+                        LIMIT 3)
+                        ORDER BY timestamp DESC
+                        LIMIT 3""",
+                    (user_id, user_id, user_id)
+                )
+                activities_result = cursor.fetchall()
+
+                recent_activities = []
+                for activity in activities_result:
+                    activity_with_color = dict(activity)
+
+                    if activity.get('type') == 'video':
+                        activity_with_color['color'] = 'success'
+                        activity_with_color['icon'] = 'video'
+                    elif activity.get('type') == 'user-plus':
+                        activity_with_color['color'] = 'primary'
+                        activity_with_color['icon'] = 'user-plus'
+                    else:
+                        activity_with_color['color'] = 'warning'
+                        activity_with_color['icon'] = 'report-medical'
+
+                    timestamp = activity.get('timestamp')
+                    now = datetime.datetime.now()
+                    if isinstance(timestamp, datetime.datetime):
+                        if timestamp.date() == now.date():
+                            activity_with_color['timestamp'] = f"Today, {timestamp.strftime('%I:%M %p')}"
+                        elif timestamp.date() == (now - timedelta(days=1)).date():
+                            activity_with_color['timestamp'] = f"Yesterday, {timestamp.strftime('%I:%M %p')}"
+                        else:
+                            activity_with_color['timestamp'] = f"{(now - timestamp).days} days ago"
+
+                    recent_activities.append(activity_with_color)
+            except Exception as e:
+                print(f"Error in recent activities query: {e}")
+                recent_activities = []
+
+            print("Setting hardcoded values for donut data")
+            donut_data = {'Completed': 65, 'Partial': 25, 'Missed': 10}
+
+            print("Rendering dashboard template with dynamic data")
+            return templates.TemplateResponse(
+                "dist/dashboard/index.html",
+                {
+                    "request": request,
+                    "therapist": therapist or None,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "appointments_count": metrics.appointments_count,
+                    "appointments_growth": metrics.appointments_growth,
+                    "appointments_monthly_diff": metrics.appointments_monthly_diff,
+                    "active_patients_count": metrics.active_patients_count,
+                    "patient_growth": metrics.patient_growth,
+                    "new_patients_monthly": metrics.new_patients_monthly,
+                    "treatment_plans_count": metrics.treatment_plans_count,
+                    "plans_growth": metrics.plans_growth,
+                    "new_plans_monthly": metrics.new_plans_monthly,
+                    "average_adherence_rate": metrics.average_adherence_rate,
+                    "adherence_trend_color": metrics.adherence_trend_color,
+                    "adherence_trend_direction": metrics.adherence_trend_direction,
+                    "adherence_change": metrics.adherence_change,
+                    "adherence_direction": metrics.adherence_direction,
+                    "adherence_monthly_diff": metrics.adherence_monthly_diff,
+                    "weekly_completion_rate": metrics.weekly_completion_rate,
+                    "recent_patients": metrics.recent_patients,
+                    "avg_recovery_rate": metrics.avg_recovery_rate,
+                    "exercise_completion_rate": exercise_completion_rate,
+                    "patient_satisfaction": metrics.patient_satisfaction,
+                    "progress_metric_value": metrics.progress_metric_value,
+                    "recent_activities": recent_activities,
+                    "chart_data": metrics.chart_data,
+                    "monthly_chart_data": metrics.monthly_chart_data,
+                    "progress_data": metrics.progress_data,
+                    "donut_data": donut_data,
+                    "recent_messages": recent_messages,
+                    "unread_messages_count": metrics.unread_messages_count
+                }
+            )
+        except Exception as e:
+            print(f"Database error in front-page route: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/Therapist_Login")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in front-page route: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/analytics/recovery")
+async def recovery_analytics(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        cached_payload = await get_cached_dashboard_payload(session_data["user_id"], RECOVERY_VIEW)
+        if cached_payload is not None:
+            return JSONResponse(content=cached_payload)
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+
+            cursor.execute(
+                """SELECT
+                        rollup_date,
+                        SUM(recovery_sum) / NULLIF(SUM(recovery_count), 0) as progress
+                    FROM PatientMetricsDailyRollup
+                    WHERE rollup_date >= DATE_SUB(CURDATE(), INTERVAL 90 DAY)
+                    AND therapist_id = %s
+                    GROUP BY rollup_date
+                    ORDER BY rollup_date""",
+                (session_data["user_id"],)
+            )
+            recovery_trend = cursor.fetchall()
+            for record in recovery_trend:
+                record["date"] = record["rollup_date"].strftime('%d %b')
+
+
+            cursor.execute(
+                """SELECT
+                        p.diagnosis,
+                        SUM(pm.recovery_sum) / NULLIF(SUM(pm.recovery_count), 0) as avg_progress,
+                        COUNT(DISTINCT p.patient_id) as patient_count
+                    FROM PatientMetricsDailyRollup pm
+                    JOIN Patients p ON pm.patient_id = p.patient_id
+                    WHERE pm.therapist_id = %s
+                    GROUP BY p.diagnosis
+                    ORDER BY avg_progress DESC""",
+                (session_data["user_id"],)
+            )
+            recovery_by_diagnosis = cursor.fetchall()
+
+
+            cursor.execute(
+                """SELECT
+                        p.first_name,
+                        p.last_name,
+                        p.diagnosis,
+                        SUM(pm.recovery_sum) / NULLIF(SUM(pm.recovery_count), 0) as avg_progress
+                    FROM PatientMetricsDailyRollup pm
+                    JOIN Patients p ON pm.patient_id = p.patient_id
+                    WHERE pm.therapist_id = %s
+                    GROUP BY p.patient_id
+                    ORDER BY avg_progress DESC
+                    LIMIT 5""",
+                (session_data["user_id"],)
+            )
+            top_recovery_patients = cursor.fetchall()
+
+            cursor.execute(
+                """SELECT
+                        p.first_name,
+                        p.last_name,
+                        p.diagnosis,
+                        SUM(pm.recovery_sum) / NULLIF(SUM(pm.recovery_count), 0) as avg_progress
+                    FROM PatientMetricsDailyRollup pm
+                    JOIN Patients p ON pm.patient_id = p.patient_id
+                    WHERE pm.therapist_id = %s
+                    GROUP BY p.patient_id
+                    ORDER BY avg_progress ASC
+                    LIMIT 5""",
+                (session_data["user_id"],)
+            )
+            bottom_recovery_patients = cursor.fetchall()
+
+            payload = {
+                "success": True,
+                "recovery_trend": [{"date": record["date"], "progress": float(record["progress"]) if record["progress"] is not None else 0} for record in recovery_trend],
+                "recovery_by_diagnosis": [{"diagnosis": record["diagnosis"], "avg_progress": float(record["avg_progress"]) if record["avg_progress"] is not None else 0, "patient_count": record["patient_count"]} for record in recovery_by_diagnosis],
+                "top_recovery_patients": [{"name": f"{record['first_name']} {record['last_name']}", "diagnosis": record["diagnosis"], "avg_progress": float(record["avg_progress"]) if record["avg_progress"] is not None else 0} for record in top_recovery_patients],
+                "bottom_recovery_patients": [{"name": f"{record['first_name']} {record['last_name']}", "diagnosis": record["diagnosis"], "avg_progress": float(record["avg_progress"]) if record["avg_progress"] is not None else 0} for record in bottom_recovery_patients]
+            }
+            release_Mysql_db(db, cursor)
+            await set_cached_dashboard_payload(session_data["user_id"], RECOVERY_VIEW, payload)
+            return JSONResponse(content=payload)
+
+        except Exception as e:
+            print(f"Database error in recovery analytics route: {e}")
+            return JSONResponse(content={"success": False, "error": str(e)}, status_code=500)
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in recovery analytics route: {e}")
+        return JSONResponse(content={"success": False, "error": str(e)}, status_code=500)
+
+
+@router.get("/api/dashboard/cache-stats", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def dashboard_cache_stats():
+    return JSONResponse(content=await get_dashboard_cache_stats())
+
+
+@router.get("/dashboard")
+async def dashboard(user = Depends(get_current_user)):
+    return {"message": f"Welcome, {user['username']}!", "user_id": user["user_id"]}
@@ -0,0 +1,1793 @@
+"""
+Exercise library pages and the mobile app's exercise progress API.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.post("/exercises/add")
+async def add_exercise(
+    request: Request,
+    name: str = Form(...),
+    category_id: Optional[int] = Form(None),
+    description: Optional[str] = Form(None),
+    video_source: Optional[str] = Form(None),
+    video_url: Optional[str] = Form(None),
+    difficulty: Optional[str] = Form(None),
+    duration: Optional[int] = Form(None),
+    instructions: Optional[str] = Form(None),
+    video_upload: Optional[UploadFile] = File(None),
+    user = Depends(get_current_user)
+):
+    """Route to handle adding a new exercise with large file upload support"""
+    db = None
+    cursor = None
+
+    try:
+
+        final_video_url = None
+        video_type = 'none'
+        video_size = None
+        video_filename = None
+
+
+        if video_source == 'youtube' and video_url:
+            final_video_url = video_url
+            video_type = 'youtube'
+
+
+        elif video_source == 'upload' and video_upload and video_upload.filename:
+
+            current_file = Path(__file__).resolve()
+            project_root = current_file.parent.parent.parent
+            uploads_dir = project_root / "Frontend_Web" / "static" / "assets" / "videos" / "exercises"
+            uploads_dir.mkdir(parents=True, exist_ok=True)
+
+
+            video_filename = video_upload.filename
+
+
+            file_extension = video_filename.split(".")[-1].lower()
+            unique_filename = f"exercise_{int(time.time())}_{secrets.token_hex(4)}.{file_extension}"
+            file_path = uploads_dir / unique_filename
+
+
+            stored_video = await stream_upload_file(
+                video_upload, file_path, EXERCISE_VIDEO_MAX_SIZE, EXERCISE_VIDEO_CHUNK_SIZE
+            )
+            video_size = stored_video.size
+
+
+            final_video_url = f"/static/assets/videos/exercises/{unique_filename}"
+            video_type = 'upload'
+
+
+        # Only borrow a connection once the upload has been written to disk
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+        cursor.execute(
+            """INSERT INTO Exercises
+                (name, category_id, description, video_url, video_type, video_size, video_filename,
+                difficulty, duration, instructions)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+            (name, category_id, description, final_video_url, video_type, video_size,
+            video_filename, difficulty, duration, instructions)
+        )
+        db.commit()
+
+        return RedirectResponse(url="/exercises", status_code=303)
+    except Exception as e:
+        if db:
+            db.rollback()
+        print(f"Error adding exercise: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+
+        release_Mysql_db(db, cursor)
+        categories = await get_exercise_categories()
+
+        therapist_data = await get_therapist_data(user["user_id"])
+        return templates.TemplateResponse(
+            "dist/exercises/add_exercise.html",
+            {
+                "request": request,
+                "error": f"Error adding exercise: {str(e)}",
+                "categories": categories,
+                "therapist": therapist_data,
+                "first_name": therapist_data["first_name"],
+                "last_name": therapist_data["last_name"]
+            },
+            status_code=400
+        )
+    finally:
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
+
+
+@router.get("/exercises/{exercise_id}/edit")
+async def edit_exercise_form(
+    request: Request,
+    exercise_id: int,
+    user = Depends(get_current_user)
+):
+    """Route to display the edit exercise form"""
+    db = await get_Mysql_db_async()
+    cursor = None
+
+    try:
+        cursor = db.cursor()
+
+        cursor.execute("SELECT * FROM Exercises WHERE exercise_id = %s", (exercise_id,))
+        exercise = cursor.fetchone()
+
+        if not exercise:
+            return RedirectResponse(url="/exercises", status_code=303)
+
+        cursor.execute("SELECT * FROM ExerciseCategories ORDER BY name")
+        categories = cursor.fetchall()
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        return templates.TemplateResponse(
+            "dist/exercises/edit_exercise.html",
+            {
+                "request": request,
+                "exercise": exercise,
+                "categories": categories,
+                "therapist": therapist_data,
+                "first_name": therapist_data["first_name"],
+                "last_name": therapist_data["last_name"]
+            }
+        )
+    except Exception as e:
+        print(f"Error loading edit exercise form: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/exercises", status_code=303)
+    finally:
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
+
+
+@router.post("/exercises/{exercise_id}/edit")
+async def update_exercise(
+    request: Request,
+    exercise_id: int,
+    name: str = Form(...),
+    category_id: Optional[int] = Form(None),
+    description: Optional[str] = Form(None),
+    difficulty: Optional[str] = Form(None),
+    duration: Optional[int] = Form(None),
+    instructions: Optional[str] = Form(None),
+    keep_current_video: Optional[str] = Form(None),
+    video_source: Optional[str] = Form(None),
+    video_url: Optional[str] = Form(None),
+    video_upload: Optional[UploadFile] = File(None),
+    user = Depends(get_current_user)
+):
+    """Route to handle updating an exercise"""
+    db = await get_Mysql_db_async()
+    cursor = None
+
+    try:
+        cursor = db.cursor()
+
+        cursor.execute("SELECT * FROM Exercises WHERE exercise_id = %s", (exercise_id,))
+        exercise = cursor.fetchone()
+        # Not held while a new video is streamed to disk; borrowed again for the update
+        release_Mysql_db(db, cursor)
+
+        if not exercise:
+            return RedirectResponse(url="/exercises")
+
+
+        final_video_url = exercise['video_url']
+        video_type = exercise.get('video_type', 'none')
+        video_size = exercise.get('video_size', None)
+        video_filename = exercise.get('video_filename', None)
+
+
+        if not keep_current_video:
+            if video_source == 'youtube' and video_url:
+                final_video_url = video_url
+                video_type = 'youtube'
+                video_size = None
+                video_filename = None
+
+            elif video_source == 'upload' and video_upload and video_upload.filename:
+
+                current_file = Path(__file__).resolve()
+                project_root = current_file.parent.parent.parent
+                uploads_dir = project_root / "Frontend_Web" / "static" / "assets" / "videos" / "exercises"
+                uploads_dir.mkdir(parents=True, exist_ok=True)
+
+
+                video_filename = video_upload.filename
+
+
+                file_extension = video_filename.split(".")[-1].lower()
+                unique_filename = f"exercise_{exercise_id}_{int(time.time())}_{secrets.token_hex(4)}.{file_extension}"
+                file_path = uploads_dir / unique_filename
+
+
+                stored_video = await stream_upload_file(
+                    video_upload, file_path, EXERCISE_VIDEO_MAX_SIZE, EXERCISE_VIDEO_CHUNK_SIZE
+                )
+                video_size = stored_video.size
+
+
+                old_video_url = exercise['video_url']
+                old_video_type = exercise.get('video_type', '')
+
+                if old_video_url and old_video_type == 'upload':
+                    try:
+                        old_video_path = Path(project_root) / "Frontend_Web" / old_video_url.lstrip('/')
+                        if os.path.exists(old_video_path):
+                            os.remove(old_video_path)
+                            print(f"Deleted old video: {old_video_path}")
+                    except Exception as e:
+                        print(f"Error deleting old video: {e}")
+
+
+                final_video_url = f"/static/assets/videos/exercises/{unique_filename}"
+                video_type = 'upload'
+            else:
+
+                final_video_url = None
+                video_type = 'none'
+                video_size = None
+                video_filename = None
+
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+        cursor.execute(
+            """UPDATE Exercises
+                SET name = %s, category_id = %s, description = %s,
+                    video_url = %s, video_type = %s, video_size = %s, video_filename = %s,
+                    difficulty = %s, duration = %s, instructions = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE exercise_id = %s""",
+            (name, category_id, description, final_video_url, video_type, video_size,
+            video_filename, difficulty, duration, instructions, exercise_id)
+        )
+        db.commit()
+
+        return RedirectResponse(url=f"/exercises", status_code=303)
+    except Exception as e:
+        if db:
+            db.rollback()
+        print(f"Error updating exercise: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+
+        release_Mysql_db(db, cursor)
+        categories = await get_exercise_categories()
+
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        return templates.TemplateResponse(
+            "dist/exercises/edit_exercise.html",
+            {
+                "request": request,
+                "exercise": exercise,
+                "categories": categories,
+                "therapist": therapist_data,
+                "first_name": therapist_data["first_name"],
+                "last_name": therapist_data["last_name"],
+                "error": f"Error updating exercise: {str(e)}"
+            },
+            status_code=400
+        )
+    finally:
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
+
+
+@router.post("/exercises/delete")
+async def delete_exercise(
+    request: Request,
+    exercise_id: int = Form(...),
+    user = Depends(get_current_user)
+):
+    """Route to delete an exercise"""
+    db = await get_Mysql_db_async()
+    cursor = None
+
+    try:
+        cursor = db.cursor()
+
+        cursor.execute(
+            "SELECT video_url, video_type FROM Exercises WHERE exercise_id = %s",
+            (exercise_id,)
+        )
+        exercise = cursor.fetchone()
+
+        if exercise and exercise['video_url'] and exercise.get('video_type') == 'upload':
+            try:
+                current_file = Path(__file__).resolve()
+                project_root = current_file.parent.parent.parent
+                video_path = project_root / "Frontend_Web" / exercise['video_url'].lstrip('/')
+
+                if os.path.exists(video_path):
+                    os.remove(video_path)
+                    print(f"Deleted video file: {video_path}")
+            except Exception as e:
+                print(f"Error deleting video file: {e}")
+
+        cursor.execute(
+            "DELETE FROM Exercises WHERE exercise_id = %s",
+            (exercise_id,)
+        )
+        db.commit()
+
+        return RedirectResponse(url="/exercises", status_code=303)
+    except Exception as e:
+        if db:
+            db.rollback()
+        print(f"Error deleting exercise: {e}")
+        return RedirectResponse(url="/exercises", status_code=303)
+    finally:
+        if cursor:
+            cursor.close()
+        if db:
+            db.close()
+
+
+@router.post("/api/exercises/rate")
+async def rate_exercise(
+    request: Request,
+    exercise_progress_id: int = Form(...),
+    rating: int = Form(...),
+    feedback: str = Form(None)
+):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+
+        if rating < 1 or rating > 5:
+            return JSONResponse(status_code=400, content={"success": False, "message": "Rating must be between 1 and 5"})
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT pep.progress_id
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE pep.progress_id = %s AND p.therapist_id = %s""",
+                (exercise_progress_id, session_data["user_id"])
+            )
+            progress = cursor.fetchone()
+
+            if not progress:
+                return JSONResponse(status_code=404, content={"success": False, "message": "Exercise progress not found"})
+
+
+            cursor.execute(
+                """UPDATE PatientExerciseProgress
+                    SET therapist_rating = %s, therapist_feedback = %s
+                    WHERE progress_id = %s""",
+                (rating, feedback, exercise_progress_id)
+            )
+            db.commit()
+
+            return JSONResponse(content={"success": True})
+
+        except Exception as e:
+            print(f"Database error in rate exercise: {e}")
+            return JSONResponse(status_code=500, content={"success": False, "message": "Error updating rating"})
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in rate exercise: {e}")
+        return JSONResponse(status_code=500, content={"success": False, "message": "Server error"})
+
+
+@router.get("/exercises")
+async def exercises_page(request: Request, user=Depends(get_current_user)):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            """SELECT e.*, c.name as category_name
+                FROM Exercises e
+                LEFT JOIN ExerciseCategories c ON e.category_id = c.category_id
+                """
+        )
+        exercises_result = cursor.fetchall()
+
+        exercises = []
+        for exercise in exercises_result:
+            clean_exercise = {}
+            for key, value in exercise.items():
+                if isinstance(value, bytes):
+                    clean_exercise[key] = value.decode('utf-8')
+                else:
+                    clean_exercise[key] = value
+            exercises.append(clean_exercise)
+
+        cursor.execute("SELECT * FROM ExerciseCategories")
+        categories_result = cursor.fetchall()
+
+        categories = []
+        for category in categories_result:
+            clean_category = {}
+            for key, value in category.items():
+                if isinstance(value, bytes):
+                    clean_category[key] = value.decode('utf-8')
+                else:
+                    clean_category[key] = value
+            categories.append(clean_category)
+
+        cursor.execute("SELECT * FROM TreatmentPlans")
+        treatment_plans_result = cursor.fetchall()
+
+        treatment_plans = []
+        for plan in treatment_plans_result:
+            clean_plan = {}
+            for key, value in plan.items():
+                if isinstance(value, bytes):
+                    clean_plan[key] = value.decode('utf-8')
+                else:
+                    clean_plan[key] = value
+            treatment_plans.append(clean_plan)
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        if isinstance(therapist_data, tuple):
+            therapist_dict = {
+                "first_name": therapist_data[0] if len(therapist_data) > 0 else "",
+                "last_name": therapist_data[1] if len(therapist_data) > 1 else "",
+                "profile_image": therapist_data[2] if len(therapist_data) > 2 else ""
+            }
+            therapist_data = therapist_dict
+
+        return templates.TemplateResponse(
+            "dist/exercises/exercise_list.html",
+            {
+                "request": request,
+                "treatment_plans": treatment_plans,
+                "exercises": exercises,
+                "categories": categories,
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", "") if isinstance(therapist_data, dict) else "",
+                "last_name": therapist_data.get("last_name", "") if isinstance(therapist_data, dict) else ""
+            }
+        )
+    except Exception as e:
+        print(f"Error loading exercises page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page")
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/exercises/add")
+async def add_exercise_page(request: Request, user=Depends(get_current_user)):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute("SELECT * FROM ExerciseCategories")
+        categories_result = cursor.fetchall()
+
+        categories = []
+        for category in categories_result:
+            clean_category = {}
+            for key, value in category.items():
+                if isinstance(value, bytes):
+                    clean_category[key] = value.decode('utf-8')
+                else:
+                    clean_category[key] = value
+            categories.append(clean_category)
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        if isinstance(therapist_data, tuple):
+            therapist_dict = {
+                "first_name": therapist_data[0] if len(therapist_data) > 0 else "",
+                "last_name": therapist_data[1] if len(therapist_data) > 1 else "",
+                "profile_image": therapist_data[2] if len(therapist_data) > 2 else ""
+            }
+            therapist_data = therapist_dict
+
+        return templates.TemplateResponse(
+            "dist/exercises/add_exercise.html",
+            {
+                "request": request,
+                "categories": categories,
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", "") if isinstance(therapist_data, dict) else "",
+                "last_name": therapist_data.get("last_name", "") if isinstance(therapist_data, dict) else ""
+            }
+        )
+    except Exception as e:
+        print(f"Error loading add exercise page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/exercises")
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/api/user/exercises/progress")
+async def get_user_exercises_progress(request: Request):
+    """API endpoint to get overall user progress across all exercises and treatment plans"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+        print(f"Getting progress for user_id: {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+            print(f"Found patient_id: {patient_id}")
+
+            cursor.execute(
+                """
+                    SELECT plan_id, status FROM TreatmentPlans WHERE patient_id = %s
+                    """,
+                (patient_id,)
+            )
+
+            plans = cursor.fetchall()
+            if not plans:
+                print("No treatment plans found for patient")
+                return {
+                    "completionRate": 0.0,
+                    "weeklyStats": {},
+                    "donutData": {"Completed": 0, "Partial": 0, "Missed": 0}
+                }
+
+            cursor.execute(
+                """
+                    SELECT
+                        COUNT(DISTINCT tpe.plan_exercise_id) as total_exercises,
+                        COUNT(DISTINCT CASE
+                            WHEN EXISTS (
+                                SELECT 1 FROM PatientExerciseProgress pep
+                                WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                                AND pep.patient_id = %s
+                            ) THEN tpe.plan_exercise_id
+                            ELSE NULL
+                        END) as completed_exercises
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE tp.patient_id = %s
+                    """,
+                (patient_id, patient_id)
+            )
+
+            overall_stats = cursor.fetchone()
+            total_exercises = overall_stats.get("total_exercises", 0) or 0
+            completed_exercises = overall_stats.get("completed_exercises", 0) or 0
+
+            completion_rate = completed_exercises / total_exercises if total_exercises > 0 else 0
+            print(f"Overall completion rate: {completed_exercises}/{total_exercises} = {completion_rate:.2f}")
+
+            cursor.execute(
+                """
+                    SELECT
+                        DAYNAME(completion_date) as day_of_week,
+                        COUNT(DISTINCT plan_exercise_id) as exercises_completed
+                    FROM PatientExerciseProgress
+                    WHERE patient_id = %s AND completion_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 7 DAY)
+                    GROUP BY DAYNAME(completion_date), completion_date
+                    ORDER BY FIELD(DAYNAME(completion_date), 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+                    """,
+                (patient_id,)
+            )
+
+            weekly_data = cursor.fetchall()
+            weekly_stats = {}
+
+            day_mapping = {
+                'Monday': 'Mon',
+                'Tuesday': 'Tue',
+                'Wednesday': 'Wed',
+                'Thursday': 'Thu',
+                'Friday': 'Fri',
+                'Saturday': 'Sat',
+                'Sunday': 'Sun'
+            }
+
+            try_alternative = False
+            if try_alternative:
+                cursor.execute(
+                    """
+                        SELECT
+                            DAYNAME(completion_date) as day_of_week,
+                            COUNT(DISTINCT plan_exercise_id) as exercises_completed
+                        FROM PatientExerciseProgress
+                        WHERE patient_id = %s AND completion_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 7 DAY)
+                        GROUP BY DAYNAME(completion_date)
+                        """,
+                    (patient_id,)
+                )
+                weekly_data = cursor.fetchall()
+
+                day_order = {'Monday': 1, 'Tuesday': 2, 'Wednesday': 3, 'Thursday': 4,
+                        'Friday': 5, 'Saturday': 6, 'Sunday': 7}
+                weekly_data = sorted(weekly_data, key=lambda x: day_order.get(x.get('day_of_week', ''), 8))
+
+            for day in weekly_data:
+                day_name = day.get("day_of_week", "")
+                day_abbrev = day_mapping.get(day_name, day_name[:3] if day_name else "")
+                weekly_stats[day_abbrev] = day.get("exercises_completed", 0)
+
+            for abbrev in ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']:
+                if abbrev not in weekly_stats:
+                    weekly_stats[abbrev] = 0
+
+            cursor.execute(
+                """
+                    SELECT
+                        SUM(CASE WHEN EXISTS (
+                            SELECT 1 FROM PatientExerciseProgress pep
+                            WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                            AND pep.patient_id = %s
+                        ) THEN 1 ELSE 0 END) as completed,
+                        SUM(CASE WHEN EXISTS (
+                            SELECT 1 FROM PatientExerciseProgress pep
+                            WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                            AND pep.patient_id = %s
+                            AND pep.sets_completed < tpe.sets
+                        ) THEN 1 ELSE 0 END) as partial,
+                        SUM(CASE WHEN NOT EXISTS (
+                            SELECT 1 FROM PatientExerciseProgress pep
+                            WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                            AND pep.patient_id = %s
+                        ) THEN 1 ELSE 0 END) as missed
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE tp.patient_id = %s AND tp.status = 'Active'
+                    """,
+                (patient_id, patient_id, patient_id, patient_id)
+            )
+
+            donut_data = cursor.fetchone()
+
+            result = {
+                "completionRate": completion_rate,
+                "weeklyStats": weekly_stats,
+                "donutData": {
+                    "Completed": donut_data.get("completed", 0) or 0,
+                    "Partial": donut_data.get("partial", 0) or 0,
+                    "Missed": donut_data.get("missed", 0) or 0
+                }
+            }
+
+            print(f"Progress result: {result}")
+            return result
+
+        except Exception as e:
+            print(f"Database error in get user progress: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user progress: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/exercises/{exercise_id}")
+async def get_exercise_details(
+    request: Request,
+    exercise_id: int
+):
+    """API endpoint to get detailed information about a specific exercise"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+
+            cursor.execute(
+                """
+                    SELECT e.*, c.name as category_name
+                    FROM Exercises e
+                    LEFT JOIN ExerciseCategories c ON e.category_id = c.category_id
+                    WHERE e.exercise_id = %s
+                    """,
+                (exercise_id,)
+            )
+            exercise = cursor.fetchone()
+
+            if not exercise:
+                return JSONResponse(status_code=404, content={"detail": "Exercise not found"})
+
+            cursor.execute(
+                """
+                    SELECT tpe.plan_exercise_id, tpe.plan_id, tpe.sets, tpe.repetitions,
+                        tpe.frequency, tpe.duration, tpe.notes,
+                        tp.name as plan_name, tp.status as plan_status
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE tpe.exercise_id = %s AND tp.patient_id = %s
+                    """,
+                (exercise_id, patient_id)
+            )
+            plan_exercises = cursor.fetchall()
+
+            plan_exercise_instances = []
+            for pe in plan_exercises:
+                cursor.execute(
+                    """
+                        SELECT *
+                        FROM PatientExerciseProgress
+                        WHERE plan_exercise_id = %s AND patient_id = %s
+                        ORDER BY completion_date DESC
+                        """,
+                    (pe.get("plan_exercise_id"), patient_id)
+                )
+                progress = cursor.fetchall()
+
+                plan_exercise_instances.append({
+                    "planExerciseId": pe.get("plan_exercise_id"),
+                    "planId": pe.get("plan_id"),
+                    "planName": pe.get("plan_name", ""),
+                    "planStatus": pe.get("plan_status", ""),
+                    "sets": pe.get("sets", 3) or 3,
+                    "repetitions": pe.get("repetitions", 10) or 10,
+                    "frequency": pe.get("frequency", "Daily") or "Daily",
+                    "duration": pe.get("duration", 0),
+                    "notes": pe.get("notes", ""),
+                    "completed": len(progress) > 0,
+                    "progressHistory": [
+                        {
+                            "completionDate": p.get("completion_date").isoformat() if p.get("completion_date") else None,
+                            "setsCompleted": p.get("sets_completed", 0),
+                            "repetitionsCompleted": p.get("repetitions_completed", 0),
+                            "durationSeconds": p.get("duration_seconds", 0),
+                            "painLevel": p.get("pain_level", 0),
+                            "difficultyLevel": p.get("difficulty_level", 0),
+                            "notes": p.get("notes", "")
+                        } for p in progress
+                    ]
+                })
+
+            result = {
+                "exerciseId": exercise.get("exercise_id"),
+                "name": exercise.get("name", ""),
+                "description": exercise.get("description", "") or "",
+                "videoUrl": exercise.get("video_url", ""),
+                "videoType": exercise.get("video_type", "") or "",
+                "thumbnailUrl": exercise.get("video_filename", ""),
+                "difficulty": exercise.get("difficulty", "Beginner") or "Beginner",
+                "categoryId": exercise.get("category_id"),
+                "categoryName": exercise.get("category_name", ""),
+                "duration": exercise.get("duration", 0),
+                "instructions": exercise.get("instructions", "") or "",
+                "planInstances": plan_exercise_instances
+            }
+
+            return result
+
+        except Exception as e:
+            print(f"Database error in get exercise details: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get exercise details: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/api/exercises/{plan_exercise_id}/progress")
+async def add_exercise_progress(
+    request: Request,
+    plan_exercise_id: int,
+    progress_request: ExerciseProgressRequest
+):
+    """API endpoint to add detailed progress for an exercise session"""
+    print(f"Received progress for exercise {plan_exercise_id}: {progress_request}")
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+        print(f"Authenticated user_id: {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                print(f"Patient not found for user_id: {user_id}")
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+            print(f"Found patient_id: {patient_id}")
+
+            cursor.execute(
+                """
+                    SELECT tpe.*, tp.patient_id, e.name as exercise_name
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    WHERE tpe.plan_exercise_id = %s
+                    """,
+                (plan_exercise_id,)
+            )
+            exercise = cursor.fetchone()
+
+            if not exercise:
+                print(f"Exercise not found: {plan_exercise_id}")
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Exercise not found"}
+                )
+
+            if exercise.get("patient_id") != patient_id:
+                print(f"Permission denied: Exercise belongs to patient {exercise.get('patient_id')}, not {patient_id}")
+                return JSONResponse(
+                    status_code=403,
+                    content={"detail": "You don't have permission to update this exercise"}
+                )
+
+            print(f"Found exercise: {exercise.get('exercise_name')}, plan_id: {exercise.get('plan_id')}, exercise_id: {exercise.get('exercise_id')}")
+
+            cursor.execute(
+                """
+                    SELECT progress_id FROM PatientExerciseProgress
+                    WHERE patient_id = %s AND plan_exercise_id = %s AND DATE(completion_date) = CURRENT_DATE()
+                    """,
+                (patient_id, plan_exercise_id)
+            )
+
+            existing_progress = cursor.fetchone()
+            print(f"Existing progress for today: {existing_progress}")
+
+            if existing_progress:
+                cursor.execute(
+                    """
+                        UPDATE PatientExerciseProgress
+                        SET sets_completed = %s,
+                            repetitions_completed = %s,
+                            duration_seconds = %s,
+                            pain_level = %s,
+                            difficulty_level = %s,
+                            notes = %s
+                        WHERE progress_id = %s
+                        """,
+                    (
+                        progress_request.sets_completed,
+                        progress_request.repetitions_completed,
+                        progress_request.duration_seconds,
+                        progress_request.pain_level,
+                        progress_request.difficulty_level,
+                        progress_request.notes,
+                        existing_progress.get("progress_id")
+                    )
+                )
+                progress_id = existing_progress.get("progress_id")
+                print(f"Updated existing progress entry: {progress_id}, rows affected: {cursor.rowcount}")
+            else:
+                cursor.execute(
+                    """
+                        INSERT INTO PatientExerciseProgress
+                        (patient_id, plan_exercise_id, completion_date, sets_completed,
+                        repetitions_completed, duration_seconds, pain_level, difficulty_level, notes)
+                        VALUES (%s, %s, CURRENT_DATE(), %s, %s, %s, %s, %s, %s)
+                        """,
+                    (
+                        patient_id,
+                        plan_exercise_id,
+                        progress_request.sets_completed,
+                        progress_request.repetitions_completed,
+                        progress_request.duration_seconds,
+                        progress_request.pain_level,
+                        progress_request.difficulty_level,
+                        progress_request.notes
+                    )
+                )
+                progress_id = cursor.lastrowid
+                print(f"Inserted new progress entry: {progress_id}")
+
+            refresh_exercise_progress_rollup(cursor, patient_id)
+            db.commit()
+            print(f"Database transaction committed")
+
+            return {
+                "detail": "Exercise progress recorded successfully",
+                "progressId": progress_id,
+                "exerciseName": exercise.get("exercise_name")
+            }
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in add exercise progress: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in add exercise progress: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/api/exercises/{plan_exercise_id}/update-status")
+async def update_exercise_status(
+    request: Request,
+    plan_exercise_id: int,
+    completed: bool
+):
+    """API endpoint to update the completion status of an exercise in a treatment plan"""
+    import traceback
+
+    print(f"Received update request for exercise {plan_exercise_id}, completed={completed}")
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        print(f"No session_id found in cookies")
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            print(f"Invalid session data for {session_id}")
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+        print(f"Authenticated user_id: {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                print(f"Patient not found for user_id: {user_id}")
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+            print(f"Found patient_id: {patient_id}")
+
+            cursor.execute(
+                """
+                    SELECT tpe.*, tp.patient_id, tp.plan_id, e.name as exercise_name
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    WHERE tpe.plan_exercise_id = %s
+                    """,
+                (plan_exercise_id,)
+            )
+            exercise = cursor.fetchone()
+
+            if not exercise:
+                print(f"Exercise not found: {plan_exercise_id}")
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Exercise not found"}
+                )
+
+            if exercise.get("patient_id") != patient_id:
+                print(f"Permission denied: Exercise belongs to patient {exercise.get('patient_id')}, not {patient_id}")
+                return JSONResponse(
+                    status_code=403,
+                    content={"detail": "You don't have permission to update this exercise"}
+                )
+
+            plan_id = exercise.get("plan_id")
+            print(f"Found exercise: {exercise.get('exercise_name')}, plan_id: {plan_id}, exercise_id: {exercise.get('exercise_id')}")
+
+            if completed:
+                cursor.execute(
+                    """
+                        SELECT progress_id FROM PatientExerciseProgress
+                        WHERE patient_id = %s AND plan_exercise_id = %s AND DATE(completion_date) = CURRENT_DATE()
+                        """,
+                    (patient_id, plan_exercise_id)
+                )
+
+                existing_progress = cursor.fetchone()
+                print(f"Existing progress for today: {existing_progress}")
+
+                if not existing_progress:
+                    sets = exercise.get("sets") or 3
+                    repetitions = exercise.get("repetitions") or 10
+
+                    print(f"Inserting progress entry with sets={sets}, reps={repetitions}")
+                    cursor.execute(
+                        """
+                            INSERT INTO PatientExerciseProgress
+                            (patient_id, plan_exercise_id, completion_date, sets_completed, repetitions_completed,
+                            pain_level, difficulty_level, duration_seconds, notes)
+                            VALUES (%s, %s, CURRENT_DATE(), %s, %s, 0, 0, 0, 'Marked as completed via app')
+                            """,
+                        (patient_id, plan_exercise_id, sets, repetitions)
+                    )
+                    print(f"Inserted progress entry, row count: {cursor.rowcount}, last row ID: {cursor.lastrowid}")
+                else:
+                    print(f"Progress entry already exists for today: {existing_progress.get('progress_id')}")
+            else:
+                print(f"Deleting progress entries for today")
+                cursor.execute(
+                    """
+                        DELETE FROM PatientExerciseProgress
+                        WHERE patient_id = %s AND plan_exercise_id = %s AND DATE(completion_date) = CURRENT_DATE()
+                        """,
+                    (patient_id, plan_exercise_id)
+                )
+                print(f"Deleted progress entries, row count: {cursor.rowcount}")
+
+            refresh_exercise_progress_rollup(cursor, patient_id)
+            db.commit()
+            print(f"Database transaction committed")
+
+            if completed:
+                cursor.execute(
+                    """
+                        SELECT COUNT(*) as count FROM PatientExerciseProgress
+                        WHERE patient_id = %s AND plan_exercise_id = %s AND DATE(completion_date) = CURRENT_DATE()
+                        """,
+                    (patient_id, plan_exercise_id)
+                )
+                verify = cursor.fetchone()
+                print(f"Verification after commit: {verify.get('count')} progress entries found")
+
+            cursor.execute(
+                """
+                    SELECT
+                        COUNT(tpe.plan_exercise_id) as total_exercises,
+                        SUM(CASE WHEN EXISTS (
+                            SELECT 1 FROM PatientExerciseProgress pep
+                            WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                            AND pep.patient_id = %s
+                        ) THEN 1 ELSE 0 END) as completed_exercises
+                    FROM TreatmentPlanExercises tpe
+                    WHERE tpe.plan_id = %s
+                    """,
+                (patient_id, plan_id)
+            )
+
+            plan_progress = cursor.fetchone()
+            total = plan_progress.get('total_exercises', 0) or 0
+            completed_count = plan_progress.get('completed_exercises', 0) or 0
+
+            completion_percentage = completed_count / total if total > 0 else 0
+            print(f"Plan completion: {completed_count}/{total} = {completion_percentage:.2f}")
+
+            if total > 0 and completed_count == total:
+                cursor.execute(
+                    """
+                        UPDATE TreatmentPlans
+                        SET status = 'Completed', updated_at = NOW()
+                        WHERE plan_id = %s AND status != 'Completed'
+                        """,
+                    (plan_id,)
+                )
+                plan_status_updated = cursor.rowcount > 0
+                if plan_status_updated:
+                    print(f"Updated plan {plan_id} status to Completed")
+                    db.commit()
+            elif completed_count < total:
+                cursor.execute(
+                    """
+                        UPDATE TreatmentPlans
+                        SET status = 'Active', updated_at = NOW()
+                        WHERE plan_id = %s AND status = 'Completed'
+                        """,
+                    (plan_id,)
+                )
+                plan_status_updated = cursor.rowcount > 0
+                if plan_status_updated:
+                    print(f"Updated plan {plan_id} status to Active")
+                    db.commit()
+
+            return {
+                "status": "success",
+                "message": f"Exercise marked as {'completed' if completed else 'pending'}",
+                "exercise_name": exercise.get('exercise_name', ''),
+                "plan_id": plan_id,
+                "plan_completion": {
+                    "total": total,
+                    "completed": completed_count,
+                    "percentage": completion_percentage
+                }
+            }
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in update exercise status: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in update exercise status: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/user/exercise-analytics")
+async def get_user_exercise_analytics(request: Request):
+    """API endpoint to get analytics about exercise habits and progress trends"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient["patient_id"]
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        e.exercise_id,
+                        e.name,
+                        e.difficulty,
+                        e.category_id,
+                        COUNT(pep.progress_id) as completion_count,
+                        MAX(pep.completion_date) as last_completed
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    WHERE pep.patient_id = %s
+                    GROUP BY e.exercise_id
+                    ORDER BY completion_count DESC
+                    LIMIT 5
+                    """,
+                (patient_id,)
+            )
+            most_frequent = cursor.fetchall()
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        e.exercise_id,
+                        e.name,
+                        e.difficulty,
+                        e.category_id,
+                        COUNT(pep.progress_id) as completion_count,
+                        MAX(pep.completion_date) as last_completed
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    LEFT JOIN PatientExerciseProgress pep ON
+                        tpe.plan_exercise_id = pep.plan_exercise_id AND
+                        pep.patient_id = %s
+                    WHERE tp.patient_id = %s AND tp.status = 'Active'
+                    GROUP BY e.exercise_id
+                    ORDER BY completion_count ASC
+                    LIMIT 5
+                    """,
+                (patient_id, patient_id)
+            )
+            least_frequent = cursor.fetchall()
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        SUM(difficulty_sum) / SUM(difficulty_count) as avg_difficulty,
+                        rollup_date
+                    FROM PatientExerciseProgressDailyRollup
+                    WHERE patient_id = %s AND difficulty_count > 0
+                    GROUP BY rollup_date
+                    ORDER BY rollup_date
+                    LIMIT 30
+                    """,
+                (patient_id,)
+            )
+            difficulty_trend = cursor.fetchall()
+            for dt in difficulty_trend:
+                dt["date"] = dt["rollup_date"].strftime('%Y-%m-%d')
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        SUM(pain_sum) / SUM(pain_count) as avg_pain,
+                        rollup_date
+                    FROM PatientExerciseProgressDailyRollup
+                    WHERE patient_id = %s AND pain_count > 0
+                    GROUP BY rollup_date
+                    ORDER BY rollup_date
+                    LIMIT 30
+                    """,
+                (patient_id,)
+            )
+            pain_trend = cursor.fetchall()
+            for pt in pain_trend:
+                pt["date"] = pt["rollup_date"].strftime('%Y-%m-%d')
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        COALESCE(c.name, 'Uncategorized') as category,
+                        COUNT(DISTINCT pep.progress_id) as count
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    LEFT JOIN ExerciseCategories c ON e.category_id = c.category_id
+                    WHERE pep.patient_id = %s
+                    GROUP BY COALESCE(c.name, 'Uncategorized')
+                    """,
+                (patient_id,)
+            )
+            category_distribution = cursor.fetchall()
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        CASE
+                            WHEN HOUR(pep.created_at) BETWEEN 5 AND 11 THEN 'Morning'
+                            WHEN HOUR(pep.created_at) BETWEEN 12 AND 16 THEN 'Afternoon'
+                            WHEN HOUR(pep.created_at) BETWEEN 17 AND 20 THEN 'Evening'
+                            ELSE 'Night'
+                        END as time_of_day,
+                        COUNT(*) as count
+                    FROM PatientExerciseProgress pep
+                    WHERE pep.patient_id = %s
+                    GROUP BY time_of_day
+                    """,
+                (patient_id,)
+            )
+            time_preference = cursor.fetchall()
+
+
+            formatted_most_frequent = []
+            for ex in most_frequent:
+                formatted_most_frequent.append({
+                    "exerciseId": ex["exercise_id"],
+                    "name": ex["name"],
+                    "difficulty": ex["difficulty"],
+                    "categoryId": ex["category_id"],
+                    "completionCount": ex["completion_count"],
+                    "lastCompleted": ex["last_completed"].isoformat() if ex["last_completed"] else None
+                })
+
+            formatted_least_frequent = []
+            for ex in least_frequent:
+                formatted_least_frequent.append({
+                    "exerciseId": ex["exercise_id"],
+                    "name": ex["name"],
+                    "difficulty": ex["difficulty"],
+                    "categoryId": ex["category_id"],
+                    "completionCount": ex["completion_count"],
+                    "lastCompleted": ex["last_completed"].isoformat() if ex["last_completed"] else None
+                })
+
+            formatted_difficulty_trend = []
+            for dt in difficulty_trend:
+                if dt["avg_difficulty"] is not None:
+                    formatted_difficulty_trend.append({
+                        "date": dt["date"],
+                        "averageDifficulty": float(dt["avg_difficulty"])
+                    })
+
+            formatted_pain_trend = []
+            for pt in pain_trend:
+                if pt["avg_pain"] is not None:
+                    formatted_pain_trend.append({
+                        "date": pt["date"],
+                        "averagePain": float(pt["avg_pain"])
+                    })
+
+            formatted_category_distribution = []
+            for cd in category_distribution:
+                formatted_category_distribution.append({
+                    "category": cd["category"],
+                    "count": cd["count"]
+                })
+
+            formatted_time_preference = []
+            for tp in time_preference:
+                formatted_time_preference.append({
+                    "timeOfDay": tp["time_of_day"],
+                    "count": tp["count"]
+                })
+
+
+            result = {
+                "mostFrequentExercises": formatted_most_frequent,
+                "leastFrequentExercises": formatted_least_frequent,
+                "difficultyTrend": formatted_difficulty_trend,
+                "painTrend": formatted_pain_trend,
+                "categoryDistribution": formatted_category_distribution,
+                "timeOfDayPreference": formatted_time_preference
+            }
+
+            return result
+
+        except Exception as e:
+            print(f"Database error in get user exercise analytics: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user exercise analytics: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/exercises/{exercise_id}/history")
+async def get_exercise_history(
+    request: Request,
+    exercise_id: int
+):
+    """API endpoint to get history of all completions of a specific exercise across all treatment plans"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+
+            cursor.execute(
+                "SELECT * FROM Exercises WHERE exercise_id = %s",
+                (exercise_id,)
+            )
+            exercise = cursor.fetchone()
+
+            if not exercise:
+                return JSONResponse(status_code=404, content={"detail": "Exercise not found"})
+
+            cursor.execute(
+                """
+                    SELECT tpe.plan_exercise_id, tpe.plan_id, tp.name as plan_name,
+                        tpe.sets, tpe.repetitions, tpe.frequency
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE tpe.exercise_id = %s AND tp.patient_id = %s
+                    """,
+                (exercise_id, patient_id)
+            )
+            plan_exercises = cursor.fetchall()
+
+            if not plan_exercises:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Exercise not found in any of your treatment plans"}
+                )
+
+            plan_exercise_ids = [pe.get("plan_exercise_id") for pe in plan_exercises]
+            placeholders = ', '.join(['%s'] * len(plan_exercise_ids))
+
+            cursor.execute(
+                f"""
+                    SELECT
+                        pep.*, tpe.plan_id, tp.name as plan_name
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE pep.plan_exercise_id IN ({placeholders}) AND pep.patient_id = %s
+                    ORDER BY pep.completion_date DESC, pep.created_at DESC
+                    """,
+                tuple(plan_exercise_ids) + (patient_id,)
+            )
+            progress_entries = cursor.fetchall()
+
+            cursor.execute(
+                f"""
+                    SELECT
+                        COUNT(*) as total_completions,
+                        AVG(pep.pain_level) as avg_pain,
+                        AVG(pep.difficulty_level) as avg_difficulty,
+                        MIN(pep.completion_date) as first_completed,
+                        MAX(pep.completion_date) as last_completed
+                    FROM PatientExerciseProgress pep
+                    WHERE pep.plan_exercise_id IN ({placeholders}) AND pep.patient_id = %s
+                    """,
+                tuple(plan_exercise_ids) + (patient_id,)
+            )
+            stats = cursor.fetchone()
+
+            formatted_progress = []
+            for entry in progress_entries:
+                formatted_progress.append({
+                    "progressId": entry.get("progress_id"),
+                    "planExerciseId": entry.get("plan_exercise_id"),
+                    "planId": entry.get("plan_id"),
+                    "planName": entry.get("plan_name", ""),
+                    "completionDate": entry.get("completion_date").isoformat() if entry.get("completion_date") else None,
+                    "setsCompleted": entry.get("sets_completed", 0),
+                    "repetitionsCompleted": entry.get("repetitions_completed", 0),
+                    "durationSeconds": entry.get("duration_seconds", 0),
+                    "painLevel": entry.get("pain_level", 0),
+                    "difficultyLevel": entry.get("difficulty_level", 0),
+                    "notes": entry.get("notes", ""),
+                    "createdAt": entry.get("created_at").isoformat() if entry.get("created_at") else None
+                })
+
+            formatted_plans = []
+            for pe in plan_exercises:
+                formatted_plans.append({
+                    "planExerciseId": pe.get("plan_exercise_id"),
+                    "planId": pe.get("plan_id"),
+                    "planName": pe.get("plan_name", ""),
+                    "sets": pe.get("sets", 3) or 3,
+                    "repetitions": pe.get("repetitions", 10) or 10,
+                    "frequency": pe.get("frequency", "Daily") or "Daily"
+                })
+
+            result = {
+                "exerciseId": exercise.get("exercise_id"),
+                "name": exercise.get("name", ""),
+                "description": exercise.get("description", "") or "",
+                "videoUrl": exercise.get("video_url", ""),
+                "videoType": exercise.get("video_type", "") or "",
+                "difficulty": exercise.get("difficulty", "Beginner") or "Beginner",
+                "stats": {
+                    "totalCompletions": stats.get("total_completions", 0) or 0,
+                    "averagePain": float(stats.get("avg_pain", 0)) if stats.get("avg_pain") is not None else None,
+                    "averageDifficulty": float(stats.get("avg_difficulty", 0)) if stats.get("avg_difficulty") is not None else None,
+                    "firstCompleted": stats.get("first_completed").isoformat() if stats.get("first_completed") else None,
+                    "lastCompleted": stats.get("last_completed").isoformat() if stats.get("last_completed") else None
+                },
+                "planInstances": formatted_plans,
+                "progressHistory": formatted_progress
+            }
+
+            return result
+
+        except Exception as e:
+            print(f"Database error in get exercise history: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get exercise history: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/exercises/{exercise_id}")
+async def view_exercise(request: Request, exercise_id: int, user = Depends(get_current_user)):
+    """Display detailed view of a specific exercise"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT id, first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT e.*, c.name as category_name
+                    FROM Exercises e
+                    LEFT JOIN ExerciseCategories c ON e.category_id = c.category_id
+                    WHERE e.exercise_id = %s""",
+                (exercise_id,)
+            )
+            exercise_result = cursor.fetchone()
+
+            if not exercise_result:
+                return RedirectResponse(url="/exercises?error=not_found")
+
+            exercise = {}
+            for key, value in exercise_result.items():
+                if isinstance(value, bytes):
+                    exercise[key] = value.decode('utf-8')
+                else:
+                    exercise[key] = value
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT tpe.*, tp.name, tp.plan_id,
+                            CONCAT(p.first_name, ' ', p.last_name) as patient_name
+                    FROM TreatmentPlanExercises tpe
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE tpe.exercise_id = %s
+                    ORDER BY tp.created_at DESC""",
+                (exercise_id,)
+            )
+            plans_using_exercise_result = cursor.fetchall()
+
+            plans_using_exercise = []
+            for plan in plans_using_exercise_result:
+                clean_plan = {}
+                for key, value in plan.items():
+                    if isinstance(value, bytes):
+                        clean_plan[key] = value.decode('utf-8')
+                    else:
+                        clean_plan[key] = value
+                plans_using_exercise.append(clean_plan)
+
+            cursor.execute(
+                """SELECT tp.plan_id, tp.name,
+                            CONCAT(p.first_name, ' ', p.last_name) as patient_name
+                    FROM TreatmentPlans tp
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE tp.therapist_id = %s AND tp.status = 'Active'
+                    ORDER BY tp.name""",
+                (session_data["user_id"],)
+            )
+            treatment_plans_result = cursor.fetchall()
+
+            treatment_plans = []
+            for plan in treatment_plans_result:
+                clean_plan = {}
+                for key, value in plan.items():
+                    if isinstance(value, bytes):
+                        clean_plan[key] = value.decode('utf-8')
+                    else:
+                        clean_plan[key] = value
+                treatment_plans.append(clean_plan)
+
+            if exercise.get('instructions') and isinstance(exercise.get('instructions'), str):
+                exercise['instructions'] = exercise.get('instructions').strip()
+
+            exercise['recommendations'] = []
+
+            if exercise.get('video_url') and 'youtube.com' in exercise.get('video_url', ''):
+                if 'watch?v=' in exercise.get('video_url', ''):
+                    video_id = exercise.get('video_url').split('watch?v=')[1].split('&')[0]
+                    exercise['video_url'] = f"https://www.youtube.com/embed/{video_id}"
+
+            category_name = exercise.get('category_name')
+
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(user["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/exercises/view_exercise.html",
+                {
+                    "request": request,
+                    "exercise": exercise,
+                    "therapist": therapist_data,
+                    "category_name": category_name,
+                    "first_name": therapist_data.get("first_name", ""),
+                    "last_name": therapist_data.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "plans_using_exercise": plans_using_exercise,
+                    "treatment_plans": treatment_plans
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in view exercise: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/exercises?error=database")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in view exercise: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
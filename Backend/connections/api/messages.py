@@ -0,0 +1,840 @@
+"""
+Therapist inbox pages and patient-to-therapist messaging.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/messages")
+async def messages_page(request: Request, search: str = None):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT first_name, last_name, profile_image FROM Therapists WHERE id = %s",
+                (user_id,)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            search_condition = ""
+            search_params = []
+            if search:
+                search_condition = """
+                        AND (
+                            t.first_name LIKE %s OR
+                            t.last_name LIKE %s OR
+                            m.subject LIKE %s OR
+                            m.content LIKE %s
+                        )
+                    """
+                search_term = f"%{search}%"
+                search_params = [search_term, search_term, search_term, search_term]
+
+            inbox_query = f"""
+                    SELECT
+                        m.message_id, m.subject, m.content, m.created_at, m.is_read,
+                        CASE
+                            WHEN m.sender_type = 'therapist' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Therapists WHERE id = m.sender_id)
+                            WHEN m.sender_type = 'patient' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Patients WHERE patient_id = m.sender_id)
+                            ELSE
+                                (SELECT username FROM users WHERE user_id = m.sender_id)
+                        END as sender_name,
+                        CASE
+                            WHEN m.sender_type = 'therapist' THEN
+                                COALESCE((SELECT profile_image FROM Therapists WHERE id = m.sender_id), 'avatar-1.jpg')
+                            WHEN m.sender_type = 'patient' THEN
+                                'patient-avatar.jpg'
+                            ELSE
+                                COALESCE((SELECT profile_pic FROM users WHERE user_id = m.sender_id), 'user-avatar.jpg')
+                        END as profile_image,
+                        m.sender_type,
+                        m.sender_id
+                    FROM Messages m
+                    WHERE m.recipient_id = %s
+                    AND m.recipient_type = 'therapist'
+                    {search_condition}
+                    ORDER BY m.created_at DESC
+                """
+
+            inbox_params = [user_id] + search_params if search else [user_id]
+            cursor.execute(inbox_query, inbox_params)
+            inbox_messages = cursor.fetchall()
+
+            sent_query = f"""
+                    SELECT
+                        m.message_id, m.subject, m.content, m.created_at, m.is_read,
+                        CASE
+                            WHEN m.recipient_type = 'therapist' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Therapists WHERE id = m.recipient_id)
+                            WHEN m.recipient_type = 'patient' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Patients WHERE patient_id = m.recipient_id)
+                            ELSE
+                                (SELECT username FROM users WHERE user_id = m.recipient_id)
+                        END as recipient_name,
+                        CASE
+                            WHEN m.recipient_type = 'therapist' THEN
+                                COALESCE((SELECT profile_image FROM Therapists WHERE id = m.recipient_id), 'avatar-1.jpg')
+                            WHEN m.recipient_type = 'patient' THEN
+                                'patient-avatar.jpg'
+                            ELSE
+                                COALESCE((SELECT profile_pic FROM users WHERE user_id = m.recipient_id), 'user-avatar.jpg')
+                        END as profile_image,
+                        m.recipient_type,
+                        m.recipient_id
+                    FROM Messages m
+                    WHERE m.sender_id = %s
+                    AND m.sender_type = 'therapist'
+                    {search_condition}
+                    ORDER BY m.created_at DESC
+                """
+
+            sent_params = [user_id] + search_params if search else [user_id]
+            cursor.execute(sent_query, sent_params)
+            sent_messages = cursor.fetchall()
+
+            for messages_list in [inbox_messages, sent_messages]:
+                for message in messages_list:
+                    timestamp = message.get('created_at')
+                    now = datetime.datetime.now()
+                    if isinstance(timestamp, datetime.datetime):
+                        diff = now - timestamp
+
+                        if timestamp.date() == now.date():
+                            message['formatted_date'] = timestamp.strftime('%I:%M %p')
+
+                            minutes_ago = diff.seconds // 60
+                            if minutes_ago < 60:
+                                message['time_ago'] = f"{minutes_ago} min ago"
+                            else:
+                                hours_ago = minutes_ago // 60
+                                message['time_ago'] = f"{hours_ago} hours ago"
+
+                        elif timestamp.date() == (now - timedelta(days=1)).date():
+                            message['formatted_date'] = "Yesterday"
+                            message['time_ago'] = timestamp.strftime('%I:%M %p')
+                        else:
+                            message['formatted_date'] = timestamp.strftime('%d %b')
+                            message['time_ago'] = timestamp.strftime('%Y')
+
+                    content = message.get('content', '')
+                    if content and len(content) > 100:
+                        message['short_content'] = content[:100] + '...'
+                    else:
+                        message['short_content'] = content
+
+            cursor.execute(
+                "SELECT id, first_name, last_name, profile_image FROM Therapists WHERE id != %s",
+                (user_id,)
+            )
+            therapists = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT patient_id, first_name, last_name FROM Patients"
+            )
+            patients = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT user_id, username FROM users"
+            )
+            users = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (user_id,)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/messages/index.html",
+                {
+                    "request": request,
+                    "profile_image": therapist.get("profile_image", ""),
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "inbox_messages": inbox_messages,
+                    "sent_messages": sent_messages,
+                    "therapists": therapists,
+                    "patients": patients,
+                    "users": users,
+                    "unread_messages_count": unread_messages_count,
+                    "search_term": search
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in messages page: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in messages page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/messages/{message_id}")
+async def view_message(request: Request, message_id: int):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT first_name, last_name, profile_image FROM Therapists WHERE id = %s",
+                (user_id,)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            cursor.execute(
+                """SELECT
+                        m.message_id, m.subject, m.content, m.created_at, m.is_read,
+                        m.sender_id, m.recipient_id, m.sender_type, m.recipient_type,
+                        CASE
+                            WHEN m.sender_type = 'therapist' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Therapists WHERE id = m.sender_id)
+                            WHEN m.sender_type = 'patient' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Patients WHERE patient_id = m.sender_id)
+                            ELSE
+                                (SELECT username FROM users WHERE user_id = m.sender_id)
+                        END as sender_name,
+                        CASE
+                            WHEN m.recipient_type = 'therapist' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Therapists WHERE id = m.recipient_id)
+                            WHEN m.recipient_type = 'patient' THEN
+                                (SELECT CONCAT(first_name, ' ', last_name) FROM Patients WHERE patient_id = m.recipient_id)
+                            ELSE
+                                (SELECT username FROM users WHERE user_id = m.recipient_id)
+                        END as recipient_name,
+                        CASE
+                            WHEN m.sender_type = 'therapist' THEN
+                                COALESCE((SELECT profile_image FROM Therapists WHERE id = m.sender_id), 'avatar-1.jpg')
+                            WHEN m.sender_type = 'patient' THEN
+                                'patient-avatar.jpg'
+                            ELSE
+                                COALESCE((SELECT profile_pic FROM users WHERE user_id = m.sender_id), 'user-avatar.jpg')
+                        END as sender_profile_image
+                    FROM Messages m
+                    WHERE m.message_id = %s
+                    AND ((m.sender_id = %s AND m.sender_type = 'therapist')
+                        OR (m.recipient_id = %s AND m.recipient_type = 'therapist'))""",
+                (message_id, user_id, user_id)
+            )
+            message = cursor.fetchone()
+
+            if not message:
+                return RedirectResponse(url="/messages")
+
+            recipient_id_from_message = message.get('recipient_id')
+            if (recipient_id_from_message == user_id and
+                message.get('recipient_type') == 'therapist' and
+                not message.get('is_read', True)):
+                cursor.execute(
+                    "UPDATE Messages SET is_read = TRUE WHERE message_id = %s",
+                    (message_id,)
+                )
+                db.commit()
+
+            timestamp = message.get('created_at')
+            if isinstance(timestamp, datetime.datetime):
+                now = datetime.datetime.now()
+                if timestamp.date() == now.date():
+                    message['formatted_date'] = f"Today at {timestamp.strftime('%I:%M %p')}"
+                elif timestamp.date() == (now - timedelta(days=1)).date():
+                    message['formatted_date'] = f"Yesterday at {timestamp.strftime('%I:%M %p')}"
+                else:
+                    message['formatted_date'] = timestamp.strftime('%b %d, %Y at %I:%M %p')
+
+            message['direction'] = 'received' if (
+                message.get('recipient_id') == user_id and
+                message.get('recipient_type') == 'therapist'
+            ) else 'sent'
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (user_id,)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/messages/view.html",
+                {
+                    "request": request,
+                    "profile_image": therapist.get("profile_image", ""),
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "message": message,
+                    "unread_messages_count": unread_messages_count
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in view message: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/messages")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in view message: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/messages/send")
+async def send_message(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return {"success": False, "message": "Not authenticated"}
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return {"success": False, "message": "Not authenticated"}
+
+        form_data = await request.form()
+        recipient_type = form_data.get("recipient_type")
+        recipient_id = form_data.get("recipient_id")
+        subject = form_data.get("subject")
+        content = form_data.get("content")
+
+        if not recipient_type or not recipient_id or not content:
+            return {"success": False, "message": "Recipient and message content are required"}
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            recipient_exists = False
+
+            if recipient_type == "therapist":
+                cursor.execute(
+                    "SELECT id FROM Therapists WHERE id = %s",
+                    (recipient_id,)
+                )
+                recipient = cursor.fetchone()
+                recipient_exists = recipient is not None
+            elif recipient_type == "patient":
+                cursor.execute(
+                    "SELECT patient_id FROM Patients WHERE patient_id = %s",
+                    (recipient_id,)
+                )
+                recipient = cursor.fetchone()
+                recipient_exists = recipient is not None
+            elif recipient_type == "user":
+                cursor.execute(
+                    "SELECT user_id FROM users WHERE user_id = %s",
+                    (recipient_id,)
+                )
+                recipient = cursor.fetchone()
+                recipient_exists = recipient is not None
+
+            if not recipient_exists:
+                return {"success": False, "message": "Recipient not found"}
+
+            cursor.execute(
+                """INSERT INTO Messages
+                        (sender_id, sender_type, recipient_id, recipient_type, subject, content)
+                        VALUES (%s, %s, %s, %s, %s, %s)""",
+                (session_data["user_id"], "therapist", recipient_id, recipient_type, subject, content)
+            )
+            db.commit()
+
+            new_message_id = cursor.lastrowid
+
+            return {"success": True, "message_id": new_message_id}
+
+        except Exception as e:
+            print(f"Database error sending message: {e}")
+            return {"success": False, "message": "Error sending message"}
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error sending message: {e}")
+        return {"success": False, "message": "Error processing request"}
+
+
+@router.post("/messages/reply/{message_id}")
+async def reply_to_message(request: Request, message_id: int):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return {"success": False, "message": "Not authenticated"}
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return {"success": False, "message": "Not authenticated"}
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        form_data = await request.form()
+        content = form_data.get("content")
+        if not content:
+            return {"success": False, "message": "Message content is required"}
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT sender_id, recipient_id, subject, sender_type, recipient_type
+                    FROM Messages
+                    WHERE message_id = %s
+                    AND ((sender_id = %s AND sender_type = 'therapist')
+                    OR (recipient_id = %s AND recipient_type = 'therapist'))""",
+                (message_id, user_id, user_id)
+            )
+            original_message = cursor.fetchone()
+
+            if not original_message:
+                return {"success": False, "message": "Original message not found"}
+
+            sender_id = original_message.get('sender_id')
+            recipient_id = original_message.get('recipient_id')
+            sender_type = original_message.get('sender_type')
+            recipient_type = original_message.get('recipient_type')
+            subject = original_message.get('subject', '')
+
+            try:
+                recipient_id_int = int(recipient_id) if recipient_id is not None else None
+                sender_id_int = int(sender_id) if sender_id is not None else None
+            except (ValueError, TypeError):
+                print(f"Warning: Could not convert IDs to integers. sender_id: {sender_id}, recipient_id: {recipient_id}")
+                recipient_id_int = recipient_id
+                sender_id_int = sender_id
+
+            if recipient_id_int == user_id and recipient_type == 'therapist':
+                reply_to_id = sender_id_int
+                reply_to_type = sender_type
+            else:
+                reply_to_id = recipient_id_int
+                reply_to_type = recipient_type
+
+            if not subject.startswith("Re:"):
+                subject = f"Re: {subject}"
+
+            cursor.execute(
+                """INSERT INTO Messages
+                    (sender_id, sender_type, recipient_id, recipient_type, subject, content)
+                    VALUES (%s, %s, %s, %s, %s, %s)""",
+                (user_id, "therapist", reply_to_id, reply_to_type, subject, content)
+            )
+            db.commit()
+
+            new_message_id = cursor.lastrowid
+            return {"success": True, "message_id": new_message_id}
+
+        except Exception as e:
+            print(f"Database error sending reply: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return {"success": False, "message": f"Error sending reply: {str(e)}"}
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error sending reply: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return {"success": False, "message": f"Error processing request: {str(e)}"}
+
+
+@router.delete("/messages/{message_id}")
+async def delete_message(request: Request, message_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return {"success": False, "message": "Not authenticated"}
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return {"success": False, "message": "Not authenticated"}
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT message_id
+                       FROM Messages
+                       WHERE message_id = %s
+                       AND ((sender_id = %s AND sender_type = 'therapist')
+                            OR (recipient_id = %s AND recipient_type = 'therapist'))""",
+                (message_id, session_data["user_id"], session_data["user_id"])
+            )
+
+            message = cursor.fetchone()
+            if not message:
+                return {"success": False, "message": "Message not found or you don't have permission to delete it"}
+
+
+            cursor.execute(
+                "DELETE FROM Messages WHERE message_id = %s",
+                (message_id,)
+            )
+            db.commit()
+
+            return {"success": True}
+
+        except Exception as e:
+            print(f"Database error deleting message: {e}")
+            return {"success": False, "message": "Error deleting message"}
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error deleting message: {e}")
+        return {"success": False, "message": "Error processing request"}
+
+
+@router.get("/api/messages/unread-count")
+async def get_unread_count(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return {"count": 0}
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return {"count": 0}
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            result = cursor.fetchone()
+            return {"count": result.get('count', 0) if result else 0}
+
+        except Exception as e:
+            print(f"Error fetching unread count: {e}")
+            return {"count": 0}
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in unread count API: {e}")
+        return {"count": 0}
+
+
+async def get_unread_messages_count(db, user_id):
+    """Get count of unread messages"""
+    try:
+        cursor = db.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+            (user_id,)
+        )
+        result = cursor.fetchone()
+        return result['count'] if result else 0
+    except Exception as e:
+        print(f"Error counting unread messages: {e}")
+        return 0
+    finally:
+        if cursor:
+            cursor.close()
+
+
+@router.get("/messages/therapist/{therapist_id}")
+async def get_therapist_messages(request: Request, therapist_id: int):
+    """API endpoint to get messages between the current user/patient and a specific therapist"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = None
+        user_id = None
+
+        try:
+            print(f"Getting session data from Redis for session_id: {session_id}")
+            session_data = await get_redis_session(session_id)
+            if session_data and "user_id" in session_data:
+                user_id = session_data["user_id"]
+                print(f"User ID from Redis session: {user_id}")
+        except Exception as e:
+            print(f"Redis session error: {e}, trying fallback method")
+
+        if not user_id:
+            try:
+                print(f"Trying fallback session method for session_id: {session_id}")
+                session_data = await get_session_data(session_id)
+                if session_data and hasattr(session_data, 'user_id'):
+                    user_id = session_data.user_id
+                    print(f"User ID from session data: {user_id}")
+            except Exception as e:
+                print(f"Session data error: {e}")
+
+        if not user_id:
+            print("No user ID found in session")
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Invalid session or user ID not found"}
+            )
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            print(f"Checking if user {user_id} has a patient record")
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient_record = cursor.fetchone()
+            patient_id = patient_record.get('patient_id') if patient_record else None
+
+            print(f"Patient ID for user {user_id}: {patient_id}")
+
+            query_params = []
+            query_conditions = []
+
+            query_conditions.append("(m.sender_id = %s AND m.sender_type = 'user' AND m.recipient_id = %s AND m.recipient_type = 'therapist')")
+            query_params.extend([user_id, therapist_id])
+
+            query_conditions.append("(m.sender_id = %s AND m.sender_type = 'therapist' AND m.recipient_id = %s AND m.recipient_type = 'user')")
+            query_params.extend([therapist_id, user_id])
+
+            if patient_id:
+                query_conditions.append("(m.sender_id = %s AND m.sender_type = 'patient' AND m.recipient_id = %s AND m.recipient_type = 'therapist')")
+                query_params.extend([patient_id, therapist_id])
+
+                query_conditions.append("(m.sender_id = %s AND m.sender_type = 'therapist' AND m.recipient_id = %s AND m.recipient_type = 'patient')")
+                query_params.extend([therapist_id, patient_id])
+
+            query = f"""
+                    SELECT m.message_id, m.subject, m.content, m.created_at, m.is_read,
+                        m.sender_id, m.sender_type, m.recipient_id, m.recipient_type
+                    FROM Messages m
+                    WHERE {" OR ".join(query_conditions)}
+                    ORDER BY m.created_at
+                """
+
+            print(f"Executing query: {query}")
+            print(f"With parameters: {query_params}")
+
+            cursor.execute(query, query_params)
+            messages = cursor.fetchall()
+
+            print(f"Found {len(messages)} messages")
+
+            formatted_messages = []
+            for message in messages:
+                created_at = message.get('created_at')
+
+                is_from_current_user = ((message.get('sender_type') == 'user' and int(message.get('sender_id', 0)) == int(user_id)) or
+                                    (message.get('sender_type') == 'patient' and patient_id and int(message.get('sender_id', 0)) == int(patient_id)))
+
+                display_sender_type = "user" if is_from_current_user else "therapist"
+
+                formatted_message = {
+                    "id": message.get('message_id'),
+                    "senderId": message.get('sender_id'),
+                    "receiverId": message.get('recipient_id'),
+                    "senderType": display_sender_type,
+                    "content": message.get('content', "") or "",
+                    "timestamp": created_at.isoformat() if created_at else "",
+                    "isRead": bool(message.get('is_read', False))
+                }
+
+                formatted_messages.append(formatted_message)
+                print(f"Formatted message: {formatted_message}")
+
+            return formatted_messages
+
+        except Exception as e:
+            print(f"Database error in get therapist messages: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get therapist messages: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/messages/send-to-therapist")
+async def send_message_to_therapist(request: Request):
+    import traceback
+    try:
+        session_id = request.cookies.get("session_id")
+        if not session_id:
+            print("No session ID found")
+            return JSONResponse(
+                status_code=401,
+                content={"id": 0, "status": "invalid", "message": "Authentication required"}
+            )
+
+        body = await request.json()
+        print(f"Request body: {body}")
+
+        session_data = await get_session_data(session_id)
+        if not session_data or not hasattr(session_data, 'user_id'):
+            print("Invalid session data")
+            return JSONResponse(
+                status_code=401,
+                content={"id": 0, "status": "invalid", "message": "Invalid session"}
+            )
+
+        user_id = session_data.user_id
+        print(f"User ID: {user_id}")
+
+        therapist_id = body.get("therapist_id")
+        content = body.get("content")
+
+        if not therapist_id:
+            return JSONResponse(
+                status_code=400,
+                content={"id": 0, "status": "invalid", "message": "therapist_id is required"}
+            )
+
+        if not content:
+            return JSONResponse(
+                status_code=400,
+                content={"id": 0, "status": "invalid", "message": "content is required"}
+            )
+
+        db = await get_Mysql_db_async()
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            sender_id = int(user_id)
+            sender_type = "user"
+            recipient_id = int(therapist_id)
+            recipient_type = "therapist"
+            subject = "Message"
+
+            print(f"Inserting message: {sender_id} -> {recipient_id}: {content}")
+
+            cursor.execute(
+                """INSERT INTO Messages
+                    (sender_id, sender_type, recipient_id, recipient_type, subject, content)
+                    VALUES (%s, %s, %s, %s, %s, %s)""",
+                (sender_id, sender_type, recipient_id, recipient_type, subject, content)
+            )
+
+            db.commit()
+
+            message_id = cursor.lastrowid
+            print(f"Message inserted with ID: {message_id}")
+
+            cursor.execute(
+                "SELECT * FROM Messages WHERE message_id = %s",
+                (message_id,)
+            )
+
+            verification = cursor.fetchone()
+            if verification:
+                print(f"Message verified: {verification}")
+            else:
+                print("WARNING: Message not found after insert")
+
+            return {
+                "id": message_id,
+                "status": "valid",
+                "message": "Message sent successfully"
+            }
+
+        except Exception as e:
+            print(f"Database error: {str(e)}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"id": 0, "status": "invalid", "message": f"Database error: {str(e)}"}
+            )
+        finally:
+            if 'cursor' in locals():
+                cursor.close()
+            db.close()
+
+    except Exception as e:
+        print(f"Server error: {str(e)}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"id": 0, "status": "invalid", "message": f"Server error: {str(e)}"}
+        )
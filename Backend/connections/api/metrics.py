@@ -0,0 +1,33 @@
+"""
+Prometheus scrape endpoint for this worker's request, query and Redis timings
+(see connections.instrumentation), plus connection pool and cache gauges.
+
+Scrapers can't hold a session cookie, so the endpoint requires
+"Authorization: Bearer <METRICS_TOKEN>" instead. With METRICS_TOKEN unset it is
+not served at all (404): query fingerprints and traffic figures are not public.
+"""
+from connections.api.common import *
+from connections.instrumentation import register_stats_source, render_metrics
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter()
+
+register_stats_source("mysql_pool", mysql_pool_stats)
+register_stats_source("session_cache", session_cache.stats)
+register_stats_source("password_hasher", password_hasher.stats)
+
+
+def require_metrics_token(request: Request):
+    """Dependency for operational endpoints that scrapers, not users, read."""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,1783 @@
+"""
+Patient pages for therapists, patient reports and metrics, and the mobile user profile.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/reports/patients")
+async def patient_reports(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT patient_id, first_name, last_name, diagnosis, status
+                    FROM Patients
+                    WHERE therapist_id = %s
+                    ORDER BY last_name, first_name""",
+                (session_data["user_id"],)
+            )
+            patients_result = cursor.fetchall()
+
+            patients = []
+            for patient in patients_result:
+                clean_patient = {}
+                for key, value in patient.items():
+                    if isinstance(value, bytes):
+                        clean_patient[key] = value.decode('utf-8')
+                    else:
+                        clean_patient[key] = value
+                patients.append(clean_patient)
+
+            cursor.execute(
+                """SELECT COUNT(*) as pending_count
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE p.therapist_id = %s AND evs.status = 'Pending'""",
+                (session_data["user_id"],)
+            )
+            pending_count_result = cursor.fetchone()
+            pending_count = pending_count_result.get('pending_count', 0) if pending_count_result else 0
+
+            cursor.execute(
+                """SELECT
+                        evs.submission_id,
+                        evs.submission_date,
+                        evs.status,
+                        p.first_name,
+                        p.last_name,
+                        e.name as exercise_name,
+                        tp.name as plan_name
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE p.therapist_id = %s
+                    ORDER BY evs.submission_date DESC
+                    LIMIT 3""",
+                (session_data["user_id"],)
+            )
+            submissions_result = cursor.fetchall()
+
+            submissions = []
+            for submission in submissions_result:
+                clean_submission = {}
+                for key, value in submission.items():
+                    if isinstance(value, bytes):
+                        clean_submission[key] = value.decode('utf-8')
+                    else:
+                        clean_submission[key] = value
+                submissions.append(clean_submission)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/reports/patient_reports.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "patients": patients,
+                    "submissions": submissions,
+                    "pending_count": pending_count
+                }
+            )
+        except Exception as e:
+            print(f"Database error in patient reports: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in patient reports: {e}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/reports/patients/{patient_id}")
+async def patient_detailed_report(request: Request, patient_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT * FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+            patient_result = cursor.fetchone()
+
+            if not patient_result:
+                return RedirectResponse(url="/reports/patients")
+
+            patient = {}
+            for key, value in patient_result.items():
+                if isinstance(value, bytes):
+                    patient[key] = value.decode('utf-8')
+                else:
+                    patient[key] = value
+
+            cursor.execute(
+                """SELECT
+                        pep.*,
+                        tpe.sets,
+                        tpe.repetitions,
+                        e.name as exercise_name,
+                        e.video_url as exercise_video_url,
+                        e.difficulty,
+                        evs.submission_id as video_submission_id,
+                        evs.video_url as submission_video_url
+                        FROM PatientExerciseProgress pep
+                        JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                        JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                        JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                        LEFT JOIN ExerciseVideoSubmissions evs ON
+                            evs.patient_id = tp.patient_id AND
+                            evs.exercise_id = e.exercise_id AND
+                            DATE(evs.submission_date) = pep.completion_date
+                        WHERE tp.patient_id = %s
+                        ORDER BY pep.completion_date DESC, pep.created_at DESC""",
+                (patient_id,)
+            )
+            exercise_history_result = cursor.fetchall()
+
+            exercise_history = []
+            for exercise in exercise_history_result:
+                clean_exercise = {}
+                for key, value in exercise.items():
+                    if isinstance(value, bytes):
+                        clean_exercise[key] = value.decode('utf-8')
+                    else:
+                        clean_exercise[key] = value
+                exercise_history.append(clean_exercise)
+
+            cursor.execute(
+                """SELECT * FROM TreatmentPlans
+                    WHERE patient_id = %s
+                    ORDER BY created_at DESC""",
+                (patient_id,)
+            )
+            treatment_plans_result = cursor.fetchall()
+
+            treatment_plans = []
+            for plan in treatment_plans_result:
+                clean_plan = {}
+                for key, value in plan.items():
+                    if isinstance(value, bytes):
+                        clean_plan[key] = value.decode('utf-8')
+                    else:
+                        clean_plan[key] = value
+                treatment_plans.append(clean_plan)
+
+            cursor.execute(
+                """SELECT * FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC""",
+                (patient_id,)
+            )
+            patient_metrics_result = cursor.fetchall()
+
+            patient_metrics = []
+            for metric in patient_metrics_result:
+                clean_metric = {}
+                for key, value in metric.items():
+                    if isinstance(value, bytes):
+                        clean_metric[key] = value.decode('utf-8')
+                    else:
+                        clean_metric[key] = value
+                patient_metrics.append(clean_metric)
+
+            for metric in patient_metrics:
+                if metric.get('measurement_date'):
+                    if isinstance(metric['measurement_date'], (datetime.date, datetime.datetime)):
+                        metric['measurement_date'] = metric['measurement_date'].strftime('%Y-%m-%d')
+
+            cursor.execute(
+                """SELECT f.* FROM feedback f
+                    JOIN users u ON f.user_id = u.user_id
+                    JOIN Patients p ON u.user_id = p.user_id
+                    WHERE p.patient_id = %s
+                    ORDER BY f.created_at DESC""",
+                (patient_id,)
+            )
+            patient_feedback_result = cursor.fetchall()
+
+            patient_feedback = []
+            for feedback in patient_feedback_result:
+                clean_feedback = {}
+                for key, value in feedback.items():
+                    if isinstance(value, bytes):
+                        clean_feedback[key] = value.decode('utf-8')
+                    else:
+                        clean_feedback[key] = value
+                patient_feedback.append(clean_feedback)
+
+            cursor.execute(
+                """SELECT evs.*, e.name as exercise_name, tp.name as plan_name, evs.video_url
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE evs.patient_id = %s
+                    ORDER BY evs.submission_date DESC
+                    LIMIT 6""",
+                (patient_id,)
+            )
+            video_submissions_result = cursor.fetchall()
+
+            video_submissions = []
+            for submission in video_submissions_result:
+                clean_submission = {}
+                for key, value in submission.items():
+                    if isinstance(value, bytes):
+                        clean_submission[key] = value.decode('utf-8')
+                    else:
+                        clean_submission[key] = value
+                video_submissions.append(clean_submission)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            # Video tokens live in Redis; hand the connection back before minting them
+            release_Mysql_db(db, cursor)
+
+            for exercise in exercise_history:
+                if exercise.get('submission_video_url'):
+                    filename = os.path.basename(exercise.get('submission_video_url', ''))
+                    token = await generate_video_token(session_data["user_id"], filename)
+                    exercise['tokenized_submission_url'] = f"/api/uploads/exercise_videos/{filename}?token={token}"
+
+                if exercise.get('exercise_video_url'):
+                    filename = os.path.basename(exercise.get('exercise_video_url', ''))
+                    token = await generate_video_token(session_data["user_id"], filename)
+                    exercise['tokenized_exercise_url'] = f"/api/uploads/exercise_videos/{filename}?token={token}"
+
+            for submission in video_submissions:
+                if submission.get('video_url'):
+                    filename = os.path.basename(submission.get('video_url', ''))
+                    token = await generate_video_token(session_data["user_id"], filename)
+                    submission['tokenized_video_url'] = f"/api/uploads/exercise_videos/{filename}?token={token}"
+
+            print(f"Found {len(exercise_history)} exercise history records")
+            print(f"Found {len(video_submissions)} video submissions")
+
+            return templates.TemplateResponse(
+                "dist/reports/patient_detailed_report.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "patient": patient,
+                    "exercise_history": exercise_history,
+                    "treatment_plans": treatment_plans,
+                    "patient_metrics": patient_metrics,
+                    "patient_feedback": patient_feedback,
+                    "video_submissions": video_submissions
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in patient detailed report: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/reports/patients")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in patient detailed report: {e}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/patients")
+async def get_patients_page(request: Request, user=Depends(get_current_user)):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            "SELECT * FROM Patients WHERE therapist_id = %s ORDER BY last_name",
+            (user["user_id"],)
+        )
+        patients_result = cursor.fetchall()
+
+        patients = []
+        for patient in patients_result:
+            clean_patient = {}
+            for key, value in patient.items():
+                if isinstance(value, bytes):
+                    clean_patient[key] = value.decode('utf-8')
+                else:
+                    clean_patient[key] = value
+            patients.append(clean_patient)
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        return templates.TemplateResponse(
+            "dist/dashboard/patient_directory.html",
+            {
+                "request": request,
+                "patients": patients,
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", ""),
+                "last_name": therapist_data.get("last_name", "")
+            }
+        )
+    except Exception as e:
+        print(f"Error loading patient directory: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page")
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/patients/add")
+async def add_patient_page(request: Request, user=Depends(get_current_user)):
+    therapist_data = await get_therapist_data(user["user_id"])
+
+    return templates.TemplateResponse(
+        "dist/dashboard/add_patient.html",
+        {
+            "request": request,
+            "therapist": therapist_data,
+            "first_name": therapist_data.get("first_name", ""),
+            "last_name": therapist_data.get("last_name", "")
+        }
+    )
+
+
+@router.post("/patients/add")
+async def add_patient(
+    request: Request,
+    first_name: str = Form(...),
+    last_name: str = Form(...),
+    email: str = Form(None),
+    phone: str = Form(None),
+    date_of_birth: str = Form(None),
+    address: str = Form(None),
+    diagnosis: str = Form(None),
+    notes: str = Form(None),
+    user=Depends(get_current_user)
+):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            """INSERT INTO Patients
+                (therapist_id, first_name, last_name, email, phone, date_of_birth,
+                address, diagnosis, notes)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+            (user["user_id"], first_name, last_name, email, phone,
+            date_of_birth, address, diagnosis, notes)
+        )
+        db.commit()
+        release_Mysql_db(db, cursor)
+        await invalidate_dashboard_cache(user["user_id"])
+        return RedirectResponse(url="/patients", status_code=303)
+    except Exception as e:
+        print(f"Error adding patient: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+        return templates.TemplateResponse(
+            "dist/dashboard/add_patient.html",
+            {
+                "request": request,
+                "error": f"Error adding patient: {str(e)}",
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", ""),
+                "last_name": therapist_data.get("last_name", ""),
+                "today": datetime.datetime.now()
+            }
+        )
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/patients/{patient_id}")
+async def patient_details(request: Request, patient_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            now = datetime.datetime.now()
+            today = datetime.date.today()
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT * FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+            patient_result = cursor.fetchone()
+
+            if not patient_result:
+                return RedirectResponse(url="/patients")
+
+            patient = {}
+            for key, value in patient_result.items():
+                if isinstance(value, bytes):
+                    patient[key] = value.decode('utf-8')
+                else:
+                    patient[key] = value
+
+            cursor.execute(
+                """SELECT * FROM TreatmentPlans
+                    WHERE patient_id = %s
+                    ORDER BY created_at DESC""",
+                (patient_id,)
+            )
+            treatment_plans_result = cursor.fetchall()
+
+            treatment_plans = []
+            for plan in treatment_plans_result:
+                clean_plan = {}
+                for key, value in plan.items():
+                    if isinstance(value, bytes):
+                        clean_plan[key] = value.decode('utf-8')
+                    else:
+                        clean_plan[key] = value
+                treatment_plans.append(clean_plan)
+
+            cursor.execute(
+                """SELECT * FROM Appointments
+                    WHERE patient_id = %s
+                    ORDER BY appointment_date DESC, appointment_time DESC""",
+                (patient_id,)
+            )
+            appointments_raw = cursor.fetchall()
+            appointments = []
+
+            for appt in appointments_raw:
+                processed_appt = {}
+
+                for key, value in appt.items():
+                    if isinstance(value, datetime.datetime):
+                        processed_appt[key] = value
+                    elif isinstance(value, datetime.date):
+                        processed_appt[key] = value
+                    elif isinstance(value, datetime.timedelta):
+                        processed_appt[key] = value
+                    elif isinstance(value, bytes):
+                        processed_appt[key] = value.decode('utf-8')
+                    else:
+                        processed_appt[key] = value
+
+                appointments.append(processed_appt)
+
+            cursor.execute(
+                """SELECT * FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC""",
+                (patient_id,)
+            )
+            metrics_result = cursor.fetchall()
+
+            metrics = []
+            for metric in metrics_result:
+                clean_metric = {}
+                for key, value in metric.items():
+                    if isinstance(value, bytes):
+                        clean_metric[key] = value.decode('utf-8')
+                    else:
+                        clean_metric[key] = value
+                metrics.append(clean_metric)
+
+            cursor.execute(
+                """SELECT
+                        pn.note_id,
+                        pn.patient_id,
+                        pn.therapist_id,
+                        pn.appointment_id,
+                        pn.note_text,
+                        pn.created_at,
+                        pn.updated_at,
+                        t.first_name,
+                        t.last_name
+                    FROM PatientNotes pn
+                    LEFT JOIN Therapists t ON pn.therapist_id = t.id
+                    WHERE pn.patient_id = %s
+                    ORDER BY pn.created_at DESC""",
+                (patient_id,)
+            )
+
+            patient_notes_raw = cursor.fetchall()
+            patient_notes = []
+
+            for note in patient_notes_raw:
+                processed_note = {}
+
+                for key, value in note.items():
+                    if isinstance(value, datetime.datetime):
+                        processed_note[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+                    elif isinstance(value, datetime.date):
+                        processed_note[key] = value.strftime('%Y-%m-%d')
+                    elif isinstance(value, datetime.timedelta):
+                        total_seconds = int(value.total_seconds())
+                        hours, remainder = divmod(total_seconds, 3600)
+                        minutes, seconds = divmod(remainder, 60)
+                        processed_note[key] = f"{hours:02d}:{minutes:02d}"
+                    elif isinstance(value, bytes):
+                        processed_note[key] = value.decode('utf-8')
+                    else:
+                        processed_note[key] = value
+
+                patient_notes.append(processed_note)
+
+            appointment_ids = [note.get('appointment_id') for note in patient_notes
+                            if note.get('appointment_id') is not None]
+
+            if appointment_ids:
+                placeholders = ', '.join(['%s'] * len(appointment_ids))
+                cursor.execute(
+                    f"""SELECT
+                            appointment_id,
+                            appointment_date,
+                            appointment_time
+                        FROM Appointments
+                        WHERE appointment_id IN ({placeholders})""",
+                    tuple(appointment_ids)
+                )
+
+                appointments_data = cursor.fetchall()
+                appointments_dict = {}
+
+                for appt in appointments_data:
+                    appt_date = appt.get('appointment_date')
+                    appt_time = appt.get('appointment_time')
+
+                    if isinstance(appt_date, (datetime.date, datetime.datetime)):
+                        date_str = appt_date.strftime('%Y-%m-%d')
+                    else:
+                        date_str = str(appt_date)
+
+                    if isinstance(appt_time, datetime.timedelta):
+                        total_seconds = int(appt_time.total_seconds())
+                        hours, remainder = divmod(total_seconds, 3600)
+                        minutes, seconds = divmod(remainder, 60)
+                        time_str = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        time_str = str(appt_time)
+
+                    appointments_dict[appt.get('appointment_id')] = {
+                        'appointment_date': date_str,
+                        'appointment_time': time_str
+                    }
+
+                for note in patient_notes:
+                    if note.get('appointment_id') in appointments_dict:
+                        note['appointment_date'] = appointments_dict[note.get('appointment_id')]['appointment_date']
+                        note['appointment_time'] = appointments_dict[note.get('appointment_id')]['appointment_time']
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            print(f"Patient ID: {patient_id}")
+            print(f"Patient notes count: {len(patient_notes)}")
+            if patient_notes:
+                print(f"First note: {patient_notes[0].get('note_text', '')[:50]}...")
+
+            return templates.TemplateResponse(
+                "dist/dashboard/patient_details.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "patient": patient,
+                    "treatment_plans": treatment_plans,
+                    "appointments": appointments,
+                    "metrics": metrics,
+                    "patient_notes": patient_notes,
+                    "today": today,
+                    "now": now
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in patient details: {e}")
+            print(traceback.format_exc())
+            return RedirectResponse(url="/patients")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in patient details: {e}")
+        print(traceback.format_exc())
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/patients/{patient_id}/edit")
+async def edit_patient_page(request: Request, patient_id: int, user=Depends(get_current_user)):
+    """Route to display the edit patient form"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            cursor.execute(
+                "SELECT * FROM Patients WHERE patient_id = %s AND therapist_id = %s",
+                (patient_id, session_data["user_id"])
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return RedirectResponse(url="/patients?error=not_found")
+
+            if patient['date_of_birth'] and isinstance(patient['date_of_birth'], datetime.date):
+                patient['formatted_dob'] = patient['date_of_birth'].strftime('%Y-%m-%d')
+            else:
+                patient['formatted_dob'] = None
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result['count'] if unread_count_result else 0
+
+            base_url = request.url.scheme + "://" + request.url.netloc
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(user["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/dashboard/edit_patient.html",
+                {
+                    "request": request,
+                    "therapist": therapist_data,
+                    "first_name": therapist["first_name"],
+                    "last_name": therapist["last_name"],
+                    "patient": patient,
+                    "unread_messages_count": unread_messages_count,
+                    "base_url": base_url
+                }
+            )
+        except Exception as e:
+            print(f"Database error in edit patient page: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/patients")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in edit patient page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/patients/{patient_id}/edit")
+async def update_patient(request: Request, patient_id: int, user=Depends(get_current_user)):
+    """Handle patient update form submission"""
+    session_id = request.cookies.get("session_id")
+    therapist_data = await get_therapist_data(user["user_id"])
+
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        form_data = await request.form()
+
+        first_name = form_data.get("first_name")
+        last_name = form_data.get("last_name")
+        email = form_data.get("email")
+        phone = form_data.get("phone")
+        date_of_birth = form_data.get("date_of_birth")
+        diagnosis = form_data.get("diagnosis")
+        address = form_data.get("address")
+        notes = form_data.get("notes")
+        status = form_data.get("status", "Active")
+
+        if not first_name or not last_name:
+            return RedirectResponse(
+                url=f"/patients/{patient_id}/edit?error=missing_fields",
+                status_code=303
+            )
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                """SELECT patient_id
+                    FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                print(f"Patient {patient_id} does not belong to therapist {session_data['user_id']}")
+                return RedirectResponse(url="/patients?error=unauthorized")
+
+            cursor.execute(
+                """UPDATE Patients
+                    SET first_name = %s,
+                        last_name = %s,
+                        email = %s,
+                        phone = %s,
+                        date_of_birth = %s,
+                        diagnosis = %s,
+                        address = %s,
+                        notes = %s,
+                        status = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE patient_id = %s""",
+                (
+                    first_name, last_name, email, phone,
+                    date_of_birth if date_of_birth else None,
+                    diagnosis, address, notes, status, patient_id
+                )
+            )
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+
+            return RedirectResponse(url=f"/patients/{patient_id}?success=updated", status_code=303)
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error updating patient: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url=f"/patients/{patient_id}/edit?error=db_error")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error updating patient: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/user/profile")
+async def get_user_profile(request: Request):
+    """API endpoint to get the user's profile information"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"}
+            )
+
+        user_id = session_data["user_id"]
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                "SELECT username, email, profile_pic, created_at FROM users WHERE user_id = %s",
+                (user_id,)
+            )
+            user = cursor.fetchone()
+
+            if not user:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "User not found"}
+                )
+
+
+            cursor.execute(
+                """SELECT p.*, t.first_name as therapist_first_name, t.last_name as therapist_last_name
+                    FROM Patients p
+                    LEFT JOIN Therapists t ON p.therapist_id = t.id
+                    WHERE p.user_id = %s""",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+
+            profile = {
+                "username": user['username'],
+                "email": user['email'],
+                "profilePicture": f"/static/assets/images/user/{user['profile_pic']}" if user['profile_pic'] else None,
+                "joinedDate": user['created_at'].strftime("%Y-%m-%d") if user['created_at'] else None,
+                "hasPatientProfile": patient is not None
+            }
+
+            if patient:
+                profile.update({
+                    "patientProfile": {
+                        "id": patient['patient_id'],
+                        "firstName": patient['first_name'],
+                        "lastName": patient['last_name'],
+                        "phoneNumber": patient['phone'],
+                        "dateOfBirth": patient['date_of_birth'].strftime("%Y-%m-%d") if patient['date_of_birth'] else None,
+                        "address": patient['address'],
+                        "diagnosis": patient['diagnosis'],
+                        "status": patient['status'],
+                        "therapist": {
+                            "id": patient['therapist_id'],
+                            "name": f"{patient['therapist_first_name']} {patient['therapist_last_name']}".strip() if patient['therapist_first_name'] else None
+                        }
+                    }
+                })
+
+            return profile
+
+        except Exception as e:
+            print(f"Database error in get user profile API: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in get user profile API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.put("/user/profile")
+async def update_user_profile(request: Request, profile_data: dict):
+    """API endpoint to update user profile information"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"status": "invalid", "detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"status": "invalid", "detail": "Not authenticated"}
+            )
+
+        user_id = session_data["user_id"]
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+            if 'username' in profile_data or 'email' in profile_data:
+                update_fields = []
+                params = []
+
+                if 'username' in profile_data:
+                    update_fields.append("username = %s")
+                    params.append(ensure_str(profile_data['username']))
+
+                if 'email' in profile_data:
+                    update_fields.append("email = %s")
+                    params.append(ensure_str(profile_data['email']))
+
+                params.append(user_id)
+
+                cursor.execute(
+                    f"UPDATE users SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s",
+                    params
+                )
+            patient_data = profile_data.get('patientProfile', {})
+            if patient_data:
+                cursor.execute(
+                    "SELECT patient_id FROM Patients WHERE user_id = %s",
+                    (user_id,)
+                )
+                patient = cursor.fetchone()
+
+                if patient:
+                    patient_id = patient[0]
+
+                    update_fields = []
+                    params = []
+
+                    for field, db_field in [
+                        ('firstName', 'first_name'),
+                        ('lastName', 'last_name'),
+                        ('phoneNumber', 'phone'),
+                        ('dateOfBirth', 'date_of_birth'),
+                        ('address', 'address'),
+                        ('diagnosis', 'diagnosis')
+                    ]:
+                        if field in patient_data:
+                            update_fields.append(f"{db_field} = %s")
+                            params.append(ensure_str(patient_data[field]))
+
+                    if update_fields:
+                        params.append(patient_id)
+                        cursor.execute(
+                            f"UPDATE Patients SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE patient_id = %s",
+                            params
+                        )
+                else:
+                    pass
+
+            db.commit()
+
+            return {"status": "valid", "message": "Profile updated successfully"}
+
+        except Exception as e:
+            db.rollback()
+            print(f"Database error in update user profile API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"status": "invalid", "detail": f"Error updating profile: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in update user profile API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "invalid", "detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/user/patient-profile")
+async def get_user_patient_profile(request: Request):
+    """API endpoint to get the patient profile for the current logged-in user"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"}
+            )
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+            cursor.execute(
+                "SELECT * FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Patient profile not found"}
+                )
+
+            formatted_patient = {
+                "patient_id": patient["patient_id"],
+                "therapist_id": patient["therapist_id"],
+                "first_name": patient["first_name"] or "",
+                "last_name": patient["last_name"] or "",
+                "email": patient["email"] or "",
+                "phone": patient["phone"] or "",
+                "date_of_birth": patient["date_of_birth"].isoformat() if patient["date_of_birth"] else "",
+                "address": patient["address"] or "",
+                "diagnosis": patient["diagnosis"] or "",
+                "status": patient["status"] or "Active",
+                "notes": patient["notes"] or "",
+                "created_at": patient["created_at"].isoformat() if patient["created_at"] else "",
+                "updated_at": patient["updated_at"].isoformat() if patient["updated_at"] else "",
+                "user_id": str(patient["user_id"]) if patient["user_id"] else ""
+            }
+
+            return formatted_patient
+
+        except Exception as e:
+            print(f"Database error in get user patient profile API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user patient profile API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/patients/{patient_id}/metrics")
+async def patient_metrics(request: Request, patient_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            now = datetime.datetime.now()
+            today = datetime.date.today()
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            cursor.execute(
+                """SELECT * FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return RedirectResponse(url="/patients")
+
+            cursor.execute(
+                """SELECT * FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC""",
+                (patient_id,)
+            )
+            patient_metrics = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result['count'] if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT
+                        ROUND(SUM(pain_sum) / NULLIF(SUM(pain_count), 0), 1) as avg_pain_level,
+                        ROUND(SUM(functionality_sum) / NULLIF(SUM(functionality_count), 0), 1) as avg_functionality_score,
+                        ROUND(SUM(adherence_sum) / NULLIF(SUM(adherence_count), 0), 1) as avg_adherence_rate,
+                        ROUND(SUM(recovery_sum) / NULLIF(SUM(recovery_count), 0), 1) as avg_recovery_progress
+                    FROM PatientMetricsDailyRollup
+                    WHERE patient_id = %s
+                    AND rollup_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)""",
+                (patient_id,)
+            )
+            monthly_averages = cursor.fetchone()
+
+            cursor.execute(
+                """SELECT
+                        pain_level,
+                        functionality_score,
+                        adherence_rate,
+                        recovery_progress
+                    FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC
+                    LIMIT 1, 1""",
+                (patient_id,)
+            )
+            previous_metrics = cursor.fetchone()
+
+            cursor.execute(
+                """SELECT
+                        pain_level,
+                        functionality_score,
+                        adherence_rate,
+                        recovery_progress,
+                        measurement_date
+                    FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC
+                    LIMIT 1""",
+                (patient_id,)
+            )
+            latest_metrics = cursor.fetchone()
+
+            chart_dates = []
+            pain_data = []
+            functionality_data = []
+            adherence_data = []
+            recovery_data = []
+
+            for metric in patient_metrics:
+                chart_dates.insert(0, metric['measurement_date'].strftime('%Y-%m-%d'))
+                pain_data.insert(0, metric['pain_level'])
+                functionality_data.insert(0, metric['functionality_score'])
+                adherence_data.insert(0, metric['adherence_rate'])
+                recovery_data.insert(0, metric['recovery_progress'])
+
+            trends = {}
+            if previous_metrics and latest_metrics:
+                trends = {
+                    'pain': {
+                        'change': latest_metrics['pain_level'] - previous_metrics['pain_level'] if latest_metrics['pain_level'] is not None and previous_metrics['pain_level'] is not None else 0,
+                        'direction': 'down' if latest_metrics['pain_level'] < previous_metrics['pain_level'] else 'up' if latest_metrics['pain_level'] is not None and previous_metrics['pain_level'] is not None else 'same',
+                        'color': 'success' if latest_metrics['pain_level'] < previous_metrics['pain_level'] else 'danger' if latest_metrics['pain_level'] is not None and previous_metrics['pain_level'] is not None else 'secondary'
+                    },
+                    'functionality': {
+                        'change': latest_metrics['functionality_score'] - previous_metrics['functionality_score'] if latest_metrics['functionality_score'] is not None and previous_metrics['functionality_score'] is not None else 0,
+                        'direction': 'up' if latest_metrics['functionality_score'] > previous_metrics['functionality_score'] else 'down' if latest_metrics['functionality_score'] is not None and previous_metrics['functionality_score'] is not None else 'same',
+                        'color': 'success' if latest_metrics['functionality_score'] > previous_metrics['functionality_score'] else 'danger' if latest_metrics['functionality_score'] is not None and previous_metrics['functionality_score'] is not None else 'secondary'
+                    },
+                    'adherence': {
+                        'change': latest_metrics['adherence_rate'] - previous_metrics['adherence_rate'] if latest_metrics['adherence_rate'] is not None and previous_metrics['adherence_rate'] is not None else 0,
+                        'direction': 'up' if latest_metrics['adherence_rate'] > previous_metrics['adherence_rate'] else 'down' if latest_metrics['adherence_rate'] is not None and previous_metrics['adherence_rate'] is not None else 'same',
+                        'color': 'success' if latest_metrics['adherence_rate'] > previous_metrics['adherence_rate'] else 'danger' if latest_metrics['adherence_rate'] is not None and previous_metrics['adherence_rate'] is not None else 'secondary'
+                    },
+                    'recovery': {
+                        'change': latest_metrics['recovery_progress'] - previous_metrics['recovery_progress'] if latest_metrics['recovery_progress'] is not None and previous_metrics['recovery_progress'] is not None else 0,
+                        'direction': 'up' if latest_metrics['recovery_progress'] > previous_metrics['recovery_progress'] else 'down' if latest_metrics['recovery_progress'] is not None and previous_metrics['recovery_progress'] is not None else 'same',
+                        'color': 'success' if latest_metrics['recovery_progress'] > previous_metrics['recovery_progress'] else 'danger' if latest_metrics['recovery_progress'] is not None and previous_metrics['recovery_progress'] is not None else 'secondary'
+                    }
+                }
+
+            return templates.TemplateResponse(
+                "dist/dashboard/patient_metrics.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist["first_name"],
+                    "last_name": therapist["last_name"],
+                    "unread_messages_count": unread_messages_count,
+                    "patient": patient,
+                    "patient_metrics": patient_metrics,
+                    "monthly_averages": monthly_averages,
+                    "latest_metrics": latest_metrics,
+                    "trends": trends,
+                    "chart_data": {
+                        "dates": chart_dates,
+                        "pain": pain_data,
+                        "functionality": functionality_data,
+                        "adherence": adherence_data,
+                        "recovery": recovery_data
+                    },
+                    "today": today,
+                    "now": now
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in patient metrics: {e}")
+            print(traceback.format_exc())
+            return RedirectResponse(url=f"/patients/{patient_id}")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in patient metrics: {e}")
+        print(traceback.format_exc())
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/patients/{patient_id}/general-note")
+async def update_patient_general_note(request: Request, patient_id: int, notes: str = Form(...)):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT patient_id FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                return RedirectResponse(url="/patients")
+
+            cursor.execute(
+                """UPDATE Patients
+                    SET notes = %s
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (notes, patient_id, session_data["user_id"])
+            )
+
+            db.commit()
+
+            return RedirectResponse(url=f"/patients/{patient_id}", status_code=303)
+
+        except Exception as e:
+            print(f"Database error updating patient general note: {e}")
+            db.rollback()
+            return RedirectResponse(url=f"/patients/{patient_id}")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error updating patient general note: {e}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/patients/{patient_id}/metrics")
+async def add_patient_metrics_legacy(
+    request: Request,
+    patient_id: int,
+    metric_type: str = Form(...),
+    value: str = Form(...),
+    unit: Optional[str] = Form(None),
+    measurement_date: str = Form(...),
+    notes: Optional[str] = Form(None)
+):
+    """
+        Legacy route handler to support the existing form in patient details.
+        This converts the old metric format to the new PatientMetrics table format.
+        """
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT patient_id FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                return RedirectResponse(url="/patients")
+
+            pain_level = None
+            functionality_score = None
+            adherence_rate = None
+            recovery_progress = None
+
+            try:
+                metric_value = float(value)
+
+                if metric_type == "pain_level":
+                    pain_level = min(10, max(0, int(metric_value)))
+                elif metric_type == "range_of_motion":
+                    functionality_score = min(100, max(0, int(metric_value)))
+                elif metric_type == "heart_rate" or metric_type == "blood_pressure" or metric_type == "weight":
+
+
+                    notes = f"{metric_type}: {value} {unit or ''}" + (f"\n{notes}" if notes else "")
+
+                else:
+                    notes = f"{metric_type}: {value} {unit or ''}" + (f"\n{notes}" if notes else "")
+            except ValueError:
+
+                notes = f"{metric_type}: {value} {unit or ''}" + (f"\n{notes}" if notes else "")
+
+
+            cursor.execute(
+                """INSERT INTO PatientMetrics
+                    (patient_id, therapist_id, measurement_date, pain_level,
+                    functionality_score, adherence_rate, recovery_progress, notes)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                (
+                    patient_id,
+                    session_data["user_id"],
+                    measurement_date,
+                    pain_level,
+                    functionality_score,
+                    adherence_rate,
+                    recovery_progress,
+                    notes
+                )
+            )
+            refresh_patient_metrics_rollup(cursor, patient_id, measurement_date)
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+
+            return RedirectResponse(url=f"/patients/{patient_id}", status_code=303)
+
+        except Exception as e:
+            print(f"Database error in adding patient metrics: {e}")
+            return RedirectResponse(url=f"/patients/{patient_id}")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in adding patient metrics: {e}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/patients/{patient_id}/notes")
+async def patient_notes(request: Request, patient_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+
+            cursor.execute(
+                """SELECT * FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return RedirectResponse(url="/patients")
+
+            cursor.execute(
+                """SELECT
+                        pn.note_id,
+                        pn.patient_id,
+                        pn.therapist_id,
+                        pn.appointment_id,
+                        pn.note_text,
+                        pn.created_at,
+                        pn.updated_at,
+                        t.first_name,
+                        t.last_name
+                    FROM PatientNotes pn
+                    LEFT JOIN Therapists t ON pn.therapist_id = t.id
+                    WHERE pn.patient_id = %s
+                    ORDER BY pn.created_at DESC""",
+                (patient_id,)
+            )
+
+            patient_notes_raw = cursor.fetchall()
+            patient_notes = []
+
+
+            for note in patient_notes_raw:
+
+                processed_note = {}
+
+
+                for key, value in note.items():
+
+                    if isinstance(value, datetime.datetime):
+                        processed_note[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+                    elif isinstance(value, datetime.date):
+                        processed_note[key] = value.strftime('%Y-%m-%d')
+                    elif isinstance(value, datetime.timedelta):
+                        total_seconds = int(value.total_seconds())
+                        hours, remainder = divmod(total_seconds, 3600)
+                        minutes, seconds = divmod(remainder, 60)
+                        processed_note[key] = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        processed_note[key] = value
+
+
+                patient_notes.append(processed_note)
+
+            appointment_ids = [note['appointment_id'] for note in patient_notes
+                            if note.get('appointment_id') is not None]
+
+            if appointment_ids:
+
+                placeholders = ', '.join(['%s'] * len(appointment_ids))
+                cursor.execute(
+                    f"""SELECT
+                            appointment_id,
+                            appointment_date,
+                            appointment_time
+                        FROM Appointments
+                        WHERE appointment_id IN ({placeholders})""",
+                    tuple(appointment_ids)
+                )
+
+                appointments_data = cursor.fetchall()
+                appointments_dict = {}
+
+                for appt in appointments_data:
+                    appt_date = appt['appointment_date']
+                    appt_time = appt['appointment_time']
+
+
+                    if isinstance(appt_date, (datetime.date, datetime.datetime)):
+                        date_str = appt_date.strftime('%Y-%m-%d')
+                    else:
+                        date_str = str(appt_date)
+
+                    if isinstance(appt_time, datetime.timedelta):
+                        total_seconds = int(appt_time.total_seconds())
+                        hours, remainder = divmod(total_seconds, 3600)
+                        minutes, seconds = divmod(remainder, 60)
+                        time_str = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        time_str = str(appt_time)
+
+                    appointments_dict[appt['appointment_id']] = {
+                        'appointment_date': date_str,
+                        'appointment_time': time_str
+                    }
+
+
+                for note in patient_notes:
+                    if note.get('appointment_id') in appointments_dict:
+                        note['appointment_date'] = appointments_dict[note['appointment_id']]['appointment_date']
+                        note['appointment_time'] = appointments_dict[note['appointment_id']]['appointment_time']
+
+
+            cursor.execute(
+                """SELECT * FROM Appointments
+                    WHERE patient_id = %s AND therapist_id = %s
+                    ORDER BY appointment_date DESC, appointment_time DESC""",
+                (patient_id, session_data["user_id"])
+            )
+
+            appointments_raw = cursor.fetchall()
+            appointments = []
+
+            for appt in appointments_raw:
+                processed_appt = {}
+
+                for key, value in appt.items():
+                    if isinstance(value, datetime.datetime):
+                        processed_appt[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+                    elif isinstance(value, datetime.date):
+                        processed_appt[key] = value.strftime('%Y-%m-%d')
+                    elif isinstance(value, datetime.timedelta):
+                        total_seconds = int(value.total_seconds())
+                        hours, remainder = divmod(total_seconds, 3600)
+                        minutes, seconds = divmod(remainder, 60)
+                        processed_appt[key] = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        processed_appt[key] = value
+
+                appointments.append(processed_appt)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result['count'] if unread_count_result else 0
+
+
+            print("Formatted patient notes:")
+            if patient_notes and len(patient_notes) > 0:
+                sample_note = patient_notes[0]
+                for key, value in sample_note.items():
+                    print(f"{key}: {type(value).__name__} = {value}")
+
+            return templates.TemplateResponse(
+                "dist/dashboard/patient_notes.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist["first_name"],
+                    "last_name": therapist["last_name"],
+                    "unread_messages_count": unread_messages_count,
+                    "patient": patient,
+                    "patient_notes": patient_notes,
+                    "appointments": appointments
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in patient notes: {e}")
+            print(traceback.format_exc())
+            return RedirectResponse(url=f"/patients/{patient_id}")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in patient notes: {e}")
+        print(traceback.format_exc())
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/patients/{patient_id}/notes")
+async def add_patient_note(request: Request, patient_id: int,
+                        note_text: str = Form(...),
+                        appointment_id: Optional[int] = Form(None)):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT patient_id FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                return RedirectResponse(url="/patients")
+
+
+            cursor.execute(
+                """INSERT INTO PatientNotes (patient_id, therapist_id, appointment_id, note_text)
+                    VALUES (%s, %s, %s, %s)""",
+                (patient_id, session_data["user_id"], appointment_id, note_text)
+            )
+
+            db.commit()
+
+
+            return RedirectResponse(url=f"/patients/{patient_id}", status_code=303)
+
+        except Exception as e:
+            print(f"Database error in adding patient note: {e}")
+
+            return RedirectResponse(url=f"/patients/{patient_id}")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in adding patient note: {e}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/patients/{patient_id}/metrics/add")
+async def add_patient_metrics(
+    request: Request,
+    patient_id: int,
+    measurement_date: str = Form(...),
+    pain_level: int = Form(...),
+    functionality_score: int = Form(...),
+    adherence_rate: float = Form(...),
+    recovery_progress: float = Form(...),
+    notes: Optional[str] = Form(None)
+):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT patient_id FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, session_data["user_id"])
+            )
+
+            if not cursor.fetchone():
+                return RedirectResponse(url="/patients")
+
+            cursor.execute(
+                """INSERT INTO PatientMetrics
+                    (patient_id, therapist_id, measurement_date, pain_level,
+                    functionality_score, adherence_rate, recovery_progress, notes)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                (
+                    patient_id,
+                    session_data["user_id"],
+                    measurement_date,
+                    pain_level,
+                    functionality_score,
+                    adherence_rate,
+                    recovery_progress,
+                    notes
+                )
+            )
+            refresh_patient_metrics_rollup(cursor, patient_id, measurement_date)
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+
+            return RedirectResponse(url=f"/patients/{patient_id}/metrics", status_code=303)
+
+        except Exception as e:
+            print(f"Database error in adding patient metrics: {e}")
+            return RedirectResponse(url=f"/patients/{patient_id}/metrics")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in adding patient metrics: {e}")
+        return RedirectResponse(url="/Therapist_Login")
@@ -0,0 +1,62 @@
+"""
+Merge the domain routers into the app's route table, refusing registrations
+that can never be served.
+
+Starlette matches routes in registration order and the first full match wins, so
+a second registration of the same method and path (even with differently named
+parameters) is never reached, yet every request for a later route still walks
+past it. A path without a leading "/" never matches at all. build_route_table()
+raises RouteTableError listing every such registration, before any route is added.
+"""
+import re
+
+PATH_PARAM = re.compile(r"{[^}:]+(:[^}]+)?}")
+
+
+class RouteTableError(Exception):
+    pass
+
+
+def route_signature(path):
+    """/patients/{patient_id} and /patients/{id} match the same requests."""
+    return PATH_PARAM.sub(lambda m: "{" + (m.group(1) or "") + "}", path)
+
+
+def route_origin(route):
+    endpoint = getattr(route, "endpoint", None)
+    if endpoint is None:
+        return repr(route)
+    return f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+
+def check_route_table(routers):
+    registered = {}
+    problems = []
+    for router in routers:
+        for route in router.routes:
+            path = getattr(route, "path", "")
+            if not path.startswith("/"):
+                problems.append(f"{path!r} from {route_origin(route)} does not start with '/'")
+                continue
+            for method in sorted(getattr(route, "methods", None) or ()):
+                key = (method, route_signature(path))
+                if key in registered:
+                    problems.append(
+                        f"{method} {path} from {route_origin(route)} duplicates "
+                        f"{registered[key].path} from {route_origin(registered[key])}"
+                    )
+                else:
+                    registered[key] = route
+    if problems:
+        raise RouteTableError("Invalid route table:\n  " + "\n  ".join(problems))
+
+
+def build_route_table(app, routers):
+    """
+    Add the routers' routes to app in order. Each router is included straight into
+    the app rather than through an intermediate router, since include_router()
+    rebuilds every route (dependency graph and all) each time.
+    """
+    check_route_table(routers)
+    for router in routers:
+        app.include_router(router)
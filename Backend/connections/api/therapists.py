@@ -0,0 +1,1389 @@
+"""
+Therapist profiles, reviews, the therapist directory and availability.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/profile")
+async def view_profile(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, company_email, profile_image,
+                            bio, experience_years, specialties, education, languages,
+                            address, rating, review_count,
+                            is_accepting_new_patients, average_session_length
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            for field in ['specialties', 'education', 'languages']:
+                if therapist.get(field):
+                    therapist[field] = safely_parse_json_field(therapist[field])
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            cursor.execute(
+                """SELECT patient_id, first_name, last_name, diagnosis, status
+                    FROM Patients
+                    WHERE therapist_id = %s
+                    ORDER BY created_at DESC
+                    LIMIT 5""",
+                (session_data["user_id"],)
+            )
+            recent_patients = cursor.fetchall()
+
+            clean_patients = []
+            for patient in recent_patients:
+                clean_patient = {}
+                for key, value in patient.items():
+                    if isinstance(value, bytes):
+                        clean_patient[key] = value.decode('utf-8')
+                    else:
+                        clean_patient[key] = value
+                clean_patients.append(clean_patient)
+
+            recent_patients = clean_patients
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Patients WHERE therapist_id = %s",
+                (session_data["user_id"],)
+            )
+            total_patients_result = cursor.fetchone()
+            total_patients = total_patients_result.get('count', 0) if total_patients_result else 0
+
+            cursor.execute(
+                """SELECT AVG(rating) as average_rating, COUNT(*) as review_count
+                    FROM Reviews
+                    WHERE therapist_id = %s""",
+                (session_data["user_id"],)
+            )
+            reviews_summary = cursor.fetchone()
+            if reviews_summary and reviews_summary.get('average_rating'):
+                average_rating = round(reviews_summary.get('average_rating', 0), 1)
+                review_count = reviews_summary.get('review_count', 0)
+            else:
+                average_rating = 0
+                review_count = 0
+
+            cursor.execute(
+                """SELECT r.review_id, r.rating, r.comment, r.created_at,
+                            p.first_name, p.last_name
+                    FROM Reviews r
+                    JOIN Patients p ON r.patient_id = p.patient_id
+                    WHERE r.therapist_id = %s
+                    ORDER BY r.created_at DESC
+                    LIMIT 3""",
+                (session_data["user_id"],)
+            )
+            recent_reviews = cursor.fetchall()
+
+            clean_reviews = []
+            for review in recent_reviews:
+                clean_review = {}
+                for key, value in review.items():
+                    if isinstance(value, bytes):
+                        clean_review[key] = value.decode('utf-8')
+                    else:
+                        clean_review[key] = value
+                clean_reviews.append(clean_review)
+
+            recent_reviews = clean_reviews
+
+            clean_therapist = {}
+            for key, value in therapist.items():
+                if isinstance(value, bytes):
+                    clean_therapist[key] = value.decode('utf-8')
+                else:
+                    clean_therapist[key] = value
+
+            therapist = clean_therapist
+
+            return templates.TemplateResponse(
+                "dist/dashboard/therapist_profile.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "recent_patients": recent_patients,
+                    "total_patients": total_patients,
+                    "average_rating": average_rating,
+                    "review_count": review_count,
+                    "recent_reviews": recent_reviews,
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in profile view: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in profile view: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/api/therapist/{therapist_id}")
+async def get_therapist_api(therapist_id: int):
+    """API endpoint to get therapist information"""
+    db = await get_Mysql_db_async()
+    cursor = db.cursor()
+
+    try:
+        cursor.execute(
+            """SELECT id, first_name, last_name, profile_image,
+                        bio, experience_years, specialties, education, languages,
+                        address, rating, review_count,
+                        is_accepting_new_patients, average_session_length
+                FROM Therapists
+                WHERE id = %s""",
+            (therapist_id,)
+        )
+        therapist = cursor.fetchone()
+
+        if not therapist:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "Therapist not found"}
+            )
+
+
+        for field in ['specialties', 'education', 'languages']:
+            if therapist[field] and isinstance(therapist[field], str):
+                try:
+                    therapist[field] = json.loads(therapist[field])
+                except:
+                    therapist[field] = []
+            elif therapist[field] is None:
+                therapist[field] = []
+
+
+        response_data = {
+            "id": therapist["id"],
+            "name": f"{therapist['first_name']} {therapist['last_name']}",
+            "photoUrl": f"/static/assets/images/user/{therapist['profile_image']}",
+            "specialties": therapist["specialties"],
+            "bio": therapist["bio"] or "",
+            "experienceYears": therapist["experience_years"] or 0,
+            "education": therapist["education"],
+            "languages": therapist["languages"],
+            "address": therapist["address"] or "",
+            "rating": therapist["rating"] or 0,
+            "reviewCount": therapist["review_count"] or 0,
+            "isAcceptingNewPatients": bool(therapist["is_accepting_new_patients"]),
+            "averageSessionLength": therapist["average_session_length"] or 60
+        }
+
+        return response_data
+
+    except Exception as e:
+        print(f"Database error in get therapist API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Internal server error: {str(e)}"}
+        )
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/profile/edit")
+async def edit_profile_form(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, company_email, profile_image,
+                            bio, experience_years, specialties, education, languages,
+                            address, rating, review_count,
+                            is_accepting_new_patients, average_session_length
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            clean_therapist = {}
+            for key, value in therapist.items():
+                if isinstance(value, bytes):
+                    clean_therapist[key] = value.decode('utf-8')
+                else:
+                    clean_therapist[key] = value
+
+            therapist = clean_therapist
+
+            for field in ['specialties', 'education', 'languages']:
+                if therapist.get(field):
+                    therapist[field] = safely_parse_json_field(therapist[field])
+                else:
+                    therapist[field] = []
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            all_specialties = get_all_specialties()
+            existing_specialties = therapist.get("specialties", [])
+
+            return templates.TemplateResponse(
+                "dist/dashboard/therapist_edit_profile.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "all_specialties": all_specialties,
+                    "existing_specialties": existing_specialties
+                }
+            )
+        except Exception as e:
+            print(f"Database error in edit profile form: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in edit profile form: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/profile/update2")
+async def update_profile_v2(request: Request):
+    """
+        A completely new implementation of profile update using only the Request object.
+        This approach eliminates any potential conflict with FastAPI's Form dependencies.
+        """
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login", status_code=303)
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login", status_code=303)
+        form_data = await request.form()
+        profile_data = {
+            "first_name": ensure_str(form_data.get("first_name", "")),
+            "last_name": ensure_str(form_data.get("last_name", "")),
+            "company_email": ensure_str(form_data.get("company_email", "")),
+            "bio": ensure_str(form_data.get("bio", "")),
+            "address": ensure_str(form_data.get("address", ""))
+        }
+        try:
+            profile_data["experience_years"] = int(form_data.get("experience_years", "0"))
+        except ValueError:
+            profile_data["experience_years"] = 0
+
+        try:
+            profile_data["rating"] = float(form_data.get("rating", "0"))
+        except ValueError:
+            profile_data["rating"] = 0
+
+        try:
+            profile_data["review_count"] = int(form_data.get("review_count", "0"))
+        except ValueError:
+            profile_data["review_count"] = 0
+
+        try:
+            profile_data["average_session_length"] = int(form_data.get("average_session_length", "60"))
+        except ValueError:
+            profile_data["average_session_length"] = 60
+        profile_data["is_accepting_new_patients"] = form_data.get("is_accepting_new_patients") == "1"
+
+        specialties = []
+        for key, value in form_data.items():
+            if key == "specialties":
+                specialties.append(value)
+        profile_data["specialties"] = json.dumps(specialties)
+
+        education = []
+        for key, value in form_data.items():
+            if key == "education":
+                education.append(value)
+        profile_data["education"] = json.dumps(education)
+
+        languages = []
+        for key, value in form_data.items():
+            if key == "languages":
+                languages.append(value)
+        profile_data["languages"] = json.dumps(languages)
+
+        profile_image_filename = None
+        profile_image = form_data.get("profile_image")
+        if profile_image and hasattr(profile_image, "filename") and profile_image.filename:
+            try:
+                contents = await profile_image.read()
+                if contents and len(contents) > 0:
+                    contents = ensure_bytes(contents)
+                    file_extension = profile_image.filename.split(".")[-1].lower()
+                    allowed_extensions = ["jpg", "jpeg", "png", "gif"]
+
+                    if file_extension in allowed_extensions:
+                        profile_image_filename = f"therapist_{session_data['user_id']}_{int(time.time())}.{file_extension}"
+                        current_file = FilePath(__file__).resolve()
+                        project_root = current_file.parent.parent.parent
+                        uploads_dir = project_root / "Frontend_Web" / "static" / "assets" / "images" / "user"
+                        uploads_dir.mkdir(parents=True, exist_ok=True)
+                        file_path = uploads_dir / profile_image_filename
+                        with open(file_path, "wb") as f:
+                            f.write(contents)
+
+                        print(f"Profile image saved: {profile_image_filename}")
+                        print(f"File path: {file_path}")
+                    else:
+                        print(f"Invalid file extension: {file_extension}")
+                else:
+                    print("Empty file content")
+            except Exception as img_error:
+                print(f"Error processing image: {img_error}")
+                print(f"Traceback: {traceback.format_exc()}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            update_fields = []
+            params = []
+            for field in profile_data:
+                update_fields.append(f"{field} = %s")
+                params.append(profile_data[field])
+            if profile_image_filename:
+                update_fields.append("profile_image = %s")
+                params.append(profile_image_filename)
+            params.append(session_data["user_id"])
+            query = f"UPDATE Therapists SET {', '.join(update_fields)} WHERE id = %s"
+            cursor.execute(query, params)
+            db.commit()
+            print("Profile updated successfully")
+            return RedirectResponse(url="/profile", status_code=303)
+        except Exception as db_error:
+            print(f"Database error: {db_error}")
+            print(f"Traceback: {traceback.format_exc()}")
+            if db:
+                db.rollback()
+            return RedirectResponse(url="/profile/edit", status_code=303)
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Unexpected error in profile update: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login", status_code=303)
+
+
+def get_all_specialties():
+    """Return list of all specialties"""
+    return [
+        "Orthopedic Physical Therapy",
+        "Neurological Physical Therapy",
+        "Cardiovascular & Pulmonary Physical Therapy",
+        "Pediatric Physical Therapy",
+        "Geriatric Physical Therapy",
+        "Sports Physical Therapy",
+        "Women's Health Physical Therapy",
+        "Manual Therapy",
+        "Vestibular Rehabilitation",
+        "Post-Surgical Rehabilitation",
+        "Pain Management"
+    ]
+
+
+@router.get("/api/therapist/{therapist_id}/reviews")
+async def get_therapist_reviews(therapist_id: int, limit: int = 10, offset: int = 0):
+    """API endpoint to get therapist reviews"""
+    db = await get_Mysql_db_async()
+    cursor = db.cursor()
+
+    try:
+
+        cursor.execute(
+            """SELECT r.review_id, r.rating, r.comment, r.created_at,
+                         p.patient_id, p.first_name, p.last_name
+                   FROM Reviews r
+                   JOIN Patients p ON r.patient_id = p.patient_id
+                   WHERE r.therapist_id = %s
+                   ORDER BY r.created_at DESC
+                   LIMIT %s OFFSET %s""",
+            (therapist_id, limit, offset)
+        )
+        reviews = cursor.fetchall()
+
+
+        cursor.execute(
+            """SELECT COUNT(*) as total, AVG(rating) as average_rating
+                   FROM Reviews
+                   WHERE therapist_id = %s""",
+            (therapist_id,)
+        )
+        stats = cursor.fetchone()
+
+
+        formatted_reviews = []
+        for review in reviews:
+            formatted_reviews.append({
+                "id": review["review_id"],
+                "rating": review["rating"],
+                "comment": review["comment"],
+                "createdAt": review["created_at"].isoformat(),
+                "patient": {
+                    "id": review["patient_id"],
+                    "name": f"{review['first_name']} {review['last_name']}"
+                }
+            })
+
+        return {
+            "reviews": formatted_reviews,
+            "totalReviews": stats["total"] or 0,
+            "averageRating": float(stats["average_rating"]) if stats["average_rating"] else 0,
+            "limit": limit,
+            "offset": offset
+        }
+
+    except Exception as e:
+        print(f"Database error in get therapist reviews API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Internal server error: {str(e)}"}
+        )
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.post("/api/therapist/reviews")
+async def create_therapist_review(
+    request: Request,
+    therapist_id: int = Form(...),
+    patient_id: int = Form(...),
+    rating: float = Form(...),
+    comment: str = Form(None)
+):
+    """API endpoint to create a review for a therapist"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"error": "Not authenticated"}
+            )
+
+
+
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT review_id FROM Reviews
+                       WHERE therapist_id = %s AND patient_id = %s""",
+                (therapist_id, patient_id)
+            )
+            existing_review = cursor.fetchone()
+
+            if existing_review:
+
+                cursor.execute(
+                    """UPDATE Reviews
+                           SET rating = %s, comment = %s, updated_at = NOW()
+                           WHERE therapist_id = %s AND patient_id = %s""",
+                    (rating, comment, therapist_id, patient_id)
+                )
+                db.commit()
+
+                return {"message": "Review updated successfully", "review_id": existing_review[0]}
+            else:
+
+                cursor.execute(
+                    """INSERT INTO Reviews (therapist_id, patient_id, rating, comment)
+                           VALUES (%s, %s, %s, %s)""",
+                    (therapist_id, patient_id, rating, comment)
+                )
+                db.commit()
+
+                return {"message": "Review created successfully", "review_id": cursor.lastrowid}
+
+        except Exception as e:
+            db.rollback()
+            print(f"Database error in create review: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": f"Error submitting review: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in create review: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error processing request: {str(e)}"}
+        )
+
+
+@router.get("/profile/reviews")
+async def therapist_reviews(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, company_email, profile_image,
+                    rating, review_count
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            clean_therapist = {}
+            for key, value in therapist.items():
+                if isinstance(value, bytes):
+                    clean_therapist[key] = value.decode('utf-8')
+                else:
+                    clean_therapist[key] = value
+
+            therapist = clean_therapist
+
+            cursor.execute(
+                """SELECT r.review_id, r.rating, r.comment, r.created_at,
+                    p.patient_id, p.first_name, p.last_name
+                    FROM Reviews r
+                    JOIN Patients p ON r.patient_id = p.patient_id
+                    WHERE r.therapist_id = %s
+                    ORDER BY r.created_at DESC""",
+                (session_data["user_id"],)
+            )
+            reviews_results = cursor.fetchall()
+
+            reviews = []
+            for review in reviews_results:
+                clean_review = {}
+                for key, value in review.items():
+                    if isinstance(value, bytes):
+                        clean_review[key] = value.decode('utf-8')
+                    else:
+                        clean_review[key] = value
+                reviews.append(clean_review)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            for review in reviews:
+                if isinstance(review.get('created_at'), datetime.datetime):
+                    review['formatted_date'] = review['created_at'].strftime('%B %d, %Y')
+                else:
+                    review['formatted_date'] = "Unknown date"
+
+            rating_distribution = {
+                5: 0,
+                4: 0,
+                3: 0,
+                2: 0,
+                1: 0
+            }
+
+            for review in reviews:
+                rating = int(review.get('rating', 0))
+                if rating < 1:
+                    rating = 1
+                elif rating > 5:
+                    rating = 5
+                rating_distribution[rating] += 1
+
+            total_reviews = len(reviews)
+            rating_percentages = {}
+            for rating, count in rating_distribution.items():
+                if total_reviews > 0:
+                    rating_percentages[rating] = (count / total_reviews) * 100
+                else:
+                    rating_percentages[rating] = 0
+
+            return templates.TemplateResponse(
+                "dist/dashboard/Therapist_reviews.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "reviews": reviews,
+                    "rating_distribution": rating_distribution,
+                    "rating_percentages": rating_percentages,
+                    "total_reviews": total_reviews
+                }
+            )
+        except Exception as e:
+            print(f"Database error in therapist reviews: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/profile")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in therapist reviews: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/api/reviews/{review_id}/reply")
+async def reply_to_review(
+    request: Request,
+    review_id: int,
+    reply: str = Form(...)
+):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"success": False, "message": "Not authenticated"})
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                """SELECT review_id
+                       FROM Reviews
+                       WHERE review_id = %s AND therapist_id = %s""",
+                (review_id, session_data["user_id"])
+            )
+            review = cursor.fetchone()
+
+            if not review:
+                return JSONResponse(status_code=404, content={"success": False, "message": "Review not found"})
+
+
+            cursor.execute(
+                """UPDATE Reviews
+                       SET therapist_reply = %s,
+                           therapist_reply_date = CURRENT_TIMESTAMP
+                       WHERE review_id = %s""",
+                (reply, review_id)
+            )
+            db.commit()
+
+            return JSONResponse(content={"success": True})
+
+        except Exception as e:
+            print(f"Database error in reply to review: {e}")
+            return JSONResponse(status_code=500, content={"success": False, "message": "Error replying to review"})
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in reply to review: {e}")
+        return JSONResponse(status_code=500, content={"success": False, "message": "Server error"})
+
+
+@router.get("/therapists")
+async def get_therapists():
+    """API endpoint to get a list of all therapists for the mobile app"""
+    import traceback
+
+    try:
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image,
+                            specialties, address, rating, review_count,
+                            is_accepting_new_patients
+                    FROM Therapists
+                    WHERE is_accepting_new_patients = TRUE
+                    ORDER BY rating DESC, review_count DESC"""
+            )
+            therapists = cursor.fetchall()
+
+            base_url = app.state.base_url
+            static_dir = getattr(app.state, 'static_directory', "/PERCEPTRONX/Frontend_Web/static")
+
+            print(f"Using base URL: {base_url}")
+
+            formatted_therapists = []
+            for therapist in therapists:
+                specialties = safely_parse_json_field(therapist.get('specialties'), [])
+
+                profile_image = therapist.get('profile_image')
+                matched_image = find_best_matching_image(
+                    therapist.get("id"),
+                    profile_image,
+                    static_dir
+                )
+
+                photoUrl = f"/static/assets/images/user/{matched_image}"
+
+                print(f"Therapist ID: {therapist.get('id')}, Original Image: {profile_image}, Matched: {matched_image}, URL: {photoUrl}")
+
+                formatted_therapists.append({
+                    "id": therapist.get("id"),
+                    "name": f"{therapist.get('first_name', '')} {therapist.get('last_name', '')}",
+                    "photoUrl": photoUrl,
+                    "specialties": specialties,
+                    "location": therapist.get("address") or "Location not provided",
+                    "rating": float(therapist.get("rating", 0) or 0),
+                    "reviewCount": therapist.get("review_count", 0) or 0,
+                    "distance": 0.0,
+                    "nextAvailable": "Today"
+                })
+
+            return formatted_therapists
+
+        except Exception as e:
+            print(f"Database error in get therapists API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in get therapists API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/therapists/{id}")
+async def get_therapist_details(id: int):
+    import traceback
+
+    try:
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+            print(f"Looking up therapist with ID: {id}")
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image,
+                            bio, experience_years, specialties, education, languages,
+                            address, rating, review_count,
+                            is_accepting_new_patients, average_session_length
+                    FROM Therapists
+                    WHERE id = %s""",
+                (id,)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                print(f"No therapist found with ID: {id}")
+                return JSONResponse(
+                    status_code=404,
+                    content={"error": "Therapist not found"}
+                )
+
+            first_name = therapist.get('first_name', "")
+            last_name = therapist.get('last_name', "")
+
+            print(f"Therapist found: {first_name} {last_name}")
+
+            for field in ['specialties', 'education', 'languages']:
+                therapist[field] = safely_parse_json_field(therapist.get(field), [])
+
+            static_dir = getattr(app.state, 'static_directory', "/PERCEPTRONX/Frontend_Web/static")
+            profile_image = therapist.get('profile_image')
+            matched_image = find_best_matching_image(id, profile_image, static_dir)
+            photoUrl = f"/static/assets/images/user/{matched_image}"
+            print(f"Therapist detail ID: {id}, Original Image: {profile_image}, Matched: {matched_image}, URL: {photoUrl}")
+
+            formatted_therapist = {
+                "id": therapist.get("id"),
+                "first_name": first_name,
+                "last_name": last_name,
+                "name": f"{first_name} {last_name}",
+                "photoUrl": photoUrl,
+                "profile_image": matched_image,
+                "specialties": therapist.get("specialties", []),
+                "bio": therapist.get("bio", "") or "",
+                "experienceYears": therapist.get("experience_years", 0) or 0,
+                "experience_years": therapist.get("experience_years", 0) or 0,
+                "education": therapist.get("education", []),
+                "languages": therapist.get("languages", []),
+                "address": therapist.get("address", "") or "",
+                "rating": float(therapist.get("rating", 0) or 0),
+                "reviewCount": therapist.get("review_count", 0) or 0,
+                "review_count": therapist.get("review_count", 0) or 0,
+                "isAcceptingNewPatients": bool(therapist.get("is_accepting_new_patients", False)),
+                "is_accepting_new_patients": bool(therapist.get("is_accepting_new_patients", False)),
+                "averageSessionLength": therapist.get("average_session_length", 60) or 60,
+                "average_session_length": therapist.get("average_session_length", 60) or 60
+            }
+
+            print(f"Formatted therapist: {formatted_therapist}")
+            return formatted_therapist
+        except Exception as e:
+            print(f"Database error in get therapist details API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in get therapist details API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Server error: {str(e)}"}
+        )
+
+
+def convert_mysql_time_to_time(mysql_time):
+    """Convert MySQL TIME (timedelta) to datetime.time"""
+    if isinstance(mysql_time, datetime.timedelta):
+        return (datetime.datetime.min + mysql_time).time()
+    return mysql_time
+
+
+@router.get("/therapists/{id}/availability")
+async def get_therapist_availability(id: int, date: str = None):
+    """API endpoint to get available time slots for a therapist"""
+    import traceback
+
+    try:
+        if not date:
+            date = datetime.datetime.now().strftime("%Y-%m-%d")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute(
+                "SELECT id, average_session_length FROM Therapists WHERE id = %s",
+                (id,)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return JSONResponse(
+                    status_code=404,
+                    content={"error": "Therapist not found"}
+                )
+
+            cursor.execute(
+                """SELECT appointment_time, duration
+                    FROM Appointments
+                    WHERE therapist_id = %s AND appointment_date = %s
+                    AND status != 'Cancelled'""",
+                (id, date)
+            )
+            booked_slots = cursor.fetchall()
+
+            start_hour = 9
+            end_hour = 17
+
+            slot_duration = therapist.get('average_session_length', 60) or 60
+
+            available_slots = []
+            current_time = datetime.time(start_hour, 0)
+            end_time = datetime.time(end_hour, 0)
+
+            slot_id = 1
+            while current_time < end_time:
+                slot_end = (datetime.datetime.combine(datetime.date.today(), current_time) +
+                            datetime.timedelta(minutes=slot_duration)).time()
+
+                is_available = True
+                for booked in booked_slots:
+                    booked_start = convert_mysql_time_to_time(booked.get('appointment_time'))
+                    booked_end_dt = (datetime.datetime.combine(datetime.date.today(), booked_start) +
+                                    datetime.timedelta(minutes=booked.get('duration', 60)))
+                    booked_end = booked_end_dt.time()
+
+                    if (current_time < booked_end and slot_end > booked_start):
+                        is_available = False
+                        break
+
+                formatted_time = current_time.strftime("%I:%M %p")
+
+                available_slots.append({
+                    "id": slot_id,
+                    "date": date,
+                    "time": formatted_time,
+                    "isAvailable": is_available
+                })
+
+                slot_id += 1
+
+                current_time_dt = datetime.datetime.combine(datetime.date.today(), current_time)
+                current_time_dt += datetime.timedelta(minutes=30)
+                current_time = current_time_dt.time()
+
+            return available_slots
+
+        except Exception as e:
+            print(f"Database error in get therapist availability API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"error": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in get therapist availability API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/therapists/{id}/add_patient")
+async def add_patient_to_therapist(request: Request, id: int, patient: dict):
+    """API endpoint to add a user as a patient to a therapist"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"status": "invalid", "detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"status": "invalid", "detail": "Not authenticated"}
+            )
+
+        user_id = session_data["user_id"]
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                "SELECT id FROM Therapists WHERE id = %s",
+                (id,)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return JSONResponse(
+                    status_code=404,
+                    content={"status": "invalid", "detail": "Therapist not found"}
+                )
+
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            existing_patient = cursor.fetchone()
+
+            if existing_patient:
+
+                cursor.execute(
+                    """UPDATE Patients
+                        SET therapist_id = %s,
+                            first_name = %s,
+                            last_name = %s,
+                            phone = %s,
+                            diagnosis = %s,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE user_id = %s""",
+                    (id, patient.get('first_name', ''), patient.get('last_name', ''),
+                    patient.get('phone', ''), patient.get('diagnosis', ''), user_id)
+                )
+            else:
+
+                cursor.execute(
+                    "SELECT email FROM users WHERE user_id = %s",
+                    (user_id,)
+                )
+                user_email = cursor.fetchone()
+                email = user_email[0] if user_email else ''
+
+
+                cursor.execute(
+                    """INSERT INTO Patients
+                        (therapist_id, user_id, first_name, last_name, email, phone, diagnosis)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    (id, user_id, patient.get('first_name', ''), patient.get('last_name', ''),
+                    email, patient.get('phone', ''), patient.get('diagnosis', ''))
+                )
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(id)
+
+            return {"status": "valid", "message": "Patient added successfully"}
+
+        except Exception as e:
+            db.rollback()
+            print(f"Database error in add patient API: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"status": "invalid", "detail": f"Error adding patient: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in add patient API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "invalid", "detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/therapists/{id}/rate")
+async def rate_therapist(request: Request, id: int, rating: dict):
+    """API endpoint to rate a therapist"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"status": "invalid", "detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"status": "invalid", "detail": "Not authenticated"}
+            )
+
+        user_id = session_data["user_id"]
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor()
+
+        try:
+
+            cursor.execute(
+                "SELECT id FROM Therapists WHERE id = %s",
+                (id,)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return JSONResponse(
+                    status_code=404,
+                    content={"status": "invalid", "detail": "Therapist not found"}
+                )
+
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient_record = cursor.fetchone()
+
+            if not patient_record:
+                return JSONResponse(
+                    status_code=400,
+                    content={"status": "invalid", "detail": "You must be a patient to leave a review"}
+                )
+
+            patient_id = patient_record[0]
+
+
+            cursor.execute(
+                "SELECT review_id FROM Reviews WHERE therapist_id = %s AND patient_id = %s",
+                (id, patient_id)
+            )
+            existing_review = cursor.fetchone()
+
+            rating_value = float(rating.get('rating', 5))
+            comment = rating.get('comment', '')
+
+            if existing_review:
+
+                cursor.execute(
+                    """UPDATE Reviews
+                        SET rating = %s, comment = %s, updated_at = CURRENT_TIMESTAMP
+                        WHERE review_id = %s""",
+                    (rating_value, comment, existing_review[0])
+                )
+            else:
+
+                cursor.execute(
+                    """INSERT INTO Reviews
+                        (therapist_id, patient_id, rating, comment)
+                        VALUES (%s, %s, %s, %s)""",
+                    (id, patient_id, rating_value, comment)
+                )
+
+            db.commit()
+
+
+            cursor.execute(
+                """UPDATE Therapists t
+                    SET rating = (
+                        SELECT AVG(r.rating) FROM Reviews r WHERE r.therapist_id = %s
+                    ),
+                    review_count = (
+                        SELECT COUNT(*) FROM Reviews r WHERE r.therapist_id = %s
+                    )
+                    WHERE t.id = %s""",
+                (id, id, id)
+            )
+            db.commit()
+
+            return {"status": "valid", "message": "Review submitted successfully"}
+
+        except Exception as e:
+            db.rollback()
+            print(f"Database error in rate therapist API: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"status": "invalid", "detail": f"Error submitting review: {str(e)}"}
+            )
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in rate therapist API: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"status": "invalid", "detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/user/therapist")
+async def get_user_therapist_data(request: Request):
+    """API endpoint to get the therapist data for the current logged-in user in the format matching the Kotlin Therapist class"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"}
+            )
+
+        user_id = session_data.user_id
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT p.therapist_id, t.*
+                    FROM Patients p
+                    JOIN Therapists t ON p.therapist_id = t.id
+                    WHERE p.user_id = %s""",
+                (user_id,)
+            )
+
+            result = cursor.fetchone()
+            if not result:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Therapist not found for this user"}
+                )
+
+            for field in ['specialties', 'education', 'languages']:
+                if field in result:
+                    result[field] = safely_parse_json_field(result[field], [])
+                else:
+                    result[field] = []
+
+            formatted_therapist = {
+                "id": result.get("id", 0),
+                "first_name": result.get("first_name", "") or "",
+                "last_name": result.get("last_name", "") or "",
+                "company_email": result.get("company_email", "") or "",
+                "profile_image": result.get("profile_image", "") or "",
+                "bio": result.get("bio", "") or "",
+                "experience_years": result.get("experience_years", 0) or 0,
+                "specialties": result.get("specialties", []),
+                "education": result.get("education", []),
+                "languages": result.get("languages", []),
+                "address": result.get("address", "") or "",
+                "rating": float(result.get("rating", 0) or 0),
+                "review_count": result.get("review_count", 0) or 0,
+                "is_accepting_new_patients": bool(result.get("is_accepting_new_patients", False)),
+                "average_session_length": result.get("average_session_length", 60) or 60
+            }
+
+            return formatted_therapist
+
+        except Exception as e:
+            print(f"Database error in get user therapist data API: {e}")
+            import traceback
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user therapist data API: {e}")
+        import traceback
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/therapists/{therapist_id}/details")
+async def get_therapist_details(therapist_id: int):
+    """API endpoint to get detailed information about a specific therapist"""
+    import traceback
+
+    try:
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, company_email, profile_image,
+                            bio, experience_years, specialties, education, languages,
+                            address, rating, review_count,
+                            is_accepting_new_patients, average_session_length
+                    FROM Therapists
+                    WHERE id = %s""",
+                (therapist_id,)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Therapist not found"}
+                )
+
+            for field in ['specialties', 'education', 'languages']:
+                therapist[field] = safely_parse_json_field(therapist.get(field), [])
+
+            static_dir = getattr(app.state, 'static_directory', "/PERCEPTRONX/Frontend_Web/static")
+
+            profile_image = therapist.get('profile_image')
+            matched_image = find_best_matching_image(therapist_id, profile_image, static_dir)
+            photo_url = f"/static/assets/images/user/{matched_image}"
+
+            formatted_therapist = {
+                "id": therapist.get("id"),
+                "first_name": therapist.get("first_name", "") or "",
+                "last_name": therapist.get("last_name", "") or "",
+                "company_email": therapist.get("company_email", "") or "",
+                "profile_image": therapist.get("profile_image", "") or "",
+                "bio": therapist.get("bio", "") or "",
+                "experience_years": therapist.get("experience_years", 0) or 0,
+                "specialties": therapist.get("specialties", []),
+                "education": therapist.get("education", []),
+                "languages": therapist.get("languages", []),
+                "address": therapist.get("address", "") or "",
+                "rating": float(therapist.get("rating", 0) or 0),
+                "review_count": therapist.get("review_count", 0) or 0,
+                "is_accepting_new_patients": bool(therapist.get("is_accepting_new_patients", False)),
+                "average_session_length": therapist.get("average_session_length", 60) or 60,
+                "name": f"{therapist.get('first_name', '')} {therapist.get('last_name', '')}",
+                "photoUrl": photo_url
+            }
+
+            return formatted_therapist
+
+        except Exception as e:
+            print(f"Database error in get therapist details API: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get therapist details API: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
@@ -0,0 +1,1512 @@
+"""
+Treatment plan pages for therapists and the mobile app's plan API.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/treatment-plans/new")
+async def new_treatment_plan_page(request: Request, user=Depends(get_current_user)):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            "SELECT patient_id, first_name, last_name FROM Patients WHERE therapist_id = %s",
+            (user["user_id"],)
+        )
+        patients_result = cursor.fetchall()
+
+        patients = []
+        for patient in patients_result:
+            clean_patient = {}
+            for key, value in patient.items():
+                if isinstance(value, bytes):
+                    clean_patient[key] = value.decode('utf-8')
+                else:
+                    clean_patient[key] = value
+            patients.append(clean_patient)
+
+        cursor.execute("SELECT * FROM Exercises")
+        exercises_result = cursor.fetchall()
+
+        exercises = []
+        for exercise in exercises_result:
+            clean_exercise = {}
+            for key, value in exercise.items():
+                if isinstance(value, bytes):
+                    clean_exercise[key] = value.decode('utf-8')
+                else:
+                    clean_exercise[key] = value
+            exercises.append(clean_exercise)
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+        print(f"exercises: {exercises}")
+
+        return templates.TemplateResponse(
+            "dist/treatment_plans/new_plan.html",
+            {
+                "request": request,
+                "patients": patients,
+                "exercises": exercises,
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", ""),
+                "last_name": therapist_data.get("last_name", ""),
+            }
+        )
+    except Exception as e:
+        print(f"Error loading new treatment plan page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/treatment-plans")
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.get("/treatment-plans/{plan_id}")
+async def view_treatment_plan(request: Request, plan_id: int):
+    """Display detailed view of a specific treatment plan with exercises and progress"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT id, first_name, last_name, profile_image FROM Therapists WHERE id = %s",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT tp.*, p.first_name as patient_first_name, p.last_name as patient_last_name
+                    FROM TreatmentPlans tp
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE tp.plan_id = %s AND tp.therapist_id = %s""",
+                (plan_id, session_data["user_id"])
+            )
+            plan_result = cursor.fetchone()
+
+            if not plan_result:
+                return RedirectResponse(url="/treatment-plans?error=not_found")
+
+            plan = {}
+            for key, value in plan_result.items():
+                if isinstance(value, bytes):
+                    plan[key] = value.decode('utf-8')
+                else:
+                    plan[key] = value
+
+            cursor.execute(
+                "SELECT * FROM Patients WHERE patient_id = %s AND therapist_id = %s",
+                (plan.get("patient_id"), session_data["user_id"])
+            )
+            patient_result = cursor.fetchone()
+
+            patient = {}
+            for key, value in patient_result.items():
+                if isinstance(value, bytes):
+                    patient[key] = value.decode('utf-8')
+                else:
+                    patient[key] = value
+
+            cursor.execute(
+                """SELECT tpe.*, e.name as exercise_name, e.difficulty, e.duration as exercise_duration,
+                            e.video_url, e.video_type, e.instructions
+                    FROM TreatmentPlanExercises tpe
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    WHERE tpe.plan_id = %s
+                    ORDER BY tpe.plan_exercise_id""",
+                (plan_id,)
+            )
+            plan_exercises_result = cursor.fetchall()
+
+            plan_exercises = []
+            for exercise in plan_exercises_result:
+                clean_exercise = {}
+                for key, value in exercise.items():
+                    if isinstance(value, bytes):
+                        clean_exercise[key] = value.decode('utf-8')
+                    else:
+                        clean_exercise[key] = value
+                plan_exercises.append(clean_exercise)
+
+            for exercise in plan_exercises:
+                if exercise.get("notes"):
+                    exercise["notes"] = exercise.get("notes")
+                elif exercise.get("instructions"):
+                    exercise["notes"] = exercise.get("instructions")
+                else:
+                    exercise["notes"] = "No specific instructions provided for this exercise."
+
+            cursor.execute(
+                """SELECT * FROM PatientMetrics
+                    WHERE patient_id = %s
+                    ORDER BY measurement_date DESC
+                    LIMIT 1""",
+                (plan.get("patient_id"),)
+            )
+            patient_progress_result = cursor.fetchone()
+
+            if patient_progress_result:
+                patient_progress = {}
+                for key, value in patient_progress_result.items():
+                    if isinstance(value, bytes):
+                        patient_progress[key] = value.decode('utf-8')
+                    else:
+                        patient_progress[key] = value
+            else:
+                patient_progress = {
+                    'adherence_rate': 0,
+                    'recovery_progress': 0,
+                    'functionality_score': 0
+                }
+
+            cursor.execute(
+                """SELECT
+                        CASE
+                            WHEN (
+                                CASE
+                                    WHEN tpe.repetitions IS NOT NULL AND tpe.repetitions > 0 THEN (pep.repetitions_completed / tpe.repetitions) * 100
+                                    WHEN tpe.sets IS NOT NULL AND tpe.sets > 0 THEN (pep.sets_completed / tpe.sets) * 100
+                                    ELSE 0
+                                END
+                            ) >= 90 THEN 'complete'
+                            WHEN (
+                                CASE
+                                    WHEN tpe.repetitions IS NOT NULL AND tpe.repetitions > 0 THEN (pep.repetitions_completed / tpe.repetitions) * 100
+                                    WHEN tpe.sets IS NOT NULL AND tpe.sets > 0 THEN (pep.sets_completed / tpe.sets) * 100
+                                    ELSE 0
+                                END
+                            ) >= 50 THEN 'partial'
+                            ELSE 'missed'
+                        END as status,
+                        COUNT(*) as count
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    WHERE tpe.plan_id = %s
+                    GROUP BY status""",
+                (plan_id,)
+            )
+            exercise_completion_raw = cursor.fetchall()
+
+            exercise_completion = {
+                'complete_count': 0,
+                'partial_count': 0,
+                'missed_count': 0,
+                'complete_percentage': 0,
+                'partial_percentage': 0,
+                'missed_percentage': 0
+            }
+
+            total_exercises = 0
+            for ec in exercise_completion_raw:
+                total_exercises += ec.get('count', 0)
+                if ec.get('status') == 'complete':
+                    exercise_completion['complete_count'] = ec.get('count', 0)
+                elif ec.get('status') == 'partial':
+                    exercise_completion['partial_count'] = ec.get('count', 0)
+                elif ec.get('status') == 'missed':
+                    exercise_completion['missed_count'] = ec.get('count', 0)
+
+            if total_exercises > 0:
+                exercise_completion['complete_percentage'] = round((exercise_completion['complete_count'] / total_exercises) * 100)
+                exercise_completion['partial_percentage'] = round((exercise_completion['partial_count'] / total_exercises) * 100)
+                exercise_completion['missed_percentage'] = round((exercise_completion['missed_count'] / total_exercises) * 100)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/treatment_plans/view_plan.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "plan": plan,
+                    "patient": patient,
+                    "plan_exercises": plan_exercises,
+                    "patient_progress": patient_progress,
+                    "exercise_completion": exercise_completion,
+                    "unread_messages_count": unread_messages_count
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in view treatment plan: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/treatment-plans?error=database")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in view treatment plan: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/treatment-plans/{plan_id}/edit")
+async def edit_treatment_plan_form(request: Request, plan_id: int):
+    """Route to display the edit treatment plan form"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT tp.*, p.first_name as patient_first_name, p.last_name as patient_last_name
+                    FROM TreatmentPlans tp
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE tp.plan_id = %s AND tp.therapist_id = %s""",
+                (plan_id, session_data["user_id"])
+            )
+            plan_result = cursor.fetchone()
+
+            if not plan_result:
+                return RedirectResponse(url="/treatment-plans", status_code=303)
+
+            plan = {}
+            for key, value in plan_result.items():
+                if isinstance(value, bytes):
+                    plan[key] = value.decode('utf-8')
+                else:
+                    plan[key] = value
+
+            cursor.execute(
+                """SELECT tpe.*, e.name as exercise_name, e.difficulty, e.duration as exercise_duration
+                    FROM TreatmentPlanExercises tpe
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    WHERE tpe.plan_id = %s
+                    ORDER BY tpe.plan_exercise_id""",
+                (plan_id,)
+            )
+            plan_exercises_result = cursor.fetchall()
+
+            plan_exercises = []
+            for exercise in plan_exercises_result:
+                clean_exercise = {}
+                for key, value in exercise.items():
+                    if isinstance(value, bytes):
+                        clean_exercise[key] = value.decode('utf-8')
+                    else:
+                        clean_exercise[key] = value
+                plan_exercises.append(clean_exercise)
+
+            cursor.execute(
+                "SELECT patient_id, first_name, last_name FROM Patients WHERE therapist_id = %s",
+                (session_data["user_id"],)
+            )
+            patients_result = cursor.fetchall()
+
+            patients = []
+            for patient in patients_result:
+                clean_patient = {}
+                for key, value in patient.items():
+                    if isinstance(value, bytes):
+                        clean_patient[key] = value.decode('utf-8')
+                    else:
+                        clean_patient[key] = value
+                patients.append(clean_patient)
+
+            cursor.execute("SELECT * FROM Exercises ORDER BY name")
+            exercises_result = cursor.fetchall()
+
+            exercises = []
+            for exercise in exercises_result:
+                clean_exercise = {}
+                for key, value in exercise.items():
+                    if isinstance(value, bytes):
+                        clean_exercise[key] = value.decode('utf-8')
+                    else:
+                        clean_exercise[key] = value
+                exercises.append(clean_exercise)
+
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(session_data["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/treatment_plans/edit_plan.html",
+                {
+                    "request": request,
+                    "plan": plan,
+                    "plan_exercises": plan_exercises,
+                    "patients": patients,
+                    "exercises": exercises,
+                    "therapist": therapist_data,
+                    "first_name": therapist_data.get("first_name", ""),
+                    "last_name": therapist_data.get("last_name", "")
+                }
+            )
+        except Exception as e:
+            print(f"Error loading edit treatment plan form: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/treatment-plans", status_code=303)
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Unexpected error in edit treatment plan form: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page", status_code=303)
+
+
+@router.post("/treatment-plans/{plan_id}/edit")
+async def update_treatment_plan(request: Request, plan_id: int):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        form = await request.form()
+        print("RECEIVED FORM DATA FOR UPDATE:", dict(form))
+
+        patient_id = form.get("patient_id")
+        plan_name = form.get("plan_name")
+        description = form.get("description", "")
+        start_date = form.get("start_date")
+        end_date = form.get("end_date")
+        status = form.get("status", "Active")
+
+        print(f"Plan update details: ID={plan_id}, patient={patient_id}, name={plan_name}")
+
+        if not patient_id or not plan_name or not start_date:
+            print("Missing required fields in update")
+            return RedirectResponse(f"/treatment-plans/{plan_id}/edit?error=missing_fields", status_code=303)
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT plan_id FROM TreatmentPlans WHERE plan_id = %s AND therapist_id = %s",
+                (plan_id, session_data["user_id"])
+            )
+            if not cursor.fetchone():
+                return RedirectResponse(url="/treatment-plans", status_code=303)
+
+            cursor.execute(
+                """UPDATE TreatmentPlans
+                    SET patient_id = %s, name = %s, description = %s,
+                        start_date = %s, end_date = %s, status = %s
+                    WHERE plan_id = %s""",
+                (patient_id, plan_name, description, start_date, end_date, status, plan_id)
+            )
+
+            existing_exercise_ids = []
+            keep_exercises = []
+
+            for key in form.keys():
+                if key.startswith("existing_exercise_id"):
+                    existing_exercise_ids.append(form.get(key))
+                elif key == "keep_exercise":
+                    keep_exercise_values = form.getlist("keep_exercise")
+                    keep_exercises.extend(keep_exercise_values)
+
+            cursor.execute(
+                "SELECT plan_exercise_id FROM TreatmentPlanExercises WHERE plan_id = %s",
+                (plan_id,)
+            )
+            current_exercise_ids_result = cursor.fetchall()
+            current_exercise_ids = [str(row.get('plan_exercise_id')) for row in current_exercise_ids_result]
+
+            for ex_id in current_exercise_ids:
+                if ex_id not in keep_exercises:
+                    cursor.execute(
+                        "DELETE FROM TreatmentPlanExercises WHERE plan_exercise_id = %s",
+                        (ex_id,)
+                    )
+                    print(f"Deleted exercise ID: {ex_id}")
+
+            for ex_id in keep_exercises:
+                if not ex_id:
+                    continue
+
+                prefix = f"existing_{ex_id}_"
+                ex_sets = form.get(f"{prefix}sets")
+                ex_reps = form.get(f"{prefix}repetitions")
+                ex_freq = form.get(f"{prefix}frequency")
+                ex_duration = form.get(f"{prefix}duration")
+                ex_notes = form.get(f"{prefix}notes")
+
+                cursor.execute(
+                    """UPDATE TreatmentPlanExercises
+                        SET sets = %s, repetitions = %s, frequency = %s,
+                            duration = %s, notes = %s
+                        WHERE plan_exercise_id = %s""",
+                    (ex_sets, ex_reps, ex_freq, ex_duration, ex_notes, ex_id)
+                )
+                print(f"Updated exercise ID: {ex_id}")
+
+            new_exercises = form.getlist("new_exercise_id")
+            new_sets = form.getlist("new_sets")
+            new_reps = form.getlist("new_repetitions")
+            new_freq = form.getlist("new_frequency")
+            new_duration = form.getlist("new_duration")
+            new_notes = form.getlist("new_notes")
+
+            for i, ex_id in enumerate(new_exercises):
+                if not ex_id or ex_id == "":
+                    continue
+
+                ex_sets = new_sets[i] if i < len(new_sets) else None
+                ex_reps = new_reps[i] if i < len(new_reps) else None
+                ex_freq = new_freq[i] if i < len(new_freq) else None
+                ex_duration = new_duration[i] if i < len(new_duration) else None
+                ex_notes = new_notes[i] if i < len(new_notes) else None
+
+                cursor.execute(
+                    """INSERT INTO TreatmentPlanExercises
+                        (plan_id, exercise_id, sets, repetitions, frequency, duration, notes)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    (plan_id, ex_id, ex_sets, ex_reps, ex_freq, ex_duration, ex_notes)
+                )
+                print(f"Added new exercise ID: {ex_id}")
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+            print(f"Treatment plan {plan_id} updated successfully")
+
+            return RedirectResponse(url=f"/treatment-plans", status_code=303)
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in update treatment plan: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(f"/treatment-plans/{plan_id}/edit?error=db_error", status_code=303)
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Unexpected error in update treatment plan: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page", status_code=303)
+
+
+@router.get("/treatment-plans")
+async def treatment_plans_page(request: Request, user=Depends(get_current_user)):
+    db = await get_Mysql_db_async()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(
+            """SELECT tp.*, p.first_name, p.last_name
+                FROM TreatmentPlans tp
+                JOIN Patients p ON tp.patient_id = p.patient_id
+                WHERE tp.therapist_id = %s
+                ORDER BY tp.created_at DESC""",
+            (user["user_id"],)
+        )
+        treatment_plans_result = cursor.fetchall()
+
+        treatment_plans = []
+        for plan in treatment_plans_result:
+            clean_plan = {}
+            for key, value in plan.items():
+                if isinstance(value, bytes):
+                    clean_plan[key] = value.decode('utf-8')
+                else:
+                    clean_plan[key] = value
+            treatment_plans.append(clean_plan)
+
+        release_Mysql_db(db, cursor)
+        therapist_data = await get_therapist_data(user["user_id"])
+
+        if isinstance(therapist_data, tuple):
+            therapist_dict = {
+                "first_name": therapist_data[0] if len(therapist_data) > 0 else "",
+                "last_name": therapist_data[1] if len(therapist_data) > 1 else "",
+                "profile_image": therapist_data[2] if len(therapist_data) > 2 else ""
+            }
+            therapist_data = therapist_dict
+
+        return templates.TemplateResponse(
+            "dist/treatment_plans/plan_list.html",
+            {
+                "request": request,
+                "treatment_plans": treatment_plans,
+                "therapist": therapist_data,
+                "first_name": therapist_data.get("first_name", "") if isinstance(therapist_data, dict) else "",
+                "last_name": therapist_data.get("last_name", "") if isinstance(therapist_data, dict) else ""
+            }
+        )
+    except Exception as e:
+        print(f"Error loading treatment plans page: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page")
+    finally:
+        cursor.close()
+        db.close()
+
+
+@router.post("/treatment-plans/delete")
+async def delete_treatment_plan(request: Request):
+    """Route to delete a treatment plan"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        form = await request.form()
+        plan_id_str = form.get("plan_id")
+
+        print(f"Delete request for plan ID: {plan_id_str}")
+
+        if not plan_id_str:
+            return RedirectResponse(url="/treatment-plans?error=no_plan_id", status_code=303)
+
+        try:
+            plan_id = int(plan_id_str)
+        except ValueError:
+            return RedirectResponse(url="/treatment-plans?error=invalid_plan_id", status_code=303)
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT plan_id FROM TreatmentPlans WHERE plan_id = %s AND therapist_id = %s",
+                (plan_id, session_data["user_id"])
+            )
+            if not cursor.fetchone():
+                return RedirectResponse(url="/treatment-plans?error=not_found", status_code=303)
+
+            cursor.execute(
+                "DELETE FROM TreatmentPlanExercises WHERE plan_id = %s",
+                (plan_id,)
+            )
+
+            cursor.execute(
+                "DELETE FROM TreatmentPlans WHERE plan_id = %s",
+                (plan_id,)
+            )
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+            print(f"Treatment plan {plan_id} deleted successfully")
+
+            return RedirectResponse(url="/treatment-plans?success=deleted", status_code=303)
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in delete treatment plan: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/treatment-plans?error=db_error", status_code=303)
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Unexpected error in delete treatment plan: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page", status_code=303)
+
+
+@router.post("/treatment-plans/new")
+async def create_treatment_plan(request: Request):
+    """Route to handle creating a new treatment plan with exercises"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+
+        form = await request.form()
+        print("RECEIVED FORM DATA:", dict(form))
+
+
+        patient_id = form.get("patient_id")
+        plan_name = form.get("plan_name")
+        description = form.get("description", "")
+        start_date = form.get("start_date")
+        end_date = form.get("end_date")
+        status = form.get("status", "Active")
+
+        print(f"Plan details: patient={patient_id}, name={plan_name}, start={start_date}, end={end_date}, status={status}")
+
+
+        if not patient_id or not plan_name or not start_date:
+            error_msg = "Missing required fields: "
+            if not patient_id: error_msg += "patient, "
+            if not plan_name: error_msg += "plan name, "
+            if not start_date: error_msg += "start date"
+
+            print(f"ERROR: {error_msg}")
+
+
+            db = await get_Mysql_db_async()
+            cursor = db.cursor()
+            cursor.execute("SELECT patient_id, first_name, last_name FROM Patients WHERE therapist_id = %s",
+                        (session_data["user_id"],))
+            patients = cursor.fetchall()
+            cursor.execute("SELECT * FROM Exercises")
+            exercises = cursor.fetchall()
+            cursor.close()
+            db.close()
+
+            therapist_data = await get_therapist_data(session_data["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/treatment_plans/new_plan.html",
+                {
+                    "request": request,
+                    "error": error_msg,
+                    "patients": patients,
+                    "exercises": exercises,
+                    "therapist":therapist_data,
+                    "first_name": therapist_data["first_name"],
+                    "last_name": therapist_data["last_name"]
+                }
+            )
+
+
+        exercises = form.getlist("exercises[]")
+        sets = form.getlist("sets[]")
+        repetitions = form.getlist("repetitions[]")
+        frequencies = form.getlist("frequency[]")
+        durations = form.getlist("duration[]")
+        exercise_notes = form.getlist("exercise_notes[]")
+
+        print(f"Exercises: {exercises}")
+        print(f"Sets: {sets}")
+        print(f"Repetitions: {repetitions}")
+        print(f"Frequencies: {frequencies}")
+        print(f"Durations: {durations}")
+
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                """INSERT INTO TreatmentPlans
+                    (patient_id, therapist_id, name, description, start_date, end_date, status)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                (patient_id, session_data["user_id"], plan_name, description, start_date, end_date, status)
+            )
+            plan_id = cursor.lastrowid
+            print(f"Created plan with ID: {plan_id}")
+
+
+            for i in range(len(exercises)):
+                exercise_id = exercises[i] if i < len(exercises) else None
+
+                if not exercise_id or exercise_id == "":
+                    print(f"Skipping empty exercise at index {i}")
+                    continue
+
+                exercise_sets = sets[i] if i < len(sets) and sets[i] else None
+                exercise_reps = repetitions[i] if i < len(repetitions) and repetitions[i] else None
+                exercise_freq = frequencies[i] if i < len(frequencies) and frequencies[i] else None
+                exercise_duration = durations[i] if i < len(durations) and durations[i] else None
+                exercise_note = exercise_notes[i] if i < len(exercise_notes) else None
+
+                print(f"Adding exercise: ID={exercise_id}, Sets={exercise_sets}, Reps={exercise_reps}, Freq={exercise_freq}, Duration={exercise_duration}")
+
+                try:
+                    cursor.execute(
+                        """INSERT INTO TreatmentPlanExercises
+                            (plan_id, exercise_id, sets, repetitions, frequency, duration, notes)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                        (plan_id, exercise_id, exercise_sets, exercise_reps, exercise_freq, exercise_duration, exercise_note)
+                    )
+                    print(f"Successfully added exercise {exercise_id} to plan {plan_id}")
+                except Exception as ex:
+                    print(f"Error adding exercise {exercise_id}: {ex}")
+
+
+            db.commit()
+            release_Mysql_db(db, cursor)
+            await invalidate_dashboard_cache(session_data["user_id"])
+            print(f"Treatment plan {plan_id} created successfully with exercises")
+            return RedirectResponse(url="/treatment-plans", status_code=303)
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+
+
+            cursor = db.cursor()
+            cursor.execute("SELECT patient_id, first_name, last_name FROM Patients WHERE therapist_id = %s",
+                        (session_data["user_id"],))
+            patients = cursor.fetchall()
+            cursor.execute("SELECT * FROM Exercises")
+            exercises = cursor.fetchall()
+
+            release_Mysql_db(db, cursor)
+            therapist_data = await get_therapist_data(session_data["user_id"])
+
+            return templates.TemplateResponse(
+                "dist/treatment_plans/new_plan.html",
+                {
+                    "request": request,
+                    "error": f"Database error: {str(e)}",
+                    "patients": patients,
+                    "exercises": exercises,
+                    "therapist": therapist_data,
+                    "first_name": therapist_data["first_name"],
+                    "last_name": therapist_data["last_name"]
+                }
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"General error: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/front-page")
+
+
+@router.get("/api/user/treatment-plans")
+async def get_user_treatment_plans(request: Request):
+    """API endpoint to get treatment plans for the current logged-in user"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id, therapist_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient["patient_id"]
+            therapist_id = patient["therapist_id"]
+
+            cursor.execute(
+                "SELECT first_name, last_name FROM Therapists WHERE id = %s",
+                (therapist_id,)
+            )
+            therapist = cursor.fetchone()
+            therapist_name = f"{therapist['first_name']} {therapist['last_name']}" if therapist else "Unknown"
+
+            cursor.execute(
+                """
+                    SELECT * FROM TreatmentPlans
+                    WHERE patient_id = %s
+                    ORDER BY created_at DESC
+                    """,
+                (patient_id,)
+            )
+            treatment_plans_raw = cursor.fetchall()
+
+            treatment_plans = []
+            for plan in treatment_plans_raw:
+                cursor.execute(
+                    """
+                        SELECT
+                            COUNT(*) as total_exercises,
+                            SUM(CASE WHEN pep.progress_id IS NOT NULL THEN 1 ELSE 0 END) as completed_exercises
+                        FROM TreatmentPlanExercises tpe
+                        LEFT JOIN PatientExerciseProgress pep ON
+                            tpe.plan_exercise_id = pep.plan_exercise_id AND
+                            pep.patient_id = %s
+                        WHERE tpe.plan_id = %s
+                        """,
+                    (patient_id, plan["plan_id"])
+                )
+                progress_data = cursor.fetchone()
+
+                total_exercises = progress_data.get("total_exercises", 0) or 0
+                completed_exercises = progress_data.get("completed_exercises", 0) or 0
+                progress = completed_exercises / total_exercises if total_exercises > 0 else 0
+
+                cursor.execute(
+                    """
+                        SELECT tpe.*, e.name, e.description, e.video_url, e.video_type,
+                            e.duration, e.instructions, e.video_filename as thumbnailUrl,
+                            (pep.progress_id IS NOT NULL) as completed
+                        FROM TreatmentPlanExercises tpe
+                        JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                        LEFT JOIN PatientExerciseProgress pep ON
+                            tpe.plan_exercise_id = pep.plan_exercise_id AND
+                            pep.patient_id = %s
+                        WHERE tpe.plan_id = %s
+                        """,
+                    (patient_id, plan["plan_id"])
+                )
+                exercises_raw = cursor.fetchall()
+
+                exercises = []
+                for ex in exercises_raw:
+                    exercise = {
+                        "exerciseId": ex.get("exercise_id"),
+                        "planExerciseId": ex.get("plan_exercise_id"),
+                        "name": ex.get("name", ""),
+                        "description": ex.get("description") or ex.get("instructions") or "",
+                        "videoUrl": ex.get("video_url"),
+                        "imageUrl": None,
+                        "videoType": ex.get("video_type", ""),
+                        "sets": ex.get("sets", 3),
+                        "repetitions": ex.get("repetitions", 10),
+                        "frequency": ex.get("frequency", "Daily"),
+                        "duration": ex.get("duration", 0),
+                        "completed": bool(ex.get("completed", False)),
+                        "thumbnailUrl": ex.get("thumbnailUrl")
+                    }
+                    exercises.append(exercise)
+
+                formatted_plan = {
+                    "planId": plan.get("plan_id"),
+                    "patientId": plan.get("patient_id"),
+                    "therapistId": plan.get("therapist_id"),
+                    "name": plan.get("name", ""),
+                    "description": plan.get("description", ""),
+                    "startDate": plan.get("start_date").isoformat() if plan.get("start_date") else None,
+                    "endDate": plan.get("end_date").isoformat() if plan.get("end_date") else None,
+                    "status": plan.get("status", "Unknown"),
+                    "createdAt": plan.get("created_at").isoformat() if plan.get("created_at") else None,
+                    "updatedAt": plan.get("updated_at").isoformat() if plan.get("updated_at") else None,
+                    "therapistName": therapist_name,
+                    "progress": progress,
+                    "exercises": exercises
+                }
+
+                treatment_plans.append(formatted_plan)
+
+            return treatment_plans
+
+        except Exception as e:
+            print(f"Database error in get user treatment plans: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get user treatment plans: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/api/treatment-plans/{plan_id}/update-status")
+async def update_treatment_plan_status(
+    request: Request,
+    plan_id: int
+):
+    """API endpoint to check and update a treatment plan's status based on exercise completion"""
+    print(f"Checking status for treatment plan {plan_id}")
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient["patient_id"]
+
+
+            cursor.execute(
+                """
+                    SELECT * FROM TreatmentPlans
+                    WHERE plan_id = %s AND patient_id = %s
+                    """,
+                (plan_id, patient_id)
+            )
+            plan = cursor.fetchone()
+
+            if not plan:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Treatment plan not found or not associated with your account"}
+                )
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        COUNT(tpe.plan_exercise_id) as total_exercises,
+                        SUM(CASE WHEN EXISTS (
+                            SELECT 1 FROM PatientExerciseProgress pep
+                            WHERE pep.plan_exercise_id = tpe.plan_exercise_id
+                            AND pep.patient_id = %s
+                        ) THEN 1 ELSE 0 END) as completed_exercises
+                    FROM TreatmentPlanExercises tpe
+                    WHERE tpe.plan_id = %s
+                    """,
+                (patient_id, plan_id)
+            )
+
+            result = cursor.fetchone()
+            total = result["total_exercises"] or 0
+            completed = result["completed_exercises"] or 0
+
+            print(f"Plan has {completed}/{total} exercises completed")
+
+            current_status = plan["status"]
+            should_update = False
+            new_status = current_status
+
+
+            if total > 0 and completed == total:
+                if current_status != "Completed":
+                    new_status = "Completed"
+                    should_update = True
+                    print("All exercises completed, updating plan status to Completed")
+            else:
+                if current_status == "Completed":
+                    new_status = "Active"
+                    should_update = True
+                    print("Not all exercises completed, updating plan status to Active")
+
+
+            if should_update:
+                cursor.execute(
+                    """
+                        UPDATE TreatmentPlans
+                        SET status = %s, updated_at = NOW()
+                        WHERE plan_id = %s
+                        """,
+                    (new_status, plan_id)
+                )
+                db.commit()
+                print(f"Updated plan status to {new_status}")
+            else:
+                print(f"No status update needed, keeping status as {current_status}")
+
+            return {
+                "status": "success",
+                "plan_id": plan_id,
+                "total_exercises": total,
+                "completed_exercises": completed,
+                "current_status": new_status,
+                "was_updated": should_update
+            }
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in update treatment plan status: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in update treatment plan status: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/treatment-plans/{plan_id}/progress")
+async def get_plan_progress(
+    request: Request,
+    plan_id: int
+):
+    """API endpoint to get detailed progress summary for a specific treatment plan"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient["patient_id"]
+
+
+            cursor.execute(
+                "SELECT * FROM TreatmentPlans WHERE plan_id = %s AND patient_id = %s",
+                (plan_id, patient_id)
+            )
+            plan = cursor.fetchone()
+
+            if not plan:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Treatment plan not found or not associated with your account"}
+                )
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        COUNT(*) as total_exercises,
+                        SUM(CASE WHEN pep.progress_id IS NOT NULL THEN 1 ELSE 0 END) as completed_exercises
+                    FROM TreatmentPlanExercises tpe
+                    LEFT JOIN PatientExerciseProgress pep ON
+                        tpe.plan_exercise_id = pep.plan_exercise_id AND
+                        pep.patient_id = %s
+                    WHERE tpe.plan_id = %s
+                    """,
+                (patient_id, plan_id)
+            )
+            overall_stats = cursor.fetchone()
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        pep.completion_date,
+                        COUNT(DISTINCT pep.plan_exercise_id) as exercises_completed
+                    FROM PatientExerciseProgress pep
+                    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+                    WHERE pep.patient_id = %s AND tpe.plan_id = %s
+                    GROUP BY pep.completion_date
+                    ORDER BY pep.completion_date DESC
+                    LIMIT 30
+                    """,
+                (patient_id, plan_id)
+            )
+            daily_activity = cursor.fetchall()
+
+
+            cursor.execute(
+                """
+                    SELECT
+                        e.exercise_id, e.name,
+                        tpe.plan_exercise_id,
+                        tpe.sets, tpe.repetitions,
+                        MAX(pep.completion_date) as last_completed,
+                        COUNT(pep.progress_id) as completion_count,
+                        AVG(pep.pain_level) as avg_pain,
+                        AVG(pep.difficulty_level) as avg_difficulty
+                    FROM TreatmentPlanExercises tpe
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    LEFT JOIN PatientExerciseProgress pep ON
+                        tpe.plan_exercise_id = pep.plan_exercise_id AND
+                        pep.patient_id = %s
+                    WHERE tpe.plan_id = %s
+                    GROUP BY e.exercise_id, tpe.plan_exercise_id
+                    """,
+                (patient_id, plan_id)
+            )
+            exercise_progress = cursor.fetchall()
+
+
+            start_date = plan["start_date"]
+            today = datetime.datetime.now().date()
+            days_active = (today - start_date).days if start_date else 0
+
+
+            formatted_daily = []
+            for day in daily_activity:
+                formatted_daily.append({
+                    "date": day["completion_date"].isoformat(),
+                    "exercisesCompleted": day["exercises_completed"]
+                })
+
+            formatted_exercises = []
+            for ex in exercise_progress:
+                formatted_exercises.append({
+                    "exerciseId": ex["exercise_id"],
+                    "planExerciseId": ex["plan_exercise_id"],
+                    "name": ex["name"],
+                    "targetSets": ex["sets"] or 3,
+                    "targetRepetitions": ex["repetitions"] or 10,
+                    "lastCompleted": ex["last_completed"].isoformat() if ex["last_completed"] else None,
+                    "completionCount": ex["completion_count"] or 0,
+                    "averagePain": float(ex["avg_pain"]) if ex["avg_pain"] is not None else None,
+                    "averageDifficulty": float(ex["avg_difficulty"]) if ex["avg_difficulty"] is not None else None,
+                    "isCompleted": ex["completion_count"] > 0
+                })
+
+            total_exercises = overall_stats["total_exercises"] or 0
+            completed_exercises = overall_stats["completed_exercises"] or 0
+
+
+            result = {
+                "planId": plan["plan_id"],
+                "planName": plan["name"],
+                "startDate": plan["start_date"].isoformat() if plan["start_date"] else None,
+                "endDate": plan["end_date"].isoformat() if plan["end_date"] else None,
+                "status": plan["status"],
+                "daysActive": days_active,
+                "totalExercises": total_exercises,
+                "completedExercises": completed_exercises,
+                "completionRate": completed_exercises / total_exercises if total_exercises > 0 else 0,
+                "dailyActivity": formatted_daily,
+                "exerciseProgress": formatted_exercises
+            }
+
+            return result
+
+        except Exception as e:
+            print(f"Database error in get plan progress: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get plan progress: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.post("/treatment-plans/add-exercise")
+async def add_exercise_to_plan(
+    request: Request,
+    exercise_id: int = Form(...),
+    plan_id: int = Form(...),
+    sets: int = Form(3),
+    repetitions: int = Form(10),
+    frequency: str = Form("Every other day"),
+    notes: str = Form(None)
+):
+    """Route to add an exercise to an existing treatment plan"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                "SELECT plan_id FROM TreatmentPlans WHERE plan_id = %s AND therapist_id = %s",
+                (plan_id, session_data["user_id"])
+            )
+            if not cursor.fetchone():
+                return RedirectResponse(url=f"/exercises/{exercise_id}?error=unauthorized_plan")
+
+
+            cursor.execute(
+                "SELECT exercise_id FROM Exercises WHERE exercise_id = %s",
+                (exercise_id,)
+            )
+            if not cursor.fetchone():
+                return RedirectResponse(url=f"/exercises/{exercise_id}?error=invalid_exercise")
+
+
+            cursor.execute(
+                "SELECT plan_exercise_id FROM TreatmentPlanExercises WHERE plan_id = %s AND exercise_id = %s",
+                (plan_id, exercise_id)
+            )
+            existing = cursor.fetchone()
+
+            if existing:
+
+                cursor.execute(
+                    """UPDATE TreatmentPlanExercises
+                        SET sets = %s, repetitions = %s, frequency = %s, notes = %s
+                        WHERE plan_id = %s AND exercise_id = %s""",
+                    (sets, repetitions, frequency, notes, plan_id, exercise_id)
+                )
+                message = "updated"
+            else:
+
+                cursor.execute(
+                    """INSERT INTO TreatmentPlanExercises
+                        (plan_id, exercise_id, sets, repetitions, frequency, notes)
+                        VALUES (%s, %s, %s, %s, %s, %s)""",
+                    (plan_id, exercise_id, sets, repetitions, frequency, notes)
+                )
+                message = "added"
+
+            db.commit()
+
+            return RedirectResponse(
+                url=f"/exercises/{exercise_id}?success=exercise_{message}_to_plan",
+                status_code=303
+            )
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error adding exercise to plan: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(
+                url=f"/exercises/{exercise_id}?error=database",
+                status_code=303
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error adding exercise to plan: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/api/treatment-plans/active")
+async def get_active_treatment_plans(request: Request):
+    """API endpoint to get active treatment plans for the current therapist"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Not authenticated"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Not authenticated"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+            cursor.execute(
+                """SELECT tp.plan_id, tp.name,
+                            CONCAT(p.first_name, ' ', p.last_name) as patient_name
+                    FROM TreatmentPlans tp
+                    JOIN Patients p ON tp.patient_id = p.patient_id
+                    WHERE tp.therapist_id = %s AND tp.status = 'Active'
+                    ORDER BY tp.name""",
+                (session_data["user_id"],)
+            )
+            treatment_plans = cursor.fetchall()
+
+            return treatment_plans
+
+        except Exception as e:
+            print(f"Database error in get active treatment plans API: {e}")
+            return JSONResponse(status_code=500, content={"error": "Database error"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in get active treatment plans API: {e}")
+        return JSONResponse(status_code=500, content={"error": "Server error"})
+
+
+@router.get("/api/debug/treatment-plans/{patient_id}")
+async def debug_treatment_plans(
+    request: Request,
+    patient_id: int
+):
+    """API endpoint to list all treatment plans for a patient (admin/debug only)"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                """
+                    SELECT plan_id, name, status, patient_id, therapist_id, created_at
+                    FROM TreatmentPlans
+                    WHERE patient_id = %s
+                    """,
+                (patient_id,)
+            )
+
+            plans = cursor.fetchall()
+
+
+            cursor.execute(
+                """
+                    SELECT tpe.plan_exercise_id, tpe.plan_id, tpe.exercise_id, e.name as exercise_name,
+                        tp.name as plan_name, tp.patient_id
+                    FROM TreatmentPlanExercises tpe
+                    JOIN Exercises e ON tpe.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+                    WHERE tp.patient_id = %s
+                    """,
+                (patient_id,)
+            )
+
+            plan_exercises = cursor.fetchall()
+
+            for plan in plans:
+                if plan["created_at"]:
+                    plan["created_at"] = plan["created_at"].isoformat()
+
+            return {
+                "patient_id": patient_id,
+                "treatment_plans": plans,
+                "plan_exercises": plan_exercises
+            }
+
+        except Exception as e:
+            print(f"Database error in debug treatment plans: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Error in debug treatment plans: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
@@ -0,0 +1,2026 @@
+"""
+Exercise video submissions: uploads, review pages, pose processing, playback and downloads.
+"""
+from connections.api.common import *
+
+router = APIRouter()
+
+
+@router.get("/api/video-jobs/dead-letter")
+async def video_jobs_dead_letter(user=Depends(get_current_user), limit: int = 50):
+    return JSONResponse(content={"jobs": await get_dead_letter_jobs(min(limit, 500))})
+
+
+@router.get("/exercises/submissions")
+async def view_exercise_submissions(request: Request):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        print(f"Session data: {session_data}")
+
+        db = await get_Mysql_db_async()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        try:
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (session_data["user_id"],)
+            )
+            therapist_result = cursor.fetchone()
+            if not therapist_result:
+                print(f"Therapist not found for user_id: {session_data['user_id']}")
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            print(f"Found therapist: {therapist}")
+
+            cursor.execute(
+                """SELECT COUNT(*) as patient_count
+                    FROM Patients
+                    WHERE therapist_id = %s""",
+                (therapist.get("id"),)
+            )
+            patient_count_result = cursor.fetchone()
+            patient_count = patient_count_result.get('patient_count', 0) if patient_count_result else 0
+            print(f"Therapist has {patient_count} assigned patients")
+
+            cursor.execute(
+                """SELECT evs.*, p.first_name, p.last_name, e.name as exercise_name, tp.name as plan_name
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE p.therapist_id = %s
+                    ORDER BY evs.submission_date DESC""",
+                (therapist.get("id"),)
+            )
+            submissions_result = cursor.fetchall()
+
+            submissions = []
+            for submission in submissions_result:
+                clean_submission = {}
+                for key, value in submission.items():
+                    if isinstance(value, bytes):
+                        clean_submission[key] = value.decode('utf-8')
+                    else:
+                        clean_submission[key] = value
+                clean_submission.update(preview_urls_for(clean_submission.get("video_url")))
+                submissions.append(clean_submission)
+
+            print(f"Found {len(submissions)} submissions for therapist_id: {therapist.get('id')}")
+
+            cursor.execute(
+                """SELECT COUNT(*) as pending_count
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE p.therapist_id = %s AND evs.status = 'Pending'""",
+                (session_data["user_id"],)
+            )
+            pending_count_result = cursor.fetchone()
+            pending_count = pending_count_result.get('pending_count', 0) if pending_count_result else 0
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (session_data["user_id"],)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/exercises/submissions.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "submissions": submissions,
+                    "pending_count": pending_count
+                }
+            )
+
+        except Exception as e:
+            print(f"Database error in exercise submissions: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/front-page")
+        finally:
+            cursor.close()
+            db.close()
+    except Exception as e:
+        print(f"Error in exercise submissions: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/debug/file-check/{filename}")
+async def debug_file_check(filename: str, request: Request):
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return {"error": "Not authenticated"}
+
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    absolute_path = os.path.abspath(file_path)
+
+    exists = os.path.exists(file_path)
+    is_file = os.path.isfile(file_path) if exists else False
+    readable = os.access(file_path, os.R_OK) if exists else False
+    size = os.path.getsize(file_path) if exists and is_file else 0
+
+    return {
+        "filename": filename,
+        "relative_path": file_path,
+        "absolute_path": absolute_path,
+        "exists": exists,
+        "is_file": is_file,
+        "readable": readable,
+        "size_bytes": size,
+        "upload_dir": UPLOAD_DIR,
+        "upload_dir_exists": os.path.exists(UPLOAD_DIR),
+        "upload_dir_is_dir": os.path.isdir(UPLOAD_DIR)
+    }
+
+
+@router.get("/exercises/submissions/{submission_id}")
+async def view_exercise_submission(request: Request, submission_id: int):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (user_id,)
+            )
+            therapist = cursor.fetchone()
+            if not therapist:
+                return RedirectResponse(url="/Therapist_Login")
+
+            cursor.execute(
+                """SELECT evs.*, p.first_name, p.last_name, p.patient_id,
+                    e.name as exercise_name, tp.name as plan_name
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, user_id)
+            )
+            submission = cursor.fetchone()
+            if not submission:
+                return RedirectResponse(url="/exercises/submissions")
+
+            cursor.execute(
+                """SELECT evs.*, e.name as exercise_name
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    WHERE evs.patient_id = %s
+                    AND evs.exercise_id = %s
+                    AND evs.submission_id != %s
+                    ORDER BY evs.submission_date DESC
+                    LIMIT 5""",
+                (submission.get('patient_id'), submission.get('exercise_id'), submission_id)
+            )
+            previous_submissions = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (user_id,)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            release_Mysql_db(db, cursor)
+            if submission and submission.get("video_url"):
+                filename = os.path.basename(submission.get("video_url"))
+                token = await generate_video_token(user_id, filename)
+                query_params = urlencode({"token": token})
+                submission["video_url"] = f"/api/uploads/exercise_videos/{filename}?{query_params}"
+                submission["hls_url"] = await hls_url_for(user_id, filename)
+                submission["processed_hls_url"] = await hls_url_for(user_id, processed_filename_for(filename))
+
+            return templates.TemplateResponse(
+                "dist/exercises/submission_detail.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "submission": submission,
+                    "previous_submissions": previous_submissions
+                }
+            )
+        except Exception as e:
+            print(f"Database error in submission detail: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/exercises/submissions")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in submission detail: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.post("/exercises/submissions/{submission_id}/feedback")
+async def provide_submission_feedback(
+    request: Request,
+    submission_id: int,
+    feedback: str = Form(...),
+    rating: str = Form(...)
+):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT evs.submission_id
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, user_id)
+            )
+
+            result = cursor.fetchone()
+            if not result:
+                print(f"Therapist {user_id} does not have access to submission {submission_id}")
+                return RedirectResponse(url="/exercises/submissions")
+
+            cursor.execute(
+                """UPDATE ExerciseVideoSubmissions
+                    SET therapist_feedback = %s,
+                        feedback_rating = %s,
+                        status = 'Feedback Provided',
+                        feedback_date = CURRENT_TIMESTAMP
+                    WHERE submission_id = %s""",
+                (feedback, rating, submission_id)
+            )
+
+            db.commit()
+            print(f"Feedback saved for submission {submission_id}")
+
+            return RedirectResponse(url=f"/exercises/submissions/{submission_id}", status_code=303)
+
+        except Exception as e:
+            print(f"Database error in providing feedback: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url=f"/exercises/submissions/{submission_id}")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in providing feedback: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+@router.get("/exercises/patient-submissions/{patient_id}")
+async def patient_exercise_submissions(request: Request, patient_id: int):
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return RedirectResponse(url="/Therapist_Login")
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return RedirectResponse(url="/Therapist_Login")
+
+        try:
+            user_id = int(session_data["user_id"])
+            print(f"User ID (int): {user_id}")
+        except (ValueError, TypeError):
+            user_id = session_data["user_id"]
+            print(f"User ID (original): {user_id}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                """SELECT id, first_name, last_name, profile_image
+                    FROM Therapists
+                    WHERE id = %s""",
+                (user_id,)
+            )
+            therapist_result = cursor.fetchone()
+            if not therapist_result:
+                return RedirectResponse(url="/Therapist_Login")
+
+            therapist = {}
+            for key, value in therapist_result.items():
+                if isinstance(value, bytes):
+                    therapist[key] = value.decode('utf-8')
+                else:
+                    therapist[key] = value
+
+            cursor.execute(
+                """SELECT * FROM Patients
+                    WHERE patient_id = %s AND therapist_id = %s""",
+                (patient_id, user_id)
+            )
+            patient_result = cursor.fetchone()
+            if not patient_result:
+                return RedirectResponse(url="/patients")
+
+            patient = {}
+            for key, value in patient_result.items():
+                if isinstance(value, bytes):
+                    patient[key] = value.decode('utf-8')
+                else:
+                    patient[key] = value
+
+            cursor.execute(
+                """SELECT evs.*, e.name as exercise_name, tp.name as plan_name
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE evs.patient_id = %s
+                    ORDER BY evs.submission_date DESC""",
+                (patient_id,)
+            )
+            submissions_result = cursor.fetchall()
+
+            submissions = []
+            for submission in submissions_result:
+                clean_submission = {}
+                for key, value in submission.items():
+                    if isinstance(value, bytes):
+                        clean_submission[key] = value.decode('utf-8')
+                    else:
+                        clean_submission[key] = value
+                submissions.append(clean_submission)
+
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM Messages WHERE recipient_id = %s AND recipient_type = 'therapist' AND is_read = FALSE",
+                (user_id,)
+            )
+            unread_count_result = cursor.fetchone()
+            unread_messages_count = unread_count_result.get('count', 0) if unread_count_result else 0
+
+            return templates.TemplateResponse(
+                "dist/exercises/patient_submissions.html",
+                {
+                    "request": request,
+                    "therapist": therapist,
+                    "first_name": therapist.get("first_name", ""),
+                    "last_name": therapist.get("last_name", ""),
+                    "unread_messages_count": unread_messages_count,
+                    "patient": patient,
+                    "submissions": submissions
+                }
+            )
+        except Exception as e:
+            print(f"Database error in patient exercise submissions: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return RedirectResponse(url="/patients")
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error in patient exercise submissions: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return RedirectResponse(url="/Therapist_Login")
+
+
+derived_video_ready = {"hls": hls_ready, "hls_processed": hls_ready, "preview": previews_ready}
+
+
+async def queue_derived_video_job(submission_id, video_path, kind, replace=False):
+    """
+    Queue an HLS/preview job for a stored video unless its output already exists.
+    With replace=True the output is rebuilt and swapped in over the existing one.
+    """
+    if not replace and derived_video_ready[kind](video_path):
+        return None
+    try:
+        job, _ = await enqueue_video_job(submission_id, video_path, {"replace": True} if replace else None, kind=kind)
+        return job
+    except Exception as e:
+        print(f"Could not queue {kind} job for {video_path}: {e}")
+        return None
+
+
+def video_file_lock(filename):
+    """
+    Held while submissions referencing a stored upload are added or removed. Uploads
+    are content addressed, so a new submission may reuse the file that deleting
+    another submission is about to drop.
+    """
+    return redis_lock(f"video_file:{filename}:lock")
+
+
+async def queue_post_upload_jobs(submission_id, video_path):
+    await queue_derived_video_job(submission_id, video_path, "preview")
+    await queue_derived_video_job(submission_id, video_path, "hls")
+
+
+async def resolve_submission_plan(user_id, exercise_id, treatment_plan_id):
+    """
+        (patient_id, plan_id, None) for a patient's exercise submission, or
+        (None, None, error response) when the exercise isn't in one of their plans.
+        """
+    patient = await fetch_one("SELECT patient_id FROM Patients WHERE user_id = %s", (user_id,))
+    if not patient:
+        return None, None, JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+    exercise_plans = await fetch_all(
+        """
+            SELECT tpe.plan_id
+            FROM TreatmentPlanExercises tpe
+            JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+            WHERE tpe.exercise_id = %s AND tp.patient_id = %s
+            """,
+        (exercise_id, patient["patient_id"])
+    )
+    if not exercise_plans:
+        return None, None, JSONResponse(
+            status_code=403,
+            content={"detail": "This exercise is not part of any of your treatment plans"}
+        )
+
+    plan_ids = [plan["plan_id"] for plan in exercise_plans]
+    plan_id = treatment_plan_id if treatment_plan_id in plan_ids else plan_ids[0]
+    return patient["patient_id"], plan_id, None
+
+
+@router.post("/api/exercises/video-submission")
+async def upload_exercise_video(request: Request):
+    """
+        API endpoint to upload an exercise video for therapist review.
+
+        Multipart fields: exercise_id, treatment_plan_id, notes (optional), video.
+        The body is parsed straight off the request stream, so the video is written
+        once to its .tmp file while its size is checked and its hash computed.
+        """
+    import traceback
+
+    try:
+        content_length = request.headers.get("content-length")
+        if content_length and int(content_length) > MAX_CONTENT_LENGTH:
+            print(f"⛔ File too large: {int(content_length) // (1024 * 1024)}MB exceeds limit of {MAX_CONTENT_LENGTH // (1024 * 1024)}MB")
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum allowed size is {MAX_CONTENT_LENGTH // (1024 * 1024)}MB"}
+            )
+        session_id = request.cookies.get("session_id")
+        if not session_id:
+            print("⛔ No session_id found in cookies")
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Not authenticated"}
+            )
+        session_data = await get_session_data(session_id)
+        if not session_data or not hasattr(session_data, 'user_id'):
+            print(f"⛔ Invalid session data for {session_id}")
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+        print(f"✅ Authenticated user_id: {user_id}")
+
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        temp_file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.mp4.tmp")
+        start_time = time.time()
+
+        print(f"📤 Starting video upload to {temp_file_path}")
+        try:
+            fields, video = await stream_multipart_upload(request, "video", temp_file_path, MAX_CONTENT_LENGTH)
+        except UploadStreamError as e:
+            print(f"⛔ Upload rejected: {e}")
+            return JSONResponse(status_code=e.status_code, content={"detail": str(e)})
+
+        def discard_upload(response):
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+            return response
+
+        exercise_id = fields.get("exercise_id")
+        treatment_plan_id = fields.get("treatment_plan_id")
+        notes = fields.get("notes") or None
+        print(f"Received video upload request: exercise_id={exercise_id}, treatment_plan_id={treatment_plan_id}")
+
+        if not video or not video.filename:
+            print("⛔ No video file provided")
+            return discard_upload(JSONResponse(
+                status_code=400,
+                content={"detail": "No video file provided"}
+            ))
+
+        print(f"File name: {video.filename}")
+        if not allowed_file(video.filename):
+            print(f"⛔ File type not allowed: {video.filename}")
+            return discard_upload(JSONResponse(
+                status_code=400,
+                content={"detail": "File type not allowed. Please upload MP4, MOV, AVI, or MKV files."}
+            ))
+
+        try:
+            exercise_id_int = int(exercise_id)
+            treatment_plan_id_int = int(treatment_plan_id)
+        except (TypeError, ValueError) as e:
+            print(f"⛔ Invalid ID format: {e}")
+            return discard_upload(JSONResponse(
+                status_code=400,
+                content={"detail": f"Invalid ID format: {str(e)}"}
+            ))
+
+        try:
+            patient_id, plan_id_to_use, error = await resolve_submission_plan(user_id, exercise_id_int, treatment_plan_id_int)
+            if error:
+                print(f"⛔ Submission rejected for user_id={user_id}, exercise_id={exercise_id_int}")
+                return discard_upload(error)
+            print(f"✅ Using patient_id={patient_id}, plan_id={plan_id_to_use}")
+        except Exception as e:
+            discard_upload(None)
+            print(f"⛔ Error resolving submission plan: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+
+        file_size = video.size
+        total_time = time.time() - start_time
+        mb_size = file_size / (1024 * 1024)
+        avg_speed = mb_size / total_time if total_time > 0 else 0
+
+        print(f"✅ Video saved successfully:")
+        print(f"   - File size: {mb_size:.2f}MB")
+        print(f"   - Upload time: {total_time:.2f} seconds")
+        print(f"   - Average speed: {avg_speed:.2f}MB/s")
+
+        print("💾 Saving submission to database...")
+
+        content_hash = video.content_hash
+        try:
+            async with video_file_lock(f"{content_hash}.mp4"):
+                filename, deduplicated = store_content_addressed(temp_file_path, UPLOAD_DIR, content_hash)
+                file_path = os.path.join(UPLOAD_DIR, filename)
+                if deduplicated:
+                    print(f"♻️ Identical video already stored, reusing {filename}")
+                video_url = f"/api/uploads/exercise_videos/{filename}"
+                try:
+                    submission_id = await execute(
+                        """
+                            INSERT INTO ExerciseVideoSubmissions
+                            (patient_id, exercise_id, treatment_plan_id, video_url, notes, status, file_size)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s)
+                            """,
+                        (patient_id, exercise_id_int, plan_id_to_use, video_url, notes, "Pending", file_size)
+                    )
+                except Exception:
+                    if not deduplicated and os.path.exists(file_path):
+                        os.remove(file_path)
+                    raise
+        except Exception as e:
+            discard_upload(None)
+            print(f"⛔ Database error: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+
+        print(f"✅ Video submission created successfully: submission_id={submission_id}")
+        await queue_post_upload_jobs(submission_id, file_path)
+
+        return {
+            "submission_id": submission_id,
+            "status": "success",
+            "message": "Video uploaded successfully for review",
+            "file_size_mb": file_size // (1024 * 1024),
+            "content_hash": content_hash,
+            "deduplicated": deduplicated
+        }
+
+    except Exception as e:
+        print(f"⛔ Unhandled error: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+async def get_resumable_upload_for(request: Request, upload_id: str):
+    """(upload, None) for the caller's own upload, or (None, error response)."""
+    session_id = request.cookies.get("session_id")
+    session_data = await get_session_data(session_id) if session_id else None
+    if not session_data:
+        return None, JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+    upload = await get_upload(upload_id)
+    if not upload or upload["user_id"] != session_data.user_id:
+        return None, JSONResponse(status_code=404, content={"detail": "Upload not found or expired"})
+    return upload, None
+
+
+@router.post("/api/exercises/video-submission/uploads")
+async def create_resumable_video_upload(request: Request):
+    session_id = request.cookies.get("session_id")
+    session_data = await get_session_data(session_id) if session_id else None
+    if not session_data:
+        return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+    try:
+        body = await request.json()
+        length = int(request.headers.get("upload-length") or body.get("length"))
+        exercise_id = int(body["exercise_id"])
+        treatment_plan_id = int(body["treatment_plan_id"])
+    except (ValueError, TypeError, KeyError) as e:
+        return JSONResponse(status_code=400, content={"detail": f"Invalid upload request: {str(e)}"})
+
+    if length <= 0:
+        return JSONResponse(status_code=400, content={"detail": "Upload-Length must be positive"})
+    if length > MAX_CONTENT_LENGTH:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"File too large. Maximum allowed size is {MAX_CONTENT_LENGTH // (1024 * 1024)}MB"}
+        )
+
+    _, _, error = await resolve_submission_plan(session_data.user_id, exercise_id, treatment_plan_id)
+    if error:
+        return error
+
+    upload = await create_upload(session_data.user_id, length, {
+        "exercise_id": exercise_id,
+        "treatment_plan_id": treatment_plan_id,
+        "notes": body.get("notes")
+    })
+    location = f"/api/exercises/video-submission/uploads/{upload['upload_id']}"
+    print(f"📤 Created resumable upload {upload['upload_id']} ({length // (1024 * 1024)}MB) for user {session_data.user_id}")
+    return JSONResponse(
+        status_code=201,
+        content={"upload_id": upload["upload_id"], "offset": 0, "length": length, "location": location},
+        headers={"Location": location, "Upload-Offset": "0", "Upload-Length": str(length)}
+    )
+
+
+@router.head("/api/exercises/video-submission/uploads/{upload_id}")
+async def get_resumable_video_upload_offset(request: Request, upload_id: str):
+    upload, error = await get_resumable_upload_for(request, upload_id)
+    if error:
+        return Response(status_code=error.status_code)
+    return Response(status_code=200, headers={
+        "Upload-Offset": str(upload["offset"]),
+        "Upload-Length": str(upload["length"]),
+        "Cache-Control": "no-store"
+    })
+
+
+@router.patch("/api/exercises/video-submission/uploads/{upload_id}")
+async def patch_resumable_video_upload(request: Request, upload_id: str):
+    upload, error = await get_resumable_upload_for(request, upload_id)
+    if error:
+        return error
+
+    if request.headers.get("content-type", "").split(";")[0].strip() != "application/offset+octet-stream":
+        return JSONResponse(status_code=415, content={"detail": "Content-Type must be application/offset+octet-stream"})
+
+    try:
+        offset = int(request.headers["upload-offset"])
+        checksum = parse_upload_checksum(request.headers.get("upload-checksum"))
+    except (KeyError, ValueError):
+        return JSONResponse(status_code=400, content={"detail": "Missing or invalid Upload-Offset header"})
+    except ResumableUploadError as e:
+        return JSONResponse(status_code=e.status_code, content={"detail": str(e)})
+
+    lock_token = await acquire_upload_lock(upload_id)
+    if not lock_token:
+        return JSONResponse(status_code=423, content={"detail": "Another chunk for this upload is in progress"})
+    try:
+        # Re-read under the lock: a chunk may have landed since the lookup above
+        upload = await get_upload(upload_id)
+        if not upload:
+            return JSONResponse(status_code=404, content={"detail": "Upload not found or expired"})
+        new_offset = await write_upload_chunk(
+            upload, offset, request.stream(), TEMP_UPLOAD_DIR, checksum, lock_token=lock_token
+        )
+    except ResumableUploadError as e:
+        current = await get_upload(upload_id)
+        current_offset = current["offset"] if current else upload["offset"]
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": str(e), "offset": current_offset},
+            headers={"Upload-Offset": str(current_offset)}
+        )
+    finally:
+        await release_upload_lock(upload_id, lock_token)
+
+    return Response(status_code=204, headers={"Upload-Offset": str(new_offset)})
+
+
+@router.post("/api/exercises/video-submission/uploads/{upload_id}/finalize")
+async def finalize_resumable_video_upload(request: Request, upload_id: str):
+    upload, error = await get_resumable_upload_for(request, upload_id)
+    if error:
+        return error
+
+    lock_token = await acquire_upload_lock(upload_id)
+    if not lock_token:
+        return JSONResponse(status_code=423, content={"detail": "Upload is busy"})
+    try:
+        # Re-read under the lock: a PATCH, DELETE or another finalize may have run
+        upload = await get_upload(upload_id)
+        if not upload:
+            return JSONResponse(status_code=404, content={"detail": "Upload not found or expired"})
+        if upload["offset"] != upload["length"]:
+            return JSONResponse(
+                status_code=409,
+                content={"detail": "Upload is incomplete", "offset": upload["offset"], "length": upload["length"]}
+            )
+
+        patient_id, plan_id, error = await resolve_submission_plan(
+            upload["user_id"], int(upload["exercise_id"]), int(upload["treatment_plan_id"])
+        )
+        if error:
+            return error
+
+        part_path = upload_part_path(TEMP_UPLOAD_DIR, upload_id)
+        content_hash = await asyncio.to_thread(hash_file, part_path)
+        filename = f"{content_hash}.mp4"
+        video_url = f"/api/uploads/exercise_videos/{filename}"
+        async with video_file_lock(filename):
+            # Row first, then the file move: if the insert fails the part file is
+            # still in place and the client can simply finalize again
+            submission_id = await execute(
+                """
+                    INSERT INTO ExerciseVideoSubmissions
+                    (patient_id, exercise_id, treatment_plan_id, video_url, notes, status, file_size)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                (patient_id, int(upload["exercise_id"]), plan_id, video_url, upload.get("notes"), "Pending", upload["length"])
+            )
+            try:
+                _, deduplicated = await asyncio.to_thread(store_content_addressed, part_path, UPLOAD_DIR, content_hash)
+            except Exception:
+                await execute("DELETE FROM ExerciseVideoSubmissions WHERE submission_id = %s", (submission_id,))
+                raise
+        await delete_upload(upload_id, TEMP_UPLOAD_DIR)
+        print(f"✅ Resumable upload {upload_id} finalized as submission {submission_id}")
+        await queue_post_upload_jobs(submission_id, os.path.join(UPLOAD_DIR, filename))
+
+        return {
+            "submission_id": submission_id,
+            "status": "success",
+            "message": "Video uploaded successfully for review",
+            "file_size_mb": upload["length"] // (1024 * 1024),
+            "content_hash": content_hash,
+            "deduplicated": deduplicated
+        }
+    except Exception as e:
+        print(f"⛔ Error finalizing resumable upload {upload_id}: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(status_code=500, content={"detail": f"Server error: {str(e)}"})
+    finally:
+        await release_upload_lock(upload_id, lock_token)
+
+
+@router.delete("/api/exercises/video-submission/uploads/{upload_id}")
+async def delete_resumable_video_upload(request: Request, upload_id: str):
+    upload, error = await get_resumable_upload_for(request, upload_id)
+    if error:
+        return error
+    lock_token = await acquire_upload_lock(upload_id)
+    if not lock_token:
+        return JSONResponse(status_code=423, content={"detail": "Upload is busy"})
+    try:
+        await delete_upload(upload_id, TEMP_UPLOAD_DIR)
+    finally:
+        await release_upload_lock(upload_id, lock_token)
+    return Response(status_code=204)
+
+
+@router.get("/api/user/video-submissions")
+async def get_user_video_submissions(request: Request):
+    """API endpoint to get all video submissions for the current user"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+
+            cursor.execute(
+                """
+                    SELECT
+                        evs.submission_id,
+                        evs.exercise_id,
+                        e.name as exercise_name,
+                        evs.treatment_plan_id,
+                        tp.name as treatment_plan_name,
+                        evs.video_url,
+                        evs.submission_date,
+                        evs.status,
+                        evs.therapist_feedback IS NOT NULL as has_feedback
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE evs.patient_id = %s
+                    ORDER BY evs.submission_date DESC
+                    """,
+                (patient_id,)
+            )
+
+            rows = cursor.fetchall()
+            release_Mysql_db(db, cursor)
+
+            submissions = []
+            for row in rows:
+                submission = dict(row)
+
+                if submission.get("submission_date"):
+                    submission["submission_date"] = submission.get("submission_date").isoformat()
+
+                submission["has_feedback"] = bool(submission.get("has_feedback"))
+                submission["hls_url"] = await hls_url_for(user_id, submission.get("video_url"))
+                submission.update(preview_urls_for(submission.get("video_url")))
+
+                submissions.append(submission)
+
+            response_data = []
+            for sub in submissions:
+                sub_dict = {}
+                for key, value in sub.items():
+                    if key == "has_feedback":
+                        sub_dict[key] = True if value else False
+                    else:
+                        sub_dict[key] = value
+                response_data.append(sub_dict)
+
+            return response_data
+
+        except Exception as e:
+            print(f"Database error in get user video submissions: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Error in get user video submissions: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/video-submissions/{submission_id}")
+async def get_video_submission_details(submission_id: int, request: Request):
+    """API endpoint to get detailed information about a specific video submission"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+
+            cursor.execute(
+                "SELECT patient_id FROM Patients WHERE user_id = %s",
+                (user_id,)
+            )
+            patient = cursor.fetchone()
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+
+            cursor.execute(
+                """
+                    SELECT
+                        evs.submission_id,
+                        evs.patient_id,
+                        evs.exercise_id,
+                        e.name as exercise_name,
+                        evs.treatment_plan_id,
+                        tp.name as treatment_plan_name,
+                        evs.video_url,
+                        evs.submission_date,
+                        evs.notes,
+                        evs.status,
+                        evs.therapist_feedback,
+                        evs.feedback_rating,
+                        evs.feedback_date
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Exercises e ON evs.exercise_id = e.exercise_id
+                    JOIN TreatmentPlans tp ON evs.treatment_plan_id = tp.plan_id
+                    WHERE evs.submission_id = %s AND evs.patient_id = %s
+                    """,
+                (submission_id, patient_id)
+            )
+
+            submission = cursor.fetchone()
+
+            if not submission:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Video submission not found or you don't have access to it"}
+                )
+
+            if submission and "video_url" in submission and submission.get("video_url"):
+                filename = os.path.basename(submission.get("video_url"))
+
+                release_Mysql_db(db, cursor)
+                token = await generate_video_token(user_id, filename)
+
+                query_params = urlencode({"token": token})
+                submission["video_url"] = f"{submission.get('video_url')}?{query_params}"
+
+            return submission
+
+        except Exception as e:
+            print(f"Database error in get video submission details: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Error in get video submission details: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.delete("/api/video-submissions/{submission_id}")
+async def delete_video_submission(submission_id: int, request: Request):
+    """API endpoint to delete a video submission"""
+    import traceback
+
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_session_data(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        user_id = session_data.user_id
+
+        try:
+            patient = await fetch_one("SELECT patient_id FROM Patients WHERE user_id = %s", (user_id,))
+
+            if not patient:
+                return JSONResponse(status_code=404, content={"detail": "Patient profile not found"})
+
+            patient_id = patient.get("patient_id")
+
+            submission = await fetch_one(
+                """
+                    SELECT video_url
+                    FROM ExerciseVideoSubmissions
+                    WHERE submission_id = %s AND patient_id = %s
+                    """,
+                (submission_id, patient_id)
+            )
+
+            if not submission:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Video submission not found or you don't have access to it"}
+                )
+
+            video_path = submission.get("video_url") or ""
+            filename = os.path.basename(video_path)
+
+            # Identical uploads share one content-addressed file. The delete, the count
+            # of remaining references and the file removal happen under the file's lock
+            # so an upload of the same clip can't start reusing it in between.
+            async with video_file_lock(filename):
+                await execute(
+                    "DELETE FROM ExerciseVideoSubmissions WHERE submission_id = %s AND patient_id = %s",
+                    (submission_id, patient_id)
+                )
+
+                if video_path.startswith("/api/uploads/exercise_videos/"):
+                    references = await fetch_one(
+                        "SELECT COUNT(*) AS references_left FROM ExerciseVideoSubmissions WHERE video_url = %s",
+                        (video_path,)
+                    )
+                    file_path = os.path.join(UPLOAD_DIR, filename)
+                    if references["references_left"] == 0:
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                        remove_hls(file_path)
+                        remove_previews(file_path)
+
+            return {
+                "status": "success",
+                "message": "Video submission deleted successfully"
+            }
+
+        except Exception as e:
+            print(f"Database error in delete video submission: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+
+    except Exception as e:
+        print(f"Error in delete video submission: {e}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/uploads/exercise_videos/{filename}")
+async def get_video_file(filename: str, request: Request, token: str = None):
+    """API endpoint to serve uploaded exercise videos with authentication"""
+    print(f"Video access request for file: {filename}")
+
+    print(f"All cookies: {request.cookies}")
+    print(f"Headers: {request.headers}")
+    print(f"Query params: {request.query_params}")
+
+
+    if not token and "token" in request.query_params:
+        token = request.query_params.get("token")
+        print(f"Found token in query params: {token}")
+
+
+    authenticated = False
+    user_id = None
+    session_id = request.cookies.get("session_id")
+
+    if session_id:
+        try:
+            session_data = await get_session_data(session_id)
+            if session_data:
+                authenticated = True
+                user_id = session_data.user_id
+                print(f"Authenticated via cookie, user_id: {user_id}")
+        except Exception as e:
+            print(f"Error checking session: {e}")
+
+
+    if not authenticated and token:
+        try:
+
+            verified_user_id = await verify_video_token(token, filename)
+            if verified_user_id:
+                authenticated = True
+                user_id = verified_user_id
+                print(f"Authenticated via token, user_id: {user_id}")
+        except Exception as e:
+            print(f"Error checking token: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+
+    if not authenticated:
+        print("Authentication failed - no valid cookie or token")
+        response = JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+        response.headers["Access-Control-Allow-Origin"] = request.headers.get("origin", "*")
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        return response
+
+    try:
+
+        file_path = os.path.join(UPLOAD_DIR, filename)
+        if not os.path.exists(file_path):
+            print(f"File does not exist: {file_path}")
+            print(f"Full path: {os.path.abspath(file_path)}")
+            print(f"Directory contents: {os.listdir(UPLOAD_DIR) if os.path.exists(UPLOAD_DIR) else 'Directory not found'}")
+            return JSONResponse(status_code=404, content={"detail": "File not found"})
+
+
+        response = RangeFileResponse(file_path, media_type="video/mp4")
+        response.headers["Access-Control-Allow-Origin"] = request.headers.get("origin", "*")
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        return response
+
+    except Exception as e:
+        print(f"Error in get_video_file: {str(e)}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+@router.get("/api/uploads/exercise_videos/processed_videos/{filename}")
+async def get_processed_video_file(filename: str, request: Request, token: str = None):
+    """Serve pose-processed videos (the URLs handed out by the processing endpoints)"""
+    user_id = None
+    session_id = request.cookies.get("session_id")
+    if session_id:
+        try:
+            session_data = await get_redis_session(session_id)
+            if session_data:
+                user_id = session_data["user_id"]
+        except Exception as e:
+            print(f"Error checking session: {e}")
+
+    if not user_id and token:
+        user_id = await verify_video_token(token, filename)
+
+    if not user_id:
+        response = JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+        response.headers["Access-Control-Allow-Origin"] = request.headers.get("origin", "*")
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        return response
+
+    file_path = os.path.join(PROCESSED_VIDEO_DIR, os.path.basename(filename))
+    if not os.path.exists(file_path):
+        return JSONResponse(status_code=404, content={"detail": "File not found"})
+
+    response = RangeFileResponse(file_path, media_type="video/mp4")
+    response.headers["Access-Control-Allow-Origin"] = request.headers.get("origin", "*")
+    response.headers["Access-Control-Allow-Credentials"] = "true"
+    return response
+
+
+async def hls_url_for(user_id, video_path):
+    """Tokenized master playlist URL for a video's HLS ladder, or None until it has been built."""
+    filename = os.path.basename(video_path or "")
+    if not filename or not hls_ready(filename):
+        return None
+    token = await generate_video_token(user_id, filename)
+    return f"/api/hls/{filename}/{HLS_MASTER_PLAYLIST}?{urlencode({'token': token})}"
+
+
+@router.get("/api/hls/{filename}/{asset:path}")
+async def get_hls_asset(filename: str, asset: str, request: Request, token: str = None):
+    """HLS playlists and segments for an uploaded or processed video (`filename` is the source video)"""
+    user_id = await verify_video_token(token, filename) if token else None
+    session_id = request.cookies.get("session_id")
+    if not user_id and session_id:
+        try:
+            therapist_session = await get_redis_session(session_id)
+            if therapist_session:
+                user_id = therapist_session["user_id"]
+            else:
+                session_data = await get_session_data(session_id)
+                user_id = session_data.user_id if session_data else None
+        except Exception as e:
+            print(f"Error checking session: {e}")
+
+    cors_headers = {
+        "Access-Control-Allow-Origin": request.headers.get("origin", "*"),
+        "Access-Control-Allow-Credentials": "true"
+    }
+    if not user_id:
+        return JSONResponse(status_code=401, content={"detail": "Not authenticated"}, headers=cors_headers)
+
+    file_path = hls_asset_path(filename, asset)
+    if not file_path or not os.path.exists(file_path):
+        return JSONResponse(status_code=404, content={"detail": "File not found"}, headers=cors_headers)
+
+    if asset.endswith(".m3u8"):
+        async with aiofiles.open(file_path) as playlist_file:
+            playlist = await playlist_file.read()
+        # Segment and variant URIs are relative, so they need the token carried over
+        return Response(
+            content=tokenize_playlist(playlist, token) if token else playlist,
+            media_type="application/vnd.apple.mpegurl",
+            headers={**cors_headers, "Cache-Control": "private, no-cache"}
+        )
+
+    return RangeFileResponse(
+        file_path,
+        media_type="video/mp2t",
+        headers={**cors_headers, "Cache-Control": "private, max-age=86400"}
+    )
+
+
+def preview_urls_for(video_path):
+    """Poster/sprite URLs for a submission video (None until the preview job has run)."""
+    filename = os.path.basename(video_path or "")
+    if not filename or not previews_ready(filename):
+        return {"poster_url": None, "poster_jpeg_url": None, "sprite_url": None, "sprite_meta_url": None}
+    base_url = f"/api/video-previews/{filename}"
+    return {
+        "poster_url": f"{base_url}/poster.webp",
+        "poster_jpeg_url": f"{base_url}/poster.jpg",
+        "sprite_url": f"{base_url}/sprite.jpg",
+        "sprite_meta_url": f"{base_url}/sprite.json",
+    }
+
+
+@router.get("/api/video-previews/{filename}/{asset}")
+async def get_video_preview(filename: str, asset: str, request: Request):
+    """Poster frames and sprite sheets; URLs are stable, so they are cacheable for a year"""
+    session_id = request.cookies.get("session_id")
+    authenticated = False
+    if session_id:
+        try:
+            authenticated = bool(await get_redis_session(session_id) or await get_session_data(session_id))
+        except Exception as e:
+            print(f"Error checking session: {e}")
+    if not authenticated:
+        return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+    if asset not in PREVIEW_ASSETS:
+        return JSONResponse(status_code=404, content={"detail": "File not found"})
+    file_path = preview_path_for(os.path.basename(filename), asset)
+    if not os.path.exists(file_path):
+        return JSONResponse(status_code=404, content={"detail": "File not found"})
+
+    # Uploads are content addressed, so a preview never changes under the same URL
+    return RangeFileResponse(
+        file_path,
+        media_type=PREVIEW_ASSETS[asset],
+        headers={"Cache-Control": "private, max-age=31536000, immutable"}
+    )
+
+
+@router.get("/api/debug/check-file/{filename}")
+async def debug_check_file(filename: str):
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    exists = os.path.exists(file_path)
+    readable = os.access(file_path, os.R_OK) if exists else False
+    file_size = os.path.getsize(file_path) if exists else 0
+
+    return {
+        "filename": filename,
+        "full_path": file_path,
+        "exists": exists,
+        "readable": readable,
+        "file_size_bytes": file_size,
+        "upload_dir": UPLOAD_DIR,
+        "absolute_path": os.path.abspath(file_path)
+    }
+
+
+@router.post("/exercises/submissions/{submission_id}/mark-reviewed")
+async def mark_submission_reviewed(submission_id: int, request: Request):
+    """Endpoint to mark a submission as reviewed by the therapist"""
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Not authenticated"}
+        )
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+        therapist_id = session_data.get("user_id")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+
+        try:
+            cursor = db.cursor()
+
+
+            cursor.execute(
+                "SELECT id FROM Therapists WHERE id = %s",
+                (therapist_id,)
+            )
+            therapist = cursor.fetchone()
+
+            if not therapist:
+                return JSONResponse(status_code=403, content={"detail": "Not authorized"})
+
+
+            cursor.execute(
+                """
+                    SELECT evs.submission_id, evs.status
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s
+                    """,
+                (submission_id, therapist_id)
+            )
+
+            submission = cursor.fetchone()
+            if not submission:
+                return JSONResponse(
+                    status_code=404,
+                    content={"detail": "Submission not found or not authorized to access"}
+                )
+
+
+            cursor.execute(
+                """
+                    UPDATE ExerciseVideoSubmissions
+                    SET status = 'Reviewed'
+                    WHERE submission_id = %s AND status = 'Pending'
+                    """,
+                (submission_id,)
+            )
+
+            db.commit()
+
+            return JSONResponse(
+                status_code=200,
+                content={"status": "success", "message": "Submission marked as reviewed"}
+            )
+
+        except Exception as e:
+            if db:
+                db.rollback()
+            print(f"Database error in mark submission reviewed: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Database error: {str(e)}"}
+            )
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+
+    except Exception as e:
+        print(f"Error in mark submission reviewed: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Server error: {str(e)}"}
+        )
+
+
+async def restore_cached_pose_video(submission_id, original_video_path, pose_quality):
+    """Processed path restored from the pose result cache, or None on a miss."""
+    try:
+        processed_path = await asyncio.to_thread(restore_pose_result, original_video_path, pose_quality)
+    except Exception as e:
+        print(f"Pose result cache lookup failed for {original_video_path}: {e}")
+        return None
+    if processed_path:
+        # The restored video may differ from the one the old ladder was cut from; the
+        # ladder is shared with other submissions of this clip, so replace it in place
+        await queue_derived_video_job(submission_id, processed_path, "hls_processed", replace=True)
+    return processed_path
+
+
+@router.post("/api/process_exercise_video/{submission_id}")
+async def process_exercise_video(request: Request, submission_id: int, quality: str = None):
+    print(f"Process video API called for submission: {submission_id}")
+    try:
+        pose_quality = get_pose_quality(quality)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        print(f"Session data: {session_data}")
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(
+                """SELECT evs.video_url
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, session_data["user_id"])
+            )
+            result = cursor.fetchone()
+            if not result:
+                print(f"No submission found for ID {submission_id} and therapist {session_data['user_id']}")
+                return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+            filename = os.path.basename(result.get("video_url", ""))
+            original_video_path = f"uploads/exercise_videos/{filename}"
+
+            if not os.path.exists(original_video_path):
+                print(f"Original video not found: {original_video_path}")
+                return JSONResponse(status_code=404, content={"error": "Original video file not found"})
+
+            print(f"Original video path: {original_video_path}")
+
+            original_filename = os.path.splitext(filename)[0]
+            processed_filename = f"{original_filename}_processed.mp4"
+            processed_video_path = f"uploads/exercise_videos/processed_videos/{processed_filename}"
+
+            file_exists = os.path.exists(processed_video_path)
+            file_size = os.path.getsize(processed_video_path) if file_exists else 0
+
+            print(f"Checking for processed video at: {processed_video_path}")
+            print(f"File exists: {file_exists}, File size: {file_size} bytes")
+
+            release_Mysql_db(db, cursor)
+            current_job = await get_video_job_for(original_video_path)
+
+            if file_exists and file_size > 0:
+                is_processing = is_job_active(current_job)
+
+                if is_processing:
+                    return JSONResponse(content={
+                        "status": "processing",
+                        "message": "Video is already being processed"
+                    })
+
+                return JSONResponse(content={
+                    "status": "already_processed",
+                    "filename": processed_filename,
+                    "download_url": f"/api/download_video/{processed_filename}?submission_id={submission_id}"
+                })
+
+            if is_job_active(current_job):
+                print(f"Submission {submission_id} is already being processed")
+                return JSONResponse(content={
+                    "status": "processing",
+                    "message": "Video is already being processed"
+                })
+
+            if file_exists and file_size == 0:
+                try:
+                    os.remove(processed_video_path)
+                    print(f"Removed invalid zero-size processed video file")
+                except Exception as e:
+                    print(f"Error removing invalid file: {e}")
+
+            if await restore_cached_pose_video(submission_id, original_video_path, pose_quality):
+                print(f"Served cached pose result for submission {submission_id}")
+                return JSONResponse(content={
+                    "status": "already_processed",
+                    "filename": processed_filename,
+                    "download_url": f"/api/download_video/{processed_filename}?submission_id={submission_id}",
+                    "cached": True
+                })
+
+            job, created = await enqueue_video_job(submission_id, original_video_path, {"quality": pose_quality.name})
+            if not created:
+                return JSONResponse(content={
+                    "status": "processing",
+                    "message": "Video is already being processed",
+                    "job_id": job["job_id"]
+                })
+
+            print(f"Processing queued for submission {submission_id} as job {job['job_id']}")
+            return JSONResponse(content={
+                "status": "processing",
+                "message": "Video processing started",
+                "job_id": job["job_id"],
+                "quality": pose_quality.name
+            })
+        except Exception as e:
+            print(f"Database error in process_exercise_video: {e}")
+            import traceback
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"error": f"Database error: {str(e)}"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error processing video: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+@router.get("/api/processed_video_status/{submission_id}")
+async def get_processed_video_status(request: Request, submission_id: int):
+    print(f"Status check for submission: {submission_id}")
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(
+                """SELECT evs.video_url
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, session_data["user_id"])
+            )
+            result = cursor.fetchone()
+            if not result:
+                return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+            filename = os.path.basename(result.get("video_url", ""))
+            release_Mysql_db(db, cursor)
+            job = await get_video_job_for(f"uploads/exercise_videos/{filename}")
+            is_processing = is_job_active(job)
+
+            print(f"Is submission {submission_id} being processed? {is_processing}")
+
+            original_filename = os.path.splitext(filename)[0]
+            processed_filename = f"{original_filename}_processed.mp4"
+            processed_video_path = f"uploads/exercise_videos/processed_videos/{processed_filename}"
+
+            file_exists = os.path.exists(processed_video_path)
+            file_size = os.path.getsize(processed_video_path) if file_exists else 0
+
+            print(f"Processed video exists? {file_exists}, File size: {file_size} bytes")
+
+            percent_complete = job["progress"] if is_processing else 0
+
+            if file_exists and file_size > 0 and not is_processing:
+                return JSONResponse(content={
+                    "ready": True,
+                    "is_processing": False,
+                    "filename": processed_filename,
+                    "download_url": f"/api/download_video/{processed_filename}?submission_id={submission_id}"
+                })
+            else:
+                return JSONResponse(content={
+                    "ready": False,
+                    "is_processing": is_processing,
+                    "percent_complete": percent_complete,
+                    "job_status": job["status"] if job else None,
+                    "attempts": job["attempts"] if job else 0,
+                    "error": job.get("error") if job and job["status"] in ("retrying", "dead") else None
+                })
+        except Exception as e:
+            print(f"Database error in processed_video_status: {e}")
+            import traceback
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"error": f"Database error: {str(e)}"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error checking processed video status: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+@router.get("/api/exercise_video_landmarks/{submission_id}")
+async def get_exercise_video_landmarks(
+    request: Request,
+    submission_id: int,
+    start_frame: int = None,
+    end_frame: int = None,
+    start_time: float = None,
+    end_time: float = None,
+    format: str = "json"
+):
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        result = await fetch_one(
+            """SELECT evs.video_url
+                FROM ExerciseVideoSubmissions evs
+                JOIN Patients p ON evs.patient_id = p.patient_id
+                WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+            (submission_id, session_data["user_id"])
+        )
+        if not result:
+            return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+        original_video_path = f"uploads/exercise_videos/{os.path.basename(result.get('video_url') or '')}"
+        landmarks, meta = await asyncio.to_thread(load_landmarks, original_video_path)
+        if landmarks is None:
+            return JSONResponse(status_code=404, content={"error": "No pose landmarks saved for this submission, process the video first"})
+
+        first, last = frame_range_for(meta, start_frame, end_frame, start_time, end_time)
+        if last - first > POSE_LANDMARK_MAX_FRAMES:
+            return JSONResponse(status_code=400, content={
+                "error": f"At most {POSE_LANDMARK_MAX_FRAMES} frames can be fetched per request"
+            })
+
+        rows = landmarks[first:last]
+        if format == "npy":
+            return Response(
+                content=await asyncio.to_thread(landmarks_to_npy_bytes, rows),
+                media_type="application/octet-stream",
+                headers={
+                    "X-Start-Frame": str(first),
+                    "X-End-Frame": str(last),
+                    "X-FPS": str(meta.get("fps"))
+                }
+            )
+
+        return JSONResponse(content={
+            "submission_id": submission_id,
+            "fps": meta.get("fps"),
+            "frame_count": meta["frame_count"],
+            "quality": meta.get("quality"),
+            "start_frame": first,
+            "end_frame": last,
+            "values": meta.get("values"),
+            "landmarks": await asyncio.to_thread(landmarks_to_json, rows)
+        })
+    except Exception as e:
+        print(f"Error fetching pose landmarks: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+async def get_processing_percent(video_path):
+    """Get an estimated percentage of video processing completion."""
+    job = await get_video_job_for(video_path)
+    return job["progress"] if is_job_active(job) else 0
+
+
+@router.post("/api/stop_exercise_video_processing/{submission_id}")
+async def stop_exercise_video_processing(request: Request, submission_id: int):
+    print(f"Stop processing API called for submission: {submission_id}")
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(
+                """SELECT evs.video_url
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, session_data["user_id"])
+            )
+            result = cursor.fetchone()
+            if not result:
+                return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+            filename = os.path.basename(result.get("video_url", ""))
+
+            release_Mysql_db(db, cursor)
+            job = await cancel_video_job(f"uploads/exercise_videos/{filename}")
+            stopped = job is not None
+            if stopped:
+                print(f"Stop requested for submission {submission_id}")
+                job = await wait_for_video_job(job["job_id"], 3)
+                if not is_job_active(job):
+                    print(f"Pose job for submission {submission_id} has stopped")
+
+            original_filename = os.path.splitext(filename)[0]
+            processed_filename = f"{original_filename}_processed.mp4"
+            processed_video_path = f"uploads/exercise_videos/processed_videos/{processed_filename}"
+
+            processed_exists = os.path.exists(processed_video_path) and os.path.getsize(processed_video_path) > 0
+            print(f"Processed video exists after stop? {processed_exists}")
+
+            processed_video_url = None
+            if processed_exists:
+                processed_token = await generate_video_token(session_data["user_id"], processed_filename)
+                processed_query_params = urlencode({"token": processed_token})
+                processed_video_url = f"/api/uploads/exercise_videos/processed_videos/{processed_filename}?{processed_query_params}"
+
+            if stopped and processed_exists:
+                return JSONResponse(content={
+                    "status": "stopped",
+                    "message": "Processing stopped and current progress saved",
+                    "processed_video_url": processed_video_url
+                })
+            elif stopped and not processed_exists:
+                return JSONResponse(content={
+                    "status": "error",
+                    "message": "Processing was stopped but no video could be created. This may be due to a codec issue."
+                })
+            elif not stopped and processed_exists:
+                return JSONResponse(content={
+                    "status": "already_processed",
+                    "message": "Video was already processed",
+                    "processed_video_url": processed_video_url
+                })
+            else:
+                return JSONResponse(content={
+                    "status": "no_processing",
+                    "message": "No active processing found for this submission"
+                })
+        except Exception as e:
+            print(f"Database error in stop_exercise_video_processing: {e}")
+            import traceback
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"error": f"Database error: {str(e)}"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error stopping video processing: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+@router.get("/api/download/{file_path:path}")
+async def download_file(request: Request, file_path: str):
+    print(f"Download requested for file: {file_path}")
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        token = request.query_params.get("token")
+        if not token:
+            return JSONResponse(status_code=401, content={"error": "Missing token"})
+
+        filename = os.path.basename(file_path)
+        valid_token = await verify_video_token(token, session_data["user_id"], filename)
+        if not valid_token:
+            return JSONResponse(status_code=401, content={"error": "Invalid token"})
+
+        full_path = f"uploads/{file_path}"
+
+        if not os.path.exists(full_path) or os.path.getsize(full_path) == 0:
+            print(f"File not found or empty: {full_path}")
+            return JSONResponse(status_code=404, content={"error": "File not found or empty"})
+
+        return FileResponse(
+            path=full_path,
+            filename=filename,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    except Exception as e:
+        print(f"Error downloading file: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+@router.get("/api/download_video/{filename}")
+async def download_video(request: Request, filename: str, submission_id: int):
+    print(f"Download video request for file: {filename} from submission: {submission_id}")
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(
+                """SELECT 1 as exists_flag
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, session_data["user_id"])
+            )
+            result = cursor.fetchone()
+            if not result:
+                return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+            processed_video_path = f"uploads/exercise_videos/processed_videos/{filename}"
+
+            if not os.path.exists(processed_video_path):
+                print(f"Processed video file not found: {processed_video_path}")
+                return JSONResponse(status_code=404, content={"error": "File not found"})
+
+            file_size = os.path.getsize(processed_video_path)
+            if file_size == 0:
+                print(f"Processed video file is empty: {processed_video_path}")
+                return JSONResponse(status_code=500, content={"error": "File exists but is empty"})
+
+            return RangeFileResponse(
+                processed_video_path,
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        except Exception as e:
+            print(f"Database error in download_video: {e}")
+            import traceback
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"error": f"Database error: {str(e)}"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error downloading video: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
+
+
+@router.post("/api/regenerate_exercise_video/{submission_id}")
+async def regenerate_exercise_video(request: Request, submission_id: int, quality: str = None, force: bool = False):
+    print(f"Regenerate video API called for submission: {submission_id}")
+    try:
+        pose_quality = get_pose_quality(quality)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+    try:
+        session_data = await get_redis_session(session_id)
+        if not session_data:
+            return JSONResponse(status_code=401, content={"error": "Unauthorized"})
+
+        db = await get_Mysql_db_async()
+        cursor = None
+        try:
+            cursor = db.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(
+                """SELECT evs.video_url
+                    FROM ExerciseVideoSubmissions evs
+                    JOIN Patients p ON evs.patient_id = p.patient_id
+                    WHERE evs.submission_id = %s AND p.therapist_id = %s""",
+                (submission_id, session_data["user_id"])
+            )
+            result = cursor.fetchone()
+            if not result:
+                return JSONResponse(status_code=404, content={"error": "Submission not found"})
+
+            filename = os.path.basename(result.get("video_url", ""))
+            original_video_path = f"uploads/exercise_videos/{filename}"
+
+            original_filename = os.path.splitext(filename)[0]
+            processed_filename = f"{original_filename}_processed.mp4"
+            processed_video_path = f"uploads/exercise_videos/processed_videos/{processed_filename}"
+
+            release_Mysql_db(db, cursor)
+            stopping_job = await cancel_video_job(original_video_path)
+            if stopping_job:
+                stopping_job = await wait_for_video_job(stopping_job["job_id"], 10)
+            if is_job_active(stopping_job):
+                return JSONResponse(status_code=409, content={
+                    "status": "processing",
+                    "message": "Previous processing run is still stopping, try again shortly"
+                })
+
+            if not force and await restore_cached_pose_video(submission_id, original_video_path, pose_quality):
+                print(f"Served cached pose result for submission {submission_id}")
+                return JSONResponse(content={
+                    "status": "already_processed",
+                    "filename": processed_filename,
+                    "download_url": f"/api/download_video/{processed_filename}?submission_id={submission_id}",
+                    "cached": True
+                })
+
+            # The processed video, its ladder and the landmarks are shared by every
+            # submission of this clip, so they are not deleted here: the new run
+            # replaces each of them atomically once it has finished
+            await cancel_video_job(processed_video_path, kind="hls_processed")
+
+            job, _ = await enqueue_video_job(submission_id, original_video_path, {"quality": pose_quality.name})
+
+            print(f"Regeneration queued for submission {submission_id} as job {job['job_id']}")
+            return JSONResponse(content={
+                "status": "processing",
+                "message": "Video regeneration started",
+                "job_id": job["job_id"],
+                "quality": pose_quality.name
+            })
+        except Exception as e:
+            print(f"Database error in regenerate_exercise_video: {e}")
+            import traceback
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"error": f"Database error: {str(e)}"})
+        finally:
+            if cursor:
+                cursor.close()
+            if db:
+                db.close()
+    except Exception as e:
+        print(f"Error regenerating video: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Server error: {str(e)}"})
@@ -0,0 +1,109 @@
+import json
+import os
+
+from connections.redis_database import r
+from connections.dashboard_metrics import DashboardMetrics, get_dashboard_metrics, count_unread_messages
+
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 300))
+DASHBOARD_CACHE_STATS_KEY = "dashboard_cache:stats"
+
+FRONT_PAGE_VIEW = "front_page"
+RECOVERY_VIEW = "recovery"
+DASHBOARD_VIEWS = (FRONT_PAGE_VIEW, RECOVERY_VIEW)
+
+
+def dashboard_cache_key(therapist_id, view):
+    return f"dashboard:{therapist_id}:{view}"
+
+
+async def _count(view, outcome):
+    try:
+        await r.hincrby(DASHBOARD_CACHE_STATS_KEY, f"{view}:{outcome}", 1)
+    except Exception as e:
+        print(f"Error updating dashboard cache stats: {e}")
+
+
+async def get_cached_dashboard_payload(therapist_id, view):
+    """Return the cached payload for a therapist's dashboard view, or None on a miss."""
+    try:
+        cached = await r.get(dashboard_cache_key(therapist_id, view))
+    except Exception as e:
+        print(f"Error reading dashboard cache: {e}")
+        cached = None
+
+    if cached:
+        try:
+            payload = json.loads(cached)
+            await _count(view, "hits")
+            return payload
+        except json.JSONDecodeError as e:
+            print(f"Discarding corrupt dashboard cache entry: {e}")
+
+    await _count(view, "misses")
+    return None
+
+
+async def set_cached_dashboard_payload(therapist_id, view, payload):
+    try:
+        await r.set(
+            dashboard_cache_key(therapist_id, view),
+            json.dumps(payload, default=str),
+            ex=DASHBOARD_CACHE_TTL
+        )
+    except Exception as e:
+        print(f"Error writing dashboard cache: {e}")
+
+
+async def invalidate_dashboard_cache(therapist_id):
+    """
+    Drop every cached dashboard view for a therapist.
+    Called by the write endpoints that change appointments, patients, plans or metrics.
+    """
+    if not therapist_id:
+        return
+    try:
+        await r.delete(*(dashboard_cache_key(therapist_id, view) for view in DASHBOARD_VIEWS))
+        await _count("all", "invalidations")
+    except Exception as e:
+        print(f"Error invalidating dashboard cache for therapist {therapist_id}: {e}")
+
+
+async def get_cached_dashboard_metrics(therapist_id):
+    """
+    DashboardMetrics for /front-page, served from Redis when possible.
+    The unread message count is always read live since messages are not an invalidation source.
+    """
+    payload = await get_cached_dashboard_payload(therapist_id, FRONT_PAGE_VIEW)
+    if payload is not None:
+        try:
+            metrics = DashboardMetrics(**payload)
+            metrics.unread_messages_count = await count_unread_messages(therapist_id)
+            return metrics
+        except TypeError as e:
+            print(f"Cached dashboard payload no longer matches DashboardMetrics: {e}")
+
+    metrics = await get_dashboard_metrics(therapist_id)
+    await set_cached_dashboard_payload(therapist_id, FRONT_PAGE_VIEW, metrics.as_dict())
+    return metrics
+
+
+async def get_dashboard_cache_stats():
+    try:
+        raw_stats = await r.hgetall(DASHBOARD_CACHE_STATS_KEY)
+    except Exception as e:
+        print(f"Error reading dashboard cache stats: {e}")
+        raw_stats = {}
+
+    stats = {}
+    for view in DASHBOARD_VIEWS:
+        hits = int(raw_stats.get(f"{view}:hits", 0))
+        misses = int(raw_stats.get(f"{view}:misses", 0))
+        total = hits + misses
+        stats[view] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0
+        }
+    stats["invalidations"] = int(raw_stats.get("all:invalidations", 0))
+    stats["ttl_seconds"] = DASHBOARD_CACHE_TTL
+    return stats
@@ -0,0 +1,272 @@
+import asyncio
+import datetime
+from dataclasses import dataclass, field, asdict
+from typing import List
+
+from connections.mysql_database import fetch_one, fetch_all, logger
+
+DAYS_OF_WEEK = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+KPI_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM Messages WHERE recipient_id = %(therapist_id)s AND is_read = FALSE) AS unread_messages_count,
+        a.appointments_count,
+        a.last_month_appointments_count,
+        p.active_patients_count,
+        p.new_patients_monthly,
+        p.last_month_new_patients_count,
+        tp.treatment_plans_count,
+        tp.new_plans_monthly,
+        tp.last_month_plans_count,
+        pm.average_adherence_rate,
+        pm.last_month_adherence_rate,
+        pm.avg_recovery_rate,
+        pm.progress_metric_value,
+        f.avg_satisfaction
+    FROM (
+        SELECT
+            COUNT(*) AS appointments_count,
+            COALESCE(SUM(CASE WHEN created_at < DATE_SUB(CURDATE(), INTERVAL 30 DAY) THEN 1 ELSE 0 END), 0) AS last_month_appointments_count
+        FROM Appointments
+        WHERE therapist_id = %(therapist_id)s
+    ) a
+    CROSS JOIN (
+        SELECT
+            COALESCE(SUM(CASE WHEN status = 'Active' THEN 1 ELSE 0 END), 0) AS active_patients_count,
+            COALESCE(SUM(CASE WHEN created_at >= DATE_FORMAT(CURDATE(), '%%Y-%%m-01') THEN 1 ELSE 0 END), 0) AS new_patients_monthly,
+            COALESCE(SUM(CASE WHEN created_at BETWEEN DATE_FORMAT(DATE_SUB(CURDATE(), INTERVAL 1 MONTH), '%%Y-%%m-01')
+                                          AND DATE_FORMAT(CURDATE(), '%%Y-%%m-01') THEN 1 ELSE 0 END), 0) AS last_month_new_patients_count
+        FROM Patients
+        WHERE therapist_id = %(therapist_id)s
+    ) p
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS treatment_plans_count,
+            COALESCE(SUM(CASE WHEN created_at >= DATE_FORMAT(CURDATE(), '%%Y-%%m-01') THEN 1 ELSE 0 END), 0) AS new_plans_monthly,
+            COALESCE(SUM(CASE WHEN created_at BETWEEN DATE_FORMAT(DATE_SUB(CURDATE(), INTERVAL 1 MONTH), '%%Y-%%m-01')
+                                          AND DATE_FORMAT(CURDATE(), '%%Y-%%m-01') THEN 1 ELSE 0 END), 0) AS last_month_plans_count
+        FROM TreatmentPlans
+        WHERE therapist_id = %(therapist_id)s
+    ) tp
+    CROSS JOIN (
+        SELECT
+            AVG(adherence_rate) AS average_adherence_rate,
+            AVG(CASE WHEN measurement_date BETWEEN DATE_FORMAT(DATE_SUB(CURDATE(), INTERVAL 1 MONTH), '%%Y-%%m-01')
+                                           AND DATE_FORMAT(CURDATE(), '%%Y-%%m-01') THEN adherence_rate END) AS last_month_adherence_rate,
+            AVG(recovery_progress) AS avg_recovery_rate,
+            AVG(functionality_score) AS progress_metric_value
+        FROM PatientMetrics
+        WHERE therapist_id = %(therapist_id)s
+    ) pm
+    CROSS JOIN (
+        SELECT AVG(rating) AS avg_satisfaction FROM feedback
+    ) f
+"""
+
+UNREAD_MESSAGES_QUERY = """
+    SELECT COUNT(*) AS count FROM Messages WHERE recipient_id = %s AND is_read = FALSE
+"""
+
+RECENT_PATIENTS_QUERY = """
+    SELECT p.patient_id, p.first_name, p.last_name, p.diagnosis, p.status,
+        COALESCE(AVG(pm.adherence_rate), 0) as adherence_rate
+    FROM Patients p
+    LEFT JOIN PatientMetrics pm ON p.patient_id = pm.patient_id
+    WHERE p.therapist_id = %s
+    GROUP BY p.patient_id
+    ORDER BY p.created_at DESC
+    LIMIT 5
+"""
+
+DAILY_ACTIVITY_QUERY = """
+    SELECT rollup_date as day, SUM(progress_count) as count
+    FROM PatientExerciseProgressDailyRollup
+    WHERE rollup_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+    AND therapist_id = %s
+    GROUP BY rollup_date
+"""
+
+PROGRESS_CHART_QUERY = """
+    SELECT rollup_date as day, SUM(functionality_sum) / NULLIF(SUM(functionality_count), 0) as score
+    FROM PatientMetricsDailyRollup
+    WHERE rollup_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+    AND therapist_id = %s
+    GROUP BY rollup_date
+    ORDER BY day
+"""
+
+
+@dataclass
+class DashboardMetrics:
+    unread_messages_count: int = 0
+    appointments_count: int = 0
+    last_month_appointments_count: int = 0
+    appointments_monthly_diff: int = 0
+    appointments_growth: float = 0.0
+    active_patients_count: int = 0
+    new_patients_monthly: int = 0
+    last_month_new_patients_count: int = 0
+    patient_growth: float = 0.0
+    treatment_plans_count: int = 0
+    new_plans_monthly: int = 0
+    last_month_plans_count: int = 0
+    plans_growth: float = 0.0
+    average_adherence_rate: float = 0.0
+    last_month_adherence_rate: float = 0.0
+    adherence_monthly_diff: float = 0.0
+    adherence_change: float = 0.0
+    adherence_trend_direction: str = "up"
+    adherence_trend_color: str = "success"
+    adherence_direction: str = "Up by"
+    weekly_completion_rate: int = 75
+    avg_recovery_rate: float = 0.0
+    avg_satisfaction: float = 0.0
+    patient_satisfaction: str = "Low"
+    progress_metric_value: float = 0.0
+    recent_patients: List[dict] = field(default_factory=list)
+    chart_data: List[dict] = field(default_factory=lambda: [{'day': day, 'count': 0} for day in DAYS_OF_WEEK])
+    monthly_chart_data: List[dict] = field(default_factory=list)
+    progress_data: List[dict] = field(default_factory=list)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _number(value, default=0):
+    return float(value) if value is not None else default
+
+
+def _apply_kpis(metrics, row):
+    if not row:
+        return
+
+    metrics.unread_messages_count = int(row.get('unread_messages_count') or 0)
+
+    metrics.appointments_count = int(row.get('appointments_count') or 0)
+    metrics.last_month_appointments_count = int(row.get('last_month_appointments_count') or 0)
+    metrics.appointments_monthly_diff = metrics.appointments_count - metrics.last_month_appointments_count
+    metrics.appointments_growth = round((metrics.appointments_monthly_diff / max(metrics.last_month_appointments_count, 1)) * 100, 1)
+
+    metrics.active_patients_count = int(row.get('active_patients_count') or 0)
+    metrics.new_patients_monthly = int(row.get('new_patients_monthly') or 0)
+    metrics.last_month_new_patients_count = int(row.get('last_month_new_patients_count') or 0)
+    metrics.patient_growth = round((metrics.new_patients_monthly / max(metrics.last_month_new_patients_count, 1)) * 100, 1)
+
+    metrics.treatment_plans_count = int(row.get('treatment_plans_count') or 0)
+    metrics.new_plans_monthly = int(row.get('new_plans_monthly') or 0)
+    metrics.last_month_plans_count = int(row.get('last_month_plans_count') or 0)
+    metrics.plans_growth = round((metrics.new_plans_monthly / max(metrics.last_month_plans_count, 1)) * 100, 1)
+
+    metrics.average_adherence_rate = round(_number(row.get('average_adherence_rate')), 1)
+    metrics.last_month_adherence_rate = _number(row.get('last_month_adherence_rate'))
+    metrics.adherence_monthly_diff = round(metrics.average_adherence_rate - metrics.last_month_adherence_rate, 1)
+    metrics.adherence_change = abs(metrics.adherence_monthly_diff)
+    if metrics.adherence_monthly_diff >= 0:
+        metrics.adherence_trend_direction = "up"
+        metrics.adherence_trend_color = "success"
+        metrics.adherence_direction = "Up by"
+    else:
+        metrics.adherence_trend_direction = "down"
+        metrics.adherence_trend_color = "warning"
+        metrics.adherence_direction = "Down"
+
+    metrics.avg_recovery_rate = round(_number(row.get('avg_recovery_rate')), 1)
+    metrics.progress_metric_value = _number(row.get('progress_metric_value'))
+
+    metrics.avg_satisfaction = _number(row.get('avg_satisfaction'))
+    if metrics.avg_satisfaction >= 4:
+        metrics.patient_satisfaction = "High"
+    elif metrics.avg_satisfaction >= 3:
+        metrics.patient_satisfaction = "Medium"
+    else:
+        metrics.patient_satisfaction = "Low"
+
+
+def _apply_recent_patients(metrics, rows):
+    recent_patients = []
+    for patient in rows:
+        status_color = "success"
+        if patient.get('status') == "Inactive":
+            status_color = "danger"
+        elif patient.get('status') == "At Risk":
+            status_color = "warning"
+
+        patient_with_color = dict(patient)
+        patient_with_color['status_color'] = status_color
+        patient_with_color['adherence_rate'] = round(_number(patient.get('adherence_rate')), 0)
+        recent_patients.append(patient_with_color)
+    metrics.recent_patients = recent_patients
+
+
+def _apply_activity_charts(metrics, rows, today=None):
+    """
+    Weekly (last 7 days by weekday) and monthly (last 30 days by day of month)
+    charts are both derived from the same per-day counts.
+    """
+    today = today or datetime.date.today()
+    week_start = today - datetime.timedelta(days=7)
+
+    weekly = {day: 0 for day in DAYS_OF_WEEK}
+    monthly = {}
+    for record in rows:
+        day = record.get('day')
+        count = int(record.get('count') or 0)
+        if not isinstance(day, datetime.date):
+            continue
+        if day >= week_start:
+            weekly[day.strftime('%a')] += count
+        day_of_month = day.strftime('%d')
+        monthly[day_of_month] = monthly.get(day_of_month, 0) + count
+
+    metrics.chart_data = [{'day': day, 'count': count} for day, count in weekly.items()]
+    metrics.monthly_chart_data = [{'date': date, 'count': monthly[date]} for date in sorted(monthly)]
+
+
+def _apply_progress_chart(metrics, rows):
+    metrics.progress_data = [
+        {'date': record['day'].strftime('%d %b'), 'score': _number(record.get('score'))}
+        for record in rows
+        if isinstance(record.get('day'), datetime.date)
+    ]
+
+
+async def count_unread_messages(therapist_id):
+    try:
+        row = await fetch_one(UNREAD_MESSAGES_QUERY, (therapist_id,))
+        return int(row.get('count') or 0) if row else 0
+    except Exception as e:
+        logger.error(f"Unread messages count failed for therapist {therapist_id}: {e}")
+        return 0
+
+
+async def get_dashboard_metrics(therapist_id):
+    """
+    Compute every KPI counter and chart series for the therapist dashboard.
+    The counters come from one conditional-aggregation query; the remaining
+    list/chart queries run concurrently on the async pool.
+    """
+    metrics = DashboardMetrics()
+
+    results = await asyncio.gather(
+        fetch_one(KPI_QUERY, {"therapist_id": therapist_id}),
+        fetch_all(RECENT_PATIENTS_QUERY, (therapist_id,)),
+        fetch_all(DAILY_ACTIVITY_QUERY, (therapist_id,)),
+        fetch_all(PROGRESS_CHART_QUERY, (therapist_id,)),
+        return_exceptions=True,
+    )
+    kpi_row, recent_patients, daily_activity, progress_chart = results
+
+    for name, result in zip(("KPI", "recent patients", "daily activity", "progress chart"), results):
+        if isinstance(result, Exception):
+            logger.error(f"Dashboard {name} query failed for therapist {therapist_id}: {result}")
+
+    if not isinstance(kpi_row, Exception):
+        _apply_kpis(metrics, kpi_row)
+    if not isinstance(recent_patients, Exception):
+        _apply_recent_patients(metrics, recent_patients)
+    if not isinstance(daily_activity, Exception):
+        _apply_activity_charts(metrics, daily_activity)
+    if not isinstance(progress_chart, Exception):
+        _apply_progress_chart(metrics, progress_chart)
+
+    return metrics
@@ -10,18 +10,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path as FilePath
 from fastapi import *
 from typing import Optional, Dict, List
-import cv2, bcrypt, user_agents, datetime
+import bcrypt, datetime
 from datetime import date, time, timedelta
 import traceback
 from contextlib import asynccontextmanager
-import uvicorn, secrets, qrcode, io, socket, time, shutil
+import uvicorn, secrets, io, socket, time, shutil
 import json
 import aiofiles
-import mediapipe as mp
 import time
 import subprocess
 import os
-import numpy as np
 import stat
 import threading
 from threading import Event
@@ -0,0 +1,325 @@
+"""
+Request, SQL query and Redis command timing, exposed in Prometheus text format.
+
+Three sources feed one in-process registry:
+    RequestTimingMiddleware   latency per method, route template and status code
+    QueryTimer / InstrumentedCursor
+                              latency, row counts and errors per query fingerprint,
+                              for both the pymysql pool and the aiomysql helpers
+    record_redis_command()    latency and errors per Redis command (see InstrumentedRedis)
+
+A query fingerprint is the SQL with comments dropped, literals and placeholders
+replaced by "?" and whitespace collapsed, so every execution of one statement
+shape lands in the same series. Queries slower than SLOW_QUERY_THRESHOLD_MS
+(0 disables) are logged on the "database.slow" logger by fingerprint; parameters
+are never logged. Series per metric are capped at METRICS_MAX_SERIES, past which
+new label sets are counted under "<other>".
+
+render_metrics() serialises everything for GET /metrics. Numbers are per
+process: with several uvicorn workers, each one is scraped on its own.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", 1000))
+LATENCY_BUCKETS = tuple(
+    float(bound) for bound in os.getenv(
+        "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+    ).split(",")
+)
+QUERY_FINGERPRINT_LENGTH = 300
+
+OVERFLOW_LABEL = "<other>"
+UNMATCHED_ROUTE = "<unmatched>"
+
+logger = logging.getLogger("metrics")
+slow_query_logger = logging.getLogger("database.slow")
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, label_names, max_series=METRICS_MAX_SERIES):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.max_series = max_series
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def _series_for(self, labels):
+        # Called with the lock held
+        series = self._series.get(labels)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                labels = (OVERFLOW_LABEL,) * len(self.label_names)
+                series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = self._new_series()
+        return series
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            snapshot = [
+                (labels, [list(part) if isinstance(part, list) else part for part in series])
+                for labels, series in self._series.items()
+            ]
+        for labels, series in sorted(snapshot):
+            lines.extend(self._render_series(labels, series))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self):
+        return [0]
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._series_for(labels)[0] += amount
+
+    def _render_series(self, labels, series):
+        yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(series[0])}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS, max_series=METRICS_MAX_SERIES):
+        super().__init__(name, help_text, label_names, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        # Per-bucket counts (not cumulative; render() sums them), sum, count
+        return [[0] * len(self.buckets), 0.0, 0]
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series_for(labels)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _render_series(self, labels, series):
+        bucket_counts, total, count = series[0], series[1], series[2]
+        names = self.label_names + ("le",)
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative += bucket_count
+            yield f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+        yield f"{self.name}_bucket{_format_labels(names, labels + ('+Inf',))} {count}"
+        yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}"
+        yield f"{self.name}_count{_format_labels(self.label_names, labels)} {count}"
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template and status.",
+    ("method", "route", "status")
+)
+query_duration = Histogram(
+    "db_query_duration_seconds", "MySQL statement execution time, by query fingerprint.", ("query",)
+)
+query_rows = Counter(
+    "db_query_rows_total", "Rows returned or affected by MySQL statements, by query fingerprint.", ("query",)
+)
+query_errors = Counter("db_query_errors_total", "MySQL statements that raised, by query fingerprint.", ("query",))
+slow_queries = Counter(
+    "db_slow_queries_total", "MySQL statements slower than SLOW_QUERY_THRESHOLD_MS, by query fingerprint.",
+    ("query",)
+)
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds", "Redis command round-trip time, by command.", ("command",)
+)
+redis_command_errors = Counter("redis_command_errors_total", "Redis commands that raised, by command.", ("command",))
+
+METRICS = (
+    request_duration, query_duration, query_rows, query_errors, slow_queries,
+    redis_command_duration, redis_command_errors,
+)
+
+_stats_sources = {}
+
+
+def register_stats_source(prefix, stats):
+    """Export the numeric values of stats() (a dict) as gauges named <prefix>_<key>."""
+    _stats_sources[prefix] = stats
+
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+@lru_cache(maxsize=2048)
+def query_fingerprint(query):
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    text = _STRING.sub("?", str(query))
+    text = _COMMENT.sub(" ", text)
+    text = _NUMBER.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    # IN (?, ?, ?) and VALUES (?, ?) vary with the number of items, not the shape
+    text = _VALUE_LIST.sub("(?)", text)
+    return " ".join(text.split())[:QUERY_FINGERPRINT_LENGTH]
+
+
+def record_query(query, seconds, rows=None, failed=False):
+    labels = (query_fingerprint(query),)
+    query_duration.observe(labels, seconds)
+    if failed:
+        query_errors.inc(labels)
+    elif rows is not None and rows > 0:
+        query_rows.inc(labels, rows)
+    if 0 < SLOW_QUERY_THRESHOLD_MS <= seconds * 1000:
+        slow_queries.inc(labels)
+        slow_query_logger.warning(
+            "Slow query: %.1f ms, %s rows%s: %s",
+            seconds * 1000, "?" if rows is None else rows, " (failed)" if failed else "", labels[0]
+        )
+
+
+class QueryTimer:
+    """
+    with QueryTimer(query) as timer:
+        cursor.execute(query, params)
+        timer.rows = cursor.rowcount
+    """
+    def __init__(self, query):
+        self.query = query
+        self.rows = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_query(self.query, time.perf_counter() - self._started, self.rows, failed=exc_type is not None)
+        return False
+
+
+class InstrumentedCursor:
+    """pymysql cursor proxy that times every execute()/executemany() with QueryTimer."""
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._cursor.__exit__(exc_type, exc, tb)
+
+    def execute(self, query, args=None):
+        with QueryTimer(query) as timer:
+            result = self._cursor.execute(query, args)
+            timer.rows = self._cursor.rowcount
+        return result
+
+    def executemany(self, query, args):
+        with QueryTimer(query) as timer:
+            result = self._cursor.executemany(query, args)
+            timer.rows = self._cursor.rowcount
+        return result
+
+
+def record_redis_command(command, seconds, failed=False):
+    if isinstance(command, bytes):
+        command = command.decode("utf-8", "replace")
+    labels = (str(command).split(" ", 1)[0].upper(),)
+    redis_command_duration.observe(labels, seconds)
+    if failed:
+        redis_command_errors.inc(labels)
+
+
+def route_label(scope):
+    """The matched route's template, never the raw path, so series stay bounded."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "app_root_path" in scope:
+        # Inside a Mount (static files): label by mount point
+        return scope["root_path"][len(scope["app_root_path"]):] + "/{path}"
+    if "endpoint" in scope and not scope.get("path_params"):
+        # Plain Starlette route without parameters: the path is the template
+        return scope["path"]
+    return UNMATCHED_ROUTE
+
+
+class RequestTimingMiddleware:
+    """Pure ASGI, like PlatformRoutingMiddleware; times until the response has been sent."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_duration.observe(
+                (scope["method"], route_label(scope), str(status)), time.perf_counter() - started
+            )
+
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for prefix, stats in sorted(_stats_sources.items()):
+        try:
+            values = stats()
+        except Exception as e:
+            logger.warning(f"Could not collect {prefix} stats: {e}")
+            continue
+        for key, value in sorted(values.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,195 @@
+"""
+Per-day rollups of PatientMetrics and PatientExerciseProgress.
+
+Each row holds the count and sum of every tracked column for one
+(therapist, patient, day) bucket, so averages over any range are
+SUM(x_sum) / SUM(x_count) and match AVG() over the raw rows exactly.
+
+Write paths call refresh_*_rollup() with their open cursor before committing,
+which rebuilds just the touched bucket inside the same transaction.
+Existing databases are filled with:
+    python -m connections.metrics_rollup --backfill [--since YYYY-MM-DD]
+"""
+import argparse
+
+import pymysql.cursors
+
+from connections.mysql_database import get_Mysql_db, logger
+
+PATIENT_METRICS_ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS `PatientMetricsDailyRollup` (
+      `therapist_id` int NOT NULL,
+      `patient_id` int NOT NULL,
+      `rollup_date` date NOT NULL,
+      `metric_count` int NOT NULL DEFAULT '0',
+      `adherence_count` int NOT NULL DEFAULT '0',
+      `adherence_sum` decimal(12,2) NOT NULL DEFAULT '0.00',
+      `recovery_count` int NOT NULL DEFAULT '0',
+      `recovery_sum` decimal(12,2) NOT NULL DEFAULT '0.00',
+      `functionality_count` int NOT NULL DEFAULT '0',
+      `functionality_sum` bigint NOT NULL DEFAULT '0',
+      `pain_count` int NOT NULL DEFAULT '0',
+      `pain_sum` bigint NOT NULL DEFAULT '0',
+      `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+      PRIMARY KEY (`therapist_id`,`patient_id`,`rollup_date`),
+      KEY `patient_date` (`patient_id`,`rollup_date`),
+      KEY `therapist_date` (`therapist_id`,`rollup_date`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+"""
+
+EXERCISE_PROGRESS_ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS `PatientExerciseProgressDailyRollup` (
+      `therapist_id` int NOT NULL,
+      `patient_id` int NOT NULL,
+      `rollup_date` date NOT NULL,
+      `progress_count` int NOT NULL DEFAULT '0',
+      `pain_count` int NOT NULL DEFAULT '0',
+      `pain_sum` bigint NOT NULL DEFAULT '0',
+      `difficulty_count` int NOT NULL DEFAULT '0',
+      `difficulty_sum` bigint NOT NULL DEFAULT '0',
+      `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+      PRIMARY KEY (`therapist_id`,`patient_id`,`rollup_date`),
+      KEY `patient_date` (`patient_id`,`rollup_date`),
+      KEY `therapist_date` (`therapist_id`,`rollup_date`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+"""
+
+PATIENT_METRICS_ROLLUP_SELECT = """
+    SELECT therapist_id, patient_id, measurement_date,
+        COUNT(*),
+        COUNT(adherence_rate), COALESCE(SUM(adherence_rate), 0),
+        COUNT(recovery_progress), COALESCE(SUM(recovery_progress), 0),
+        COUNT(functionality_score), COALESCE(SUM(functionality_score), 0),
+        COUNT(pain_level), COALESCE(SUM(pain_level), 0)
+    FROM PatientMetrics
+"""
+
+PATIENT_METRICS_ROLLUP_INSERT = """
+    INSERT INTO PatientMetricsDailyRollup
+    (therapist_id, patient_id, rollup_date, metric_count,
+    adherence_count, adherence_sum, recovery_count, recovery_sum,
+    functionality_count, functionality_sum, pain_count, pain_sum)
+"""
+
+EXERCISE_PROGRESS_ROLLUP_SELECT = """
+    SELECT tp.therapist_id, pep.patient_id, pep.completion_date,
+        COUNT(*),
+        COUNT(pep.pain_level), COALESCE(SUM(pep.pain_level), 0),
+        COUNT(pep.difficulty_level), COALESCE(SUM(pep.difficulty_level), 0)
+    FROM PatientExerciseProgress pep
+    JOIN TreatmentPlanExercises tpe ON pep.plan_exercise_id = tpe.plan_exercise_id
+    JOIN TreatmentPlans tp ON tpe.plan_id = tp.plan_id
+"""
+
+EXERCISE_PROGRESS_ROLLUP_INSERT = """
+    INSERT INTO PatientExerciseProgressDailyRollup
+    (therapist_id, patient_id, rollup_date, progress_count,
+    pain_count, pain_sum, difficulty_count, difficulty_sum)
+"""
+
+
+def ensure_rollup_tables(cursor):
+    cursor.execute(PATIENT_METRICS_ROLLUP_DDL)
+    cursor.execute(EXERCISE_PROGRESS_ROLLUP_DDL)
+
+
+def refresh_patient_metrics_rollup(cursor, patient_id, day=None):
+    """
+    Rebuild the PatientMetrics bucket(s) for one patient and day (None = today).
+    Safe after inserts, updates and deletes; the caller commits. Errors are left to
+    the caller's rollback: the DELETE must never be committed without its INSERT.
+    """
+    cursor.execute(
+        "DELETE FROM PatientMetricsDailyRollup WHERE patient_id = %s AND rollup_date = COALESCE(%s, CURDATE())",
+        (patient_id, day)
+    )
+    cursor.execute(
+        PATIENT_METRICS_ROLLUP_INSERT + PATIENT_METRICS_ROLLUP_SELECT + """
+        WHERE patient_id = %s AND measurement_date = COALESCE(%s, CURDATE())
+        GROUP BY therapist_id, patient_id, measurement_date""",
+        (patient_id, day)
+    )
+
+
+def refresh_exercise_progress_rollup(cursor, patient_id, day=None):
+    """
+    Rebuild the PatientExerciseProgress bucket(s) for one patient and day (None = today).
+    Safe after inserts, updates and deletes; the caller commits. Errors are left to
+    the caller's rollback: the DELETE must never be committed without its INSERT.
+    """
+    cursor.execute(
+        "DELETE FROM PatientExerciseProgressDailyRollup WHERE patient_id = %s AND rollup_date = COALESCE(%s, CURDATE())",
+        (patient_id, day)
+    )
+    cursor.execute(
+        EXERCISE_PROGRESS_ROLLUP_INSERT + EXERCISE_PROGRESS_ROLLUP_SELECT + """
+        WHERE pep.patient_id = %s AND pep.completion_date = COALESCE(%s, CURDATE())
+        GROUP BY tp.therapist_id, pep.patient_id, pep.completion_date""",
+        (patient_id, day)
+    )
+
+
+def backfill_rollups(since=None):
+    """Recompute both rollup tables from the raw rows, optionally only from `since` onwards."""
+    db = get_Mysql_db()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        ensure_rollup_tables(cursor)
+
+        cursor.execute(
+            "DELETE FROM PatientMetricsDailyRollup WHERE rollup_date >= COALESCE(%s, '1000-01-01')",
+            (since,)
+        )
+        cursor.execute(
+            PATIENT_METRICS_ROLLUP_INSERT + PATIENT_METRICS_ROLLUP_SELECT + """
+            WHERE measurement_date >= COALESCE(%s, '1000-01-01')
+            GROUP BY therapist_id, patient_id, measurement_date""",
+            (since,)
+        )
+        metrics_buckets = cursor.rowcount
+
+        cursor.execute(
+            "DELETE FROM PatientExerciseProgressDailyRollup WHERE rollup_date >= COALESCE(%s, '1000-01-01')",
+            (since,)
+        )
+        cursor.execute(
+            EXERCISE_PROGRESS_ROLLUP_INSERT + EXERCISE_PROGRESS_ROLLUP_SELECT + """
+            WHERE pep.completion_date >= COALESCE(%s, '1000-01-01')
+            GROUP BY tp.therapist_id, pep.patient_id, pep.completion_date""",
+            (since,)
+        )
+        progress_buckets = cursor.rowcount
+
+        db.commit()
+        logger.info(f"Backfilled {metrics_buckets} metrics buckets and {progress_buckets} exercise progress buckets")
+        return {"patient_metrics": metrics_buckets, "exercise_progress": progress_buckets}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+        db.close()
+
+
+def create_rollup_tables():
+    db = get_Mysql_db()
+    cursor = db.cursor()
+    try:
+        ensure_rollup_tables(cursor)
+        db.commit()
+    finally:
+        cursor.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the PatientMetrics / PatientExerciseProgress daily rollups")
+    parser.add_argument("--backfill", action="store_true", help="recompute the rollup tables from the raw rows")
+    parser.add_argument("--since", help="only backfill buckets on or after this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.backfill:
+        print(backfill_rollups(args.since))
+    else:
+        create_rollup_tables()
+        print("Rollup tables are in place")
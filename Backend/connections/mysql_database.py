@@ -1,43 +1,347 @@
 import pymysql
 import pymysql.cursors
+import aiomysql
+import asyncio
 from connections.functions import *
 import os
 import time
-import bcrypt
+import threading
+import collections
+from connections.password_hashing import password_hasher
+from connections.instrumentation import InstrumentedCursor, QueryTimer
 from fastapi import HTTPException
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+logging.basicConfig(level=LOG_LEVEL)
 logger = logging.getLogger("database")
 
+MYSQL_POOL_MIN_SIZE = int(os.getenv("MYSQL_POOL_MIN_SIZE", 2))
+MYSQL_POOL_MAX_SIZE = int(os.getenv("MYSQL_POOL_MAX_SIZE", 20))
+MYSQL_POOL_RECYCLE = int(os.getenv("MYSQL_POOL_RECYCLE", 3600))
+MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", 30))
+
+class PooledConnection:
+    """
+    Thin proxy around a pooled pymysql connection.
+    close() hands the connection back to the pool instead of tearing down the socket.
+    """
+    def __init__(self, pool, connection, created_at):
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        connection = self.__dict__.get("_connection")
+        if connection is None:
+            raise AttributeError(name)
+        return getattr(connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __bool__(self):
+        # False once handed back, so the usual `if db: db.rollback()` guards skip it
+        return not self.__dict__.get("_released", True)
+
+    def cursor(self, cursor=None):
+        return InstrumentedCursor(self._connection.cursor(cursor))
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def close(self):
+        if self.__dict__.get("_released", True):
+            return
+        self._released = True
+        # Drop our reference so a stray use after close() fails instead of touching
+        # a connection that another caller may have borrowed by now
+        self._pool.release(self.__dict__.pop("_connection"), self._created_at)
+
+class MySQLConnectionPool:
+    def __init__(self, min_size, max_size, recycle, timeout, **connect_kwargs):
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.recycle = recycle
+        self.timeout = timeout
+        self.connect_kwargs = connect_kwargs
+        self._idle = collections.deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._warmed = False
+
+    def _connect(self):
+        host = self.connect_kwargs.get("host")
+        port = self.connect_kwargs.get("port")
+        logger.debug(f"Opening pooled MySQL connection to {host}:{port}")
+        connection = pymysql.connect(**self.connect_kwargs)
+        return connection, time.monotonic()
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, connection, created_at):
+        if self.recycle > 0 and time.monotonic() - created_at > self.recycle:
+            logger.debug("Recycling pooled MySQL connection past its max age")
+            return False
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled MySQL connection failed health check: {e}")
+            return False
+
+    def _warm_up(self):
+        with self._condition:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            try:
+                connection, created_at = self._connect()
+            except Exception as e:
+                logger.error(f"Failed to pre-open pooled MySQL connection: {e}")
+                with self._condition:
+                    self._size -= 1
+                continue
+            with self._condition:
+                self._idle.append((connection, created_at))
+                self._condition.notify()
+
+    def acquire(self, blocking=True):
+        """
+        Borrow a connection, waiting up to `timeout` seconds for one to be returned
+        when the pool is exhausted. With blocking=False, returns None instead of waiting.
+        """
+        if not self._warmed:
+            self._warm_up()
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if not blocking:
+                        return None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"Timed out after {self.timeout}s waiting for a MySQL connection "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._condition.wait(remaining)
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if entry is None:
+                try:
+                    connection, created_at = self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                return PooledConnection(self, connection, created_at)
+
+            connection, created_at = entry
+            if self._is_healthy(connection, created_at):
+                return PooledConnection(self, connection, created_at)
+            self._discard(connection)
+
+    async def acquire_async(self):
+        """
+        acquire() for coroutines. Waiting on the pool's condition from the event loop
+        would stall the very coroutines that hold connections and could return them,
+        so when the pool is exhausted the wait happens on a worker thread instead.
+        """
+        connection = self.acquire(blocking=False)
+        if connection is None:
+            connection = await asyncio.to_thread(self.acquire)
+        return connection
+
+    def release(self, connection, created_at):
+        try:
+            if not connection.open:
+                raise pymysql.err.InterfaceError("connection already closed")
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, created_at))
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+            }
+
+    def close_all(self):
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._warmed = False
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+def mysql_connection_settings():
+    return {
+        "host": os.getenv("MYSQL_HOST", "mysql.railway.internal"),
+        "port": int(os.getenv("MYSQL_PORT", 3306)),
+        "user": os.getenv("MYSQL_USER", "root"),
+        "password": os.getenv("MYSQL_PASSWORD", "zgOcgtuHZLmHfTBxpxAgCaEzgeVnOEII"),
+        "database": os.getenv("MYSQL_DB", "railway"),
+    }
+
+_mysql_pool = None
+_mysql_pool_lock = threading.Lock()
+
+def get_mysql_pool():
+    global _mysql_pool
+    if _mysql_pool is None:
+        with _mysql_pool_lock:
+            if _mysql_pool is None:
+                _mysql_pool = MySQLConnectionPool(
+                    min_size=MYSQL_POOL_MIN_SIZE,
+                    max_size=MYSQL_POOL_MAX_SIZE,
+                    recycle=MYSQL_POOL_RECYCLE,
+                    timeout=MYSQL_POOL_TIMEOUT,
+                    **mysql_connection_settings()
+                )
+    return _mysql_pool
+
+def mysql_pool_stats():
+    return _mysql_pool.stats() if _mysql_pool is not None else {}
+
 def get_Mysql_db():
+    """
+    Borrow a connection from the process-wide pool.
+    Callers keep calling db.close() when done; that returns the connection to the pool.
+    """
     try:
-        host = os.getenv("MYSQL_HOST", "mysql.railway.internal")
-        port = int(os.getenv("MYSQL_PORT", 3306))
-        user = os.getenv("MYSQL_USER", "root")
-        password = os.getenv("MYSQL_PASSWORD", "zgOcgtuHZLmHfTBxpxAgCaEzgeVnOEII")
-        database = os.getenv("MYSQL_DB", "railway")
-        
-        logger.debug(f"Connecting to MySQL at {host}:{port}")
-        
-        connection = pymysql.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=database
-        )
-        
-        logger.debug("Connection successful")
-        return connection
+        return get_mysql_pool().acquire()
     except Exception as e:
         logger.error(f"Database connection failed: {e}", exc_info=True)
         raise
 
+async def get_Mysql_db_async():
+    """get_Mysql_db() for async handlers: waits for a free connection without blocking the event loop."""
+    try:
+        return await get_mysql_pool().acquire_async()
+    except Exception as e:
+        logger.error(f"Database connection failed: {e}", exc_info=True)
+        raise
+
+def release_Mysql_db(db, cursor=None):
+    """
+    Close the cursor and hand the connection back to the pool ahead of the handler's
+    finally block, so it isn't held while the handler awaits unrelated I/O (Redis,
+    the aiomysql pool, the request body). Closing both again later is a no-op.
+    """
+    if cursor:
+        cursor.close()
+    if db:
+        db.close()
+
+_async_mysql_pool = None
+_async_mysql_pool_lock = None
+
+async def get_async_mysql_pool():
+    """
+    Lazily create the aiomysql pool on the running event loop.
+    Uses the same MYSQL_POOL_* limits as the blocking pool.
+    """
+    global _async_mysql_pool, _async_mysql_pool_lock
+    if _async_mysql_pool is not None:
+        return _async_mysql_pool
+    if _async_mysql_pool_lock is None:
+        _async_mysql_pool_lock = asyncio.Lock()
+    async with _async_mysql_pool_lock:
+        if _async_mysql_pool is None:
+            settings = mysql_connection_settings()
+            logger.debug(f"Creating async MySQL pool for {settings['host']}:{settings['port']}")
+            _async_mysql_pool = await aiomysql.create_pool(
+                host=settings["host"],
+                port=settings["port"],
+                user=settings["user"],
+                password=settings["password"],
+                db=settings["database"],
+                minsize=MYSQL_POOL_MIN_SIZE,
+                maxsize=MYSQL_POOL_MAX_SIZE,
+                pool_recycle=MYSQL_POOL_RECYCLE,
+                autocommit=True,
+            )
+    return _async_mysql_pool
+
+async def close_async_mysql_pool():
+    global _async_mysql_pool
+    if _async_mysql_pool is None:
+        return
+    pool = _async_mysql_pool
+    _async_mysql_pool = None
+    pool.close()
+    await pool.wait_closed()
+
+async def fetch_one(query, params=None):
+    """Run a SELECT on the async pool and return the first row as a dict (or None)."""
+    pool = await get_async_mysql_pool()
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            with QueryTimer(query) as timer:
+                await cursor.execute(query, params)
+                timer.rows = cursor.rowcount
+            return await cursor.fetchone()
+
+async def fetch_all(query, params=None):
+    """Run a SELECT on the async pool and return every row as a list of dicts."""
+    pool = await get_async_mysql_pool()
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            with QueryTimer(query) as timer:
+                await cursor.execute(query, params)
+                timer.rows = cursor.rowcount
+            return list(await cursor.fetchall())
+
+async def execute(query, params=None):
+    """Run a write statement on the async pool and return the last inserted id."""
+    pool = await get_async_mysql_pool()
+    async with pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            with QueryTimer(query) as timer:
+                await cursor.execute(query, params)
+                timer.rows = cursor.rowcount
+            return cursor.lastrowid
+
 def Register_User_Web(first_name, last_name, company_email, password):
     db = get_Mysql_db()
     cursor = db.cursor(pymysql.cursors.DictCursor)
-    hashed_password = bcrypt.hashpw(password.password.encode("utf-8"), bcrypt.gensalt())
+    hashed_password = password_hasher.hash_blocking(password)
     try:
         logger.debug(f"Registering user: {first_name} {last_name}, {company_email}")
         cursor.execute("SELECT COUNT(*) AS count FROM Therapists WHERE first_name = %s AND last_name = %s", (first_name, last_name))
@@ -50,7 +354,7 @@ def Register_User_Web(first_name, last_name, company_email, password):
             
         cursor.execute(
             "INSERT INTO Therapists (first_name, last_name, company_email, password) VALUES (%s, %s, %s, %s)",
-            (first_name, last_name, company_email, hashed_password.decode("utf-8"))
+            (first_name, last_name, company_email, hashed_password)
         )
         db.commit()
         logger.debug("User registered successfully")
@@ -66,7 +370,7 @@ def Register_User_Web(first_name, last_name, company_email, password):
         db.close()
         
 async def get_exercise_categories():
-    db = get_Mysql_db()
+    db = await get_Mysql_db_async()
     cursor = None
     
     try:
@@ -83,23 +387,14 @@ async def get_exercise_categories():
             db.close()
             
 async def user_profile(user_id):
-    db = get_Mysql_db()
-    cursor = None
     try:
-        cursor = db.cursor(pymysql.cursors.DictCursor)
-        cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
-        return cursor.fetchall()
+        return await fetch_all("SELECT * FROM users WHERE user_id = %s", (user_id,))
     except Exception as e:
         logger.error(f"Error fetching patient profile: {e}", exc_info=True)
         return []
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
 
 async def user_patient_profile(user_id):
-    db = get_Mysql_db()
+    db = await get_Mysql_db_async()
     cursor = None
     try:
         cursor = db.cursor(pymysql.cursors.DictCursor)
@@ -115,23 +410,14 @@ async def user_patient_profile(user_id):
             db.close()
 
 async def get_therapist_data(therapist_id):
-    db = get_Mysql_db()
-    cursor = None
     try:
-        cursor = db.cursor(pymysql.cursors.DictCursor)
-        cursor.execute("SELECT * FROM Therapists WHERE id = %s", (therapist_id,))
-        return cursor.fetchall()
+        return await fetch_all("SELECT * FROM Therapists WHERE id = %s", (therapist_id,))
     except Exception as e:
         logger.error(f"Error fetching therapist profile: {e}", exc_info=True)
         return []
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
 
 async def get_appointment_data(patient_id):
-    db = get_Mysql_db()
+    db = await get_Mysql_db_async()
     cursor = None
     try:
         cursor = db.cursor(pymysql.cursors.DictCursor)
@@ -147,23 +433,14 @@ async def get_appointment_data(patient_id):
             db.close()
 
 async def get_treatment_plans(patient_id):
-    db = get_Mysql_db()
-    cursor = None
     try:
-        cursor = db.cursor(pymysql.cursors.DictCursor)
-        cursor.execute("SELECT * FROM TreatmentPlans WHERE patient_id = %s", (patient_id,))
-        return cursor.fetchall()
+        return await fetch_all("SELECT * FROM TreatmentPlans WHERE patient_id = %s", (patient_id,))
     except Exception as e:
         logger.error(f"Error fetching treatment plans: {e}", exc_info=True)
         return []
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
 
 async def get_treatment_plan_exercises(plan_id):
-    db = get_Mysql_db()
+    db = await get_Mysql_db_async()
     cursor = None
     try:
         cursor = db.cursor(pymysql.cursors.DictCursor)
@@ -193,7 +470,7 @@ async def get_treatment_plan_exercises(plan_id):
             db.close()
             
 async def get_exercise_details(exercise_id):
-    db = get_Mysql_db()
+    db = await get_Mysql_db_async()
     cursor = None
     try:
         cursor = db.cursor(pymysql.cursors.DictCursor)
@@ -231,12 +508,16 @@ def verify_therapist_login(email, password):
             return None
             
         stored_password = therapist['password']
-        if isinstance(stored_password, str):
-            stored_password = stored_password.encode('utf-8')
             
         logger.debug("Checking password")
-        if bcrypt.checkpw(password.encode('utf-8'), stored_password):
+        if password_hasher.verify_blocking(password, stored_password):
             logger.debug("Password verified")
+            if password_hasher.needs_rehash(stored_password):
+                cursor.execute(
+                    "UPDATE Therapists SET password = %s WHERE id = %s",
+                    (password_hasher.hash_blocking(password), therapist['id'])
+                )
+                db.commit()
             return {
                 "user_id": therapist['id'],
                 "first_name": therapist['first_name'],
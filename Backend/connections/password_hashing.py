@@ -0,0 +1,150 @@
+"""
+bcrypt hashing and verification off the event loop.
+
+Each bcrypt call is 100-300 ms of CPU. Calls run on a dedicated thread pool of
+PASSWORD_HASH_WORKERS threads (bcrypt releases the GIL while it works), so other
+requests on the worker keep being served. At most PASSWORD_HASH_MAX_QUEUE calls
+may wait for a thread; past that PasswordHasherBusy (503) is raised, so a login
+flood sheds load instead of queueing without bound.
+
+New hashes use BCRYPT_ROUNDS. verify_password() reports a replacement hash when
+the stored one was made with a different cost, and the login endpoints save it,
+so changing BCRYPT_ROUNDS migrates users as they sign in.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+
+class PasswordHasherBusy(Exception):
+    status_code = 503
+
+
+def bcrypt_cost(stored_hash):
+    """Cost factor of a $2b$12$... hash, or None if it isn't a bcrypt hash."""
+    if isinstance(stored_hash, bytes):
+        stored_hash = stored_hash.decode("utf-8")
+    parts = stored_hash.split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(password, stored_hash):
+    if isinstance(stored_hash, str):
+        stored_hash = stored_hash.encode("utf-8")
+    return bcrypt.checkpw(password.encode("utf-8"), stored_hash)
+
+
+class PasswordHasher:
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE, rounds=BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            # Calls beyond the free threads wait in the executor's queue
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy("Too many sign-in requests, please try again shortly")
+            self._pending += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._pending - self.workers)
+        enqueued_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started_at - enqueued_at
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._run_seconds += time.perf_counter() - started_at
+
+        try:
+            return self._executor.submit(run)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def needs_rehash(self, stored_hash):
+        return bcrypt_cost(stored_hash) != self.rounds
+
+    async def hash(self, password):
+        return await asyncio.wrap_future(self._submit(_hashpw, password, self.rounds))
+
+    async def verify(self, password, stored_hash):
+        """
+        (matches, new_hash). new_hash is a fresh hash at the configured cost when the
+        password matched but the stored hash used another cost, otherwise None.
+        """
+        matches = await asyncio.wrap_future(self._submit(_checkpw, password, stored_hash))
+        if not matches or not self.needs_rehash(stored_hash):
+            return matches, None
+        new_hash = await self.hash(password)
+        with self._lock:
+            self._rehashed += 1
+        return True, new_hash
+
+    def hash_blocking(self, password):
+        """For synchronous callers; still counts against the pool's concurrency cap."""
+        return self._submit(_hashpw, password, self.rounds).result()
+
+    def verify_blocking(self, password, stored_hash):
+        return self._submit(_checkpw, password, stored_hash).result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "running": self._running,
+                "queue_depth": max(0, self._pending - self.workers),
+                "max_queue_depth": self._max_queue_depth,
+                "queue_limit": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "avg_wait_ms": round(self._wait_seconds / self._completed * 1000, 2) if self._completed else 0.0,
+                "avg_run_ms": round(self._run_seconds / self._completed * 1000, 2) if self._completed else 0.0,
+            }
+
+
+password_hasher = PasswordHasher()
+
+
+async def hash_password(password):
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password, stored_hash):
+    return await password_hasher.verify(password, stored_hash)
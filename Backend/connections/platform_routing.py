@@ -0,0 +1,50 @@
+"""
+Redirect browser visits to the web app's entry pages, leaving the mobile app alone.
+
+PlatformRoutingMiddleware is plain ASGI: requests whose path has no web redirect
+(nearly all of them) are handed straight to the app without reading headers or
+parsing the User-Agent, and without BaseHTTPMiddleware's per-request task and
+body-stream wrapping. User-Agent classifications are memoised in a bounded LRU
+(PLATFORM_UA_CACHE_SIZE entries), since clients repeat the same handful of strings.
+"""
+import os
+from functools import lru_cache
+
+from starlette.responses import RedirectResponse
+
+PLATFORM_UA_CACHE_SIZE = int(os.getenv("PLATFORM_UA_CACHE_SIZE", 1024))
+
+WEB_REDIRECTS = {
+    "/": "/Therapist_Login",
+}
+
+
+@lru_cache(maxsize=PLATFORM_UA_CACHE_SIZE)
+def is_mobile_user_agent(user_agent):
+    import user_agents
+
+    return user_agents.parse(user_agent).is_mobile
+
+
+class PlatformRoutingMiddleware:
+    def __init__(self, app, web_redirects=None):
+        self.app = app
+        self.web_redirects = WEB_REDIRECTS if web_redirects is None else web_redirects
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.web_redirects:
+            await self.app(scope, receive, send)
+            return
+
+        user_agent = None
+        for name, value in scope["headers"]:
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
+
+        if not user_agent or is_mobile_user_agent(user_agent):
+            await self.app(scope, receive, send)
+            return
+
+        response = RedirectResponse(url=self.web_redirects[scope["path"]])
+        await response(scope, receive, send)
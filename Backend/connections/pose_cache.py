@@ -0,0 +1,164 @@
+"""
+Content hashing for exercise video uploads and the pose result cache.
+
+New uploads are stored as <sha256>.mp4, so identical clips share one file.
+Pose results (processed video + landmarks) are cached under
+POSE_CACHE_DIR/<key>/ where key = sha256(content_hash, model, settings).
+Restoring a result hard-links the cached files into place (copying when the
+filesystem can't link), so a repeat request costs no MediaPipe pass at all.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+
+from connections.pose_pipeline import PROCESSED_VIDEO_DIR, processed_video_path_for
+
+POSE_CACHE_DIR = os.path.join(PROCESSED_VIDEO_DIR, "cache")
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+_CONTENT_HASH_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+def new_content_hasher():
+    return hashlib.sha256()
+
+
+def hash_file(path):
+    hasher = new_content_hasher()
+    with open(path, "rb") as video_file:
+        for chunk in iter(lambda: video_file.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def store_content_addressed(temp_path, upload_dir, content_hash, extension=".mp4"):
+    """
+    Move a fully written upload to <content_hash><extension> in `upload_dir`.
+    If that content is already stored the temp file is dropped instead.
+    Returns (filename, deduplicated).
+    """
+    filename = f"{content_hash}{extension}"
+    final_path = os.path.join(upload_dir, filename)
+    if os.path.exists(final_path) and os.path.getsize(final_path) == os.path.getsize(temp_path):
+        os.remove(temp_path)
+        return filename, True
+    os.replace(temp_path, final_path)
+    return filename, False
+
+
+def file_content_hash(path):
+    """
+    SHA-256 of a stored upload. Content-addressed files are named by their hash;
+    older uploads are hashed once and the result kept in a <path>.sha256 sidecar.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    if _CONTENT_HASH_NAME.fullmatch(name):
+        return name
+
+    stat = os.stat(path)
+    fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+    sidecar_path = f"{path}.sha256"
+    try:
+        with open(sidecar_path) as sidecar:
+            stored_fingerprint, stored_hash = sidecar.read().split()
+            if stored_fingerprint == fingerprint:
+                return stored_hash
+    except (OSError, ValueError):
+        pass
+
+    content_hash = hash_file(path)
+
+    try:
+        with open(sidecar_path, "w") as sidecar:
+            sidecar.write(f"{fingerprint} {content_hash}")
+    except OSError as e:
+        print(f"Could not write content hash sidecar for {path}: {e}")
+    return content_hash
+
+
+def pose_model_id(quality):
+    try:
+        from importlib.metadata import version
+        mediapipe_version = version("mediapipe")
+    except Exception:
+        mediapipe_version = "unknown"
+    return f"mediapipe-{mediapipe_version}-pose-c{quality.model_complexity}"
+
+
+def pose_settings_id(quality):
+    from connections import video_encoder
+
+    return json.dumps({
+        "stride": quality.stride,
+        "inference_max_side": quality.inference_max_side,
+        "encoder": video_encoder.POSE_VIDEO_ENCODER,
+        "preset": video_encoder.POSE_FFMPEG_PRESET,
+        "crf": video_encoder.POSE_FFMPEG_CRF,
+    }, sort_keys=True)
+
+
+def pose_cache_key(content_hash, quality):
+    return hashlib.sha256(
+        f"{content_hash}|{pose_model_id(quality)}|{pose_settings_id(quality)}".encode()
+    ).hexdigest()
+
+
+def _cached_files(video_path):
+    """(path in the processed dir, name inside a cache entry) for every cached artefact."""
+    from connections.pose_landmarks import landmarks_path_for, landmarks_meta_path_for
+
+    return [
+        (processed_video_path_for(video_path), "processed.mp4"),
+        (landmarks_path_for(video_path), "landmarks.npy"),
+        (landmarks_meta_path_for(video_path), "landmarks.json"),
+    ]
+
+
+def _link_or_copy(source, destination):
+    temp_path = f"{destination}.{uuid.uuid4().hex}.link"
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copy2(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def store_pose_result(video_path, quality):
+    """Cache the processed video and landmarks just produced for `video_path`."""
+    entry_dir = os.path.join(POSE_CACHE_DIR, pose_cache_key(file_content_hash(video_path), quality))
+    if os.path.isdir(entry_dir):
+        return entry_dir
+
+    files = _cached_files(video_path)
+    if not all(os.path.exists(path) for path, _ in files):
+        return None
+
+    staging_dir = f"{entry_dir}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(staging_dir)
+    try:
+        for path, name in files:
+            _link_or_copy(path, os.path.join(staging_dir, name))
+        os.rename(staging_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        if not os.path.isdir(entry_dir):
+            raise
+    return entry_dir
+
+
+def restore_pose_result(video_path, quality):
+    """
+    Put a cached result for `video_path` at the usual processed paths.
+    Returns the processed video path, or None on a cache miss.
+    """
+    entry_dir = os.path.join(POSE_CACHE_DIR, pose_cache_key(file_content_hash(video_path), quality))
+    if not os.path.isdir(entry_dir):
+        return None
+
+    os.makedirs(PROCESSED_VIDEO_DIR, exist_ok=True)
+    for path, name in _cached_files(video_path):
+        _link_or_copy(os.path.join(entry_dir, name), path)
+    return processed_video_path_for(video_path)
@@ -0,0 +1,150 @@
+"""
+Per-frame pose landmarks stored next to each processed video.
+
+    <name>_landmarks.npy   float32 array of shape (frames, 33, 4) holding
+                           (x, y, z, visibility) per MediaPipe pose landmark;
+                           frames without a detection are NaN
+    <name>_landmarks.json  fps, frame count, quality preset and keyframe stride
+
+The .npy is written once and opened memory-mapped, so reading a range of frames
+only touches those rows instead of re-running MediaPipe.
+"""
+import io
+import json
+import os
+
+from connections.pose_pipeline import PROCESSED_VIDEO_DIR
+
+POSE_LANDMARK_COUNT = 33
+LANDMARK_VALUES = ("x", "y", "z", "visibility")
+POSE_LANDMARK_MAX_FRAMES = int(os.getenv("POSE_LANDMARK_MAX_FRAMES", 1800))
+
+
+def landmarks_path_for(video_path):
+    original_filename = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(PROCESSED_VIDEO_DIR, f"{original_filename}_landmarks.npy")
+
+
+def landmarks_meta_path_for(video_path):
+    return f"{os.path.splitext(landmarks_path_for(video_path))[0]}.json"
+
+
+def remove_landmarks(video_path):
+    for path in (landmarks_path_for(video_path), landmarks_meta_path_for(video_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class LandmarkWriter:
+    """
+    Appends one (33, 4) landmark row per output frame. Rows are streamed to a raw
+    part file so memory stays flat on long videos; close() prepends the .npy
+    header and swaps the finished files into place.
+    """
+    def __init__(self, video_path, fps, quality):
+        import numpy as np
+
+        self._np = np
+        self.video_path = video_path
+        self.path = landmarks_path_for(video_path)
+        self.meta_path = landmarks_meta_path_for(video_path)
+        self.fps = fps
+        self.quality = quality
+        self.frame_count = 0
+        self._raw_path = f"{self.path}.part"
+        self._raw = open(self._raw_path, "wb")
+        self._empty = np.full((POSE_LANDMARK_COUNT, len(LANDMARK_VALUES)), np.nan, dtype=np.float32)
+
+    def append(self, landmarks):
+        if landmarks is None:
+            landmarks = self._empty
+        self._raw.write(self._np.ascontiguousarray(landmarks, dtype=self._np.float32).tobytes())
+        self.frame_count += 1
+
+    def close(self):
+        np = self._np
+        self._raw.close()
+
+        shape = (self.frame_count, POSE_LANDMARK_COUNT, len(LANDMARK_VALUES))
+        npy_part_path = f"{self.path}.tmp"
+        with open(npy_part_path, "wb") as npy_file, open(self._raw_path, "rb") as raw_file:
+            np.lib.format.write_array_header_1_0(
+                npy_file, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)), "fortran_order": False, "shape": shape}
+            )
+            while True:
+                chunk = raw_file.read(4 * 1024 * 1024)
+                if not chunk:
+                    break
+                npy_file.write(chunk)
+        os.remove(self._raw_path)
+
+        meta = {
+            "fps": self.fps,
+            "frame_count": self.frame_count,
+            "quality": self.quality.name,
+            "stride": self.quality.stride,
+            "landmarks": POSE_LANDMARK_COUNT,
+            "values": list(LANDMARK_VALUES),
+        }
+        meta_part_path = f"{self.meta_path}.tmp"
+        with open(meta_part_path, "w") as meta_file:
+            json.dump(meta, meta_file)
+
+        os.replace(npy_part_path, self.path)
+        os.replace(meta_part_path, self.meta_path)
+        return self.path
+
+    def discard(self):
+        if not self._raw.closed:
+            self._raw.close()
+        for path in (self._raw_path, f"{self.path}.tmp", f"{self.meta_path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def load_landmarks(video_path):
+    """(memory-mapped landmark array, metadata dict), or (None, None) if none were saved."""
+    path = landmarks_path_for(video_path)
+    meta_path = landmarks_meta_path_for(video_path)
+    if not os.path.exists(path) or not os.path.exists(meta_path):
+        return None, None
+
+    import numpy as np
+
+    with open(meta_path) as meta_file:
+        meta = json.load(meta_file)
+    return np.load(path, mmap_mode="r"), meta
+
+
+def frame_range_for(meta, start_frame=None, end_frame=None, start_time=None, end_time=None):
+    """
+    Resolve a frame window (end exclusive) from frame numbers or seconds, clamped
+    to the stored frames. Frame numbers win when both are given.
+    """
+    fps = meta.get("fps") or 30.0
+    frame_count = meta["frame_count"]
+
+    if start_frame is None:
+        start_frame = int(start_time * fps) if start_time is not None else 0
+    if end_frame is None:
+        end_frame = int(end_time * fps) if end_time is not None else frame_count
+
+    start_frame = max(0, min(start_frame, frame_count))
+    end_frame = max(start_frame, min(end_frame, frame_count))
+    return start_frame, end_frame
+
+
+def landmarks_to_json(rows):
+    """Nested lists for a JSON response; missing detections become null."""
+    import numpy as np
+
+    values = np.asarray(rows, dtype=np.float32)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def landmarks_to_npy_bytes(rows):
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(rows, dtype=np.float32))
+    return buffer.getvalue()
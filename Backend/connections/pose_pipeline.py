@@ -0,0 +1,329 @@
+"""
+MediaPipe pose overlay for exercise video submissions.
+
+Everything here is plain module-level code with no FastAPI/app state so it can
+run inside the pose worker processes (see connections.pose_worker).
+"""
+import os
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Optional
+
+PROCESSED_VIDEO_DIR = "uploads/exercise_videos/processed_videos"
+
+
+@dataclass(frozen=True)
+class PoseQuality:
+    """
+    How much work MediaPipe does per video.
+
+    Inference runs on every `stride`-th frame (keyframes), on a copy of the frame
+    scaled so its longest side is at most `inference_max_side` (None = native).
+    Landmarks for the frames in between are linearly interpolated from the two
+    surrounding keyframes. Landmarks are normalised coordinates, so they are always
+    drawn on the full-resolution frame.
+    """
+    name: str
+    stride: int
+    inference_max_side: Optional[int]
+    model_complexity: int
+
+
+POSE_QUALITY_PRESETS = {
+    "fast": PoseQuality("fast", stride=3, inference_max_side=480, model_complexity=0),
+    "balanced": PoseQuality("balanced", stride=2, inference_max_side=720, model_complexity=1),
+    "full": PoseQuality("full", stride=1, inference_max_side=None, model_complexity=1),
+}
+
+DEFAULT_POSE_QUALITY = os.getenv("POSE_DEFAULT_QUALITY", "full")
+
+# Frames buffered between each pipeline stage; bounds memory on long videos
+POSE_PIPELINE_QUEUE_SIZE = int(os.getenv("POSE_PIPELINE_QUEUE_SIZE", 8))
+
+_END_OF_STREAM = object()
+
+
+def get_pose_quality(name=None):
+    """Resolve a preset name (None = DEFAULT_POSE_QUALITY); raises ValueError for unknown names."""
+    quality = POSE_QUALITY_PRESETS.get((name or DEFAULT_POSE_QUALITY).lower())
+    if quality is None:
+        raise ValueError(f"Unknown pose quality '{name}', expected one of: {', '.join(POSE_QUALITY_PRESETS)}")
+    return quality
+
+
+def processed_filename_for(video_path):
+    original_filename = os.path.splitext(os.path.basename(video_path))[0]
+    return f"{original_filename}_processed.mp4"
+
+
+def processed_video_path_for(video_path):
+    return os.path.join(PROCESSED_VIDEO_DIR, processed_filename_for(video_path))
+
+
+def _landmarks_to_array(np, pose_landmarks):
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+        dtype=np.float32
+    )
+
+
+def _array_to_landmarks(landmark_pb2, landmarks):
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in landmarks.tolist():
+        landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+    return landmark_list
+
+
+def interpolate_landmarks(start, end, t):
+    """
+    Landmarks at fraction `t` (0..1) of the way from keyframe `start` to `end`.
+    When either keyframe has no detection the nearer keyframe is used as-is.
+    """
+    if start is None or end is None:
+        return start if t < 0.5 else end
+    return start + (end - start) * t
+
+
+def _put_unless_stopped(stage_queue, item, stop_event):
+    """Blocking put that gives up once `stop_event` is set; True if the item was queued."""
+    while not stop_event.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _decode_frames(cap, frame_queue, stop_event, errors):
+    """Decoder stage: read frames into `frame_queue` until the video ends or the pipeline stops."""
+    try:
+        while not stop_event.is_set():
+            success, frame = cap.read()
+            if not success:
+                break
+            if not _put_unless_stopped(frame_queue, frame, stop_event):
+                return
+    except Exception as e:
+        errors.append(e)
+    _put_unless_stopped(frame_queue, _END_OF_STREAM, stop_event)
+
+
+def _encode_frames(encode_queue, write_frame):
+    """Encoder stage: draw and write frames from `encode_queue` until end of stream."""
+    while True:
+        item = encode_queue.get()
+        if item is _END_OF_STREAM:
+            return
+        try:
+            write_frame(*item)
+        except Exception as e:
+            print(f"Error encoding frame {item[0]}: {e}")
+
+
+def process_video_with_pose_detection(video_path, submission_id=None, progress_callback=None, should_stop=None, quality=None):
+    """
+    Draw pose landmarks on every frame of `video_path` and write the result next to
+    the other processed videos. Returns the processed path, or None on failure.
+
+    `quality` is a POSE_QUALITY_PRESETS name or PoseQuality and controls the
+    keyframe stride and inference resolution. Decoding, inference and drawing/encoding
+    run as three stages joined by bounded queues, so they overlap on multi-core
+    hosts while at most POSE_PIPELINE_QUEUE_SIZE frames wait per stage.
+    Per-frame landmarks are saved alongside the video (see connections.pose_landmarks).
+    progress_callback(percent) is called
+    as frames are processed; should_stop() is polled once per frame and ends
+    processing early, keeping what was written so far.
+    """
+    landmark_writer = None
+    try:
+        if not isinstance(quality, PoseQuality):
+            quality = get_pose_quality(quality)
+
+        print(f"Starting video processing for path: {video_path}, submission_id: {submission_id}, quality: {quality.name}")
+
+        if progress_callback:
+            progress_callback(0)
+
+        processed_video_path = processed_video_path_for(video_path)
+        partial_video_path = f"{os.path.splitext(processed_video_path)[0]}.part.mp4"
+
+        os.makedirs(PROCESSED_VIDEO_DIR, exist_ok=True)
+
+        if os.path.exists(partial_video_path):
+            try:
+                os.remove(partial_video_path)
+            except Exception as e:
+                print(f"Error removing stale partial file: {e}")
+
+        import cv2
+        import mediapipe as mp
+        import numpy as np
+        from mediapipe.framework.formats import landmark_pb2
+
+        from connections.pose_landmarks import LandmarkWriter
+        from connections.video_encoder import open_video_writer
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            print(f"Error: Could not open video file {video_path}")
+            return None
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        print(f"Video FPS: {fps}, Total frames: {total_frames}")
+
+        inference_size = None
+        if quality.inference_max_side and max(frame_width, frame_height) > quality.inference_max_side:
+            scale = quality.inference_max_side / max(frame_width, frame_height)
+            inference_size = (max(1, int(frame_width * scale)), max(1, int(frame_height * scale)))
+            print(f"Running pose inference at {inference_size[0]}x{inference_size[1]}")
+
+        out = open_video_writer(partial_video_path, fps, (frame_width, frame_height))
+
+        if out is None or not out.isOpened():
+            print("No video encoder could be opened. Cannot process video.")
+            cap.release()
+            return None
+
+        landmark_writer = LandmarkWriter(video_path, fps, quality)
+
+        mp_pose = mp.solutions.pose
+        mp_drawing = mp.solutions.drawing_utils
+        mp_drawing_styles = mp.solutions.drawing_styles
+        landmark_style = mp_drawing_styles.get_default_pose_landmarks_style()
+
+        def write_frame(index, frame, landmarks):
+            landmark_writer.append(landmarks)
+            if landmarks is not None:
+                mp_drawing.draw_landmarks(
+                    frame,
+                    _array_to_landmarks(landmark_pb2, landmarks),
+                    mp_pose.POSE_CONNECTIONS,
+                    landmark_drawing_spec=landmark_style)
+            try:
+                out.write(frame)
+            except Exception as e:
+                print(f"Error writing frame {index}: {e}")
+
+        frame_queue = queue.Queue(maxsize=POSE_PIPELINE_QUEUE_SIZE)
+        encode_queue = queue.Queue(maxsize=POSE_PIPELINE_QUEUE_SIZE)
+        stop_event = threading.Event()
+        decoder_errors = []
+
+        decoder = threading.Thread(
+            target=_decode_frames, args=(cap, frame_queue, stop_event, decoder_errors),
+            name="pose-decoder", daemon=True)
+        encoder = threading.Thread(
+            target=_encode_frames, args=(encode_queue, write_frame),
+            name="pose-encoder", daemon=True)
+
+        def flush_pending(pending, start, end):
+            # Frames between two keyframes, drawn with interpolated landmarks
+            span = len(pending) + 1
+            for offset, (index, frame) in enumerate(pending, start=1):
+                encode_queue.put((index, frame, interpolate_landmarks(start, end, offset / span)))
+            pending.clear()
+
+        print("Processing video frames...")
+        frame_count = 0
+        inference_count = 0
+        last_progress = -1
+        pending = []
+        previous_landmarks = None
+        started_at = time.perf_counter()
+
+        decoder.start()
+        encoder.start()
+        try:
+            with mp_pose.Pose(
+                model_complexity=quality.model_complexity,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5) as pose:
+
+                while True:
+                    if should_stop and should_stop():
+                        print(f"Stopping video processing for submission {submission_id} at frame {frame_count}")
+                        break
+
+                    frame = frame_queue.get()
+                    if frame is _END_OF_STREAM:
+                        break
+
+                    frame_count += 1
+
+                    if total_frames > 0 and progress_callback:
+                        progress = min(int((frame_count / total_frames) * 100), 99)
+                        if progress != last_progress:
+                            progress_callback(progress)
+                            last_progress = progress
+
+                    if (frame_count - 1) % quality.stride != 0:
+                        pending.append((frame_count, frame))
+                        continue
+
+                    inference_frame = frame
+                    if inference_size:
+                        inference_frame = cv2.resize(frame, inference_size, interpolation=cv2.INTER_AREA)
+                    results = pose.process(cv2.cvtColor(inference_frame, cv2.COLOR_BGR2RGB))
+                    inference_count += 1
+
+                    landmarks = _landmarks_to_array(np, results.pose_landmarks) if results.pose_landmarks else None
+                    flush_pending(pending, previous_landmarks, landmarks)
+                    encode_queue.put((frame_count, frame, landmarks))
+                    previous_landmarks = landmarks
+
+                    if frame_count % 30 == 0:
+                        print(f"Processed {frame_count} frames")
+
+                # Frames after the last keyframe hold its landmarks
+                flush_pending(pending, previous_landmarks, previous_landmarks)
+        finally:
+            stop_event.set()
+            encode_queue.put(_END_OF_STREAM)
+            decoder.join()
+            encoder.join()
+            cap.release()
+            out.release()
+
+        if decoder_errors:
+            raise decoder_errors[0]
+
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"Ran pose inference on {inference_count} of {frame_count} frames ({quality.name}) "
+            f"in {elapsed:.1f}s, {frame_count / max(elapsed, 1e-6):.1f} fps"
+        )
+
+        if not os.path.exists(partial_video_path) or os.path.getsize(partial_video_path) == 0:
+            print(f"Warning: Processed video file does not exist or is empty at {partial_video_path}")
+            landmark_writer.discard()
+            return None
+
+        landmark_writer.close()
+        print(f"Saved {landmark_writer.frame_count} frames of pose landmarks to {landmark_writer.path}")
+
+        os.replace(partial_video_path, processed_video_path)
+        try:
+            os.chmod(processed_video_path, 0o644)
+        except Exception as e:
+            print(f"Error setting permissions: {e}")
+        print(f"Video processing completed for {processed_video_path}")
+
+        if progress_callback:
+            progress_callback(100)
+
+        return processed_video_path
+
+    except Exception as e:
+        print(f"Error in video processing: {e}")
+        traceback.print_exc()
+        if landmark_writer is not None:
+            landmark_writer.discard()
+        return None
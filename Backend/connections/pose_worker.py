@@ -0,0 +1,217 @@
+"""
+Process pool for pose video processing, HLS transcoding and preview extraction.
+
+MediaPipe inference, OpenCV and ffmpeg encoding are CPU bound, so jobs run in
+separate (spawned) processes instead of daemon threads in the web process. Jobs come from
+the Redis queue in connections.video_job_queue, so any web worker can enqueue and
+any node running a PoseWorkerPool can pick them up. At most
+POSE_WORKER_CONCURRENCY jobs run at once per pool. A finished pose job queues an
+"hls_processed" job so the overlay video gets its own HLS ladder.
+
+The pool runs inside the app (POSE_WORKER_EMBEDDED, the default) or standalone:
+    python -m connections.pose_worker
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from connections.pose_cache import store_pose_result
+from connections.pose_pipeline import get_pose_quality, process_video_with_pose_detection
+from connections.video_hls import transcode_hls
+from connections.video_previews import generate_previews
+from connections.video_job_queue import (
+    JobProgressReporter,
+    claim_video_job,
+    enqueue_video_job,
+    heartbeat_video_job,
+    finish_video_job,
+    fail_video_job,
+    promote_due_retries,
+    reap_stale_jobs,
+    requeue_crashed_video_job,
+)
+
+POSE_WORKER_CONCURRENCY = int(os.getenv("POSE_WORKER_CONCURRENCY", max(1, (os.cpu_count() or 2) // 2)))
+POSE_WORKER_EMBEDDED = os.getenv("POSE_WORKER_EMBEDDED", "true").lower() in ("1", "true", "yes")
+POSE_WORKER_POLL_INTERVAL = float(os.getenv("POSE_WORKER_POLL_INTERVAL", 1.0))
+POSE_WORKER_HEARTBEAT_INTERVAL = float(os.getenv("POSE_WORKER_HEARTBEAT_INTERVAL", 10.0))
+POSE_WORKER_DRAIN_TIMEOUT = float(os.getenv("POSE_WORKER_DRAIN_TIMEOUT", 30.0))
+
+
+def _run_pose_job(job_id, claim, video_path, submission_id, options):
+    reporter = JobProgressReporter(job_id, claim)
+    quality = get_pose_quality(options.get("quality"))
+    result = process_video_with_pose_detection(
+        video_path,
+        submission_id,
+        progress_callback=reporter.report,
+        should_stop=reporter.should_stop,
+        quality=quality
+    )
+    cancelled = reporter.should_stop()
+    if result and not cancelled:
+        try:
+            store_pose_result(video_path, quality)
+        except Exception as e:
+            print(f"Could not cache pose result for {video_path}: {e}")
+    return result, cancelled
+
+
+def _run_hls_job(job_id, claim, video_path, submission_id, options):
+    reporter = JobProgressReporter(job_id, claim)
+    result = transcode_hls(
+        video_path,
+        progress_callback=reporter.report,
+        should_stop=reporter.should_stop,
+        replace=options.get("replace", False)
+    )
+    return result, reporter.should_stop()
+
+
+def _run_preview_job(job_id, claim, video_path, submission_id, options):
+    reporter = JobProgressReporter(job_id, claim)
+    result = generate_previews(video_path, progress_callback=reporter.report, should_stop=reporter.should_stop)
+    return result, reporter.should_stop()
+
+
+JOB_RUNNERS = {
+    "pose": _run_pose_job,
+    "hls": _run_hls_job,
+    "hls_processed": _run_hls_job,
+    "preview": _run_preview_job,
+}
+
+
+class PoseWorkerPool:
+    def __init__(self, max_workers=POSE_WORKER_CONCURRENCY):
+        self.max_workers = max_workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._context = multiprocessing.get_context("spawn")
+        self._executor = None
+        self._consumer = None
+        self._running = set()
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+            print(f"Pose worker pool {self.worker_id} started with {self.max_workers} worker process(es)")
+
+    def _restart(self, broken):
+        """Replace a broken executor; every job that was running on it sees the same one."""
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            print(f"Pose worker pool {self.worker_id} lost a worker process, restarting")
+        self._ensure_started()
+
+    async def _execute(self, job, slots):
+        job_id = job["job_id"]
+        claim = job["claim"]
+        executor = self._executor
+        owned = True
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                executor, JOB_RUNNERS[job["kind"]], job_id, claim, job["video_path"], job["submission_id"], job.get("options") or {}
+            )
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=POSE_WORKER_HEARTBEAT_INTERVAL)
+                if done:
+                    break
+                if owned and not await heartbeat_video_job(job_id, claim):
+                    # The worker process sees the lost claim through should_stop()
+                    owned = False
+                    print(f"{job['kind']} job {job_id} is no longer owned by {self.worker_id}, stopping it")
+
+            result, cancelled = future.result()
+            if not (owned and await heartbeat_video_job(job_id, claim)):
+                print(f"{job['kind']} job {job_id} was taken over by another worker, dropping its result")
+            elif cancelled:
+                await finish_video_job(job_id, "cancelled", result)
+                print(f"{job['kind']} job {job_id} for submission {job['submission_id']} cancelled")
+            elif result:
+                await finish_video_job(job_id, "completed", result)
+                print(f"{job['kind']} job {job_id} for submission {job['submission_id']} finished: {result}")
+                if job["kind"] == "pose":
+                    # The processed video may have been regenerated; rebuild its ladder
+                    await enqueue_video_job(job["submission_id"], result, {"replace": True}, kind="hls_processed")
+            else:
+                await fail_video_job(job_id, f"{job['kind']} job produced no output")
+        except asyncio.CancelledError:
+            raise
+        except BrokenProcessPool:
+            self._restart(executor)
+            if await heartbeat_video_job(job_id, claim):
+                await requeue_crashed_video_job(job_id)
+        except Exception as e:
+            print(f"{job['kind']} job {job_id} for submission {job['submission_id']} failed: {e}")
+            if await heartbeat_video_job(job_id, claim):
+                await fail_video_job(job_id, e)
+        finally:
+            slots.release()
+
+    async def run(self):
+        """Claim and run jobs until cancelled."""
+        self._ensure_started()
+        slots = asyncio.Semaphore(self.max_workers)
+        while True:
+            try:
+                await promote_due_retries()
+                await reap_stale_jobs()
+
+                await slots.acquire()
+                try:
+                    job = await claim_video_job(self.worker_id)
+                except BaseException:
+                    slots.release()
+                    raise
+                if not job:
+                    slots.release()
+                    await asyncio.sleep(POSE_WORKER_POLL_INTERVAL)
+                    continue
+
+                print(f"Pose worker {self.worker_id} claimed job {job['job_id']} (attempt {job['attempts']})")
+                task = asyncio.create_task(self._execute(job, slots))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Pose worker {self.worker_id} queue error: {e}")
+                await asyncio.sleep(POSE_WORKER_POLL_INTERVAL)
+
+    def start(self):
+        """Start consuming in the current event loop (used from the app lifespan)."""
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop claiming new jobs and give running ones POSE_WORKER_DRAIN_TIMEOUT to
+        finish. Anything still running is abandoned; it stops heartbeating and is
+        retried by another worker.
+        """
+        if self._consumer is not None:
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+            self._consumer = None
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=POSE_WORKER_DRAIN_TIMEOUT)
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pose_pool = PoseWorkerPool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(pose_pool.run())
+    except KeyboardInterrupt:
+        pass
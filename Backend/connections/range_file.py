@@ -0,0 +1,210 @@
+"""
+Byte-range file responses for exercise and processed videos.
+
+RangeFileResponse answers
+    GET/HEAD without Range     200 with the whole file
+    Range: bytes=a-b | a- | -n 206 Partial Content with Content-Range
+    unsatisfiable range        416 with Content-Range: bytes */<size>
+    several ranges             416 -- multipart/byteranges is not supported, and
+                               video players only ever ask for one range
+    If-Range (ETag or date)    the range is honoured only if it still matches,
+                               otherwise the whole file is sent (200)
+    If-None-Match              304 when the strong ETag matches
+
+The ETag is strong, derived from size and mtime_ns, so it changes whenever a
+processed video is regenerated in place. The body is sent with the server's
+zero-copy extension (http.response.zerocopy, os.sendfile) when it offers one,
+then http.response.pathsend for whole files, and otherwise read in
+RANGE_FILE_CHUNK_SIZE pieces on a worker thread.
+"""
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+
+import anyio
+from starlette.responses import Response
+
+RANGE_FILE_CHUNK_SIZE = int(os.getenv("RANGE_FILE_CHUNK_SIZE", 1024 * 1024))
+
+
+class RangeNotSatisfiable(Exception):
+    status_code = 416
+
+
+def file_etag(stat_result):
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range_header(header, size):
+    """
+    Resolve a single `bytes=` range against a file of `size` bytes.
+    Returns (start, end) with `end` inclusive, or None when the header is absent or
+    not a byte range (RFC 9110 says to ignore it). Raises RangeNotSatisfiable for
+    ranges outside the file and for multi-range requests.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    if "," in spec:
+        raise RangeNotSatisfiable("Multiple ranges are not supported")
+
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the final `last` bytes
+            suffix = int(last)
+            if suffix == 0:
+                raise RangeNotSatisfiable("Empty suffix range")
+            start = max(0, size - suffix)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable(f"Range starts past the end of the file ({size} bytes)")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(if_range, etag, stat_result):
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(("W/", '"')):
+        # Weak validators never match for If-Range
+        return if_range == etag
+    try:
+        return int(parsedate_to_datetime(if_range).timestamp()) == int(stat_result.st_mtime)
+    except (TypeError, ValueError):
+        return False
+
+
+def _etag_listed(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+class RangeFileResponse(Response):
+    """File response with Range/If-Range/ETag handling; see the module docstring."""
+
+    def __init__(self, path, media_type=None, filename=None, headers=None, stat_result=None,
+                 chunk_size=RANGE_FILE_CHUNK_SIZE):
+        self.path = path
+        self.media_type = media_type
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.stat_result = stat_result
+        self.background = None
+        self.body = b""
+        self.status_code = 200
+        # Headers set on the response (e.g. CORS) after construction are kept;
+        # the entity headers are worked out per request in __call__
+        self.init_headers(headers)
+
+    async def __call__(self, scope, receive, send):
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                await Response("File not found", status_code=404)(scope, receive, send)
+                return
+        if not stat.S_ISREG(self.stat_result.st_mode):
+            await Response("File not found", status_code=404)(scope, receive, send)
+            return
+
+        request_headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        base_headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in self.raw_headers
+            if key not in (b"content-length", b"content-type")
+        }
+        size = self.stat_result.st_size
+        etag = file_etag(self.stat_result)
+        validators = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": formatdate(self.stat_result.st_mtime, usegmt=True),
+        }
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and _etag_listed(if_none_match, etag):
+            await self._send_head(send, 304, {**base_headers, **validators}, include_entity=False)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        byte_range = None
+        if _if_range_matches(request_headers.get("if-range"), etag, self.stat_result):
+            try:
+                byte_range = parse_range_header(request_headers.get("range"), size)
+            except RangeNotSatisfiable:
+                await self._send_head(send, 416, {
+                    **base_headers, **validators,
+                    "content-range": f"bytes */{size}",
+                    "content-length": "0",
+                }, include_entity=False)
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+        headers = {**base_headers, **validators}
+        if self.filename and "content-disposition" not in {key.lower() for key in headers}:
+            headers["content-disposition"] = f'attachment; filename="{self.filename}"'
+        if byte_range is None:
+            status_code, start, length = 200, 0, size
+        else:
+            start, end = byte_range
+            status_code, length = 206, end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(length)
+
+        await self._send_head(send, status_code, headers)
+        if scope.get("method", "GET").upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        await self._send_file(scope, send, start, length, whole_file=byte_range is None)
+
+    async def _send_head(self, send, status_code, headers, include_entity=True):
+        raw_headers = [(key.lower().encode("latin-1"), str(value).encode("latin-1")) for key, value in headers.items()]
+        if include_entity and self.media_type:
+            raw_headers.append((b"content-type", self.media_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+
+    async def _send_file(self, scope, send, start, length, whole_file):
+        extensions = scope.get("extensions") or {}
+
+        if "http.response.zerocopy" in extensions:
+            with open(self.path, "rb") as video_file:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": video_file.fileno(),
+                    "offset": start,
+                    "count": length,
+                    "more_body": False,
+                })
+            return
+
+        if whole_file and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as video_file:
+            await video_file.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await video_file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0 or length == 0:
+            # Empty file, or it shrank under us: end the body so the connection isn't left hanging
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -4,7 +4,12 @@ import os
 from dotenv import load_dotenv
 import traceback
 import json, secrets, time
+import datetime
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from urllib.parse import urlencode
+from connections.instrumentation import record_redis_command
 
 load_dotenv()
 
@@ -13,7 +18,21 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
 REDIS_USER = os.getenv("REDIS_USER", "default")
 
-r = redis.Redis(
+class InstrumentedRedis(redis.Redis):
+    """Every command goes through execute_command(), so this times all of them."""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await super().execute_command(*args, **options)
+            failed = False
+            return result
+        finally:
+            record_redis_command(args[0], time.perf_counter() - started, failed)
+
+
+r = InstrumentedRedis(
     host=REDIS_HOST, 
     port=REDIS_PORT, 
     password=REDIS_PASSWORD,
@@ -22,20 +41,125 @@ r = redis.Redis(
 )
 
 SESSION_TTL = 63072000
+SESSION_PREFIX = "session"
+
+# Mobile-app sessions share the store under their own prefix, so a mobile session
+# id is never accepted where a therapist session is expected (or vice versa).
+MOBILE_SESSION_PREFIX = "mobile_session"
+MOBILE_SESSION_TTL = int(os.getenv("MOBILE_SESSION_TTL", 24 * 3600))
+MOBILE_SESSION_REMEMBER_TTL = int(os.getenv("MOBILE_SESSION_REMEMBER_TTL", 30 * 24 * 3600))
+
+# In-process cache in front of session lookups. SESSION_CACHE_TTL is the longest a
+# worker may keep serving a session after it was changed or deleted elsewhere
+# (0 disables the cache); invalidations are also broadcast on
+# SESSION_INVALIDATION_CHANNEL so other workers normally drop it at once.
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", 5))
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", 10000))
+SESSION_INVALIDATION_CHANNEL = "sessions:invalidate"
+
+
+class SessionCache:
+    """TTL-bounded LRU of decoded sessions keyed by their Redis key."""
+
+    def __init__(self, max_size=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_key):
+        entry = self._entries.get(session_key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[session_key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(session_key)
+        self.hits += 1
+        # Callers get their own copy so they can't change the cached session
+        return dict(entry[1])
+
+    def set(self, session_key, session_data):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[session_key] = (time.monotonic() + self.ttl, dict(session_data))
+        self._entries.move_to_end(session_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, session_key):
+        self._entries.pop(session_key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+session_cache = SessionCache()
+
+
+def session_key_for(session_id: str, prefix: str = SESSION_PREFIX):
+    return f"{prefix}:{session_id}"
+
+
+async def invalidate_session_cache(session_key: str):
+    """Drop a session from this worker's cache and tell the other workers to do the same."""
+    session_cache.invalidate(session_key)
+    try:
+        await r.publish(SESSION_INVALIDATION_CHANNEL, session_key)
+    except Exception as e:
+        print(f"Error broadcasting session invalidation: {e}")
+
 
-async def create_redis_session(data: dict):
+async def listen_for_session_invalidations():
+    """
+    Evict sessions invalidated by other workers; runs for the app's lifetime.
+    Messages missed while disconnected are covered by clearing the cache on reconnect.
+    """
+    while True:
+        pubsub = r.pubsub()
+        try:
+            await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+            session_cache.clear()
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    session_cache.invalidate(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Session invalidation listener error: {e}")
+            session_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.reset()
+
+
+async def create_redis_session(data: dict, ttl: int = SESSION_TTL, prefix: str = SESSION_PREFIX):
     session_id = str(uuid.uuid4())
-    session_key = f"session:{session_id}"
+    session_key = session_key_for(session_id, prefix)
     try:
         json_data = json.dumps(data)
-        await r.set(session_key, json_data, ex=SESSION_TTL)
-        verification = await r.get(session_key)
-        print(f"Session verification: {verification}")
+        await r.set(session_key, json_data, ex=ttl)
+        session_cache.set(session_key, data)
         return session_id
     except Exception as e:
         print(f"Error creating Redis session: {e}")
         return None
 
+async def update_redis_session(session_id: str, data: dict, prefix: str = SESSION_PREFIX):
+    """Replace a session's data, keeping its expiry, and invalidate cached copies."""
+    session_key = session_key_for(session_id, prefix)
+    try:
+        updated = await r.set(session_key, json.dumps(data), keepttl=True, xx=True)
+        await invalidate_session_cache(session_key)
+        return bool(updated)
+    except Exception as e:
+        print(f"Error updating Redis session: {e}")
+        return False
+
 async def test_redis_connection():
     try:
         await r.set('test_key', 'Success!')
@@ -46,10 +170,13 @@ async def test_redis_connection():
         print(f"Error connecting to Redis: {e}")
         return False
 
-async def get_redis_session(session_id: str):
-    """Retrieve session data from Redis asynchronously"""
+async def get_redis_session(session_id: str, prefix: str = SESSION_PREFIX):
+    """Retrieve session data, from the in-process cache when fresh, else from Redis"""
+    session_key = session_key_for(session_id, prefix)
+    cached = session_cache.get(session_key)
+    if cached is not None:
+        return cached
     try:
-        session_key = f"session:{session_id}"
         json_data = await r.get(session_key)
         if not json_data:
             print(f"Session ID {session_id} does not exist or has expired.")
@@ -60,24 +187,41 @@ async def get_redis_session(session_id: str):
         
         try:
             session_data = json.loads(json_data)
-            print(f"Session data retrieved successfully: {session_data}")
+            session_cache.set(session_key, session_data)
             return session_data
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from Redis: {e}")
-            print(f"Raw data: {json_data}")
+            print(f"Error decoding JSON from Redis for session {session_id}: {e}")
             return None
     except Exception as e:
         print(f"Error retrieving Redis session: {e}")
         print(f"Traceback: {traceback.format_exc()}")
         return None
 
-async def delete_redis_session(session_id: str):
+async def delete_redis_session(session_id: str, prefix: str = SESSION_PREFIX):
     """
     >>> To log out user
     Args:
-    session_id (str): User id
+    session_id (str): Session id from the session_id cookie
     """
-    await r.delete(session_id)
+    session_key = session_key_for(session_id, prefix)
+    await r.delete(session_key)
+    await invalidate_session_cache(session_key)
+
+async def create_mobile_session(user_id: int, email: str, remember: bool = False):
+    """Mobile-app session; Redis expires it after 24 hours, or 30 days with remember."""
+    ttl = MOBILE_SESSION_REMEMBER_TTL if remember else MOBILE_SESSION_TTL
+    expires = datetime.datetime.now() + datetime.timedelta(seconds=ttl)
+    return await create_redis_session(
+        {"user_id": user_id, "email": email, "expires": expires.isoformat()},
+        ttl=ttl,
+        prefix=MOBILE_SESSION_PREFIX
+    )
+
+async def get_mobile_session(session_id: str):
+    return await get_redis_session(session_id, prefix=MOBILE_SESSION_PREFIX)
+
+async def delete_mobile_session(session_id: str):
+    await delete_redis_session(session_id, prefix=MOBILE_SESSION_PREFIX)
 
 async def generate_video_token(user_id, filename, expiry_seconds=3600):
     token = secrets.token_hex(16)
@@ -97,4 +241,48 @@ async def verify_video_token(token, filename):
     token_data = json.loads(token_data_str)
     if int(time.time()) > token_data["expires"] or token_data["filename"] != filename:
         return None
-    return token_data["user_id"]
\ No newline at end of file
+    return token_data["user_id"]
+
+# Short-lived mutual exclusion across workers. Each holder gets a random token and
+# only deletes the lock while it still holds that token, so a holder that outlived
+# the TTL cannot release a lock someone else has taken since.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LockTimeout(Exception):
+    status_code = 503
+
+
+async def acquire_lock(lock_key, timeout):
+    """Returns the lock's token, or None if someone else holds it."""
+    token = secrets.token_hex(16)
+    if await r.set(lock_key, token, nx=True, ex=timeout):
+        return token
+    return None
+
+async def release_lock(lock_key, token):
+    return bool(await r.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token))
+
+@asynccontextmanager
+async def redis_lock(lock_key, timeout=30, wait=10, poll_interval=0.05):
+    """
+    async with redis_lock("video_file:<name>:lock"):
+        ...
+    Waits up to `wait` seconds for the lock, then raises LockTimeout.
+    """
+    deadline = time.monotonic() + wait
+    token = await acquire_lock(lock_key, timeout)
+    while token is None:
+        if time.monotonic() >= deadline:
+            raise LockTimeout(f"Timed out waiting for {lock_key}")
+        await asyncio.sleep(poll_interval)
+        token = await acquire_lock(lock_key, timeout)
+    try:
+        yield token
+    finally:
+        await release_lock(lock_key, token)
@@ -0,0 +1,203 @@
+"""
+Resumable (tus-style) uploads for exercise video submissions.
+
+    POST   .../uploads                 create, Upload-Length header (+ submission fields)
+    HEAD   .../uploads/{upload_id}     Upload-Offset / Upload-Length
+    PATCH  .../uploads/{upload_id}     append the body at Upload-Offset; optional
+                                       Upload-Checksum: <algorithm> <base64 digest>
+    POST   .../uploads/{upload_id}/finalize
+    DELETE .../uploads/{upload_id}
+
+Upload state lives in Redis under video_upload:{upload_id} so any worker can take
+the next chunk; bytes go to TEMP_UPLOAD_DIR/{upload_id}.part, which must be on
+storage shared by those workers. Each PATCH is all-or-nothing: if the body is cut
+off, too long or fails its checksum the part file is truncated back to the
+starting offset, so the client simply resends that chunk.
+
+PATCH, finalize and DELETE each hold video_upload:{upload_id}:lock and re-read
+the upload state once they have it. The lock carries a random token: releasing it,
+and committing a chunk's new offset, only happen while that token still holds the
+lock, so a request that outlived RESUMABLE_UPLOAD_LOCK_TIMEOUT can neither free
+nor advance an upload that another request has taken over since.
+"""
+import base64
+import hashlib
+import os
+import time
+import uuid
+
+import aiofiles
+
+from connections.redis_database import r, acquire_lock, release_lock
+
+RESUMABLE_UPLOAD_TTL = int(os.getenv("RESUMABLE_UPLOAD_TTL", 24 * 3600))
+RESUMABLE_UPLOAD_LOCK_TIMEOUT = int(os.getenv("RESUMABLE_UPLOAD_LOCK_TIMEOUT", 600))
+UPLOAD_CHECKSUM_ALGORITHMS = ("sha256", "sha1", "md5")
+
+
+class ResumableUploadError(Exception):
+    status_code = 400
+
+
+class UploadOffsetMismatch(ResumableUploadError):
+    status_code = 409
+
+
+class UploadChecksumMismatch(ResumableUploadError):
+    # tus checksum extension: 460 Checksum Mismatch
+    status_code = 460
+
+
+class UploadTooLarge(ResumableUploadError):
+    status_code = 413
+
+# Advance the offset only if the caller still holds the upload lock and nobody
+# else has moved the offset in the meantime
+COMMIT_OFFSET_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return -1
+end
+if redis.call('HGET', KEYS[1], 'offset') ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'offset', ARGV[3], 'updated_at', ARGV[4])
+return 1
+"""
+
+
+class UploadLockLost(ResumableUploadError):
+    status_code = 409
+
+
+def upload_key(upload_id):
+    return f"video_upload:{upload_id}"
+
+
+def upload_lock_key(upload_id):
+    return f"video_upload:{upload_id}:lock"
+
+
+def upload_chunks_key(upload_id):
+    return f"video_upload:{upload_id}:chunks"
+
+
+def upload_part_path(temp_dir, upload_id):
+    return os.path.join(temp_dir, f"{upload_id}.part")
+
+
+def parse_upload_checksum(header):
+    """Upload-Checksum header -> (algorithm, digest bytes); None when absent."""
+    if not header:
+        return None
+    try:
+        algorithm, encoded = header.strip().split(" ", 1)
+        digest = base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise ResumableUploadError("Malformed Upload-Checksum header")
+    algorithm = algorithm.lower()
+    if algorithm not in UPLOAD_CHECKSUM_ALGORITHMS:
+        raise ResumableUploadError(f"Unsupported checksum algorithm '{algorithm}'")
+    return algorithm, digest
+
+
+async def create_upload(user_id, length, metadata):
+    upload_id = uuid.uuid4().hex
+    now = time.time()
+    await r.hset(upload_key(upload_id), mapping={
+        "upload_id": upload_id,
+        "user_id": user_id,
+        "length": length,
+        "offset": 0,
+        "created_at": now,
+        "updated_at": now,
+        **{key: value for key, value in metadata.items() if value is not None}
+    })
+    await r.expire(upload_key(upload_id), RESUMABLE_UPLOAD_TTL)
+    return await get_upload(upload_id)
+
+
+async def get_upload(upload_id):
+    upload = await r.hgetall(upload_key(upload_id))
+    if not upload:
+        return None
+    for field in ("user_id", "length", "offset"):
+        upload[field] = int(upload[field])
+    return upload
+
+
+async def acquire_upload_lock(upload_id):
+    """The lock's token, or None while another request holds it."""
+    return await acquire_lock(upload_lock_key(upload_id), RESUMABLE_UPLOAD_LOCK_TIMEOUT)
+
+
+async def release_upload_lock(upload_id, lock_token):
+    await release_lock(upload_lock_key(upload_id), lock_token)
+
+
+async def write_upload_chunk(upload, offset, stream, temp_dir, checksum=None, lock_token=None):
+    """
+    Append the request body `stream` to the upload at `offset`; returns the new offset.
+    The caller holds the upload lock, identified by `lock_token`.
+    """
+    upload_id = upload["upload_id"]
+    if offset != upload["offset"]:
+        raise UploadOffsetMismatch(f"Upload-Offset {offset} does not match current offset {upload['offset']}")
+
+    part_path = upload_part_path(temp_dir, upload_id)
+    hasher = hashlib.new(checksum[0]) if checksum else None
+    written = 0
+
+    async with aiofiles.open(part_path, "r+b" if os.path.exists(part_path) else "wb") as part_file:
+        # Drop bytes past the committed offset left by an interrupted PATCH
+        await part_file.truncate(offset)
+        await part_file.seek(offset)
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                if offset + written + len(chunk) > upload["length"]:
+                    raise UploadTooLarge("Chunk runs past the declared Upload-Length")
+                await part_file.write(chunk)
+                if hasher:
+                    hasher.update(chunk)
+                written += len(chunk)
+
+            if hasher and hasher.digest() != checksum[1]:
+                raise UploadChecksumMismatch("Chunk checksum does not match Upload-Checksum")
+        except BaseException:
+            await part_file.truncate(offset)
+            raise
+
+    new_offset = offset + written
+    committed = await r.eval(
+        COMMIT_OFFSET_SCRIPT, 2, upload_key(upload_id), upload_lock_key(upload_id),
+        lock_token, offset, new_offset, time.time()
+    )
+    if committed != 1:
+        raise UploadLockLost("Upload changed while the chunk was being written, resend it from the current offset")
+    if hasher:
+        await r.rpush(upload_chunks_key(upload_id), f"{offset}:{written}:{checksum[0]}:{hasher.hexdigest()}")
+        await r.expire(upload_chunks_key(upload_id), RESUMABLE_UPLOAD_TTL)
+    await r.expire(upload_key(upload_id), RESUMABLE_UPLOAD_TTL)
+    return new_offset
+
+
+async def delete_upload(upload_id, temp_dir):
+    # The lock is left to its holder, which releases it once this returns
+    await r.delete(upload_key(upload_id), upload_chunks_key(upload_id))
+    part_path = upload_part_path(temp_dir, upload_id)
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+
+async def cleanup_abandoned_uploads(temp_dir):
+    """Remove part files whose upload state has expired from Redis."""
+    removed = 0
+    for name in os.listdir(temp_dir):
+        if not name.endswith(".part"):
+            continue
+        upload_id = name[:-len(".part")]
+        if not await r.exists(upload_key(upload_id)):
+            os.remove(os.path.join(temp_dir, name))
+            removed += 1
+    return removed
@@ -0,0 +1,205 @@
+"""
+Bounded-memory upload writers.
+
+stream_multipart_upload() parses a multipart/form-data body straight off
+request.stream() with python-multipart's push parser: the file part is written
+to its destination with aiofiles as it arrives, its size limit is enforced and
+its SHA-256 computed in the same pass, and the small form fields are returned.
+Nothing is spooled to a SpooledTemporaryFile first, so each byte is written once.
+
+stream_upload_file() is the same bounded-memory writer for an UploadFile that
+FastAPI has already parsed, for endpoints that keep their Form(...) parameters.
+"""
+import hashlib
+import os
+import time
+
+import aiofiles
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_FORM_FIELD_SIZE = 64 * 1024
+UPLOAD_STREAM_CHUNK_SIZE = int(os.getenv("UPLOAD_STREAM_CHUNK_SIZE", 1024 * 1024))
+
+
+class UploadStreamError(Exception):
+    status_code = 400
+
+
+class UploadTooLargeError(UploadStreamError):
+    status_code = 413
+
+
+class StreamedFile:
+    def __init__(self, path, filename=None, content_type=None):
+        self.path = path
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.hasher = hashlib.sha256()
+
+    @property
+    def content_hash(self):
+        return self.hasher.hexdigest()
+
+
+class _ProgressLog:
+    def __init__(self, label, expected=None, interval=5.0):
+        self.label = label
+        self.expected = expected
+        self.interval = interval
+        self.started = time.time()
+        self.last = self.started
+
+    def update(self, size, force=False):
+        now = time.time()
+        if not force and now - self.last < self.interval:
+            return
+        self.last = now
+        mb_size = size / (1024 * 1024)
+        elapsed = now - self.started
+        speed = mb_size / elapsed if elapsed > 0 else 0
+        if self.expected:
+            percent = min(100, int(size / self.expected * 100))
+            print(f"📊 {self.label}: {percent}% ({mb_size:.2f}MB / {self.expected / (1024 * 1024):.2f}MB) at {speed:.2f}MB/s")
+        else:
+            print(f"📊 {self.label}: {mb_size:.2f}MB at {speed:.2f}MB/s")
+
+
+async def stream_multipart_upload(request, file_field, destination, max_size):
+    """
+    Parse the multipart body of `request`, writing the part named `file_field` to
+    `destination`. Returns (fields, StreamedFile or None). Raises UploadStreamError
+    (or UploadTooLargeError once more than `max_size` bytes of file data arrive);
+    a partially written destination is removed before raising.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadStreamError("Expected a multipart/form-data body")
+
+    # The parser's callbacks are synchronous; they queue events that are
+    # handled (with awaits) after each chunk is fed in.
+    events = []
+    header = {"field": b"", "value": b""}
+    part_headers = {}
+
+    def on_part_begin():
+        part_headers.clear()
+
+    def on_header_field(data, start, end):
+        header["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        part_headers[header["field"].lower()] = header["value"]
+        header["field"] = b""
+        header["value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(part_headers.get(b"content-disposition", b""))
+        events.append(("begin", {
+            "name": disposition.get(b"name", b"").decode(),
+            "filename": disposition[b"filename"].decode() if b"filename" in disposition else None,
+            "content_type": part_headers.get(b"content-type", b"").decode() or None,
+        }))
+
+    def on_part_data(data, start, end):
+        events.append(("data", bytes(data[start:end])))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    fields = {}
+    streamed = None
+    output = None
+    current = None
+    field_value = b""
+    content_length = request.headers.get("content-length")
+    progress = _ProgressLog(f"Upload to {os.path.basename(destination)}", int(content_length) if content_length else None)
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event, payload in events:
+                if event == "begin":
+                    current = payload
+                    field_value = b""
+                    if current["name"] == file_field and current["filename"] is not None and streamed is None:
+                        streamed = StreamedFile(destination, current["filename"], current["content_type"])
+                        output = await aiofiles.open(destination, "wb")
+                        current["is_file"] = True
+                elif event == "data":
+                    if current.get("is_file"):
+                        streamed.size += len(payload)
+                        if streamed.size > max_size:
+                            raise UploadTooLargeError(f"File too large. Maximum allowed size is {max_size // (1024 * 1024)}MB")
+                        await output.write(payload)
+                        streamed.hasher.update(payload)
+                        progress.update(streamed.size)
+                    elif current["filename"] is None:
+                        field_value += payload
+                        if len(field_value) > MAX_FORM_FIELD_SIZE:
+                            raise UploadStreamError(f"Form field '{current['name']}' is too large")
+                elif event == "end":
+                    if current.get("is_file"):
+                        await output.close()
+                        output = None
+                    elif current["filename"] is None:
+                        fields[current["name"]] = field_value.decode("utf-8", errors="replace")
+                    current = None
+            events.clear()
+        parser.finalize()
+
+        if output is not None:
+            raise UploadStreamError("Upload ended before the file part was complete")
+        if streamed:
+            progress.update(streamed.size, force=True)
+        return fields, streamed
+    except BaseException:
+        if output is not None:
+            await output.close()
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+
+
+
+async def stream_upload_file(upload_file, destination, max_size, chunk_size=UPLOAD_STREAM_CHUNK_SIZE):
+    """
+    Copy an UploadFile to `destination` in `chunk_size` pieces with aiofiles,
+    enforcing `max_size` and hashing as it goes. Returns a StreamedFile; a partially
+    written destination is removed before UploadTooLargeError is raised.
+    """
+    streamed = StreamedFile(str(destination), upload_file.filename, upload_file.content_type)
+    try:
+        async with aiofiles.open(destination, "wb") as output:
+            while True:
+                chunk = await upload_file.read(chunk_size)
+                if not chunk:
+                    break
+                streamed.size += len(chunk)
+                if streamed.size > max_size:
+                    raise UploadTooLargeError(f"File too large. Maximum allowed size is {max_size // (1024 * 1024)}MB")
+                await output.write(chunk)
+                streamed.hasher.update(chunk)
+        return streamed
+    except BaseException:
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
@@ -0,0 +1,132 @@
+"""
+Video writers for the pose overlay output.
+
+The preferred backend pipes raw BGR frames into an ffmpeg subprocess that encodes
+browser-playable H.264 (yuv420p, moov atom up front for progressive playback).
+The ffmpeg binary comes from FFMPEG_BINARY, the imageio-ffmpeg build bundled with
+moviepy, or PATH. Without ffmpeg the old cv2.VideoWriter fourcc fallback is used.
+
+Settings (environment):
+    POSE_VIDEO_ENCODER   auto | ffmpeg | opencv   (default auto)
+    POSE_FFMPEG_PRESET   x264 preset              (default veryfast)
+    POSE_FFMPEG_CRF      x264 constant quality    (default 23)
+    POSE_FFMPEG_THREADS  encoder threads, 0=auto  (default 0)
+    POSE_FFMPEG_FASTSTART  move moov atom to the front (default true)
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+
+POSE_VIDEO_ENCODER = os.getenv("POSE_VIDEO_ENCODER", "auto").lower()
+POSE_FFMPEG_PRESET = os.getenv("POSE_FFMPEG_PRESET", "veryfast")
+POSE_FFMPEG_CRF = int(os.getenv("POSE_FFMPEG_CRF", 23))
+POSE_FFMPEG_THREADS = int(os.getenv("POSE_FFMPEG_THREADS", 0))
+POSE_FFMPEG_FASTSTART = os.getenv("POSE_FFMPEG_FASTSTART", "true").lower() in ("1", "true", "yes")
+
+OPENCV_FOURCC_OPTIONS = ['XVID', 'mp4v', 'avc1', 'H264']
+
+_ffmpeg_binary = None
+
+
+def find_ffmpeg():
+    """Path to an ffmpeg binary, or None if none is available."""
+    global _ffmpeg_binary
+    if _ffmpeg_binary is None:
+        candidate = os.getenv("FFMPEG_BINARY")
+        if not candidate:
+            try:
+                import imageio_ffmpeg
+                candidate = imageio_ffmpeg.get_ffmpeg_exe()
+            except Exception:
+                candidate = shutil.which("ffmpeg")
+        _ffmpeg_binary = candidate or ""
+    return _ffmpeg_binary or None
+
+
+class FFmpegWriter:
+    """cv2.VideoWriter-compatible writer that streams frames into ffmpeg's stdin."""
+
+    def __init__(self, path, fps, frame_size, preset=POSE_FFMPEG_PRESET, crf=POSE_FFMPEG_CRF,
+                 threads=POSE_FFMPEG_THREADS, faststart=POSE_FFMPEG_FASTSTART, binary=None):
+        width, height = frame_size
+        self.path = path
+        command = [
+            binary or find_ffmpeg(), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-vcodec", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{width}x{height}", "-r", str(fps or 30),
+            "-i", "-",
+            "-an",
+            # yuv420p needs even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-preset", preset, "-crf", str(crf),
+            "-pix_fmt", "yuv420p", "-threads", str(threads),
+        ]
+        if faststart:
+            command += ["-movflags", "+faststart"]
+        command += ["-f", "mp4", path]
+
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self._stderr)
+
+    def isOpened(self):
+        return self._process is not None and self._process.poll() is None
+
+    def write(self, frame):
+        self._process.stdin.write(frame.tobytes())
+
+    def release(self):
+        """Finish encoding; a failed encode removes the output so callers see no file."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._process.wait()
+        self._process = None
+
+        if returncode != 0:
+            self._stderr.seek(0)
+            print(f"ffmpeg exited with {returncode}: {self._stderr.read().decode(errors='replace').strip()}")
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        self._stderr.close()
+
+
+def _open_opencv_writer(cv2, path, fps, frame_size):
+    for codec in OPENCV_FOURCC_OPTIONS:
+        try:
+            fourcc = cv2.VideoWriter_fourcc(*codec)
+            out = cv2.VideoWriter(path, fourcc, fps, frame_size)
+            if out.isOpened():
+                print(f"Successfully initialized VideoWriter with codec: {codec}")
+                return out
+        except Exception as e:
+            print(f"Failed to initialize VideoWriter with codec {codec}: {e}")
+    return None
+
+
+def open_video_writer(path, fps, frame_size):
+    """
+    Writer for `path` using the configured backend (see module docstring), or None
+    if no backend could be opened. The returned object has the cv2.VideoWriter
+    isOpened/write/release interface.
+    """
+    if POSE_VIDEO_ENCODER in ("auto", "ffmpeg"):
+        binary = find_ffmpeg()
+        if binary:
+            try:
+                writer = FFmpegWriter(path, fps, frame_size, binary=binary)
+                if writer.isOpened():
+                    print(f"Encoding with ffmpeg libx264 (preset={POSE_FFMPEG_PRESET}, crf={POSE_FFMPEG_CRF})")
+                    return writer
+                writer.release()
+            except Exception as e:
+                print(f"Failed to start ffmpeg encoder: {e}")
+        elif POSE_VIDEO_ENCODER == "ffmpeg":
+            print("POSE_VIDEO_ENCODER=ffmpeg but no ffmpeg binary was found, falling back to OpenCV")
+
+    import cv2
+
+    return _open_opencv_writer(cv2, path, fps, frame_size)
@@ -0,0 +1,219 @@
+"""
+HLS renditions for exercise video submissions and pose-processed outputs.
+
+Each video gets an adaptive bitrate ladder under HLS_DIR/<video name>/:
+
+    master.m3u8             variant playlist, one entry per rendition
+    <height>p/index.m3u8    VOD media playlist
+    <height>p/seg_00000.ts  HLS_SEGMENT_SECONDS long H.264 segments
+
+Renditions come from HLS_RENDITIONS ("height:kbps,..."); rungs taller than the
+source are dropped so phone-sized clips are never upscaled. Keyframes are forced
+on segment boundaries so players can switch rungs at any segment. Encoding
+happens in the video job workers (job kind "hls"/"hls_processed") and goes to a
+staging directory that is renamed into place, so a half-written ladder is never
+served. Uploads are content addressed, so identical clips share one ladder.
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import uuid
+
+from connections.video_encoder import POSE_FFMPEG_PRESET, POSE_FFMPEG_THREADS, find_ffmpeg
+
+HLS_DIR = os.getenv("HLS_DIR", "uploads/exercise_videos/hls")
+HLS_SEGMENT_SECONDS = int(os.getenv("HLS_SEGMENT_SECONDS", 4))
+HLS_RENDITIONS = os.getenv("HLS_RENDITIONS", "360:700,540:1400,720:2800")
+HLS_AUDIO_BITRATE = os.getenv("HLS_AUDIO_BITRATE", "96k")
+HLS_MASTER_PLAYLIST = "master.m3u8"
+
+_ASSET_PATH = re.compile(r"(?:master\.m3u8|\d+p/(?:index\.m3u8|seg_\d+\.ts))")
+
+
+def parse_renditions(spec=HLS_RENDITIONS):
+    """"360:700,720:2800" -> [(360, 700), (720, 2800)] sorted by height."""
+    renditions = []
+    for rung in spec.split(","):
+        height, _, kbps = rung.strip().partition(":")
+        if height and kbps:
+            renditions.append((int(height), int(kbps)))
+    if not renditions:
+        raise ValueError(f"No HLS renditions in '{spec}'")
+    return sorted(renditions)
+
+
+def hls_name_for(video_path):
+    return os.path.splitext(os.path.basename(video_path))[0]
+
+
+def hls_dir_for(video_path):
+    return os.path.join(HLS_DIR, hls_name_for(video_path))
+
+
+def hls_ready(video_path):
+    return os.path.exists(os.path.join(hls_dir_for(video_path), HLS_MASTER_PLAYLIST))
+
+
+def hls_asset_path(video_filename, asset):
+    """Absolute location of a playlist/segment, or None for anything outside the ladder."""
+    if not _ASSET_PATH.fullmatch(asset):
+        return None
+    return os.path.join(hls_dir_for(video_filename), asset)
+
+
+def remove_hls(video_path):
+    shutil.rmtree(hls_dir_for(video_path), ignore_errors=True)
+
+
+def _probe_video(path):
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"Could not open video {path}")
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        duration = frames / fps if frames > 0 else None
+        return height, fps, duration
+    finally:
+        capture.release()
+
+
+def _has_audio(binary, path):
+    probe = subprocess.run([binary, "-hide_banner", "-i", path], capture_output=True, text=True)
+    return "Audio:" in probe.stderr
+
+
+def select_renditions(source_height, renditions=None):
+    """Rungs no taller than the source; a short source still gets one rung at its own height."""
+    renditions = renditions or parse_renditions()
+    selected = [(height, kbps) for height, kbps in renditions if height <= source_height]
+    if not selected:
+        selected = [(source_height - source_height % 2, renditions[0][1])]
+    return selected
+
+
+def build_hls_command(binary, video_path, output_dir, renditions, fps, with_audio):
+    gop = max(1, round(fps * HLS_SEGMENT_SECONDS))
+    split = "".join(f"[v{index}]" for index in range(len(renditions)))
+    filters = [f"[0:v]split={len(renditions)}{split}"]
+    filters += [f"[v{index}]scale=-2:{height}[v{index}out]" for index, (height, _) in enumerate(renditions)]
+
+    command = [binary, "-y", "-hide_banner", "-loglevel", "error", "-nostats",
+               "-progress", "pipe:1", "-i", video_path,
+               "-filter_complex", ";".join(filters)]
+    stream_map = []
+    for index, (height, kbps) in enumerate(renditions):
+        command += [
+            "-map", f"[v{index}out]",
+            f"-c:v:{index}", "libx264",
+            f"-b:v:{index}", f"{kbps}k",
+            f"-maxrate:v:{index}", f"{int(kbps * 1.07)}k",
+            f"-bufsize:v:{index}", f"{kbps * 2}k",
+        ]
+        entry = f"v:{index}"
+        if with_audio:
+            command += ["-map", "0:a:0"]
+            entry += f",a:{index}"
+        stream_map.append(f"{entry},name:{height}p")
+
+    command += [
+        "-preset", POSE_FFMPEG_PRESET, "-threads", str(POSE_FFMPEG_THREADS),
+        "-pix_fmt", "yuv420p", "-profile:v", "main",
+        "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+    ]
+    command += ["-c:a", "aac", "-b:a", HLS_AUDIO_BITRATE, "-ac", "2"] if with_audio else ["-an"]
+    command += [
+        "-f", "hls",
+        "-hls_time", str(HLS_SEGMENT_SECONDS),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", os.path.join(output_dir, "%v", "seg_%05d.ts"),
+        "-master_pl_name", HLS_MASTER_PLAYLIST,
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(output_dir, "%v", "index.m3u8"),
+    ]
+    return command
+
+
+def transcode_hls(video_path, progress_callback=None, should_stop=None, replace=False):
+    """
+    Build the HLS ladder for `video_path`. Returns the ladder directory, or None if
+    it was cancelled via `should_stop`. Raises on encoder failure.
+
+    An existing ladder is kept unless `replace` is set, in which case the new one is
+    swapped in once it is complete; the old ladder keeps being served until then.
+    """
+    output_dir = hls_dir_for(video_path)
+    if hls_ready(video_path) and not replace:
+        return output_dir
+
+    binary = find_ffmpeg()
+    if not binary:
+        raise RuntimeError("HLS transcoding needs ffmpeg (FFMPEG_BINARY, imageio-ffmpeg or PATH)")
+
+    source_height, fps, duration = _probe_video(video_path)
+    renditions = select_renditions(source_height)
+    staging_dir = f"{output_dir}.{uuid.uuid4().hex}.tmp"
+    for height, _ in renditions:
+        os.makedirs(os.path.join(staging_dir, f"{height}p"))
+
+    command = build_hls_command(binary, video_path, staging_dir, renditions, fps, _has_audio(binary, video_path))
+    print(f"Building HLS ladder {[f'{height}p@{kbps}k' for height, kbps in renditions]} for {video_path}")
+
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+    cancelled = False
+    try:
+        # -progress writes key=value lines; out_time_us tracks the encoded position
+        for line in process.stdout:
+            if should_stop and should_stop():
+                cancelled = True
+                process.kill()
+                break
+            key, _, value = line.strip().partition("=")
+            if key == "out_time_us" and duration and progress_callback and value.isdigit():
+                progress_callback(min(99, int(int(value) / 1e6 / duration * 100)))
+        returncode = process.wait()
+
+        if cancelled:
+            return None
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"ffmpeg exited with {returncode}: {stderr.read().decode(errors='replace').strip()}")
+
+        if replace and os.path.isdir(output_dir):
+            retired_dir = f"{output_dir}.{uuid.uuid4().hex}.old"
+            os.rename(output_dir, retired_dir)
+            os.rename(staging_dir, output_dir)
+            shutil.rmtree(retired_dir, ignore_errors=True)
+        else:
+            try:
+                os.rename(staging_dir, output_dir)
+            except OSError:
+                # Another worker finished the same content first
+                if not hls_ready(video_path):
+                    raise
+        if progress_callback:
+            progress_callback(100)
+        return output_dir
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr.close()
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def tokenize_playlist(playlist, token):
+    """Append ?token= to every URI line so relative segment/variant fetches stay authorised."""
+    lines = []
+    for line in playlist.splitlines():
+        if line and not line.startswith("#"):
+            line = f"{line}?token={token}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,370 @@
+"""
+Durable Redis job queue for exercise video processing.
+
+Keys:
+    video_jobs:queue        LIST  job ids ready to run (LPUSH in, RPOP out)
+    video_jobs:processing   ZSET  claimed job ids scored by heartbeat deadline
+    video_jobs:delayed      ZSET  failed job ids scored by the time they may retry
+    video_jobs:dead         LIST  job ids that exhausted VIDEO_JOB_MAX_ATTEMPTS
+    video_job:{job_id}      HASH  job state (status, progress, attempts, error, ...)
+    video_job:video:{filename}[:{kind}]  STRING  the current job id of that kind for
+                            a stored video ("pose" has no suffix)
+
+Job kinds: "pose" (pose overlay + landmarks), "hls" (HLS ladder of the upload),
+"hls_processed" (HLS ladder of the pose-processed output) and "preview" (poster
+frame and sprite sheet of the upload).
+
+Uploads are content-addressed (see connections.pose_cache), so submissions of
+the same clip share one file and every output derived from it. Jobs are therefore
+keyed by the video file, not the submission: one active job per file and kind
+serves every submission of that content, and no two jobs write the same outputs.
+
+Any web worker can enqueue, cancel or read a job; any pose worker on any node can
+claim it. A worker that dies stops heartbeating and its job is retried.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+
+import redis as sync_redis
+
+from connections.redis_database import r, REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, REDIS_USER
+
+VIDEO_JOB_MAX_ATTEMPTS = int(os.getenv("VIDEO_JOB_MAX_ATTEMPTS", 3))
+VIDEO_JOB_RETRY_BASE_SECONDS = int(os.getenv("VIDEO_JOB_RETRY_BASE_SECONDS", 30))
+VIDEO_JOB_HEARTBEAT_TIMEOUT = int(os.getenv("VIDEO_JOB_HEARTBEAT_TIMEOUT", 120))
+VIDEO_JOB_RETENTION = int(os.getenv("VIDEO_JOB_RETENTION", 7 * 24 * 3600))
+
+QUEUE_KEY = "video_jobs:queue"
+PROCESSING_KEY = "video_jobs:processing"
+DELAYED_KEY = "video_jobs:delayed"
+DEAD_LETTER_KEY = "video_jobs:dead"
+
+ACTIVE_STATUSES = {"queued", "processing", "retrying"}
+VIDEO_JOB_KINDS = ("pose", "hls", "hls_processed", "preview")
+
+CLAIM_SCRIPT = """
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then
+    return nil
+end
+redis.call('ZADD', KEYS[2], ARGV[1], job_id)
+local job_key = 'video_job:' .. job_id
+redis.call('HSET', job_key, 'status', 'processing', 'worker', ARGV[2], 'claim', ARGV[4], 'heartbeat_at', ARGV[3], 'updated_at', ARGV[3])
+redis.call('HINCRBY', job_key, 'attempts', 1)
+return job_id
+"""
+
+PROMOTE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, job_id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('LPUSH', KEYS[2], job_id)
+    redis.call('HSET', 'video_job:' .. job_id, 'status', 'queued', 'updated_at', ARGV[1])
+end
+return #ids
+"""
+
+# Check-and-claim in one step, so two requests for the same video can't both see
+# no active job and queue one each. The statuses mirror ACTIVE_STATUSES.
+ENQUEUE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local status = redis.call('HGET', 'video_job:' .. current, 'status')
+    if status == 'queued' or status == 'processing' or status == 'retrying' then
+        return {0, current}
+    end
+end
+redis.call('HSET', 'video_job:' .. ARGV[1], unpack(ARGV, 2))
+redis.call('SET', KEYS[1], ARGV[1])
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return {1, ARGV[1]}
+"""
+
+# Extend the deadline only while this claim still owns the job. Once it has been
+# reaped (or reaped and claimed again) the old worker must stop, not keep running.
+HEARTBEAT_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+local job_key = 'video_job:' .. ARGV[1]
+if redis.call('HGET', job_key, 'claim') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('HSET', job_key, 'heartbeat_at', ARGV[4], 'updated_at', ARGV[4])
+return 1
+"""
+
+# Put a claimed job back at the head of the queue without spending an attempt.
+REQUEUE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+local job_key = 'video_job:' .. ARGV[1]
+redis.call('HINCRBY', job_key, 'attempts', -1)
+redis.call('HSET', job_key, 'status', 'queued', 'updated_at', ARGV[2])
+redis.call('RPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+def job_key(job_id):
+    return f"video_job:{job_id}"
+
+
+def video_job_key(video_path, kind="pose"):
+    filename = os.path.basename(video_path)
+    if kind == "pose":
+        return f"video_job:video:{filename}"
+    return f"video_job:video:{filename}:{kind}"
+
+
+def _decode_job(raw):
+    if not raw:
+        return None
+    job = dict(raw)
+    for field in ("submission_id", "attempts", "crashes", "progress"):
+        if field in job and job[field] not in (None, ""):
+            job[field] = int(float(job[field]))
+    job["cancel_requested"] = job.get("cancel_requested") == "1"
+    job.setdefault("kind", "pose")
+    if job.get("options"):
+        try:
+            job["options"] = json.loads(job["options"])
+        except json.JSONDecodeError:
+            job["options"] = {}
+    return job
+
+
+async def get_video_job(job_id):
+    return _decode_job(await r.hgetall(job_key(job_id)))
+
+
+async def get_video_job_for(video_path, kind="pose"):
+    job_id = await r.get(video_job_key(video_path, kind))
+    if not job_id:
+        return None
+    return await get_video_job(job_id)
+
+
+def is_job_active(job):
+    return bool(job) and job.get("status") in ACTIVE_STATUSES
+
+
+async def enqueue_video_job(submission_id, video_path, options=None, kind="pose"):
+    """
+    Queue a `kind` job for the video at `video_path`. Returns (job, created); when the
+    video already has an active job of that kind (possibly queued for another
+    submission of the same content) it is returned with created=False.
+    """
+    if kind not in VIDEO_JOB_KINDS:
+        raise ValueError(f"Unknown video job kind '{kind}'")
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    fields = {
+        "job_id": job_id,
+        "submission_id": submission_id,
+        "kind": kind,
+        "video_path": video_path,
+        "options": json.dumps(options or {}),
+        "status": "queued",
+        "attempts": 0,
+        "progress": 0,
+        "cancel_requested": 0,
+        "created_at": now,
+        "updated_at": now,
+    }
+    created, job_id = await r.eval(
+        ENQUEUE_SCRIPT, 2, video_job_key(video_path, kind), QUEUE_KEY,
+        job_id, *[item for pair in fields.items() for item in pair]
+    )
+    return await get_video_job(job_id), bool(created)
+
+
+async def claim_video_job(worker_id):
+    job_id = await r.eval(
+        CLAIM_SCRIPT, 2, QUEUE_KEY, PROCESSING_KEY,
+        time.time() + VIDEO_JOB_HEARTBEAT_TIMEOUT, worker_id, time.time(), uuid.uuid4().hex
+    )
+    if not job_id:
+        return None
+    job = await get_video_job(job_id)
+    if job and job["cancel_requested"]:
+        await finish_video_job(job_id, "cancelled")
+        return None
+    return job
+
+
+async def heartbeat_video_job(job_id, claim):
+    """
+    Extend the job's heartbeat deadline. Returns False once `claim` (the token
+    handed out by claim_video_job) no longer owns the job; the caller must then
+    stop and leave the job's state to its new owner.
+    """
+    now = time.time()
+    return bool(await r.eval(
+        HEARTBEAT_SCRIPT, 1, PROCESSING_KEY,
+        job_id, claim, now + VIDEO_JOB_HEARTBEAT_TIMEOUT, now
+    ))
+
+
+async def finish_video_job(job_id, status, result=None):
+    """Record a terminal state (completed/cancelled) for a job."""
+    await r.zrem(PROCESSING_KEY, job_id)
+    await r.zrem(DELAYED_KEY, job_id)
+    await r.lrem(QUEUE_KEY, 0, job_id)
+    mapping = {"status": status, "updated_at": time.time()}
+    if status == "completed":
+        mapping["progress"] = 100
+    if result:
+        mapping["result"] = result
+    await r.hset(job_key(job_id), mapping=mapping)
+    await r.expire(job_key(job_id), VIDEO_JOB_RETENTION)
+
+
+async def fail_video_job(job_id, error):
+    """
+    Record a failed attempt. The job is retried with exponential backoff until
+    VIDEO_JOB_MAX_ATTEMPTS, then moved to the dead-letter list.
+    """
+    if not await r.zrem(PROCESSING_KEY, job_id):
+        return None
+
+    job = await get_video_job(job_id)
+    if not job:
+        return None
+
+    now = time.time()
+    if job["cancel_requested"]:
+        await finish_video_job(job_id, "cancelled")
+        return "cancelled"
+
+    if job["attempts"] >= VIDEO_JOB_MAX_ATTEMPTS:
+        await r.hset(job_key(job_id), mapping={"status": "dead", "error": str(error), "updated_at": now})
+        await r.lpush(DEAD_LETTER_KEY, job_id)
+        print(f"Video job {job_id} moved to dead-letter list after {job['attempts']} attempts: {error}")
+        return "dead"
+
+    retry_at = now + VIDEO_JOB_RETRY_BASE_SECONDS * (2 ** (job["attempts"] - 1))
+    await r.hset(job_key(job_id), mapping={
+        "status": "retrying",
+        "error": str(error),
+        "retry_at": retry_at,
+        "updated_at": now
+    })
+    await r.zadd(DELAYED_KEY, {job_id: retry_at})
+    print(f"Video job {job_id} failed (attempt {job['attempts']}), retrying in {int(retry_at - now)}s: {error}")
+    return "retrying"
+
+
+async def requeue_crashed_video_job(job_id):
+    """
+    Requeue a job whose worker process died under it (e.g. a sibling job crashed
+    the pool). The attempt is not counted; crashes are tracked separately and a
+    job that keeps taking its worker down is failed after VIDEO_JOB_MAX_ATTEMPTS.
+    """
+    crashes = await r.hincrby(job_key(job_id), "crashes", 1)
+    if crashes > VIDEO_JOB_MAX_ATTEMPTS:
+        return await fail_video_job(job_id, f"worker process crashed {crashes} times")
+    if not await r.eval(REQUEUE_SCRIPT, 2, PROCESSING_KEY, QUEUE_KEY, job_id, time.time()):
+        return None
+    print(f"Video job {job_id} requeued after its worker process crashed ({crashes} crash(es))")
+    return "queued"
+
+
+async def cancel_video_job(video_path, kind="pose"):
+    """
+    Cancel the video's active job of `kind`. Queued/retrying jobs are cancelled
+    at once; running jobs get a cancel flag that the worker process polls.
+    """
+    job = await get_video_job_for(video_path, kind)
+    if not is_job_active(job):
+        return None
+
+    await r.hset(job_key(job["job_id"]), mapping={"cancel_requested": 1, "updated_at": time.time()})
+    if job["status"] in ("queued", "retrying"):
+        await finish_video_job(job["job_id"], "cancelled")
+    return await get_video_job(job["job_id"])
+
+
+async def promote_due_retries():
+    return await r.eval(PROMOTE_SCRIPT, 2, DELAYED_KEY, QUEUE_KEY, time.time())
+
+
+async def reap_stale_jobs():
+    """Fail jobs whose worker stopped heartbeating so they get retried elsewhere."""
+    stale = await r.zrangebyscore(PROCESSING_KEY, "-inf", time.time())
+    for job_id in stale:
+        await fail_video_job(job_id, "worker heartbeat timed out")
+    return len(stale)
+
+
+async def wait_for_video_job(job_id, timeout):
+    """Poll a job until it leaves the active states or `timeout` passes; returns the last seen state."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    job = await get_video_job(job_id)
+    while is_job_active(job) and loop.time() < deadline:
+        await asyncio.sleep(0.25)
+        job = await get_video_job(job_id)
+    return job
+
+
+async def get_dead_letter_jobs(limit=50):
+    job_ids = await r.lrange(DEAD_LETTER_KEY, 0, limit - 1)
+    return [job for job in [await get_video_job(job_id) for job_id in job_ids] if job]
+
+
+_sync_client = None
+
+
+def _sync_redis():
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = sync_redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            password=REDIS_PASSWORD,
+            username=REDIS_USER,
+            decode_responses=True
+        )
+    return _sync_client
+
+
+class JobProgressReporter:
+    """
+    Blocking progress/cancel hooks for code running inside a video worker process.
+    should_stop() is also true once `claim` no longer owns the job (it was reaped
+    or claimed again elsewhere). Checks are rate limited to one Redis round trip
+    per `check_interval` seconds.
+    """
+    def __init__(self, job_id, claim=None, check_interval=1.0):
+        self.job_id = job_id
+        self.claim = claim
+        self.check_interval = check_interval
+        self._last_check = 0.0
+        self._cancelled = False
+
+    def report(self, percent):
+        try:
+            _sync_redis().hset(job_key(self.job_id), mapping={"progress": percent, "updated_at": time.time()})
+        except Exception as e:
+            print(f"Error reporting progress for video job {self.job_id}: {e}")
+
+    def should_stop(self):
+        now = time.monotonic()
+        if self._cancelled or now - self._last_check < self.check_interval:
+            return self._cancelled
+        self._last_check = now
+        try:
+            cancel_requested, status, claim = _sync_redis().hmget(
+                job_key(self.job_id), "cancel_requested", "status", "claim"
+            )
+            lost = self.claim is not None and (status != "processing" or claim != self.claim)
+            self._cancelled = cancel_requested == "1" or lost
+        except Exception as e:
+            print(f"Error checking cancel flag for video job {self.job_id}: {e}")
+        return self._cancelled
@@ -0,0 +1,152 @@
+"""
+Poster frames and preview sprite sheets for exercise video submissions.
+
+For each uploaded video, PREVIEW_DIR gets
+    <name>_poster.jpg / <name>_poster.webp   one frame, at most POSTER_MAX_WIDTH wide
+    <name>_sprite.jpg                        SPRITE_FRAMES evenly spaced thumbnails
+                                             in a grid SPRITE_COLUMNS wide
+    <name>_sprite.json                       tile size, grid and the timestamp of
+                                             each tile, for scrubbing previews
+
+They are extracted with OpenCV by the video job workers (job kind "preview")
+right after upload, so list screens load a few KB per item instead of video bytes.
+Uploads are content addressed, so a preview never changes once written and can be
+served with long-lived cache headers.
+"""
+import json
+import os
+import uuid
+
+PREVIEW_DIR = os.getenv("VIDEO_PREVIEW_DIR", "uploads/exercise_videos/previews")
+POSTER_MAX_WIDTH = int(os.getenv("POSTER_MAX_WIDTH", 480))
+POSTER_POSITION = float(os.getenv("POSTER_POSITION", 0.1))
+POSTER_JPEG_QUALITY = int(os.getenv("POSTER_JPEG_QUALITY", 80))
+POSTER_WEBP_QUALITY = int(os.getenv("POSTER_WEBP_QUALITY", 75))
+SPRITE_FRAMES = int(os.getenv("SPRITE_FRAMES", 10))
+SPRITE_COLUMNS = int(os.getenv("SPRITE_COLUMNS", 5))
+SPRITE_TILE_WIDTH = int(os.getenv("SPRITE_TILE_WIDTH", 160))
+
+PREVIEW_ASSETS = {
+    "poster.jpg": "image/jpeg",
+    "poster.webp": "image/webp",
+    "sprite.jpg": "image/jpeg",
+    "sprite.json": "application/json",
+}
+
+
+def preview_path_for(video_path, asset):
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    stem, extension = os.path.splitext(asset)
+    return os.path.join(PREVIEW_DIR, f"{name}_{stem}{extension}")
+
+
+def previews_ready(video_path):
+    return os.path.exists(preview_path_for(video_path, "sprite.json"))
+
+
+def remove_previews(video_path):
+    for asset in PREVIEW_ASSETS:
+        path = preview_path_for(video_path, asset)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _resize_to_width(cv2, frame, width):
+    height, frame_width = frame.shape[:2]
+    if frame_width <= width:
+        return frame
+    return cv2.resize(frame, (width, max(1, round(height * width / frame_width))), interpolation=cv2.INTER_AREA)
+
+
+def _write_image(cv2, path, image, params):
+    extension = os.path.splitext(path)[1]
+    ok, encoded = cv2.imencode(extension, image, params)
+    if not ok:
+        raise RuntimeError(f"OpenCV could not encode {extension} preview")
+    part_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(part_path, "wb") as image_file:
+        image_file.write(encoded.tobytes())
+    os.replace(part_path, path)
+
+
+def _read_frame_at(cv2, capture, frame_index):
+    capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    ok, frame = capture.read()
+    return frame if ok else None
+
+
+def generate_previews(video_path, progress_callback=None, should_stop=None):
+    """
+    Write the poster and sprite sheet for `video_path`. Returns the sprite metadata
+    path, or None if cancelled via `should_stop`. Raises if the video can't be read.
+    """
+    if previews_ready(video_path):
+        return preview_path_for(video_path, "sprite.json")
+
+    import cv2
+    import numpy as np
+
+    os.makedirs(PREVIEW_DIR, exist_ok=True)
+    capture = cv2.VideoCapture(video_path)
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"Could not open video {video_path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        # Seek targets; the poster skips the first moments, which are often blank
+        poster_index = int(frame_count * POSTER_POSITION) if frame_count > 0 else 0
+        tile_count = max(1, min(SPRITE_FRAMES, frame_count or 1))
+        tile_indexes = [int((i + 0.5) * frame_count / tile_count) for i in range(tile_count)] if frame_count else [0]
+
+        poster = _read_frame_at(cv2, capture, poster_index)
+        if poster is None:
+            poster = _read_frame_at(cv2, capture, 0)
+        if poster is None:
+            raise ValueError(f"No decodable frames in {video_path}")
+        poster = _resize_to_width(cv2, poster, POSTER_MAX_WIDTH)
+        _write_image(cv2, preview_path_for(video_path, "poster.jpg"), poster, [cv2.IMWRITE_JPEG_QUALITY, POSTER_JPEG_QUALITY])
+        _write_image(cv2, preview_path_for(video_path, "poster.webp"), poster, [cv2.IMWRITE_WEBP_QUALITY, POSTER_WEBP_QUALITY])
+        if progress_callback:
+            progress_callback(20)
+
+        tile_width = SPRITE_TILE_WIDTH
+        tile_height = max(1, round(poster.shape[0] * tile_width / poster.shape[1]))
+        tiles = []
+        for position, frame_index in enumerate(tile_indexes):
+            if should_stop and should_stop():
+                return None
+            frame = _read_frame_at(cv2, capture, frame_index)
+            if frame is None:
+                break
+            tiles.append((frame_index, cv2.resize(frame, (tile_width, tile_height), interpolation=cv2.INTER_AREA)))
+            if progress_callback:
+                progress_callback(20 + int(75 * (position + 1) / len(tile_indexes)))
+    finally:
+        capture.release()
+
+    if not tiles:
+        tiles = [(poster_index, cv2.resize(poster, (tile_width, tile_height), interpolation=cv2.INTER_AREA))]
+    columns = min(SPRITE_COLUMNS, len(tiles))
+    rows = -(-len(tiles) // columns)
+    sheet = np.zeros((rows * tile_height, columns * tile_width, 3), dtype=np.uint8)
+    for position, (_, tile) in enumerate(tiles):
+        row, column = divmod(position, columns)
+        sheet[row * tile_height:(row + 1) * tile_height, column * tile_width:(column + 1) * tile_width] = tile
+    _write_image(cv2, preview_path_for(video_path, "sprite.jpg"), sheet, [cv2.IMWRITE_JPEG_QUALITY, POSTER_JPEG_QUALITY])
+
+    meta_path = preview_path_for(video_path, "sprite.json")
+    part_path = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+    with open(part_path, "w") as meta_file:
+        json.dump({
+            "tile_width": tile_width,
+            "tile_height": tile_height,
+            "columns": columns,
+            "rows": rows,
+            "timestamps": [round(frame_index / fps, 3) for frame_index, _ in tiles],
+        }, meta_file)
+    # The metadata goes last: its presence marks the preview set as complete
+    os.replace(part_path, meta_path)
+    if progress_callback:
+        progress_callback(100)
+    return meta_path
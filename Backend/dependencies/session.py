@@ -7,8 +7,8 @@ async def get_current_user(request: Request):
     if not session_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
+    # Served from the in-process session cache for up to SESSION_CACHE_TTL seconds
     session = await get_redis_session(session_id)
-    print(f"session: {session}")
 
     if not session:
         raise HTTPException(status_code=401, detail="Session expired or invalid")
@@ -221,6 +221,22 @@ CREATE TABLE `PatientExerciseProgress` (
 INSERT INTO `PatientExerciseProgress` (`progress_id`, `patient_id`, `plan_exercise_id`, `completion_date`, `sets_completed`, `repetitions_completed`, `duration_seconds`, `pain_level`, `difficulty_level`, `notes`, `created_at`) VALUES
 (40,	26,	38,	'2025-05-04',	3,	10,	300,	10,	10,	'ez',	'2025-05-03 16:58:03');
 
+DROP TABLE IF EXISTS `PatientExerciseProgressDailyRollup`;
+CREATE TABLE `PatientExerciseProgressDailyRollup` (
+  `therapist_id` int NOT NULL,
+  `patient_id` int NOT NULL,
+  `rollup_date` date NOT NULL,
+  `progress_count` int NOT NULL DEFAULT '0',
+  `pain_count` int NOT NULL DEFAULT '0',
+  `pain_sum` bigint NOT NULL DEFAULT '0',
+  `difficulty_count` int NOT NULL DEFAULT '0',
+  `difficulty_sum` bigint NOT NULL DEFAULT '0',
+  `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`therapist_id`,`patient_id`,`rollup_date`),
+  KEY `patient_date` (`patient_id`,`rollup_date`),
+  KEY `therapist_date` (`therapist_id`,`rollup_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
 DROP TABLE IF EXISTS `PatientMetrics`;
 CREATE TABLE `PatientMetrics` (
   `metric_id` int NOT NULL AUTO_INCREMENT,
@@ -241,6 +257,27 @@ CREATE TABLE `PatientMetrics` (
 ) ENGINE=InnoDB AUTO_INCREMENT=22 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 
+DROP TABLE IF EXISTS `PatientMetricsDailyRollup`;
+CREATE TABLE `PatientMetricsDailyRollup` (
+  `therapist_id` int NOT NULL,
+  `patient_id` int NOT NULL,
+  `rollup_date` date NOT NULL,
+  `metric_count` int NOT NULL DEFAULT '0',
+  `adherence_count` int NOT NULL DEFAULT '0',
+  `adherence_sum` decimal(12,2) NOT NULL DEFAULT '0.00',
+  `recovery_count` int NOT NULL DEFAULT '0',
+  `recovery_sum` decimal(12,2) NOT NULL DEFAULT '0.00',
+  `functionality_count` int NOT NULL DEFAULT '0',
+  `functionality_sum` bigint NOT NULL DEFAULT '0',
+  `pain_count` int NOT NULL DEFAULT '0',
+  `pain_sum` bigint NOT NULL DEFAULT '0',
+  `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`therapist_id`,`patient_id`,`rollup_date`),
+  KEY `patient_date` (`patient_id`,`rollup_date`),
+  KEY `therapist_date` (`therapist_id`,`rollup_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+
 DROP TABLE IF EXISTS `PatientNotes`;
 CREATE TABLE `PatientNotes` (
   `note_id` int NOT NULL AUTO_INCREMENT,
@@ -437,4 +474,16 @@ INSERT INTO `users` (`user_id`, `username`, `email`, `password_hash`, `profile_p
 (59,	'cat',	'cat@gmail.com',	'$2b$12$uAtgLYY1fYi6CLHzWYirjujwOAKzIzM3U4OkduKxDUIIM1RXxZJPi',	'avatar-2.jpg',	'2025-05-01 13:31:27',	'2025-05-01 13:31:27'),
 (62,	'212',	'a@gmail.com',	'$2b$12$T69LJAehPH40SPv/rNQnC.7A5MTcJLiEC167by7.NkDbxykYRjIQq',	'avatar-2.jpg',	'2025-05-03 11:32:16',	'2025-05-03 11:32:16');
 
+INSERT INTO `PatientMetricsDailyRollup` (`therapist_id`, `patient_id`, `rollup_date`, `metric_count`, `adherence_count`, `adherence_sum`, `recovery_count`, `recovery_sum`, `functionality_count`, `functionality_sum`, `pain_count`, `pain_sum`)
+SELECT `therapist_id`, `patient_id`, `measurement_date`, COUNT(*), COUNT(`adherence_rate`), COALESCE(SUM(`adherence_rate`), 0), COUNT(`recovery_progress`), COALESCE(SUM(`recovery_progress`), 0), COUNT(`functionality_score`), COALESCE(SUM(`functionality_score`), 0), COUNT(`pain_level`), COALESCE(SUM(`pain_level`), 0)
+FROM `PatientMetrics`
+GROUP BY `therapist_id`, `patient_id`, `measurement_date`;
+
+INSERT INTO `PatientExerciseProgressDailyRollup` (`therapist_id`, `patient_id`, `rollup_date`, `progress_count`, `pain_count`, `pain_sum`, `difficulty_count`, `difficulty_sum`)
+SELECT tp.`therapist_id`, pep.`patient_id`, pep.`completion_date`, COUNT(*), COUNT(pep.`pain_level`), COALESCE(SUM(pep.`pain_level`), 0), COUNT(pep.`difficulty_level`), COALESCE(SUM(pep.`difficulty_level`), 0)
+FROM `PatientExerciseProgress` pep
+JOIN `TreatmentPlanExercises` tpe ON pep.`plan_exercise_id` = tpe.`plan_exercise_id`
+JOIN `TreatmentPlans` tp ON tpe.`plan_id` = tp.`plan_id`
+GROUP BY tp.`therapist_id`, pep.`patient_id`, pep.`completion_date`;
+
 -- 2025-05-07 06:27:40 UTC